@@ -7,8 +7,12 @@ distributed proportionally to AC booth votes.
 
 import json
 from pathlib import Path
+import sys
 
-BASE_DIR = Path("/Users/p0s097d/ElectionLens")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+BASE_DIR = PATHS.root
 BOOTHS_DIR = BASE_DIR / "public/data/booths/TN"
 PC_DATA = BASE_DIR / "public/data/elections/pc/TN/2024.json"
 SCHEMA_FILE = BASE_DIR / "public/data/schema.json"
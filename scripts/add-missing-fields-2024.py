@@ -6,8 +6,12 @@ Required fields: acId, acName, electionType, date, summary
 
 import json
 from pathlib import Path
+import sys
 
-BASE_DIR = Path("/Users/p0s097d/ElectionLens")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+BASE_DIR = PATHS.root
 BOOTHS_DIR = BASE_DIR / "public/data/booths/TN"
 
 def get_ac_name_from_booths(ac_id):
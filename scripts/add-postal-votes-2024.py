@@ -11,10 +11,14 @@ This script adds postal vote data to all 2024 booth files.
 
 import json
 from pathlib import Path
+import sys
 
-BOOTHS_DIR = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-PC_DATA = Path("/Users/p0s097d/ElectionLens/public/data/elections/pc/TN/2024.json")
-SCHEMA = Path("/Users/p0s097d/ElectionLens/public/data/schema.json")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+BOOTHS_DIR = PATHS.booths / "TN"
+PC_DATA = PATHS.elections / "pc/TN/2024.json"
+SCHEMA = PATHS.schema
 
 
 def load_json(path):
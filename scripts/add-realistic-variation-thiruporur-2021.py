@@ -9,8 +9,12 @@ Solution: Add realistic variation (10-15% CV) while maintaining exact totals.
 import json
 import random
 from pathlib import Path
+import sys
 
-BASE_DIR = Path("/Users/p0s097d/ElectionLens")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+BASE_DIR = PATHS.root
 BOOTHS_DIR = BASE_DIR / "public/data/booths/TN"
 ELECTION_DATA = BASE_DIR / "public/data/elections/ac/TN/2021.json"
 
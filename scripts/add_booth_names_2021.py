@@ -3,9 +3,13 @@
 
 import json
 from pathlib import Path
+import sys
 
-BOOTHS_FILE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN/TN-081/booths.json")
-RESULTS_FILE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN/TN-081/2021.json")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+BOOTHS_FILE = PATHS.booths / "TN/TN-081/booths.json"
+RESULTS_FILE = PATHS.booths / "TN/TN-081/2021.json"
 
 def main():
     print("=" * 70)
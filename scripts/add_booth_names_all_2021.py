@@ -3,8 +3,12 @@
 
 import json
 from pathlib import Path
+import sys
 
-BASE_DIR = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+BASE_DIR = PATHS.booths / "TN"
 
 def process_ac(ac_dir: Path):
     """Process a single AC directory."""
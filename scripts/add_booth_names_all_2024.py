@@ -4,8 +4,12 @@
 import json
 import re
 from pathlib import Path
+import sys
 
-BASE_DIR = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+BASE_DIR = PATHS.booths / "TN"
 
 def normalize_booth_id(booth_id: str, ac_id: str) -> str:
     """Normalize booth ID to match booths.json format.
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Alliance Scenario Engine
+========================
+What-if analysis for alliances on a (units × parties) vote matrix, where a
+unit is an AC (official results) or a booth (booth results).
+
+The matrix is loaded once; a scenario is just a party mask plus per-party
+vote-transfer efficiencies, so thousands of scenarios are evaluated as
+array operations in chunks.
+
+Scenario model (per unit):
+    lead      = strongest alliance member (the one that would contest)
+    combined  = lead + Σ efficiency[p] × votes[p] for the other members
+    rival     = strongest non-member
+    win       = combined > rival;  margin = combined - rival
+A seat "flips" when it is won under the scenario but the actual winner was
+not a member.
+
+Usage:
+    # Single scenario (AC level), full transfer
+    python scripts/alliance_scenarios.py --alliance ADMK,BJP,PMK,AMMK
+
+    # Partners transfer 70% of their votes; booth level
+    python scripts/alliance_scenarios.py --alliance ADMK,BJP,PMK --efficiency 0.7 --booths
+
+    # Sweep every subset of partners added to a base, over an efficiency grid
+    python scripts/alliance_scenarios.py --base ADMK --partners BJP,PMK,AMMK,DMDK,NTK \\
+        --efficiencies 0.5,0.6,0.7,0.8,0.9,1.0 --sweep
+
+    # Blog-ready JSON for one scenario
+    python scripts/alliance_scenarios.py --alliance ADMK,BJP,PMK,AMMK \\
+        --blog public/data/blog/ammk-admk-alliance-2026.json
+
+    --state KA --year 2023 selects any state/year with AC results.
+"""
+
+import itertools
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from booth_matrix import ELECTIONS_DIR, iter_booth_matrices, load_json, load_schema
+
+# Upper bound on scenario × unit × party elements evaluated per chunk
+MAX_CHUNK_ELEMENTS = 4_000_000
+CLOSE_MARGIN_SHARE = 0.05    # A win by < 5% of the unit's votes counts as close
+
+
+# ============================================================================
+# Data Classes
+# ============================================================================
+
+@dataclass
+class PartyMatrix:
+    """Votes of each party's best candidate per unit (AC or booth)."""
+    state: str
+    year: int
+    level: str                  # "ac" or "booth"
+    unit_ids: list[str]
+    unit_names: list[str]
+    parties: list[str]
+    votes: np.ndarray           # (units, parties) int64
+    winner_names: list[str]     # actual winning candidate per unit
+    seat_index: Optional[np.ndarray] = None   # booth level: unit → AC position
+    seat_ids: list[str] = field(default_factory=list)
+
+    def party_index(self, party: str) -> int:
+        return self.parties.index(party) if party in self.parties else -1
+
+    @property
+    def winner(self) -> np.ndarray:
+        return self.votes.argmax(axis=1)
+
+
+@dataclass
+class Scenario:
+    """An alliance and how well partner votes transfer to the contesting member."""
+    name: str
+    members: list[str]
+    efficiency: dict[str, float] = field(default_factory=dict)
+    default_efficiency: float = 1.0
+
+    def vectors(self, parties: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        mask = np.array([p in self.members for p in parties], dtype=bool)
+        eff = np.array([self.efficiency.get(p, self.default_efficiency) for p in parties], dtype=np.float64)
+        return mask, eff
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+
+def best_by_party(unit_votes: list[tuple[str, int]], party_pos: dict[str, int], row: np.ndarray):
+    """Fill `row` with each party's best candidate (INDs never add up)."""
+    for party, votes in unit_votes:
+        col = party_pos[party]
+        if votes > row[col]:
+            row[col] = votes
+
+
+def load_ac_matrix(state: str, year: int, schema: Optional[dict] = None) -> PartyMatrix:
+    """AC × party matrix from official results (public/data/elections/ac/{state}/{year}.json)."""
+    data = load_json(ELECTIONS_DIR / "ac" / state / f"{year}.json")
+    schema = schema if schema is not None else load_schema()
+    schema_acs = schema.get('assemblyConstituencies', {})
+
+    unit_ids = [ac_id for ac_id, ac in data.items() if ac.get('candidates')]
+    parties = sorted({c.get('party', '') for ac_id in unit_ids for c in data[ac_id]['candidates']})
+    party_pos = {p: i for i, p in enumerate(parties)}
+
+    votes = np.zeros((len(unit_ids), len(parties)), dtype=np.int64)
+    names, winners = [], []
+    for row, ac_id in enumerate(unit_ids):
+        ac = data[ac_id]
+        cands = ac['candidates']
+        best_by_party([(c.get('party', ''), c.get('votes', 0) or 0) for c in cands], party_pos, votes[row])
+        names.append(schema_acs.get(ac_id, {}).get('name') or ac.get('constituencyName') or ac_id)
+        winners.append(max(cands, key=lambda c: c.get('votes', 0) or 0).get('name', ''))
+
+    return PartyMatrix(state=state, year=year, level='ac', unit_ids=unit_ids, unit_names=names,
+                       parties=parties, votes=votes, winner_names=winners)
+
+
+def load_booth_party_matrix(state: str, year: int) -> PartyMatrix:
+    """Booth × party matrix stacked over every AC's booth results."""
+    bms = list(iter_booth_matrices(state, year))
+    parties = sorted({p for bm in bms for p in bm.parties})
+    party_pos = {p: i for i, p in enumerate(parties)}
+
+    blocks, unit_ids, names, winners, seat_index, seat_ids = [], [], [], [], [], []
+    for seat, bm in enumerate(bms):
+        rows = np.flatnonzero(bm.has_votes)
+        block = np.zeros((len(rows), len(parties)), dtype=np.int64)
+        for col, party in enumerate(bm.parties):
+            target = party_pos[party]
+            np.maximum(block[:, target], bm.votes[rows, col], out=block[:, target])
+        blocks.append(block)
+        unit_ids.extend(bm.booth_ids[i] for i in rows)
+        names.extend([bm.ac_name] * len(rows))
+        top = bm.votes[rows].argmax(axis=1) if len(rows) else []
+        winners.extend(bm.names[t] for t in top)
+        seat_index.append(np.full(len(rows), seat, dtype=np.int32))
+        seat_ids.append(bm.ac_id)
+
+    return PartyMatrix(
+        state=state, year=year, level='booth', unit_ids=unit_ids, unit_names=names,
+        parties=parties,
+        votes=np.vstack(blocks) if blocks else np.zeros((0, len(parties)), dtype=np.int64),
+        winner_names=winners,
+        seat_index=np.concatenate(seat_index) if seat_index else np.zeros(0, dtype=np.int32),
+        seat_ids=seat_ids,
+    )
+
+
+# ============================================================================
+# Evaluation
+# ============================================================================
+
+def evaluate_batch(pm: PartyMatrix, masks: np.ndarray, effs: np.ndarray) -> dict:
+    """
+    Evaluate S scenarios at once.
+
+    masks: (S, parties) bool alliance membership
+    effs:  (S, parties) transfer efficiency per party
+    Returns (S, units) arrays: combined, rival, margin, win, flip, hold, lead.
+
+    Only parties that are a member in at least one scenario get their own
+    column; everyone else collapses into a single "best outsider" column,
+    which keeps the (S, units, columns) working set small.
+    """
+    universe = masks.any(axis=0)
+    cols = np.flatnonzero(universe)
+    outside = np.where(universe, -1, pm.votes).max(axis=1).clip(min=0) if (~universe).any() \
+        else np.zeros(len(pm.unit_ids), dtype=np.int64)
+    votes = np.column_stack([pm.votes[:, cols], outside]).astype(np.float64)    # (U, C+1)
+    m = np.column_stack([masks[:, cols], np.zeros(len(masks), dtype=bool)])     # (S, C+1)
+    e = np.column_stack([effs[:, cols], np.zeros(len(effs))])
+
+    member_votes = np.where(m[:, None, :], votes[None], -1.0)                   # (S, U, C+1)
+    lead = member_votes.argmax(axis=2)                                          # (S, U)
+    lead_votes = np.take_along_axis(member_votes, lead[..., None], axis=2)[..., 0].clip(min=0)
+
+    contrib = np.where(m[:, None, :], votes[None] * e[:, None, :], 0.0)
+    lead_contrib = np.take_along_axis(contrib, lead[..., None], axis=2)[..., 0]
+    combined = lead_votes + contrib.sum(axis=2) - lead_contrib
+
+    rival = np.where(m[:, None, :], -1.0, votes[None]).max(axis=2).clip(min=0)
+    winner = np.broadcast_to(pm.winner, (len(masks), len(pm.unit_ids)))
+    actual_member = np.take_along_axis(masks, winner, axis=1)
+
+    win = combined > rival
+    return {
+        'combined': np.rint(combined).astype(np.int64),
+        'rival': rival.astype(np.int64),
+        'margin': np.rint(combined - rival).astype(np.int64),
+        'win': win,
+        'flip': win & ~actual_member,
+        'hold': win & actual_member,
+        'lead': cols[np.minimum(lead, len(cols) - 1)] if len(cols) else lead,
+    }
+
+
+def evaluate(pm: PartyMatrix, scenario: Scenario) -> dict:
+    """Evaluate one scenario; returns (units,) arrays."""
+    mask, eff = scenario.vectors(pm.parties)
+    return {k: v[0] for k, v in evaluate_batch(pm, mask[None], eff[None]).items()}
+
+
+def seat_rollup(pm: PartyMatrix, result: dict) -> Optional[dict]:
+    """Booth level: combined vs rival votes summed per AC (None at AC level)."""
+    if pm.seat_index is None:
+        return None
+    num_seats = len(pm.seat_ids)
+    combined = np.bincount(pm.seat_index, weights=result['combined'], minlength=num_seats)
+    rival = np.bincount(pm.seat_index, weights=result['rival'], minlength=num_seats)
+    booths_won = np.bincount(pm.seat_index, weights=result['win'], minlength=num_seats)
+    return {'combined': combined, 'rival': rival, 'booths_won': booths_won.astype(int),
+            'win': combined > rival}
+
+
+def sweep(pm: PartyMatrix, scenarios: list[Scenario]) -> list[dict]:
+    """Evaluate many scenarios in memory-bounded chunks; one row per scenario."""
+    universe = {p for s in scenarios for p in s.members}
+    num_units, num_cols = len(pm.unit_ids), len(universe) + 1
+    chunk = max(1, MAX_CHUNK_ELEMENTS // max(num_units * num_cols, 1))
+    close_limit = pm.votes.sum(axis=1) * CLOSE_MARGIN_SHARE
+    rows = []
+    for start in range(0, len(scenarios), chunk):
+        batch = scenarios[start:start + chunk]
+        vecs = [s.vectors(pm.parties) for s in batch]
+        masks = np.stack([m for m, _ in vecs])
+        effs = np.stack([e for _, e in vecs])
+        res = evaluate_batch(pm, masks, effs)
+        for i, s in enumerate(batch):
+            won = res['win'][i]
+            rows.append({
+                'name': s.name,
+                'members': s.members,
+                'efficiency': s.default_efficiency,
+                'wins': int(won.sum()),
+                'flips': int(res['flip'][i].sum()),
+                'holds': int(res['hold'][i].sum()),
+                'marginWon': int(res['margin'][i][won].sum()),
+                'closeWins': int((won & (res['margin'][i] < close_limit)).sum()),
+            })
+    return sorted(rows, key=lambda r: (-r['wins'], -r['marginWon']))
+
+
+def sweep_scenarios(base: list[str], partners: list[str], efficiencies: list[float],
+                    min_partners: int = 0) -> list[Scenario]:
+    """Every subset of partners added to base, at each efficiency level."""
+    scenarios = []
+    for k in range(min_partners, len(partners) + 1):
+        for combo in itertools.combinations(partners, k):
+            members = base + list(combo)
+            for eff in efficiencies:
+                name = f"{'+'.join(members)}@{eff:.0%}"
+                scenarios.append(Scenario(name=name, members=members, default_efficiency=eff,
+                                          efficiency={base[0]: 1.0} if base else {}))
+    return scenarios
+
+
+# ============================================================================
+# Blog Output
+# ============================================================================
+
+def blog_json(pm: PartyMatrix, scenario: Scenario, extra_parties: Optional[list[str]] = None) -> dict:
+    """
+    Blog data in the format of public/data/blog/ammk-admk-alliance-2026.json:
+    `flips` (seats a non-member won that the alliance would take) and
+    `margin_increases` (seats a member won, plus what partners add).
+    """
+    res = evaluate(pm, scenario)
+    winner = pm.winner
+    member_cols = [pm.party_index(p) for p in scenario.members]
+    extra_cols = [(p, pm.party_index(p)) for p in (extra_parties or [])]
+
+    def party_fields(row: int) -> dict:
+        fields = {}
+        for party, col in zip(scenario.members, member_cols):
+            fields[f"{party.lower()}_votes"] = int(pm.votes[row, col]) if col >= 0 else 0
+        return fields
+
+    flips, margin_increases = [], []
+    for row in np.flatnonzero(res['flip'] | res['hold']):
+        winner_party = pm.parties[winner[row]]
+        winner_votes = int(pm.votes[row, winner[row]])
+        entry = {
+            'ac_id': pm.unit_ids[row],
+            'ac_name': pm.unit_names[row],
+            'current_winner': winner_party,
+        }
+        if res['flip'][row]:
+            entry.update({
+                'current_winner_name': pm.winner_names[row],
+                'current_winner_votes': winner_votes,
+                **party_fields(row),
+                'combined_votes': int(res['combined'][row]),
+                'margin': int(res['margin'][row]),
+            })
+            for party, col in extra_cols:
+                entry[f"{party.lower()}_votes"] = int(pm.votes[row, col]) if col >= 0 else 0
+            flips.append(entry)
+        else:
+            entry.update({
+                'current_winner_votes': winner_votes,
+                **party_fields(row),
+                'combined_votes': int(res['combined'][row]),
+                'margin_increase': int(res['combined'][row]) - winner_votes,
+            })
+            margin_increases.append(entry)
+
+    flips.sort(key=lambda x: x['margin'], reverse=True)
+    margin_increases.sort(key=lambda x: x['margin_increase'], reverse=True)
+
+    return {
+        'scenario': {
+            'name': scenario.name,
+            'members': scenario.members,
+            'efficiency': scenario.default_efficiency,
+            'state': pm.state,
+            'year': pm.year,
+            'level': pm.level,
+        },
+        'flips': flips,
+        'margin_increases': margin_increases,
+        'total_flips': len(flips),
+        'total_margin_increases': len(margin_increases),
+    }
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def arg_value(args: list[str], flag: str, default=None):
+    return args[args.index(flag) + 1] if flag in args else default
+
+
+def arg_list(args: list[str], flag: str) -> list[str]:
+    value = arg_value(args, flag, '')
+    return [v.strip() for v in value.split(',') if v.strip()]
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or '--help' in args or '-h' in args:
+        print(__doc__)
+        return
+
+    state = arg_value(args, '--state', 'TN')
+    year = int(arg_value(args, '--year', 2021))
+    booth_level = '--booths' in args
+
+    start = time.perf_counter()
+    pm = load_booth_party_matrix(state, year) if booth_level else load_ac_matrix(state, year)
+    print(f"Loaded {pm.level} matrix {pm.votes.shape[0]:,} × {pm.votes.shape[1]} "
+          f"({state} {year}) in {time.perf_counter() - start:.2f}s")
+
+    if '--sweep' in args:
+        base = arg_list(args, '--base')
+        partners = arg_list(args, '--partners')
+        effs = [float(e) for e in arg_list(args, '--efficiencies')] or [1.0]
+        scenarios = sweep_scenarios(base, partners, effs)
+
+        start = time.perf_counter()
+        rows = sweep(pm, scenarios)
+        elapsed = time.perf_counter() - start
+        print(f"Evaluated {len(scenarios):,} scenarios in {elapsed:.2f}s "
+              f"({len(scenarios) / max(elapsed, 1e-9):,.0f}/s)\n")
+        print(f"  {'Scenario':45s} {'Wins':>5s} {'Flips':>6s} {'Close':>6s}")
+        for r in rows[:20]:
+            print(f"  {r['name'][:45]:45s} {r['wins']:5d} {r['flips']:6d} {r['closeWins']:6d}")
+
+        out = arg_value(args, '--output')
+        if out:
+            with open(out, 'w') as f:
+                json.dump({'state': state, 'year': year, 'level': pm.level, 'scenarios': rows}, f, indent=2)
+            print(f"\n✅ Sweep written: {out}")
+        return
+
+    members = arg_list(args, '--alliance')
+    eff = float(arg_value(args, '--efficiency', 1.0))
+    scenario = Scenario(name='+'.join(members), members=members, default_efficiency=eff,
+                        efficiency={members[0]: 1.0} if members else {})
+    res = evaluate(pm, scenario)
+
+    print(f"\nScenario {scenario.name} @ {eff:.0%} transfer")
+    print(f"  Units won:  {int(res['win'].sum()):,} of {len(pm.unit_ids):,}")
+    print(f"  Flips:      {int(res['flip'].sum()):,}")
+    print(f"  Holds:      {int(res['hold'].sum()):,}")
+    seats = seat_rollup(pm, res)
+    if seats is not None:
+        print(f"  ACs won on booth aggregate: {int(seats['win'].sum())} of {len(pm.seat_ids)}")
+
+    blog_path = arg_value(args, '--blog')
+    if blog_path:
+        output = blog_json(pm, scenario, extra_parties=arg_list(args, '--report-parties') or ['DMK'])
+        Path(blog_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(blog_path, 'w') as f:
+            json.dump(output, f, indent=2)
+        print(f"\n✅ Blog data written: {blog_path}")
+
+
+if __name__ == "__main__":
+    main()
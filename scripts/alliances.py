@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Alliance Definitions
+====================
+Party → alliance mapping per state and election year.
+
+Alliance labels are chosen to be comparable across years (the DMK-led front
+is "DMK+" in both 2021 and 2024, even though it was branded SPA and INDIA),
+so cross-year swing and scenario analysis can line blocs up by label.
+
+Usage:
+    from alliances import party_groups
+
+    groups = party_groups("TN", 2024)   # {"DMK": "DMK+", "BJP": "NDA", ...}
+"""
+
+ALLIANCES = {
+    'TN': {
+        2021: {
+            'DMK+': ['DMK', 'INC', 'VCK', 'CPI', 'CPI(M)', 'CPM', 'MDMK', 'IUML', 'KMDK', 'MMK', 'MAHMMK'],
+            'ADMK+': ['ADMK', 'BJP', 'PMK', 'TMC(M)', 'PT', 'Puthiya Tamilagam'],
+            'AMMK+': ['AMMK', 'DMDK', 'SDPI'],
+            'MNM+': ['MNM', 'IJK', 'AISMK'],
+        },
+        2024: {
+            'DMK+': ['DMK', 'INC', 'VCK', 'CPI', 'CPI(M)', 'CPM', 'MDMK', 'IUML', 'KMDK', 'MMK', 'MAHMMK'],
+            'ADMK+': ['ADMK', 'DMDK', 'SDPI', 'PT', 'Puthiya Tamilagam'],
+            'NDA': ['BJP', 'PMK', 'TMC(M)', 'AMMK', 'AMMKMNKZ', 'IJK'],
+        },
+    },
+}
+
+
+def normalize_party(party: str) -> str:
+    """Upper-case and collapse whitespace so "CPI(M)" / "cpi(m) " compare equal."""
+    return ' '.join((party or '').upper().split())
+
+
+def party_groups(state: str, year: int) -> dict[str, str]:
+    """Normalized party → alliance label for a state-year (empty if undefined)."""
+    groups = {}
+    for label, parties in ALLIANCES.get(state, {}).get(year, {}).items():
+        for party in parties:
+            groups[normalize_party(party)] = label
+    return groups
+
+
+def alliance_of(party: str, groups: dict[str, str]) -> str:
+    """Alliance label for a party, falling back to the party itself."""
+    norm = normalize_party(party)
+    return groups.get(norm, norm)
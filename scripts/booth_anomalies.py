@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Booth Anomaly Detector
+======================
+Runs the detection heuristics of the fix-* scripts, plus statistical
+checks, over every AC-year in one pass and ranks what it finds.
+
+Each fixer used to carry its own detector and its own walk over the
+dataset. Here every AC-year is loaded once as a BoothMatrix, matched once
+against the official results, and every signature runs on its arrays:
+
+    column-offset  first column > 2x the second and > 50,000 votes, above
+                   its official figure (electors read as votes)
+    booth-number   the booth number among a row's first five votes, or a
+                   vote column that tracks the booth numbers
+    swap           swapping two columns brings the booth sums closer to the
+                   official votes by more than 1,000
+    scaling        booth sums off the official votes by the same factor in
+                   every column (booths missing, or counted twice)
+    over-count     booth sums more than 10% above the official votes
+    transposed     rows that read as runs of consecutive numbers (booth
+                   numbers of a table with booths in columns)
+    duplicate      identical vote rows under different booth ids
+    outlier        booth votes more than Z_LIMIT standard deviations from
+                   their column's mean (and OUTLIER_MIN_VOTES off it)
+
+Every anomaly is scored by the share of the AC's votes it puts in doubt and
+names the fixer that applies ("re-extract" and "review" where no fix-*
+script covers it).
+
+Usage:
+    from booth_anomalies import detect_anomalies
+
+    for anomaly in detect_anomalies("TN", [2021, 2024]):   # ranked, worst first
+        anomaly.ac_id, anomaly.kind, anomaly.score, anomaly.fixer
+
+    python scripts/booth_anomalies.py                       # all years, top 40
+    python scripts/booth_anomalies.py --year 2024 --top 100
+    python scripts/booth_anomalies.py TN-001 TN-030         # specific ACs
+    python scripts/booth_anomalies.py --kind swap --json anomalies.json
+"""
+
+import json
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from booth_matrix import BoothMatrix, iter_booth_matrices, load_schema
+from postal_reconcile import election_kind, match_candidates, official_candidates, years_with_booth_data
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# fix-column-offset-auto.py: detect_offset
+OFFSET_RATIO = 2
+OFFSET_MIN_VOTES = 50000
+# ... and the column must exceed its own official figure by this factor
+OFFSET_OVER_OFFICIAL = 1.5
+# fix-booth-number-in-votes-2024.py: fix_booth_votes checks the first five votes.
+# A booth number matches a real vote count by chance in about 1% of rows
+LEAK_POSITIONS = 5
+LEAK_MIN_SHARE = 0.05
+LEAK_CORRELATION = 0.95
+# fix-nagapattinam-complete-2024.py: find_vote_swap_pattern
+SWAP_MIN_IMPROVEMENT = 1000
+# Booth sums / official votes outside this range; postal ballots put a clean
+# AC a few percent short. Scaling is uniform: the column ratios of candidates
+# with SCALING_MIN_SHARE of the votes lie within SCALING_SPREAD of each other
+SCALING_RANGE = (0.90, 1.02)
+SCALING_MIN_SHARE = 0.05
+SCALING_SPREAD = 1.2
+OVER_COUNT_RATIO = 1.10
+# A row is a run of consecutive numbers when half its neighbouring cells
+# differ by exactly one; an AC is transposed when this share of rows is
+SEQUENCE_ROW_SHARE = 0.5
+TRANSPOSED_MIN_SHARE = 0.2
+# Vote rows smaller than this repeat by chance (tiny auxiliary booths)
+DUPLICATE_MIN_VOTES = 50
+# Outlier cells: beyond Z_LIMIT standard deviations and this many votes off
+# the column mean (a 4 in a column of zeros is far out, but harmless)
+Z_LIMIT = 6.0
+OUTLIER_MIN_VOTES = 100
+
+# Fixer per anomaly kind and year
+FIXERS = {
+    'column-offset': {2024: 'fix-column-offset-auto.py'},
+    'booth-number': {2024: 'fix-booth-number-in-votes-2024.py'},
+    'swap': {2024: 'fix_2024_candidate_order.py'},
+    'scaling': {2024: 'fix-vote-scaling-2024.py'},
+    'over-count': {2021: 'fix-over-votes-2021.py'},
+    'transposed': {2021: 'fix-transposed.py'},
+}
+# Kinds without a fix-* script: structural ones need the PDF read again
+REEXTRACT = 'unified-pdf-parser.py (re-extract)'
+REVIEW = 'review'
+STATISTICAL = ('duplicate', 'outlier')
+
+KINDS = ('column-offset', 'booth-number', 'swap', 'scaling', 'over-count',
+         'transposed', 'duplicate', 'outlier')
+
+
+@dataclass
+class Anomaly:
+    state: str
+    ac_id: str
+    year: int
+    kind: str                   # one of KINDS
+    score: float                # share of the AC's votes in doubt, 0-1
+    detail: str
+    fixer: str
+    booths: list[str] = field(default_factory=list)     # example booth ids
+
+
+def fixer_for(kind: str, year: int) -> str:
+    """fix-* script for an anomaly kind in a year."""
+    return FIXERS.get(kind, {}).get(year, REVIEW if kind in STATISTICAL else REEXTRACT)
+
+
+# ============================================================================
+# Signatures
+# ============================================================================
+
+def official_targets(bm: BoothMatrix, official: Optional[list[dict]]) -> np.ndarray:
+    """Official votes per booth-file column (NaN where unmatched)."""
+    targets = np.full(bm.num_candidates, np.nan)
+    if not official:
+        return targets
+    match = match_candidates(bm.candidates, official, bm.column_totals)
+    votes = np.array([c.get('votes', 0) or 0 for c in official], dtype=float)
+    targets[match >= 0] = votes[match[match >= 0]]
+    return targets
+
+
+def column_offset(bm: BoothMatrix, sums: np.ndarray, targets: np.ndarray) -> Optional[tuple]:
+    """(score, detail) when the first column holds electors rather than votes."""
+    if bm.num_candidates < 2:
+        return None
+    col0, col1 = sums[0], max(sums[1], 1)
+    if not (col0 > OFFSET_RATIO * col1 and col0 > OFFSET_MIN_VOTES):
+        return None
+    if not np.isnan(targets[0]) and col0 <= OFFSET_OVER_OFFICIAL * targets[0]:
+        return None
+    excess = col0 - (0 if np.isnan(targets[0]) else targets[0])
+    return min(1.0, excess / max(sums.sum(), 1)), f"column 0 sums to {col0:,} vs {int(sums[1]):,} in column 1"
+
+
+def booth_number_leak(bm: BoothMatrix, rows: np.ndarray) -> Optional[tuple]:
+    """(score, detail, booth rows) when booth numbers were read as votes."""
+    votes, nos = bm.votes[rows], bm.booth_nos[rows]
+    if not len(votes):
+        return None
+    hits = (votes[:, :LEAK_POSITIONS] == nos[:, None]) & (nos[:, None] > 0)
+    leaked = hits.any(axis=1)
+
+    # A whole column of booth numbers: it correlates with them
+    column = ''
+    if len(votes) > 2 and nos.std() > 0:
+        v = votes - votes.mean(axis=0)
+        n = nos - nos.mean()
+        std = v.std(axis=0) * n.std()
+        corr = np.divide(v.T @ n / len(n), std, out=np.zeros(bm.num_candidates), where=std > 0)
+        if corr.max() > LEAK_CORRELATION:
+            c = int(corr.argmax())
+            leaked |= votes[:, c] == nos
+            column = f", column {c} tracks the booth numbers (r={corr[c]:.2f})"
+
+    share = leaked.mean()
+    if share < LEAK_MIN_SHARE and not column:
+        return None
+    at_stake = votes[leaked].sum() / max(votes.sum(), 1)
+    return at_stake, f"{int(leaked.sum())} of {len(votes)} rows ({share:.0%}) carry their booth number{column}", \
+        rows[leaked]
+
+
+def best_swap(sums: np.ndarray, targets: np.ndarray) -> Optional[tuple]:
+    """(score, detail) of the column swap that brings the sums closest to the official votes."""
+    known = np.flatnonzero(~np.isnan(targets))
+    if len(known) < 2:
+        return None
+    s, t = sums[known].astype(float), targets[known]
+    before = np.abs(s - t)
+    after = np.abs(s[:, None] - t[None, :]) + np.abs(s[None, :] - t[:, None])
+    gain = np.triu(before[:, None] + before[None, :] - after, k=1)
+    i, j = np.unravel_index(gain.argmax(), gain.shape)
+    if gain[i, j] <= SWAP_MIN_IMPROVEMENT:
+        return None
+    a, b = known[i], known[j]
+    return min(1.0, gain[i, j] / max(t.sum(), 1)), \
+        f"columns {a} and {b} swapped ({int(s[i]):,} / {int(s[j]):,} vs official {int(t[i]):,} / {int(t[j]):,})"
+
+
+def vote_scaling(sums: np.ndarray, targets: np.ndarray) -> Optional[tuple]:
+    """(kind, score, detail) when the booth sums are off the official votes as a whole."""
+    known = ~np.isnan(targets) & (targets > 0)
+    if not known.any():
+        return None
+    ratio = sums[known].sum() / targets[known].sum()
+    if ratio > OVER_COUNT_RATIO:
+        return 'over-count', min(1.0, ratio - 1), f"booth sums at {ratio:.1%} of the official votes"
+    if SCALING_RANGE[0] <= ratio <= SCALING_RANGE[1]:
+        return None
+    major = known & (targets >= SCALING_MIN_SHARE * targets[known].sum())
+    ratios = sums[major] / targets[major]
+    if len(ratios) and ratios.min() > 0 and ratios.max() / ratios.min() > SCALING_SPREAD:
+        return None         # uneven: misread columns, not missing booths
+    return 'scaling', min(1.0, abs(ratio - 1)), \
+        f"booth sums at {ratio:.1%} of the official votes, evenly across candidates"
+
+
+def transposed_rows(bm: BoothMatrix, rows: np.ndarray) -> Optional[tuple]:
+    """(score, detail, booth rows) when rows read as runs of booth/station numbers."""
+    votes = bm.votes[rows]
+    if bm.num_candidates < 4 or not len(votes):
+        return None
+    steps = (np.abs(np.diff(votes, axis=1)) == 1) & (votes[:, 1:] > 0)
+    sequence = steps.mean(axis=1) >= SEQUENCE_ROW_SHARE
+    share = sequence.mean()
+    if share < TRANSPOSED_MIN_SHARE:
+        return None
+    return share, f"{int(sequence.sum())} of {len(votes)} rows are runs of consecutive numbers", rows[sequence]
+
+
+def duplicate_rows(bm: BoothMatrix, rows: np.ndarray) -> Optional[tuple]:
+    """(score, detail, booth rows) for vote rows repeated under other booth ids."""
+    rows = rows[bm.votes[rows].sum(axis=1) >= DUPLICATE_MIN_VOTES]
+    if len(rows) < 2:
+        return None
+    _, inverse, counts = np.unique(bm.votes[rows], axis=0, return_inverse=True, return_counts=True)
+    repeated = counts[inverse.ravel()] > 1
+    if not repeated.any():
+        return None
+    # Copies of one vector next to each other in the examples
+    order = np.argsort(inverse.ravel()[repeated], kind='stable')
+    # Every copy after the first is in doubt
+    extra = repeated.sum() - np.count_nonzero(counts > 1)
+    at_stake = extra / len(rows)
+    return at_stake, f"{int(repeated.sum())} rows share {int(np.count_nonzero(counts > 1))} vote vectors", \
+        rows[repeated][order]
+
+
+def outliers(bm: BoothMatrix, rows: np.ndarray) -> Optional[tuple]:
+    """(score, detail, booth rows) for booth votes far outside their column."""
+    votes = bm.votes[rows].astype(float)
+    if len(votes) < 10:
+        return None
+    mean, std = votes.mean(axis=0), votes.std(axis=0)
+    z = np.divide(votes - mean, std, out=np.zeros_like(votes), where=std > 0)
+    off = np.abs(votes - mean)
+    cells = (np.abs(z) > Z_LIMIT) & (off >= OUTLIER_MIN_VOTES)
+    if not cells.any():
+        return None
+    excess = off[cells].sum()
+    at_stake = min(1.0, excess / max(votes.sum(), 1))
+    r, c = np.unravel_index(np.where(cells, np.abs(z), 0).argmax(), z.shape)
+    return at_stake, f"{int(cells.sum())} cells beyond {Z_LIMIT:g} sd, worst {int(votes[r, c]):,} " \
+        f"in column {c} (z={z[r, c]:.1f})", rows[cells.any(axis=1)]
+
+
+def scan_matrix(bm: BoothMatrix, official: Optional[list[dict]]) -> list[Anomaly]:
+    """Every signature on one AC-year."""
+    found = []
+
+    def add(kind: str, score: float, detail: str, booth_rows=()):
+        found.append(Anomaly(bm.state, bm.ac_id, bm.year, kind, round(float(score), 4), detail,
+                             fixer_for(kind, bm.year), [bm.booth_ids[r] for r in booth_rows[:5]]))
+
+    if not bm.num_candidates or not bm.has_votes.any():
+        return found
+    rows = np.flatnonzero(bm.has_votes)
+    sums = bm.column_totals
+    targets = official_targets(bm, official)
+
+    # Structural signatures first: an offset or a transposed table explains
+    # the column sums, so swap and scaling are only checked without one
+    structural = False
+    hit = transposed_rows(bm, rows)
+    if hit:
+        add('transposed', *hit)
+        structural = True
+    hit = column_offset(bm, sums, targets)
+    if hit:
+        add('column-offset', *hit)
+        structural = True
+    hit = booth_number_leak(bm, rows)
+    if hit:
+        add('booth-number', *hit)
+    if not structural:
+        hit = best_swap(sums, targets)
+        if hit:
+            add('swap', *hit)
+        hit = vote_scaling(sums, targets)
+        if hit:
+            add(*hit)
+    for check, kind in ((duplicate_rows, 'duplicate'), (outliers, 'outlier')):
+        hit = check(bm, rows)
+        if hit:
+            add(kind, *hit)
+    return found
+
+
+# ============================================================================
+# Dataset
+# ============================================================================
+
+def detect_anomalies(state: str, years: list[int], ac_ids: Optional[list[str]] = None,
+                     kinds: Optional[list[str]] = None) -> list[Anomaly]:
+    """Anomalies of every AC-year of a state, ranked by score (worst first)."""
+    schema = load_schema()
+    found = []
+    for year in years:
+        kind = election_kind(state, year)
+        official = official_candidates(state, year, kind, schema) if kind else {}
+        for bm in iter_booth_matrices(state, year, ac_ids):
+            found += scan_matrix(bm, official.get(bm.ac_id))
+    if kinds:
+        found = [a for a in found if a.kind in kinds]
+    return sorted(found, key=lambda a: (-a.score, a.ac_id, a.year))
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    args = sys.argv[1:]
+    if '--help' in args or '-h' in args:
+        print(__doc__)
+        return
+    state = args[args.index('--state') + 1] if '--state' in args else 'TN'
+    years = [int(args[args.index('--year') + 1])] if '--year' in args else years_with_booth_data(state)
+    top = int(args[args.index('--top') + 1]) if '--top' in args else 40
+    kinds = args[args.index('--kind') + 1].split(',') if '--kind' in args else None
+    out = args[args.index('--json') + 1] if '--json' in args else None
+    ac_ids = [a for a in args if re.match(r'^[A-Z]{2}-\d{3}$', a)] or None
+
+    print("=" * 70)
+    print(f"Booth Anomalies ({state} {', '.join(map(str, years))})")
+    print("=" * 70)
+
+    start = time.time()
+    anomalies = detect_anomalies(state, years, ac_ids, kinds)
+    elapsed = time.time() - start
+
+    for a in anomalies[:top]:
+        icon = '❌' if a.score >= 0.05 else '⚠️ '
+        print(f"  {icon} {a.score:6.1%}  {a.ac_id} {a.year}  {a.kind:13s}  → {a.fixer}")
+        print(f"              {a.detail}")
+    if len(anomalies) > top:
+        print(f"  ... and {len(anomalies) - top} more")
+
+    print("\n  By kind:")
+    for kind in KINDS:
+        hits = [a for a in anomalies if a.kind == kind]
+        if hits:
+            print(f"    {kind:13s} {len(hits):4d}  ({len({(a.ac_id, a.year) for a in hits})} AC-years)")
+    print(f"\n{'✅' if not anomalies else '⚠️'} {len(anomalies)} anomalies in {elapsed:.2f}s")
+
+    if out:
+        Path(out).write_text(json.dumps([asdict(a) for a in anomalies], indent=2) + '\n')
+        print(f"   Written: {out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Booth Matrix Loader
+===================
+Shared loader that turns per-AC booth result files into NumPy vote matrices.
+
+Every analysis script used to walk `results` dicts booth by booth. This module
+decodes a `{year}.json` file once into a (booths × candidates) int32 matrix
+plus aligned per-booth vectors, so downstream stages can work with array
+operations instead of Python loops.
+
+Layout on disk:
+    public/data/booths/{STATE}/{AC_ID}/booths.json   - booth metadata
+    public/data/booths/{STATE}/{AC_ID}/{year}.json   - booth results
+
+Usage:
+    from booth_matrix import load_booth_matrix, iter_booth_matrices
+
+    bm = load_booth_matrix("TN", "TN-001", 2021)
+    bm.votes.sum(axis=0)  # per-candidate booth totals
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+import msgspec
+import numpy as np
+
+from electionlens.config import PATHS
+from records import BoothResults, RecordError, load_booth_list, load_results
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+BASE_DIR = PATHS.root
+DATA_DIR = PATHS.data
+BOOTHS_DIR = PATHS.booths
+ELECTIONS_DIR = PATHS.elections
+SCHEMA_PATH = PATHS.schema
+
+# "TN-001-001", "TN-200-7(A)", "TN-004-10A(W)" -> AC id + booth part
+BOOTH_ID_RE = re.compile(r'^(?P<ac>[A-Z]{2}-\d{3})-(?P<booth>.+)$')
+BOOTH_NO_RE = re.compile(r'^0*(?P<num>\d+)(?P<suffix>.*)$')
+
+
+# ============================================================================
+# Booth Keys
+# ============================================================================
+
+def canonical_booth_key(booth_id: str) -> str:
+    """
+    Canonical booth key that is stable across files and years.
+
+    Results files disagree on booth id formatting: 2021 uses "TN-001-1",
+    2024 uses "TN-001-001", and auxiliary/women booths appear as "7(A)",
+    "7A", "10A(W)" or "10AW". The key drops the AC prefix, leading zeros,
+    brackets and case, e.g. "TN-004-010A(w)" -> "10AW".
+    """
+    match = BOOTH_ID_RE.match(booth_id)
+    booth = match.group('booth') if match else booth_id
+    booth = re.sub(r'[()\s]', '', booth).upper()
+    match = BOOTH_NO_RE.match(booth)
+    if not match:
+        return booth
+    return f"{int(match.group('num'))}{match.group('suffix')}"
+
+
+def booth_number(booth_id: str) -> int:
+    """Numeric part of a booth id ("TN-001-045A" -> 45, unparseable -> 0)."""
+    match = BOOTH_NO_RE.match(canonical_booth_key(booth_id))
+    return int(match.group('num')) if match else 0
+
+
+# ============================================================================
+# Data Classes
+# ============================================================================
+
+@dataclass
+class BoothMatrix:
+    """Booth results for one AC-year as aligned NumPy arrays."""
+    state: str
+    ac_id: str
+    ac_name: str
+    year: int
+    path: Path
+    candidates: list[dict]
+    booth_ids: list[str]
+    booth_keys: list[str]
+    booth_nos: np.ndarray          # (booths,) int32
+    votes: np.ndarray              # (booths, candidates) int32
+    totals: np.ndarray             # (booths,) int32 - `total` field as stored
+    rejected: np.ndarray           # (booths,) int32
+    has_votes: np.ndarray          # (booths,) bool - False for empty vote arrays
+    postal: Optional[np.ndarray] = None  # (candidates,) int32 from `postal` block
+    meta: dict = field(default_factory=dict)
+
+    @property
+    def num_booths(self) -> int:
+        return len(self.booth_ids)
+
+    @property
+    def num_candidates(self) -> int:
+        return len(self.candidates)
+
+    @property
+    def parties(self) -> list[str]:
+        return [c.get('party', '') for c in self.candidates]
+
+    @property
+    def names(self) -> list[str]:
+        return [c.get('name', '') for c in self.candidates]
+
+    @property
+    def column_totals(self) -> np.ndarray:
+        """Per-candidate booth vote totals (int64 to avoid overflow in rollups)."""
+        return self.votes.sum(axis=0, dtype=np.int64)
+
+    def nota_index(self) -> int:
+        """Column index of NOTA, or -1 when the file has no NOTA column."""
+        for i, cand in enumerate(self.candidates):
+            if cand.get('party') == 'NOTA' or cand.get('name') == 'NOTA':
+                return i
+        return -1
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+
+def load_json(path: Path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_schema() -> dict:
+    return load_json(SCHEMA_PATH)
+
+
+def results_path(state: str, ac_id: str, year: int) -> Path:
+    return BOOTHS_DIR / state / ac_id / f"{year}.json"
+
+
+def iter_ac_ids(state: str) -> list[str]:
+    """All AC ids with a booth directory for a state, sorted."""
+    state_dir = BOOTHS_DIR / state
+    if not state_dir.exists():
+        return []
+    return sorted(d.name for d in state_dir.iterdir()
+                  if d.is_dir() and d.name.startswith(f"{state}-"))
+
+
+def ac_to_pc_map(schema: dict, state: Optional[str] = None) -> dict[str, str]:
+    """Map AC id -> PC id in one pass (instead of scanning PCs per AC)."""
+    mapping = {}
+    for pc_id, pc_info in schema.get('parliamentaryConstituencies', {}).items():
+        if state and pc_info.get('stateId') != state:
+            continue
+        for ac_id in pc_info.get('assemblyIds', []):
+            mapping[ac_id] = pc_id
+    return mapping
+
+
+def matrix_from_results(record: BoothResults, state: str, ac_id: str, year: int, path: Path) -> BoothMatrix:
+    """Build a BoothMatrix from a typed results record (see records.py)."""
+    num_candidates = len(record.candidates)
+    booth_ids = list(record.results)
+    num_booths = len(booth_ids)
+
+    votes = np.zeros((num_booths, num_candidates), dtype=np.int32)
+    totals = np.zeros(num_booths, dtype=np.int32)
+    rejected = np.zeros(num_booths, dtype=np.int32)
+    has_votes = np.zeros(num_booths, dtype=bool)
+
+    for row, result in enumerate(record.results.values()):
+        if result.votes:
+            n = min(len(result.votes), num_candidates)
+            votes[row, :n] = result.votes[:n]
+            has_votes[row] = True
+        totals[row] = result.total
+        rejected[row] = result.rejected
+
+    booth_keys = [canonical_booth_key(b) for b in booth_ids]
+    booth_nos = np.array([booth_number(k) for k in booth_keys], dtype=np.int32)
+
+    postal = None
+    if record.postal is not None and record.postal.candidates:
+        postal = np.zeros(num_candidates, dtype=np.int32)
+        for i, cand in enumerate(record.postal.candidates[:num_candidates]):
+            postal[i] = cand.postal
+
+    meta = {key: getattr(record, field) for field, key in
+            zip(record.__struct_fields__, record.__struct_encode_fields__)
+            if field not in ('results', 'candidates', 'postal')}
+
+    return BoothMatrix(
+        state=state,
+        ac_id=ac_id,
+        ac_name=record.ac_name or ac_id,
+        year=year,
+        path=path,
+        candidates=msgspec.to_builtins(record.candidates),
+        booth_ids=booth_ids,
+        booth_keys=booth_keys,
+        booth_nos=booth_nos,
+        votes=votes,
+        totals=totals,
+        rejected=rejected,
+        has_votes=has_votes,
+        postal=postal,
+        meta=meta,
+    )
+
+
+def matrix_from_data(data: dict, state: str, ac_id: str, year: int, path: Path) -> BoothMatrix:
+    """Build a BoothMatrix from an already decoded results file (validated like a load)."""
+    try:
+        record = msgspec.convert(data, BoothResults)
+    except msgspec.ValidationError as e:
+        raise RecordError(f"{path}: {e}") from None
+    return matrix_from_results(record, state, ac_id, year, path)
+
+
+def load_booth_matrix(state: str, ac_id: str, year: int) -> Optional[BoothMatrix]:
+    """Load one AC-year results file as a BoothMatrix (None if missing)."""
+    path = results_path(state, ac_id, year)
+    if not path.exists():
+        return None
+    return matrix_from_results(load_results(path), state, ac_id, year, path)
+
+
+def iter_booth_matrices(state: str, year: int, ac_ids: Optional[list[str]] = None) -> Iterator[BoothMatrix]:
+    """Yield BoothMatrix objects for every AC of a state that has `year` data."""
+    for ac_id in ac_ids or iter_ac_ids(state):
+        bm = load_booth_matrix(state, ac_id, year)
+        if bm is not None:
+            yield bm
+
+
+def load_booth_types(state: str, ac_id: str, year: Optional[int] = None) -> dict[str, str]:
+    """
+    Map canonical booth key -> booth type ("regular", "women", ...).
+
+    Mirrors the frontend: a year-specific `booths-{year}.json` wins over the
+    generic `booths.json`.
+    """
+    ac_dir = BOOTHS_DIR / state / ac_id
+    candidates = [ac_dir / f"booths-{year}.json"] if year else []
+    candidates.append(ac_dir / "booths.json")
+
+    for path in candidates:
+        if path.exists():
+            return {canonical_booth_key(b.id): b.type for b in load_booth_list(path).booths}
+    return {}
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Booth Analytics Summaries
+=========================
+Precomputes the booth panel analytics once per AC-year and rolls them up to
+PC and state level, so the frontend can fetch a few KB instead of the full
+results file and recomputing everything on every view.
+
+The AC panel (useBoothData.loadBoothSummary) fetches summary-{year}.json when
+it opens and only falls back to {year}.json when there is no summary; the full
+file is otherwise fetched when the Booths, Postal or Analysis tab is opened.
+
+Per AC-year summary (public/data/booths/{STATE}/{AC_ID}/summary-{year}.json):
+- Vote distribution by party (distribution bar)
+- Booths won per party, strike rate, average winning margin
+- Landslides (winner > 60%), one-sided booths (winner > 80%)
+- Battlegrounds (margin < 50 votes)
+- High-NOTA booths (> 2% or > 50 votes, when a NOTA column exists)
+- Women's booths and who won them
+
+Rollups:
+    public/data/booths/{STATE}/summary/{year}/{PC_ID}.json   - per PC
+    public/data/booths/{STATE}/summary/{year}/{STATE}.json   - whole state
+
+Refresh is incremental: a manifest records the size/mtime/hash of every
+input file, and only ACs whose results or booth list changed are recomputed.
+Rollups are rebuilt from the (small) AC summaries of affected PCs only.
+
+Usage:
+    python scripts/booth_summaries.py                  # Refresh changed ACs (all years)
+    python scripts/booth_summaries.py --year 2024      # Only 2024
+    python scripts/booth_summaries.py TN-001 TN-002    # Force specific ACs
+    python scripts/booth_summaries.py --force          # Recompute everything
+    python scripts/booth_summaries.py --state TN       # State (default: TN)
+"""
+
+import hashlib
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from booth_matrix import (
+    BOOTHS_DIR, BoothMatrix,
+    ac_to_pc_map, iter_ac_ids, load_booth_matrix, load_booth_types, load_json,
+    load_schema, results_path,
+)
+
+# Thresholds - keep in sync with BoothwiseAnalysis in ElectionResultPanel.tsx
+MIN_WINNER_SHARE = 0.03      # Candidates below 3% AC share can't "win" a booth
+LANDSLIDE_PERCENT = 60
+ONE_SIDED_PERCENT = 80
+BATTLEGROUND_MARGIN = 50
+HIGH_NOTA_PERCENT = 2
+HIGH_NOTA_VOTES = 50
+MAX_LISTED_BOOTHS = 50       # Booth lists are capped; counts are always exact
+
+YEARS = [2021, 2024]
+SUMMARY_VERSION = 1
+
+
+# ============================================================================
+# AC Summary
+# ============================================================================
+
+def winner_columns(bm: BoothMatrix, col_totals: np.ndarray) -> np.ndarray:
+    """Boolean mask of candidate columns that are allowed to win a booth."""
+    eligible = np.ones(bm.num_candidates, dtype=bool)
+    nota = bm.nota_index()
+    if nota >= 0:
+        eligible[nota] = False
+
+    grand_total = col_totals[eligible].sum()
+    if grand_total > 0:
+        share_ok = col_totals / grand_total >= MIN_WINNER_SHARE
+        if (eligible & share_ok).any():
+            eligible &= share_ok
+    return eligible
+
+
+def party_sums(parties: list[str], values: np.ndarray) -> dict[str, int]:
+    """Sum a per-candidate vector by party (several INDs share one key)."""
+    sums = defaultdict(int)
+    for party, value in zip(parties, values.tolist()):
+        sums[party] += int(value)
+    return sums
+
+
+def summarize_ac(bm: BoothMatrix, booth_types: dict[str, str], pc_id: Optional[str]) -> dict:
+    """Compute the booth analytics summary for one AC-year."""
+    rows = np.flatnonzero(bm.has_votes)
+    votes = bm.votes[rows]
+    booth_ids = [bm.booth_ids[i] for i in rows]
+    parties = bm.parties
+    num_booths = len(rows)
+
+    row_sums = votes.sum(axis=1)
+    totals = np.where(bm.totals[rows] > 0, bm.totals[rows], row_sums).astype(np.float64)
+    col_totals = votes.sum(axis=0, dtype=np.int64)
+    grand_total = int(col_totals.sum())
+
+    # Winner per booth among eligible columns
+    eligible = winner_columns(bm, col_totals)
+    masked = np.where(eligible, votes, -1)
+    winner_idx = masked.argmax(axis=1) if num_booths else np.zeros(0, dtype=np.intp)
+    winner_votes = votes[np.arange(num_booths), winner_idx] if num_booths else np.zeros(0, dtype=np.int32)
+    has_winner = winner_votes > 0
+    winner_pct = np.divide(winner_votes * 100.0, totals, out=np.zeros(num_booths), where=totals > 0)
+
+    # Margin between top two columns (all columns, as the panel does)
+    if bm.num_candidates >= 2 and num_booths:
+        top2 = np.partition(votes, -2, axis=1)[:, -2:]
+        margins = top2[:, 1] - top2[:, 0]
+    else:
+        margins = winner_votes.copy()
+
+    win_counts = np.bincount(winner_idx[has_winner], minlength=bm.num_candidates)
+    margin_sums = np.bincount(winner_idx[has_winner], weights=margins[has_winner],
+                              minlength=bm.num_candidates)
+
+    booths_won = party_sums(parties, win_counts)
+    margin_total = party_sums(parties, margin_sums)
+    party_votes = party_sums(parties, col_totals)
+    won_count = int(has_winner.sum()) or 1
+
+    party_rows = []
+    for party, party_total in sorted(party_votes.items(), key=lambda x: -x[1]):
+        wins = booths_won.get(party, 0)
+        party_rows.append({
+            'party': party,
+            'votes': party_total,
+            'voteShare': round(party_total / grand_total * 100, 2) if grand_total else 0,
+            'boothsWon': wins,
+            'strikeRate': round(wins / won_count * 100, 1),
+            'marginTotal': margin_total.get(party, 0),
+            'avgMargin': round(margin_total.get(party, 0) / wins) if wins else 0,
+        })
+
+    def booth_list(mask: np.ndarray, order: np.ndarray, extra: dict) -> dict:
+        idx = np.flatnonzero(mask & has_winner)
+        idx = idx[np.argsort(order[idx], kind='stable')]
+        return {
+            'count': len(idx),
+            'booths': [
+                {'id': booth_ids[i], 'party': parties[winner_idx[i]],
+                 **{k: round(float(v[i]), 1) if v.dtype.kind == 'f' else int(v[i]) for k, v in extra.items()}}
+                for i in idx[:MAX_LISTED_BOOTHS]
+            ],
+        }
+
+    landslides = booth_list(winner_pct > LANDSLIDE_PERCENT, -winner_pct, {'percent': winner_pct})
+    one_sided = booth_list(winner_pct > ONE_SIDED_PERCENT, -winner_pct, {'percent': winner_pct})
+    battlegrounds = booth_list(margins < BATTLEGROUND_MARGIN, margins, {'margin': margins})
+
+    high_nota = {'count': 0, 'booths': []}
+    nota = bm.nota_index()
+    if nota >= 0:
+        nota_votes = votes[:, nota]
+        nota_pct = np.divide(nota_votes * 100.0, totals, out=np.zeros(num_booths), where=totals > 0)
+        high_nota = booth_list((nota_pct > HIGH_NOTA_PERCENT) | (nota_votes > HIGH_NOTA_VOTES),
+                               -nota_pct, {'notaVotes': nota_votes, 'notaPercent': nota_pct})
+
+    # Women's booths
+    keys = [bm.booth_keys[i] for i in rows]
+    women = np.array([booth_types.get(k) == 'women' for k in keys], dtype=bool)
+    women_wins = party_sums(parties, np.bincount(winner_idx[women & has_winner], minlength=bm.num_candidates))
+
+    return {
+        'version': SUMMARY_VERSION,
+        'acId': bm.ac_id,
+        'acName': bm.ac_name,
+        'pcId': pc_id,
+        'year': bm.year,
+        'totalBooths': num_booths,
+        'totalVotes': grand_total,
+        'parties': party_rows,
+        'landslides': landslides,
+        'oneSided': one_sided,
+        'battlegrounds': battlegrounds,
+        'highNota': high_nota,
+        'womenBooths': {
+            'count': int(women.sum()),
+            'boothsWon': {p: n for p, n in women_wins.items() if n},
+        },
+    }
+
+
+# ============================================================================
+# Rollups (PC / State)
+# ============================================================================
+
+def rollup(summaries: list[dict], level_id: str, level: str, year: int) -> dict:
+    """Combine AC summaries into a PC- or state-level summary."""
+    party_votes = defaultdict(int)
+    party_wins = defaultdict(int)
+    party_margin = defaultdict(int)
+    women_wins = defaultdict(int)
+    counts = defaultdict(int)
+    acs = []
+
+    for s in summaries:
+        for p in s['parties']:
+            party_votes[p['party']] += p['votes']
+            party_wins[p['party']] += p['boothsWon']
+            party_margin[p['party']] += p['marginTotal']
+        for party, n in s['womenBooths']['boothsWon'].items():
+            women_wins[party] += n
+        counts['totalBooths'] += s['totalBooths']
+        counts['totalVotes'] += s['totalVotes']
+        counts['womenBooths'] += s['womenBooths']['count']
+        for key in ('landslides', 'oneSided', 'battlegrounds', 'highNota'):
+            counts[key] += s[key]['count']
+
+        leader = max(s['parties'], key=lambda p: p['boothsWon'], default=None)
+        acs.append({
+            'acId': s['acId'],
+            'acName': s['acName'],
+            'totalBooths': s['totalBooths'],
+            'leader': leader['party'] if leader else None,
+            'leaderStrikeRate': leader['strikeRate'] if leader else 0,
+            'landslides': s['landslides']['count'],
+            'battlegrounds': s['battlegrounds']['count'],
+        })
+
+    grand_total = sum(party_votes.values())
+    won_total = sum(party_wins.values()) or 1
+    parties = [{
+        'party': party,
+        'votes': votes,
+        'voteShare': round(votes / grand_total * 100, 2) if grand_total else 0,
+        'boothsWon': party_wins[party],
+        'strikeRate': round(party_wins[party] / won_total * 100, 1),
+        'marginTotal': party_margin[party],
+        'avgMargin': round(party_margin[party] / party_wins[party]) if party_wins[party] else 0,
+    } for party, votes in sorted(party_votes.items(), key=lambda x: -x[1])]
+
+    return {
+        'version': SUMMARY_VERSION,
+        'level': level,
+        'id': level_id,
+        'year': year,
+        'totalBooths': counts['totalBooths'],
+        'totalVotes': counts['totalVotes'],
+        'parties': parties,
+        'landslides': counts['landslides'],
+        'oneSided': counts['oneSided'],
+        'battlegrounds': counts['battlegrounds'],
+        'highNota': counts['highNota'],
+        'womenBooths': {
+            'count': counts['womenBooths'],
+            'boothsWon': dict(sorted(women_wins.items(), key=lambda x: -x[1])),
+        },
+        'acs': sorted(acs, key=lambda a: a['acId']),
+    }
+
+
+# ============================================================================
+# Incremental Refresh
+# ============================================================================
+
+def summary_path(state: str, ac_id: str, year: int) -> Path:
+    return BOOTHS_DIR / state / ac_id / f"summary-{year}.json"
+
+
+def rollup_dir(state: str, year: int) -> Path:
+    return BOOTHS_DIR / state / "summary" / str(year)
+
+
+def manifest_path(state: str) -> Path:
+    return BOOTHS_DIR / state / "summary" / "manifest.json"
+
+
+def file_stat(path: Path) -> Optional[dict]:
+    if not path.exists():
+        return None
+    st = path.stat()
+    return {'size': st.st_size, 'mtimeNs': st.st_mtime_ns}
+
+
+def file_hash(path: Path) -> Optional[str]:
+    if not path.exists():
+        return None
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def input_files(state: str, ac_id: str, year: int) -> list[Path]:
+    ac_dir = BOOTHS_DIR / state / ac_id
+    return [results_path(state, ac_id, year), ac_dir / f"booths-{year}.json", ac_dir / "booths.json"]
+
+
+def is_stale(state: str, ac_id: str, year: int, entry: Optional[dict]) -> tuple[bool, dict]:
+    """
+    Compare input files against the manifest entry.
+
+    A size/mtime match is trusted without reading the file; on mismatch the
+    content hash decides, so a `touch` or a checkout does not force a rebuild.
+    Returns (stale, fresh_entry).
+    """
+    files = {p.name: p for p in input_files(state, ac_id, year)}
+    stats = {name: file_stat(p) for name, p in files.items()}
+    old = (entry or {}).get('files', {})
+
+    fresh = {'files': {}}
+    stale = not summary_path(state, ac_id, year).exists()
+    for name, path in files.items():
+        stat = stats[name]
+        prev = old.get(name)
+        if stat is None:
+            if prev is not None:
+                stale = True
+            continue
+        if prev and prev.get('size') == stat['size'] and prev.get('mtimeNs') == stat['mtimeNs']:
+            fresh['files'][name] = prev
+            continue
+        digest = file_hash(path)
+        if not prev or prev.get('sha1') != digest:
+            stale = True
+        fresh['files'][name] = {**stat, 'sha1': digest}
+    return stale, fresh
+
+
+def write_json(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def refresh_summaries(
+    state: str,
+    years: list[int],
+    force_acs: Optional[set[str]] = None,
+    force: bool = False,
+    schema: Optional[dict] = None,
+) -> dict:
+    """
+    Recompute stale AC summaries and the rollups that depend on them.
+    Returns {year: [changed AC ids]}.
+    """
+    schema = schema if schema is not None else load_schema()
+    ac_pc = ac_to_pc_map(schema, state)
+    mpath = manifest_path(state)
+    manifest = load_json(mpath) if mpath.exists() and not force else {'version': SUMMARY_VERSION, 'entries': {}}
+    entries = manifest.setdefault('entries', {})
+    force_acs = force_acs or set()
+
+    changed_by_year = {}
+    for year in years:
+        changed = []
+        ac_ids = [a for a in iter_ac_ids(state) if results_path(state, a, year).exists()]
+        for ac_id in ac_ids:
+            key = f"{ac_id}/{year}"
+            stale, fresh = is_stale(state, ac_id, year, entries.get(key))
+            if not (stale or force or ac_id in force_acs):
+                entries[key] = fresh
+                continue
+
+            bm = load_booth_matrix(state, ac_id, year)
+            summary = summarize_ac(bm, load_booth_types(state, ac_id, year), ac_pc.get(ac_id))
+            write_json(summary_path(state, ac_id, year), summary)
+            entries[key] = fresh
+            changed.append(ac_id)
+
+        out_dir = rollup_dir(state, year)
+        state_file = out_dir / f"{state}.json"
+        if changed or not state_file.exists():
+            summaries = {a: load_json(summary_path(state, a, year)) for a in ac_ids}
+
+            by_pc = defaultdict(list)
+            for ac_id, s in summaries.items():
+                if ac_id in ac_pc:
+                    by_pc[ac_pc[ac_id]].append(s)
+
+            dirty_pcs = {ac_pc.get(a) for a in changed}
+            for pc_id, pc_summaries in by_pc.items():
+                pc_file = out_dir / f"{pc_id}.json"
+                if pc_id in dirty_pcs or not pc_file.exists():
+                    write_json(pc_file, rollup(pc_summaries, pc_id, 'pc', year))
+
+            write_json(state_file, rollup(list(summaries.values()), state, 'state', year))
+
+        changed_by_year[year] = changed
+
+    manifest['version'] = SUMMARY_VERSION
+    write_json(mpath, manifest)
+    return changed_by_year
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    args = sys.argv[1:]
+    if '--help' in args or '-h' in args:
+        print(__doc__)
+        return
+
+    force = '--force' in args
+    state = args[args.index('--state') + 1] if '--state' in args else 'TN'
+    years = [int(args[args.index('--year') + 1])] if '--year' in args else YEARS
+    force_acs = {a for a in args if a.startswith(f"{state}-")}
+
+    print("=" * 80)
+    print(f"Booth Analytics Summaries - {state} {', '.join(map(str, years))}")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    changed = refresh_summaries(state, years, force_acs=force_acs, force=force)
+    elapsed = time.perf_counter() - start
+
+    for year, acs in changed.items():
+        print(f"  {year}: {len(acs)} AC summaries refreshed")
+        for ac_id in acs[:10]:
+            print(f"    ✓ {ac_id}")
+        if len(acs) > 10:
+            print(f"    ... and {len(acs) - 10} more")
+
+    print(f"\n✅ Done in {elapsed:.2f}s")
+    print(f"   Rollups: {BOOTHS_DIR / state / 'summary'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Cross-Year Booth Swing Engine
+=============================
+Joins two elections' booth results (e.g. 2021 assembly and 2024 PC segment)
+booth by booth and computes swing, turnout change and flips for every AC of
+a state in one vectorized pass.
+
+How it works:
+1. Every AC-year is loaded once as a BoothMatrix (booths × candidates).
+2. Candidates are projected onto groups (alliances from alliances.py, plus
+   unaligned parties above MIN_GROUP_SHARE statewide, rest → "OTH") with a
+   one-hot matrix product, giving booths × groups per AC.
+3. All ACs are stacked into one array per year and aligned through
+   canonical booth keys ("TN-001-1" and "TN-001-001" both → "TN-001|1").
+4. Swing (pp), turnout change and leader flips are computed on the stacked
+   arrays; AC summaries are reduced with bincount over the AC index.
+
+Outputs:
+    public/data/booths/{STATE}/{AC_ID}/swing-{from}-{to}.json   - per-booth swing (columnar)
+    public/data/booths/{STATE}/swing/{from}-{to}.json          - AC-level summaries
+
+Usage:
+    python scripts/booth_swing.py                       # TN 2021 → 2024
+    python scripts/booth_swing.py --from 2021 --to 2024
+    python scripts/booth_swing.py --state TN --dry-run  # Compute and report only
+"""
+
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from alliances import alliance_of, party_groups
+from booth_matrix import BOOTHS_DIR, BoothMatrix, iter_booth_matrices
+
+MIN_GROUP_SHARE = 0.01   # Unaligned parties below 1% statewide fold into "OTH"
+OTHERS = 'OTH'
+
+
+# ============================================================================
+# Data Classes
+# ============================================================================
+
+@dataclass
+class StackedYear:
+    """All booths of one election year, stacked across ACs."""
+    year: int
+    keys: np.ndarray        # (booths,) "TN-001|12A"
+    booth_ids: np.ndarray   # (booths,) original booth ids
+    ac_index: np.ndarray    # (booths,) index into ac_ids
+    votes: np.ndarray       # (booths, groups) int64
+    totals: np.ndarray      # (booths,) int64
+
+
+# ============================================================================
+# Grouping
+# ============================================================================
+
+def build_group_vocabulary(matrices: dict[int, list[BoothMatrix]], groups_by_year: dict[int, dict]) -> list[str]:
+    """Alliances first, then unaligned parties with >= MIN_GROUP_SHARE in any year, then OTH."""
+    alliance_labels = []
+    for groups in groups_by_year.values():
+        for label in groups.values():
+            if label not in alliance_labels:
+                alliance_labels.append(label)
+
+    big_parties = []
+    for year, bms in matrices.items():
+        totals = {}
+        for bm in bms:
+            for party, votes in zip(bm.parties, bm.column_totals.tolist()):
+                label = alliance_of(party, groups_by_year[year])
+                totals[label] = totals.get(label, 0) + votes
+        grand = sum(totals.values()) or 1
+        for label, votes in sorted(totals.items(), key=lambda x: -x[1]):
+            if label not in alliance_labels and label not in big_parties and votes / grand >= MIN_GROUP_SHARE:
+                big_parties.append(label)
+
+    return alliance_labels + big_parties + [OTHERS]
+
+
+def group_projection(bm: BoothMatrix, groups: dict[str, str], vocab_index: dict[str, int]) -> np.ndarray:
+    """One-hot (candidates × groups) matrix mapping candidate columns to groups."""
+    proj = np.zeros((bm.num_candidates, len(vocab_index)), dtype=np.int64)
+    for col, party in enumerate(bm.parties):
+        label = alliance_of(party, groups)
+        proj[col, vocab_index.get(label, vocab_index[OTHERS])] = 1
+    return proj
+
+
+def stack_year(bms: list[BoothMatrix], year: int, groups: dict[str, str],
+               vocab_index: dict[str, int], ac_pos: dict[str, int]) -> StackedYear:
+    """Project every AC onto groups and stack all booths into one array."""
+    keys, ids, ac_idx, votes, totals = [], [], [], [], []
+    for bm in bms:
+        rows = np.flatnonzero(bm.has_votes)
+        if len(rows) == 0:
+            continue
+        grouped = bm.votes[rows].astype(np.int64) @ group_projection(bm, groups, vocab_index)
+        keys.extend(f"{bm.ac_id}|{bm.booth_keys[i]}" for i in rows)
+        ids.extend(bm.booth_ids[i] for i in rows)
+        ac_idx.append(np.full(len(rows), ac_pos[bm.ac_id], dtype=np.int32))
+        votes.append(grouped)
+        totals.append(grouped.sum(axis=1))
+
+    num_groups = len(vocab_index)
+    return StackedYear(
+        year=year,
+        keys=np.array(keys, dtype=str),
+        booth_ids=np.array(ids, dtype=str),
+        ac_index=np.concatenate(ac_idx) if ac_idx else np.zeros(0, dtype=np.int32),
+        votes=np.vstack(votes) if votes else np.zeros((0, num_groups), dtype=np.int64),
+        totals=np.concatenate(totals) if totals else np.zeros(0, dtype=np.int64),
+    )
+
+
+def dedupe(stacked: StackedYear) -> np.ndarray:
+    """Row indices of the first occurrence of each key (duplicate keys can't be joined)."""
+    _, first = np.unique(stacked.keys, return_index=True)
+    return np.sort(first)
+
+
+# ============================================================================
+# Swing Computation
+# ============================================================================
+
+def compute_swing(state: str, from_year: int, to_year: int) -> dict:
+    """Load, align and compute swing for every AC of a state."""
+    matrices = {
+        from_year: list(iter_booth_matrices(state, from_year)),
+        to_year: list(iter_booth_matrices(state, to_year)),
+    }
+    groups_by_year = {y: party_groups(state, y) for y in matrices}
+    vocab = build_group_vocabulary(matrices, groups_by_year)
+    vocab_index = {g: i for i, g in enumerate(vocab)}
+
+    ac_ids = sorted({bm.ac_id for bms in matrices.values() for bm in bms})
+    ac_pos = {a: i for i, a in enumerate(ac_ids)}
+    ac_names = {bm.ac_id: bm.ac_name for bm in matrices[from_year]}
+
+    a = stack_year(matrices[from_year], from_year, groups_by_year[from_year], vocab_index, ac_pos)
+    b = stack_year(matrices[to_year], to_year, groups_by_year[to_year], vocab_index, ac_pos)
+
+    # Align booths through canonical keys
+    ia, ib = dedupe(a), dedupe(b)
+    keys, ma, mb = np.intersect1d(a.keys[ia], b.keys[ib], assume_unique=True, return_indices=True)
+    ra, rb = ia[ma], ib[mb]
+
+    votes_a, votes_b = a.votes[ra], b.votes[rb]
+    total_a = a.totals[ra].astype(np.float64)
+    total_b = b.totals[rb].astype(np.float64)
+    share_a = np.divide(votes_a, total_a[:, None], out=np.zeros(votes_a.shape), where=total_a[:, None] > 0)
+    share_b = np.divide(votes_b, total_b[:, None], out=np.zeros(votes_b.shape), where=total_b[:, None] > 0)
+    swing = (share_b - share_a) * 100
+
+    turnout_change = np.divide((total_b - total_a) * 100, total_a, out=np.zeros(len(keys)), where=total_a > 0)
+    lead_a = votes_a.argmax(axis=1)
+    lead_b = votes_b.argmax(axis=1)
+    flipped = lead_a != lead_b
+    ac_index = a.ac_index[ra]
+
+    # AC-level reductions
+    num_acs, num_groups = len(ac_ids), len(vocab)
+    matched = np.bincount(ac_index, minlength=num_acs)
+    booths_a = np.bincount(a.ac_index, minlength=num_acs)
+    booths_b = np.bincount(b.ac_index, minlength=num_acs)
+    flips = np.bincount(ac_index, weights=flipped, minlength=num_acs).astype(int)
+    sum_a = np.zeros((num_acs, num_groups))
+    sum_b = np.zeros((num_acs, num_groups))
+    np.add.at(sum_a, ac_index, votes_a)
+    np.add.at(sum_b, ac_index, votes_b)
+    ac_total_a = sum_a.sum(axis=1, keepdims=True)
+    ac_total_b = sum_b.sum(axis=1, keepdims=True)
+    ac_swing = (np.divide(sum_b, ac_total_b, out=np.zeros_like(sum_b), where=ac_total_b > 0)
+                - np.divide(sum_a, ac_total_a, out=np.zeros_like(sum_a), where=ac_total_a > 0)) * 100
+    flip_pairs = np.bincount(
+        (ac_index * num_groups + lead_a) * num_groups + lead_b,
+        minlength=num_acs * num_groups * num_groups,
+    ).reshape(num_acs, num_groups, num_groups)
+
+    return {
+        'state': state,
+        'from': from_year,
+        'to': to_year,
+        'groups': vocab,
+        'ac_ids': ac_ids,
+        'ac_names': ac_names,
+        'keys': keys,
+        'booth_ids_from': a.booth_ids[ra],
+        'booth_ids_to': b.booth_ids[rb],
+        'ac_index': ac_index,
+        'total_from': a.totals[ra],
+        'total_to': b.totals[rb],
+        'lead_from': lead_a,
+        'lead_to': lead_b,
+        'swing': swing,
+        'turnout_change': turnout_change,
+        'flipped': flipped,
+        'matched': matched,
+        'booths_from': booths_a,
+        'booths_to': booths_b,
+        'flips': flips,
+        'ac_swing': ac_swing,
+        'ac_share_to': np.divide(sum_b, ac_total_b, out=np.zeros_like(sum_b), where=ac_total_b > 0) * 100,
+        'ac_votes_from': ac_total_a[:, 0],
+        'ac_votes_to': ac_total_b[:, 0],
+        'flip_pairs': flip_pairs,
+    }
+
+
+# ============================================================================
+# Output
+# ============================================================================
+
+def ac_summaries(res: dict) -> list[dict]:
+    groups = res['groups']
+    summaries = []
+    for i, ac_id in enumerate(res['ac_ids']):
+        if res['matched'][i] == 0:
+            continue
+        pairs = res['flip_pairs'][i]
+        flip_list = [
+            {'from': groups[f], 'to': groups[t], 'booths': int(pairs[f, t])}
+            for f, t in zip(*np.nonzero(pairs)) if f != t
+        ]
+        votes_from, votes_to = res['ac_votes_from'][i], res['ac_votes_to'][i]
+        summaries.append({
+            'acId': ac_id,
+            'acName': res['ac_names'].get(ac_id, ac_id),
+            'matchedBooths': int(res['matched'][i]),
+            'boothsFrom': int(res['booths_from'][i]),
+            'boothsTo': int(res['booths_to'][i]),
+            'matchRate': round(res['matched'][i] / max(res['booths_to'][i], 1) * 100, 1),
+            'turnoutChange': round((votes_to - votes_from) / votes_from * 100, 2) if votes_from else 0,
+            'swing': {g: round(float(res['ac_swing'][i, j]), 2) for j, g in enumerate(groups)},
+            'shareTo': {g: round(float(res['ac_share_to'][i, j]), 2) for j, g in enumerate(groups)},
+            'flippedBooths': int(res['flips'][i]),
+            'flips': sorted(flip_list, key=lambda f: -f['booths']),
+        })
+    return summaries
+
+
+def booth_dataset(res: dict, ac_pos: int) -> dict:
+    """Columnar per-booth swing rows for one AC."""
+    rows = np.flatnonzero(res['ac_index'] == ac_pos)
+    return {
+        'acId': res['ac_ids'][ac_pos],
+        'from': res['from'],
+        'to': res['to'],
+        'groups': res['groups'],
+        'booths': [k.split('|', 1)[1] for k in res['keys'][rows].tolist()],
+        'boothIdsFrom': res['booth_ids_from'][rows].tolist(),
+        'boothIdsTo': res['booth_ids_to'][rows].tolist(),
+        'totalFrom': res['total_from'][rows].tolist(),
+        'totalTo': res['total_to'][rows].tolist(),
+        'turnoutChange': np.round(res['turnout_change'][rows], 2).tolist(),
+        'leadFrom': res['lead_from'][rows].tolist(),
+        'leadTo': res['lead_to'][rows].tolist(),
+        'swing': np.round(res['swing'][rows], 2).tolist(),
+    }
+
+
+def write_json(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def write_outputs(res: dict):
+    state, span = res['state'], f"{res['from']}-{res['to']}"
+    for pos, ac_id in enumerate(res['ac_ids']):
+        if res['matched'][pos]:
+            write_json(BOOTHS_DIR / state / ac_id / f"swing-{span}.json", booth_dataset(res, pos))
+
+    write_json(BOOTHS_DIR / state / "swing" / f"{span}.json", {
+        'state': state,
+        'from': res['from'],
+        'to': res['to'],
+        'groups': res['groups'],
+        'matchedBooths': int(len(res['keys'])),
+        'flippedBooths': int(res['flipped'].sum()),
+        'acs': ac_summaries(res),
+    })
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    args = sys.argv[1:]
+    state = args[args.index('--state') + 1] if '--state' in args else 'TN'
+    from_year = int(args[args.index('--from') + 1]) if '--from' in args else 2021
+    to_year = int(args[args.index('--to') + 1]) if '--to' in args else 2024
+    dry_run = '--dry-run' in args or '-n' in args
+
+    print("=" * 80)
+    print(f"Booth Swing - {state} {from_year} → {to_year}")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    res = compute_swing(state, from_year, to_year)
+    computed = time.perf_counter() - start
+
+    total_to = int(res['booths_to'].sum())
+    print(f"  Groups: {', '.join(res['groups'])}")
+    print(f"  Matched booths: {len(res['keys']):,} of {total_to:,} "
+          f"({len(res['keys']) / max(total_to, 1):.1%})")
+    print(f"  Flipped booths: {int(res['flipped'].sum()):,}")
+    print(f"  Computed in {computed:.2f}s")
+
+    # Biggest AC swings for the two largest groups
+    for g in res['groups'][:2]:
+        j = res['groups'].index(g)
+        order = np.argsort(res['ac_swing'][:, j])
+        worst, best = order[0], order[-1]
+        print(f"  {g}: best {res['ac_ids'][best]} {res['ac_swing'][best, j]:+.1f}pp, "
+              f"worst {res['ac_ids'][worst]} {res['ac_swing'][worst, j]:+.1f}pp")
+
+    if dry_run:
+        print("\n🔍 DRY RUN - no files written")
+        return
+
+    write_outputs(res)
+    print(f"\n✅ Written in {time.perf_counter() - start:.2f}s total")
+    print(f"   Summary: {BOOTHS_DIR / state / 'swing' / f'{from_year}-{to_year}.json'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Booth Table
+===========
+Array-backed store of extracted booth rows. Every reading an extraction
+strategy makes (a page x preprocessing x PSM x DPI rung) is one row of a
+NumPy structured array instead of a BoothResult held in a dict of
+(booth, confidence) tuples:
+
+    booth_no     int32
+    votes        int32[num_candidates]
+    confidence   float64
+    page         int32     source page (0-based)
+    method       str       strategy / OCR method that read the row
+    checksum     str       row_checksum.py status: ok, fixed, ambiguous,
+                           mismatch or unchecked (text rows)
+
+Readings of all strategies are concatenated and merged per booth number
+in one vectorized pass:
+
+    best        the highest-confidence reading (the earlier one on ties),
+                as the strategies merged their dicts before
+    consensus   the reading with the most confidence behind it, summed
+                over the readings that agree on every vote; its best
+                copy is kept. Two 0.8 OCR readings that agree outvote
+                one 0.85 reading that does not.
+
+BoothResult is the row type for code that wants one booth at a time
+(parse functions, validation messages, results files); rows become
+BoothResults only when asked for.
+
+Usage:
+    from booth_table import BoothResult, BoothTable
+
+    table = BoothTable.from_booths(parse_text_data(...), num_candidates, method='text')
+    readings = BoothTable.concat([table, ocr_table])
+    merged = readings.merge('consensus')        # one row per booth number
+    merged.votes.sum(axis=0)                    # column totals
+    merged.booths()                             # {'001': BoothResult, ...}
+
+    python scripts/booth_table.py               # merge benchmark: dict of tuples vs table
+"""
+
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.lazy import lazy_import
+
+np = lazy_import('numpy')
+
+# ============================================================================
+# Rows
+# ============================================================================
+
+MERGES = ('best', 'consensus')
+
+
+@dataclass
+class BoothResult:
+    """Single booth extraction result."""
+    booth_no: int
+    votes: list[int]
+    total: int
+    source_page: int = 0
+    confidence: float = 1.0
+    method: str = ''
+    checksum: str = 'unchecked'
+
+
+def booth_dtype(num_candidates: int) -> 'np.dtype':
+    return np.dtype([('booth_no', np.int32), ('votes', np.int32, (num_candidates,)),
+                     ('confidence', np.float64), ('page', np.int32),
+                     ('method', 'U16'), ('checksum', 'U9')])
+
+
+def booth_key(booth_no: int) -> str:
+    """Key of a booth in ExtractionResult.booths and the results files ('007')."""
+    return f"{booth_no:03d}"
+
+
+# ============================================================================
+# Table
+# ============================================================================
+
+class BoothTable:
+    """Extracted booth rows of one AC as a structured array (see module docstring)."""
+
+    def __init__(self, rows: 'np.ndarray'):
+        self.rows = rows
+
+    @classmethod
+    def empty(cls, num_candidates: int) -> 'BoothTable':
+        return cls(np.zeros(0, dtype=booth_dtype(num_candidates)))
+
+    @classmethod
+    def from_booths(cls, booths: Iterable[BoothResult], num_candidates: int, method: Optional[str] = None,
+                    confidence: Optional[float] = None) -> 'BoothTable':
+        """Rows from BoothResults; method and confidence override the booths' own."""
+        booths = list(booths)
+        rows = np.zeros(len(booths), dtype=booth_dtype(num_candidates))
+        if not booths:
+            return cls(rows)
+        rows['booth_no'] = [b.booth_no for b in booths]
+        votes = [b.votes for b in booths]
+        if all(len(v) == num_candidates for v in votes):
+            rows['votes'] = votes
+        else:
+            for i, v in enumerate(votes):
+                n = min(len(v), num_candidates)
+                rows['votes'][i, :n] = v[:n]
+        rows['confidence'] = confidence if confidence is not None else [b.confidence for b in booths]
+        rows['page'] = [b.source_page for b in booths]
+        rows['method'] = method if method is not None else [b.method for b in booths]
+        rows['checksum'] = [b.checksum for b in booths]
+        return cls(rows)
+
+    @classmethod
+    def concat(cls, tables: list['BoothTable']) -> 'BoothTable':
+        """Rows of several tables in order (all of the same candidate count)."""
+        return cls(np.concatenate([t.rows for t in tables]))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def num_candidates(self) -> int:
+        return self.rows.dtype['votes'].shape[0]
+
+    @property
+    def booth_nos(self) -> 'np.ndarray':
+        return self.rows['booth_no']
+
+    @property
+    def votes(self) -> 'np.ndarray':
+        return self.rows['votes']
+
+    @property
+    def confidence(self) -> 'np.ndarray':
+        return self.rows['confidence']
+
+    @property
+    def num_booths(self) -> int:
+        """Distinct booth numbers (len() once merged)."""
+        return len(np.unique(self.rows['booth_no']))
+
+    @property
+    def totals(self) -> 'np.ndarray':
+        return self.rows['votes'].sum(axis=1)
+
+    def select(self, mask: 'np.ndarray') -> 'BoothTable':
+        return BoothTable(self.rows[mask])
+
+    def missing_from(self, other: 'BoothTable') -> 'BoothTable':
+        """Rows whose booth number other does not have."""
+        return self.select(~np.isin(self.booth_nos, other.booth_nos))
+
+    def with_columns(self, mapping: list[int]) -> 'BoothTable':
+        """Votes reordered: column i takes column mapping[i]."""
+        rows = self.rows.copy()
+        rows['votes'] = self.rows['votes'][:, mapping]
+        return BoothTable(rows)
+
+    # -- merging -------------------------------------------------------------
+
+    def best(self) -> 'BoothTable':
+        """One row per booth number: the highest confidence, the earlier row on ties."""
+        if len(self.rows) == 0:
+            return self
+        order = np.lexsort((np.arange(len(self.rows)), -self.rows['confidence'], self.rows['booth_no']))
+        return BoothTable(self.rows[order[self._group_starts(self.rows['booth_no'][order])]])
+
+    def consensus(self) -> 'BoothTable':
+        """One row per booth number: the reading with the most summed confidence behind it."""
+        if len(self.rows) == 0:
+            return self
+        # Best-first within each booth, so each reading's first row is its best copy
+        rows = self.rows[np.lexsort((np.arange(len(self.rows)), -self.rows['confidence'],
+                                     self.rows['booth_no']))]
+        # Identical readings (booth number and every vote), each row as one
+        # opaque value so they sort as a 1-D array
+        readings = np.column_stack([rows['booth_no'], rows['votes']])
+        _, reading = np.unique(readings.view(np.dtype((np.void, readings.shape[1] * readings.itemsize))).ravel(),
+                               return_inverse=True)
+        support = np.bincount(reading, weights=rows['confidence'])[reading]
+        order = np.lexsort((np.arange(len(rows)), -support, rows['booth_no']))
+        return BoothTable(rows[order[self._group_starts(rows['booth_no'][order])]])
+
+    def merge(self, how: str = 'best') -> 'BoothTable':
+        if how not in MERGES:
+            raise ValueError(f"Unknown merge {how!r} (one of {', '.join(MERGES)})")
+        return self.best() if how == 'best' else self.consensus()
+
+    @staticmethod
+    def _group_starts(sorted_keys: 'np.ndarray') -> 'np.ndarray':
+        return np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])
+
+    # -- rows as objects -----------------------------------------------------
+
+    def booth_results(self) -> list[BoothResult]:
+        rows = self.rows
+        return [BoothResult(int(no), votes, sum(votes), int(page), float(conf), str(method), str(check))
+                for no, votes, conf, page, method, check in zip(
+                    rows['booth_no'].tolist(), rows['votes'].tolist(), rows['confidence'].tolist(),
+                    rows['page'].tolist(), rows['method'].tolist(), rows['checksum'].tolist())]
+
+    def booths(self) -> dict[str, BoothResult]:
+        """{booth key: BoothResult}; keys repeat if the table is not merged."""
+        return {booth_key(b.booth_no): b for b in self.booth_results()}
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    """Merge benchmark on synthetic readings: dict of (BoothResult, confidence) tuples vs table."""
+    if '--help' in sys.argv or '-h' in sys.argv:
+        print(__doc__)
+        return
+    rng = np.random.default_rng(20)
+    num_booths, num_candidates, readings_per_booth = 400, 20, 24   # pages x methods x PSMs x rungs
+    truth = rng.integers(0, 400, (num_booths, num_candidates))
+    booth_nos = np.repeat(np.arange(1, num_booths + 1), readings_per_booth)
+    votes = truth[booth_nos - 1].copy()
+    # A third of the readings have one misread digit; confidence does not know which
+    noisy = rng.random(len(booth_nos)) < 0.3
+    votes[noisy, rng.integers(0, num_candidates, noisy.sum())] += 10
+    confidence = rng.choice([0.75, 0.8, 0.85, 0.9], len(booth_nos)).astype(np.float32)
+    tracemalloc.start()
+    booths = [BoothResult(int(b), v, sum(v), 0, float(c))
+              for b, v, c in zip(booth_nos.tolist(), votes.tolist(), confidence.tolist())]
+    objects_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print("=" * 70)
+    print(f"BOOTH TABLE MERGE ({num_booths} booths x {readings_per_booth} readings, "
+          f"{num_candidates} candidates)")
+    print("=" * 70)
+    start = time.perf_counter()
+    found = {}
+    for booth in booths:
+        key = booth_key(booth.booth_no)
+        if key not in found or found[key][1] < booth.confidence:
+            found[key] = (booth, booth.confidence)
+    dict_seconds = time.perf_counter() - start
+
+    table = BoothTable.from_booths(booths, num_candidates)
+    for how in MERGES:
+        start = time.perf_counter()
+        merged = table.merge(how)
+        seconds = time.perf_counter() - start
+        exact = float((merged.votes == truth[merged.booth_nos - 1]).all(axis=1).mean())
+        print(f"  table {how:10s} {seconds * 1000:8.2f} ms  {len(merged)} booths, {exact:.0%} exact")
+    exact = np.mean([b.votes == truth[b.booth_no - 1].tolist() for b, _ in found.values()])
+    print(f"  dict  best       {dict_seconds * 1000:8.2f} ms  {len(found)} booths, {exact:.0%} exact")
+    print(f"\n  Rows: {table.rows.nbytes / 1e6:.1f} MB as a table, {objects_bytes / 1e6:.1f} MB as BoothResults")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,16 +12,18 @@ This script:
 import json
 from pathlib import Path
 from collections import defaultdict
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS, form20_dir
 
-BOOTHS_DIR = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-PC_DATA = Path("/Users/p0s097d/ElectionLens/public/data/elections/pc/TN/2024.json")
-SCHEMA = Path("/Users/p0s097d/ElectionLens/public/data/schema.json")
-FORM20_DIR = Path.home() / "Desktop" / "GELS_2024_Form20_PDFs"
+BOOTHS_DIR = PATHS.booths / "TN"
+PC_DATA = PATHS.elections / "pc/TN/2024.json"
+SCHEMA = PATHS.schema
+FORM20_DIR = form20_dir("TN", 2024)
 
 # Import from unified parser
-import sys
 import re
-sys.path.insert(0, str(Path(__file__).parent))
 
 # Import functions we need
 def load_reference_data():
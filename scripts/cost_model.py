@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Extraction Cost Model and LPT Scheduling
+========================================
+Estimates how long each AC will take and orders a batch
+longest-processing-time-first (LPT), so text and scanned ACs share one
+pool and the long OCR jobs start first instead of forming a serial tail.
+
+Estimates, in order of preference:
+  1. The AC's own last successful duration in the run ledger.
+  2. Its page count times a per-page rate for its PDF type. Rates are
+     calibrated from the ledger history (median seconds per page over the
+     ACs with a recorded duration) and fall back to the defaults below.
+
+Thread budget: tesseract (OpenMP) and OpenCV start their own threads. With
+W worker processes on C cores each worker gets max(1, C // W) threads
+(OMP_THREAD_LIMIT for tesseract subprocesses, cv2.setNumThreads), so
+workers x threads never exceeds the cores.
+
+Usage:
+    # Predicted makespan of a batch (no extraction)
+    python scripts/cost_model.py 1-234
+    python scripts/cost_model.py --all --threads-per-worker 2
+"""
+
+import heapq
+import os
+import statistics
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Default per-page rates (seconds) and fixed per-AC overhead (reference
+# loading, validation, write)
+TEXT_SECONDS_PER_PAGE = 0.5
+SCANNED_SECONDS_PER_PAGE = 12.0
+AC_OVERHEAD_SECONDS = 2.0
+
+# Calibrated rates need at least this many ACs of a type
+MIN_CALIBRATION_ACS = 3
+
+
+@dataclass
+class TaskCost:
+    ac_id: str
+    pdf_type: str
+    pages: int
+    seconds: float
+    source: str   # 'history' or 'model'
+
+
+def calibrate_rates(history: dict[str, float], pages: dict[str, int],
+                    types: dict[str, str]) -> dict[str, float]:
+    """Seconds per page by PDF type, from ACs with a recorded duration."""
+    rates = {'text': TEXT_SECONDS_PER_PAGE, 'scanned': SCANNED_SECONDS_PER_PAGE}
+    for pdf_type in rates:
+        samples = [(history[ac] - AC_OVERHEAD_SECONDS) / pages[ac] for ac in history
+                   if types.get(ac) == pdf_type and pages.get(ac)]
+        if len(samples) >= MIN_CALIBRATION_ACS:
+            rates[pdf_type] = max(0.01, statistics.median(samples))
+    return rates
+
+
+def estimate_costs(ac_ids: list[str], types: dict[str, str], pages: dict[str, int],
+                   history: dict[str, float] = None) -> list[TaskCost]:
+    history = history or {}
+    rates = calibrate_rates(history, pages, types)
+    costs = []
+    for ac_id in ac_ids:
+        pdf_type = types.get(ac_id, 'text')
+        n = pages.get(ac_id, 0)
+        if ac_id in history:
+            costs.append(TaskCost(ac_id, pdf_type, n, history[ac_id], 'history'))
+        else:
+            costs.append(TaskCost(ac_id, pdf_type, n,
+                                  AC_OVERHEAD_SECONDS + rates.get(pdf_type, TEXT_SECONDS_PER_PAGE) * n,
+                                  'model'))
+    return costs
+
+
+def lpt_order(costs: list[TaskCost]) -> list[TaskCost]:
+    """Longest first; a pool handing tasks to the next free worker then is LPT."""
+    return sorted(costs, key=lambda c: -c.seconds)
+
+
+def simulate_makespan(costs: list[TaskCost], workers: int) -> float:
+    """Makespan of handing the tasks, in order, to the earliest free worker."""
+    finish = [0.0] * max(1, workers)
+    for cost in costs:
+        earliest = heapq.heappop(finish)
+        heapq.heappush(finish, earliest + cost.seconds)
+    return max(finish)
+
+
+def thread_budget(cores: int, num_tasks: int, threads_per_worker: int = 1) -> tuple[int, int]:
+    """(worker processes, threads per worker) that fit the cores."""
+    threads = max(1, min(threads_per_worker, cores))
+    workers = max(1, min(num_tasks, cores // threads))
+    # Hand leftover cores to the workers when there are fewer tasks than cores
+    threads = max(threads, cores // workers)
+    return workers, threads
+
+
+def limit_threads(threads: int):
+    """Pool initializer: cap native thread pools of this worker and its children.
+
+    OpenCV reads OPENCV_FOR_THREADS_NUM when it is first imported, so a
+    worker that never touches a scanned PDF doesn't import it here.
+    """
+    os.environ['OMP_THREAD_LIMIT'] = str(threads)
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    os.environ['OPENCV_FOR_THREADS_NUM'] = str(threads)
+    if 'cv2' in sys.modules:
+        sys.modules['cv2'].setNumThreads(threads)
+
+
+def print_plan(costs: list[TaskCost], workers: int, threads: int):
+    total = sum(c.seconds for c in costs)
+    makespan = simulate_makespan(costs, workers)
+    by_type = {}
+    for c in costs:
+        by_type.setdefault(c.pdf_type, []).append(c)
+    mix = ', '.join(f"{len(v)} {k} ({sum(c.seconds for c in v) / 60:.0f} min)" for k, v in sorted(by_type.items()))
+    from_history = sum(1 for c in costs if c.source == 'history')
+    print(f"Schedule: {len(costs)} ACs [{mix}], {from_history} estimates from history")
+    print(f"  {workers} workers x {threads} threads, longest first; predicted makespan "
+          f"{makespan / 60:.1f} min (work/workers bound {total / workers / 60:.1f} min)")
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    import importlib.util
+    from run_ledger import LEDGER_PATH, RunLedger
+
+    spec = importlib.util.spec_from_file_location('unified_pdf_parser',
+                                                  Path(__file__).parent / 'unified-pdf-parser.py')
+    parser = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(parser)
+
+    args = sys.argv[1:]
+    threads_per_worker = 1
+    if '--threads-per-worker' in args:
+        i = args.index('--threads-per-worker')
+        threads_per_worker = int(args[i + 1])
+        del args[i:i + 2]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    if args[0] == '--all':
+        ac_nums = list(range(1, 235))
+    elif '-' in args[0]:
+        start, end = map(int, args[0].split('-'))
+        ac_nums = list(range(start, end + 1))
+    else:
+        ac_nums = [int(a) for a in args if a.isdigit()]
+
+    election = parser.TN_2024
+    ac_ids = [election.ac_id(n) for n in ac_nums]
+    types = {election.ac_id(n): 'scanned' if n in parser.SCANNED_ACS else 'text' for n in ac_nums}
+    pages = {election.ac_id(n): parser.count_pages(election.pdf_path(n)) for n in ac_nums}
+    history = RunLedger(LEDGER_PATH).durations('unified-pdf-parser.py')
+
+    costs = lpt_order(estimate_costs(ac_ids, types, pages, history))
+    workers, threads = thread_budget(os.cpu_count() or 1, len(costs), threads_per_worker)
+    print_plan(costs, workers, threads)
+    print("\n  Longest ACs:")
+    for c in costs[:15]:
+        print(f"    {c.ac_id}: {c.seconds / 60:6.1f} min  {c.pdf_type:8s} {c.pages:4d} pages  ({c.source})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Digit Recognizer
+================
+A NumPy digit classifier for the cells of scanned Form 20 tables. Nearly
+every token on a Form 20 page is a 1-4 digit number; reading them with a
+general-purpose OCR engine costs a tesseract process per column. Here a
+whole page is read in one batch instead:
+
+- glyphs are the connected components of the deskewed, binarized page
+  with the ruling lines removed, assigned to table cells (table_grid.Grid)
+  by their centre and ordered left to right
+- every glyph is scaled to 16x16 and a small two-layer network classifies
+  the whole batch in two matrix products: digits 0-9 or "not a digit"
+  (letters of headers and names)
+- a cell's value is its digits; its confidence the product of its glyph
+  probabilities
+
+Cells below table_grid.MIN_CELL_CONFIDENCE go to tesseract (read_cells
+batches them into a single call per page), so the OCR engine only sees
+the few cells the network is unsure of.
+
+The network is trained on synthetic Form 20 renders (synth_form20.py)
+segmented by the same grid and glyph code as real pages, so its inputs
+look exactly like what it reads. The trained model is cached in
+<cache>/digit_recognizer.npz and trained on first use when missing
+(seeded: the same model every time).
+
+Usage:
+    from digit_recognizer import load_recognizer
+
+    recognizer = load_recognizer()
+    values, confidence = recognizer.read_page(binary, grid)   # one per cell, -1: no number
+
+    python scripts/digit_recognizer.py train [--pages 60] [--seed 7]
+    python scripts/digit_recognizer.py eval [--pages 20]     # accuracy, cells/s
+"""
+
+import os
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+from electionlens.lazy import lazy_import
+from table_grid import MIN_CELL_CONFIDENCE, Grid, binarize, detect_grid, rule_masks, straighten
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+MODEL_PATH = PATHS.cache / 'digit_recognizer.npz'
+
+GLYPH = 16                  # glyphs are scaled to GLYPH x GLYPH
+OTHER = 10                  # class of everything that is not a digit
+HIDDEN = 96                 # hidden layer width
+
+# Pixels around the ruling lines removed with them
+RULE_MARGIN = 3
+# A glyph is at least this share of its cell's tallest glyph (drops specks
+# and dots) and at most this share of the row height (drops rule remnants)
+MIN_GLYPH_SHARE = 0.5
+MAX_GLYPH_SHARE = 0.9
+# Wider than this times its height is several touching digits
+MAX_GLYPH_ASPECT = 1.1
+DIGIT_ASPECT = 0.6
+
+# Training
+TRAIN_PAGES = 60
+TRAIN_SEED = 7
+EVAL_SEED = 1007
+EPOCHS = 12
+BATCH = 256
+LEARNING_RATE = 0.05
+
+
+# ============================================================================
+# Glyphs
+# ============================================================================
+
+def normalize_glyph(mask: 'np.ndarray') -> 'np.ndarray':
+    """A glyph's ink centred in a square (aspect kept) and scaled to GLYPH x GLYPH."""
+    h, w = mask.shape
+    side = max(h, w)
+    y, x = (side - h) // 2, (side - w) // 2
+    square = cv2.copyMakeBorder(mask, y, side - h - y, x, side - w - x, cv2.BORDER_CONSTANT, value=0)
+    return cv2.resize(square, (GLYPH, GLYPH), interpolation=cv2.INTER_AREA)
+
+
+def page_glyphs(binary: 'np.ndarray', grid: Grid) -> tuple['np.ndarray', 'np.ndarray']:
+    """Glyphs of a straightened, binarized page and the cell each belongs to.
+
+    Returns (glyphs, cells): float32 (N, GLYPH*GLYPH) and cell index
+    row * num_columns + column, sorted by cell and left to right.
+    """
+    # Only the table is labelled: the title block and margins are not cells
+    top, left = grid.rows[0], grid.cols[0]
+    binary = binary[top:grid.rows[-1] + 1, left:grid.cols[-1] + 1]
+    rows = np.asarray(grid.rows) - top
+    cols = np.asarray(grid.cols) - left
+    horizontal, vertical = rule_masks(binary)
+    # Rules are removed with a margin: a rule's ragged edge is not a glyph
+    rules = cv2.dilate(cv2.bitwise_or(horizontal, vertical), np.ones((RULE_MARGIN, RULE_MARGIN), np.uint8))
+    ink = cv2.subtract(binary, rules)
+    count, labels, stats, centroids = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    x, y, w, h = (stats[1:, i] for i in range(4))
+    cx, cy = centroids[1:, 0], centroids[1:, 1]
+
+    row = np.searchsorted(rows, cy) - 1
+    col = np.searchsorted(cols, cx) - 1
+    inside = (row >= 0) & (row < len(rows) - 1) & (col >= 0) & (col < len(cols) - 1)
+    row_height = np.diff(rows)[np.clip(row, 0, len(rows) - 2)]
+    keep = inside & (h <= MAX_GLYPH_SHARE * row_height)
+    cell = row * grid.num_columns + col
+
+    # Specks and dots: shorter than half the tallest glyph of their cell
+    tallest = np.zeros(grid.num_columns * (len(rows) - 1) + 1, np.int64)
+    np.maximum.at(tallest, np.where(keep, cell, -1), np.where(keep, h, 0))
+    keep &= h >= MIN_GLYPH_SHARE * tallest[np.where(keep, cell, -1)]
+
+    # A page has thousands of glyphs: plain ints in the loop
+    glyphs, owners, lefts = [], [], []
+    normalize, uint8 = normalize_glyph, np.uint8
+    xs, ys, ws, hs, cells = x.tolist(), y.tolist(), w.tolist(), h.tolist(), cell.tolist()
+    for i in np.flatnonzero(keep).tolist():
+        left, top, width, height = xs[i], ys[i], ws[i], hs[i]
+        mask = (labels[top:top + height, left:left + width] == i + 1).astype(uint8) * 255
+        parts = 1
+        if width > MAX_GLYPH_ASPECT * height:
+            parts = max(2, round(width / (DIGIT_ASPECT * height)))
+        step = width / parts
+        for k in range(parts):
+            glyphs.append(normalize(mask[:, int(k * step):int((k + 1) * step)]))
+            owners.append(cells[i])
+            lefts.append(left + k * step)
+    if not glyphs:
+        return np.zeros((0, GLYPH * GLYPH), np.float32), np.zeros(0, np.int64)
+    order = np.lexsort((lefts, owners))
+    glyphs = np.asarray(glyphs, np.float32).reshape(len(glyphs), -1)[order] / 255
+    return glyphs, np.asarray(owners, np.int64)[order]
+
+
+# ============================================================================
+# Recognizer
+# ============================================================================
+
+class DigitRecognizer:
+    """Two-layer network: GLYPH*GLYPH pixels -> HIDDEN ReLU units -> 11 classes."""
+
+    def __init__(self, weights: dict):
+        self.w1, self.b1 = weights['w1'], weights['b1']
+        self.w2, self.b2 = weights['w2'], weights['b2']
+
+    def probabilities(self, glyphs: 'np.ndarray') -> 'np.ndarray':
+        hidden = np.maximum(glyphs @ self.w1 + self.b1, 0)
+        logits = hidden @ self.w2 + self.b2
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def read_page(self, binary: 'np.ndarray', grid: Grid) -> tuple['np.ndarray', 'np.ndarray']:
+        """Value and confidence of every cell (row-major); value -1: blank or not a number.
+
+        A cell that is mostly digits is a number; its non-digit glyphs are
+        specks and are dropped. A cell that is mostly non-digits is text.
+        Confidence is the product of the cell's glyph probabilities (a
+        blank cell is certain, a text cell in a row of numbers doubtful).
+        """
+        glyphs, cells = page_glyphs(binary, grid)
+        num_cells = grid.num_columns * (len(grid.rows) - 1)
+        probs = self.probabilities(glyphs)
+        classes = probs.argmax(axis=1)
+        conf = probs[np.arange(len(classes)), classes]
+
+        is_digit = classes != OTHER
+        digit_cells = cells[is_digit]
+        digits = np.bincount(digit_cells, minlength=num_cells)
+        others = np.bincount(cells, minlength=num_cells) - digits
+        # Place value of each digit: digits after it in its cell
+        starts = np.concatenate(([0], np.cumsum(digits)[:-1]))
+        place = digits[digit_cells] - 1 - (np.arange(len(digit_cells)) - starts[digit_cells])
+        values = np.bincount(digit_cells, weights=classes[is_digit] * 10.0 ** place,
+                             minlength=num_cells).astype(np.int64)
+        values[digits <= others] = -1
+
+        confidence = np.exp(np.bincount(cells, weights=np.log(conf), minlength=num_cells))
+        # Text in a row of numbers is more likely digits broken by noise
+        text = ((digits <= others) & (others > 0)).reshape(-1, grid.num_columns)
+        numeric = (digits > others).reshape(-1, grid.num_columns)
+        suspect = text & (numeric.sum(axis=1) > text.sum(axis=1))[:, None]
+        confidence[suspect.ravel()] = 0.0
+        return values, confidence
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez_compressed(tmp, w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2)
+        # Never a partial file, should two processes train at once
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> 'DigitRecognizer':
+        with np.load(path) as data:
+            return cls({key: data[key] for key in ('w1', 'b1', 'w2', 'b2')})
+
+
+@lru_cache(maxsize=None)
+def load_recognizer(path: Path = MODEL_PATH) -> DigitRecognizer:
+    """The cached model, trained (and cached) first if there is none."""
+    if not Path(path).exists():
+        print(f"    Training digit recognizer on {TRAIN_PAGES} synthetic pages (once) ...")
+        recognizer = train(*training_set(TRAIN_PAGES, TRAIN_SEED))
+        recognizer.save(Path(path))
+        return recognizer
+    return DigitRecognizer.load(path)
+
+
+# ============================================================================
+# Training
+# ============================================================================
+
+def synthetic_pages(num_pages: int, seed: int):
+    """(gray page, synth Page, dpi) of scanned synthetic Form 20 pages.
+
+    Candidate counts (font sizes), resolution, noise and skew vary per AC,
+    two pages per AC.
+    """
+    import synth_form20 as synth
+
+    rng = np.random.default_rng(seed)
+    opts = {'kind': 'scan', 'booths': (60, 120), 'candidates': (4, 30), 'noise': 0.0,
+            'skew': 1.5, 'rotate': 0.0, 'transpose': 0.0, 'dpi': 200, 'seed': seed}
+    produced, index = 0, 0
+    while produced < num_pages:
+        opts['noise'] = float(rng.uniform(0, 0.1))
+        opts['dpi'] = int(rng.choice([150, 200, 300]))
+        ac = synth.make_ac(index, opts)
+        index += 1
+        page_rng = np.random.default_rng(ac.seed)
+        for page in synth.layout_pages(ac)[:2]:
+            image = synth.degrade(synth.render_page(page, ac.dpi), ac, page_rng)
+            yield np.array(image), page, ac.dpi
+            produced += 1
+            if produced >= num_pages:
+                return
+
+
+def page_labels(page, dpi: int, grid: Grid) -> dict[int, str]:
+    """Cell index -> the text synth_form20 drew in it (spaces removed)."""
+    scale = dpi / 72
+    labels = {}
+    for x, y, size, text in page.texts:
+        px = max(6, int(size * scale))
+        cx, cy = x * scale + px * 0.3, y * scale - px / 2
+        row = int(np.searchsorted(grid.rows, cy)) - 1
+        col = int(np.searchsorted(grid.cols, cx)) - 1
+        if 0 <= row < len(grid.rows) - 1 and 0 <= col < grid.num_columns:
+            labels[row * grid.num_columns + col] = text.replace(' ', '')
+    return labels
+
+
+def labelled_cells(num_pages: int, seed: int):
+    """(glyphs, cells, labels by cell) of synthetic pages, through the production grid code."""
+    for gray, page, dpi in synthetic_pages(num_pages, seed):
+        grid = detect_grid(gray)
+        if grid is None:
+            continue
+        binary = binarize(straighten(gray, grid.angle))
+        glyphs, cells = page_glyphs(binary, grid)
+        yield binary, grid, glyphs, cells, page_labels(page, dpi, grid)
+
+
+def training_set(num_pages: int, seed: int) -> tuple['np.ndarray', 'np.ndarray']:
+    """Glyphs and classes; cells whose glyph count differs from their text are left out."""
+    xs, ys = [], []
+    for _, _, glyphs, cells, labels in labelled_cells(num_pages, seed):
+        bounds = np.flatnonzero(np.diff(cells)) + 1
+        for start, group in zip(np.concatenate(([0], bounds)), np.split(cells, bounds)):
+            text = labels.get(int(group[0]), '')
+            if len(text) != len(group):
+                continue
+            xs.append(glyphs[start:start + len(group)])
+            ys.extend(int(ch) if ch.isdigit() else OTHER for ch in text)
+    return np.concatenate(xs), np.asarray(ys, np.int64)
+
+
+def train(glyphs: 'np.ndarray', classes: 'np.ndarray', seed: int = TRAIN_SEED) -> DigitRecognizer:
+    """Minibatch SGD with momentum on cross-entropy."""
+    rng = np.random.default_rng(seed)
+    n, d = glyphs.shape
+    weights = {
+        'w1': (rng.standard_normal((d, HIDDEN)) * np.sqrt(2 / d)).astype(np.float32),
+        'b1': np.zeros(HIDDEN, np.float32),
+        'w2': (rng.standard_normal((HIDDEN, OTHER + 1)) * np.sqrt(1 / HIDDEN)).astype(np.float32),
+        'b2': np.zeros(OTHER + 1, np.float32),
+    }
+    velocity = {key: np.zeros_like(value) for key, value in weights.items()}
+    onehot = np.eye(OTHER + 1, dtype=np.float32)[classes]
+    model = DigitRecognizer(weights)
+
+    for epoch in range(EPOCHS):
+        rate = LEARNING_RATE * (0.5 if epoch >= EPOCHS * 2 // 3 else 1.0)
+        for batch in np.array_split(rng.permutation(n), max(1, n // BATCH)):
+            x = glyphs[batch]
+            hidden = np.maximum(x @ model.w1 + model.b1, 0)
+            logits = hidden @ model.w2 + model.b2
+            logits -= logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            grad = (probs - onehot[batch]) / len(batch)
+            grad_hidden = (grad @ model.w2.T) * (hidden > 0)
+            grads = {'w2': hidden.T @ grad, 'b2': grad.sum(axis=0),
+                     'w1': x.T @ grad_hidden, 'b1': grad_hidden.sum(axis=0)}
+            for key, g in grads.items():
+                velocity[key] = 0.9 * velocity[key] - rate * g
+                weights[key] += velocity[key]
+    return model
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def arg_value(args: list[str], flag: str, default=None):
+    return args[args.index(flag) + 1] if flag in args else default
+
+
+def evaluate(recognizer: DigitRecognizer, num_pages: int):
+    """Cell accuracy on fresh synthetic pages (a different seed than training)."""
+    numeric = correct = accepted = accepted_correct = 0
+    cells_read, seconds = 0, 0.0
+    for binary, grid, _, _, labels in labelled_cells(num_pages, EVAL_SEED):
+        start = time.perf_counter()
+        values, confidence = recognizer.read_page(binary, grid)
+        seconds += time.perf_counter() - start
+        cells_read += len(values)
+        for cell, text in labels.items():
+            if not text.isdigit():
+                continue
+            numeric += 1
+            ok = values[cell] == int(text)
+            correct += ok
+            if confidence[cell] >= MIN_CELL_CONFIDENCE:
+                accepted += 1
+                accepted_correct += ok
+    print(f"  Numeric cells:      {numeric:,}")
+    print(f"  Accuracy:           {correct / max(numeric, 1):.2%}")
+    print(f"  Confident (>= {MIN_CELL_CONFIDENCE}): {accepted / max(numeric, 1):.2%} of cells, "
+          f"{accepted_correct / max(accepted, 1):.2%} correct")
+    print(f"  Throughput:         {cells_read / max(seconds, 1e-9):,.0f} cells/s "
+          f"({seconds / max(num_pages, 1) * 1000:.0f} ms/page, glyph extraction included)")
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('train', 'eval'):
+        print(__doc__)
+        return
+    path = Path(arg_value(args, '--model', MODEL_PATH))
+
+    print("=" * 70)
+    print(f"DIGIT RECOGNIZER: {args[0]}")
+    print("=" * 70)
+    if args[0] == 'train':
+        pages = int(arg_value(args, '--pages', TRAIN_PAGES))
+        seed = int(arg_value(args, '--seed', TRAIN_SEED))
+        start = time.time()
+        glyphs, classes = training_set(pages, seed)
+        print(f"  Glyphs: {len(glyphs):,} from {pages} pages ({time.time() - start:.1f}s)")
+        start = time.time()
+        recognizer = train(glyphs, classes, seed)
+        print(f"  Trained in {time.time() - start:.1f}s")
+        recognizer.save(path)
+        print(f"  ✅ Saved {path}")
+        return
+
+    if not path.exists():
+        print(f"  ❌ No model at {path} (run: python scripts/digit_recognizer.py train)")
+        return
+    evaluate(DigitRecognizer.load(path), int(arg_value(args, '--pages', 20)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+"""
+ElectionLens data tools
+=======================
+One command line for the booth data pipeline (extract, validate, fix,
+export, report) plus the shared pieces every script needs: data paths
+resolved from config (config.py) and deferred imports of heavy backends
+(lazy.py).
+
+The subcommands run the scripts in scripts/ without importing them up
+front, so `electionlens --help` or a validation run never loads OpenCV,
+pdfplumber or tesseract.
+"""
+
+__version__ = '2.0.0'
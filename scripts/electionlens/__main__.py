@@ -0,0 +1,3 @@
+from electionlens.cli import main
+
+main()
@@ -0,0 +1,159 @@
+"""
+ElectionLens Command Line
+=========================
+One entry point for the booth data pipeline. Each subcommand runs one of
+the scripts in scripts/ with the remaining arguments, importing it only
+when it is invoked, so lightweight commands start in tens of
+milliseconds.
+
+Usage:
+    electionlens extract 1-50 --spans /tmp/spans     # TN 2024 Form 20 parser
+    electionlens extract work --workers 8            # sharded driver (any state)
+    electionlens validate coverage
+    electionlens fix postal -n
+    electionlens export summaries --force
+    electionlens report runs list
+    electionlens watch --year 2024                   # re-run the pipeline for changed ACs
+    electionlens paths                               # resolved data paths
+
+    python -m electionlens ...                       # without installing
+
+Install (editable, so the scripts are found in the checkout):
+    pip install -e scripts
+    pip install -e 'scripts[ocr]'                    # + scanned PDF backends
+"""
+
+import sys
+
+from electionlens import __version__
+
+# command -> verb -> (script, summary); the None verb runs when the first
+# argument is not a verb. Verbs listed in PASS_VERB are handed to the
+# script, which has its own subcommands.
+COMMANDS = {
+    'extract': {
+        None: ('unified-pdf-parser.py', 'TN 2024 Form 20 booth extraction (AC numbers, ranges, --all, --resume)'),
+        'enqueue': ('extract_driver.py', 'Queue per-state extraction runs for an election year'),
+        'work': ('extract_driver.py', 'Work the shared extraction queue'),
+        'status': ('extract_driver.py', 'Extraction queue and lease status'),
+        'v2': ('unified-pdf-parser-v2.py', 'v2 parser for 2024 PC booth data'),
+        'v2-2021': ('unified-pdf-parser-v2-2021.py', 'v2 parser for 2021 AC booth data'),
+        'synth': ('synth_form20.py', 'Synthetic Form 20 PDFs with ground truth'),
+    },
+    'validate': {
+        None: ('validate_2024_comprehensive.py', 'Comprehensive validation of 2024 booth data'),
+        'complete': ('validate_2024_complete.py', 'Complete validation of 2024 PC booth data'),
+        'coverage': ('validate_booth_coverage.py', 'Booth data coverage'),
+        'postal': ('validate_postal_accuracy.py', 'Postal vote accuracy'),
+    },
+    'fix': {
+        'postal': ('postal_reconcile.py', 'Rewrite postal blocks from official results'),
+        'booth-numbers': ('fix-booth-number-in-votes-2024.py', 'Booth numbers leaking into votes arrays'),
+    },
+    'export': {
+        'summaries': ('booth_summaries.py', 'Booth panel summaries per AC-year, rolled up to PC and state'),
+        'swing': ('booth_swing.py', 'Cross-year booth swing, turnout change and flips'),
+        'scenarios': ('alliance_scenarios.py', 'Alliance what-if scenarios'),
+        'ingest': ('ingest.py', 'XLSX/CSV result files into public/data'),
+    },
+    'report': {
+        'runs': ('run_ledger.py', 'Extraction run ledger: list, show, pages, quarantine'),
+        'spans': ('spans.py', 'Timing span summary of a run'),
+        'memory': ('memory_budget.py', 'Per-AC peak memory from a span directory'),
+        'schedule': ('cost_model.py', 'Predicted schedule and makespan of a batch'),
+        'strategies': ('strategies.py', 'Extraction strategy success and cost per layout family'),
+        'bench': ('bench_extraction.py', 'Parser hot path benchmarks against the baseline'),
+    },
+    'watch': {
+        None: ('watch.py', 'Re-extract, reconcile, validate and export the ACs whose files change'),
+    },
+}
+
+PASS_VERB = {'enqueue', 'work', 'status'}
+
+
+def scripts_dir():
+    """The scripts/ checkout: next to this package, else under the configured root."""
+    from pathlib import Path
+    here = Path(__file__).resolve().parent.parent
+    if (here / 'unified-pdf-parser.py').exists():
+        return here
+    from electionlens.config import PATHS
+    return PATHS.scripts
+
+
+def print_help(command: str = None):
+    if command:
+        print(f"Usage: electionlens {command} {{{','.join(v for v in COMMANDS[command] if v)}}} [args]\n")
+        for verb, (script, summary) in COMMANDS[command].items():
+            print(f"  {verb or '(default)':14s} {summary}  [{script}]")
+        print(f"\nArguments after the verb go to the script; "
+              f"`electionlens {command} VERB --help` shows its usage.")
+        return
+    # Docstring without its title
+    print(__doc__.strip().split('\n', 2)[2])
+    print("\nCommands:")
+    for name, verbs in COMMANDS.items():
+        print(f"  {name:10s} {', '.join(v for v in verbs if v)}")
+    print(f"  {'paths':10s} resolved data paths and config file")
+    print("\nRun `electionlens COMMAND --help` for its verbs.")
+
+
+def print_paths():
+    from electionlens.config import PATHS
+    print(f"config:    {PATHS.config_file or '(none, defaults and environment)'}")
+    for name in ('root', 'data', 'booths', 'elections', 'schema', 'downloads', 'cache'):
+        print(f"{name + ':':10s} {getattr(PATHS, name)}")
+    print(f"form20:    {PATHS.form20['default']}")
+    for election in PATHS.form20:
+        if election != 'default':
+            print(f"  {election}: {PATHS.form20_dir(*election.split('-'))}")
+
+
+def run_script(script: str, argv: list[str]):
+    """Run a script as __main__ with argv, as `python scripts/<script> ...` would."""
+    import runpy
+    path = scripts_dir() / script
+    if not path.exists():
+        print(f"❌ {path} not found; install with `pip install -e scripts` or set ELECTIONLENS_ROOT")
+        sys.exit(1)
+    sys.argv = [str(path), *argv]
+    sys.path.insert(0, str(path.parent))
+    runpy.run_path(str(path), run_name='__main__')
+
+
+def main(argv: list[str] = None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    if not args or args[0] in ('-h', '--help', 'help'):
+        print_help()
+        return
+    if args[0] == '--version':
+        print(f"electionlens {__version__}")
+        return
+    if args[0] == 'paths':
+        print_paths()
+        return
+
+    command, rest = args[0], args[1:]
+    verbs = COMMANDS.get(command)
+    if verbs is None:
+        print(f"❌ Unknown command: {command}\n")
+        print_help()
+        sys.exit(2)
+    if (not rest and None not in verbs) or (rest and rest[0] in ('-h', '--help')):
+        print_help(command)
+        return
+    verb = rest[0] if rest and rest[0] in verbs else None
+    if verb is None and None not in verbs:
+        print(f"❌ Unknown {command} verb: {rest[0]}\n")
+        print_help(command)
+        sys.exit(2)
+
+    script, _ = verbs[verb]
+    if verb is not None and verb not in PASS_VERB:
+        rest = rest[1:]
+    run_script(script, rest)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Data Paths
+==========
+Resolves every data location from config instead of absolute paths baked
+into scripts.
+
+Sources, later ones winning:
+  1. Defaults: the repository this package lives in (or the nearest parent
+     of the working directory holding public/data/schema.json), ~/Desktop
+     for downloaded source files, <root>/.cache for caches.
+  2. The first config file found: $ELECTIONLENS_CONFIG, ./electionlens.toml,
+     <root>/electionlens.toml, ~/.config/electionlens/config.toml.
+  3. Environment: ELECTIONLENS_ROOT, ELECTIONLENS_DATA,
+     ELECTIONLENS_DOWNLOADS, ELECTIONLENS_CACHE, ELECTIONLENS_FORM20.
+
+Config file (see scripts/electionlens.example.toml):
+    [paths]
+    root = "~/src/ElectionLens"
+    downloads = "~/Downloads"
+
+    [form20]
+    default = "/mnt/form20/{state}/{year}"
+    TN-2021 = "{downloads}/TNLA_2021_PDFs"
+
+Usage:
+    from electionlens.config import PATHS, form20_dir
+
+    PATHS.schema                   # public/data/schema.json
+    PATHS.booths / "TN"            # public/data/booths/TN
+    form20_dir("TN", 2024)         # Form 20 PDFs of an election
+"""
+
+import os
+from pathlib import Path
+
+CONFIG_ENV = 'ELECTIONLENS_CONFIG'
+ENV_PREFIX = 'ELECTIONLENS_'
+CONFIG_NAME = 'electionlens.toml'
+USER_CONFIG = Path('~/.config/electionlens/config.toml')
+
+# Form 20 PDF directories by election; {state}, {year}, {downloads} and
+# {root} are filled in
+FORM20_DIRS = {
+    'default': '~/Form20/{state}/{year}',
+    'TN-2024': '{downloads}/GELS_2024_Form20_PDFs',
+    'TN-2021': '{downloads}/TNLA_2021_PDFs',
+}
+
+
+class Paths:
+    # A plain class: dataclasses would add ~10 ms to every CLI start
+    __slots__ = ('root', 'data', 'downloads', 'cache', 'form20', 'config_file')
+
+    def __init__(self, root: Path, data: Path, downloads: Path, cache: Path,
+                 form20: dict, config_file: Path = None):
+        self.root = root
+        self.data = data
+        self.downloads = downloads
+        self.cache = cache
+        self.form20 = form20
+        self.config_file = config_file
+
+    @property
+    def booths(self) -> Path:
+        return self.data / 'booths'
+
+    @property
+    def elections(self) -> Path:
+        return self.data / 'elections'
+
+    @property
+    def schema(self) -> Path:
+        return self.data / 'schema.json'
+
+    @property
+    def scripts(self) -> Path:
+        return self.root / 'scripts'
+
+    def form20_dir(self, state: str, year: int) -> Path:
+        template = self.form20.get(f'{state}-{year}', self.form20['default'])
+        return expand(template.format(state=state, year=year, downloads=self.downloads, root=self.root))
+
+
+def expand(path) -> Path:
+    return Path(os.path.expandvars(os.path.expanduser(str(path))))
+
+
+def find_root() -> Path:
+    """The repository holding public/data: this package's checkout, else the working directory's."""
+    here = Path(__file__).resolve().parent.parent.parent
+    if (here / 'public' / 'data').is_dir():
+        return here
+    cwd = Path.cwd()
+    for candidate in (cwd, *cwd.parents):
+        if (candidate / 'public' / 'data' / 'schema.json').exists():
+            return candidate
+    return cwd
+
+
+def read_config(root: Path) -> tuple[dict, Path]:
+    candidates = [os.environ.get(CONFIG_ENV), Path.cwd() / CONFIG_NAME, root / CONFIG_NAME, USER_CONFIG]
+    for candidate in candidates:
+        if candidate and expand(candidate).is_file():
+            # Only parse TOML when there is a file (keeps CLI startup lean)
+            import tomllib
+            with open(expand(candidate), 'rb') as f:
+                return tomllib.load(f), expand(candidate)
+    return {}, None
+
+
+def load_paths() -> Paths:
+    env = {key: os.environ.get(ENV_PREFIX + key.upper())
+           for key in ('root', 'data', 'downloads', 'cache', 'form20')}
+    root = expand(env['root']) if env['root'] else find_root()
+    config, config_file = read_config(root)
+    paths = config.get('paths', {})
+    root = expand(env['root'] or paths.get('root') or root)
+
+    def resolve(key: str, default: str) -> Path:
+        value = env[key] or paths.get(key) or default
+        return expand(str(value).format(root=root))
+
+    form20 = {**FORM20_DIRS, **config.get('form20', {})}
+    if env['form20']:
+        form20['default'] = env['form20']
+    return Paths(root=root,
+                 data=resolve('data', '{root}/public/data'),
+                 downloads=resolve('downloads', '~/Desktop'),
+                 cache=resolve('cache', '{root}/.cache'),
+                 form20=form20,
+                 config_file=config_file)
+
+
+PATHS = load_paths()
+
+
+def form20_dir(state: str, year: int) -> Path:
+    return PATHS.form20_dir(state, year)
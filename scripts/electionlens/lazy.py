@@ -0,0 +1,70 @@
+"""
+Deferred Imports
+================
+OpenCV, NumPy, pdfplumber, pytesseract and pdf2image take hundreds of
+milliseconds to import. Scripts bind them with lazy_import() instead of a
+top-level import: the module is imported on first attribute access, so
+--help, validation-only runs and text-only pool workers never load the OCR
+stack.
+
+Usage:
+    from electionlens.lazy import lazy_import
+
+    cv2 = lazy_import('cv2')
+    np = lazy_import('numpy')
+    pytesseract = lazy_import('pytesseract')
+    HAS_TESSERACT = available('pytesseract')   # optional backends: no import
+
+Annotations are evaluated at definition time, so annotations naming a lazy
+module's types are quoted: `def f(image: 'Image.Image') -> 'np.ndarray'`.
+"""
+
+import importlib
+import importlib.util
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in that imports the real module on first use."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str):
+    """The module if already imported, else a LazyModule for it."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def available(name: str) -> bool:
+    """Whether a module can be imported, without importing it."""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def loaded(name: str) -> bool:
+    """Whether a module has actually been imported (a LazyModule counts once used)."""
+    return name in sys.modules
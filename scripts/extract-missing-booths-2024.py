@@ -8,9 +8,13 @@ Identifies ACs with missing booths and extracts them using unified parser.
 import json
 from pathlib import Path
 import subprocess
+import sys
 
-BOOTHS_DIR = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-FORM20_DIR = Path.home() / "Desktop" / "GELS_2024_Form20_PDFs"
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS, form20_dir
+
+BOOTHS_DIR = PATHS.booths / "TN"
+FORM20_DIR = form20_dir("TN", 2024)
 
 
 def load_json(path):
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Sharded Form 20 Extraction Driver
+=================================
+Extracts booth results for any state and election, sharing the work
+between any number of worker processes and machines.
+
+Work units (one AC of one state-election) are queued in the run ledger
+(run_ledger.py), one run per state-election. Workers claim an AC with a
+lease, renew it with heartbeats while extracting, and record the outcome;
+an AC whose worker died is picked up again once its lease expires. Point
+every machine at the same ledger file on a shared filesystem to spread a
+batch over several machines.
+
+Paths:
+    Form 20 PDFs  {form20}/AC{num:03d}.pdf, where --form20 is a template
+                  with {state} and {year} (default: the [form20] config,
+                  see `electionlens paths`)
+    Results       public/data/elections/{ac|pc}/{STATE}/{year}.json
+    Output        public/data/booths/{STATE}/{AC_ID}/{year}.json
+
+Usage:
+    # Queue one run per state for an election year (ACs without a PDF are skipped)
+    python scripts/extract_driver.py enqueue --year 2024 --states TN,KL,KA
+    python scripts/extract_driver.py enqueue --year 2021 --states all --form20 /mnt/form20/{state}/{year}
+
+    # Work the queue (on each machine); --wait keeps polling for new runs
+    python scripts/extract_driver.py work --workers 8
+    python scripts/extract_driver.py work --workers 4 --ledger /mnt/shared/runs.sqlite --journal delete
+
+    # Queue and lease status
+    python scripts/extract_driver.py status
+
+Options:
+    --ledger PATH       shared ledger (default .cache/extraction-runs.sqlite)
+    --journal MODE      SQLite journal mode; 'delete' for network filesystems
+    --lease SECONDS     lease length (default 600, renewed every third of it)
+    --max-attempts N    attempts before an AC is marked failed (default 3)
+    --runs A,B          only work these runs
+    --spans DIR         record timing spans (see spans.py)
+"""
+
+import importlib.util
+import os
+import socket
+import sys
+import threading
+import time
+from multiprocessing import Process
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from cost_model import estimate_costs, limit_threads, lpt_order, thread_budget
+from electionlens.config import PATHS, form20_dir
+from run_ledger import LEDGER_PATH, Checkpoint, RunLedger
+from spans import enable as enable_spans
+
+SCRIPT = 'extract_driver.py'
+PDF_PATTERN = 'AC{num:03d}.pdf'
+DEFAULT_LEASE = 600
+DEFAULT_MAX_ATTEMPTS = 3
+IDLE_POLL = 10
+
+
+# ============================================================================
+# Elections
+# ============================================================================
+
+def load_parser():
+    """Import unified-pdf-parser.py (hyphenated file name) as a module."""
+    spec = importlib.util.spec_from_file_location('unified_pdf_parser',
+                                                  Path(__file__).parent / 'unified-pdf-parser.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def election_config(state: str, year: int, form20: str = None) -> dict:
+    """JSON-serializable election description stored with a run.
+
+    form20 is a directory template with {state} and {year}; without one the
+    configured Form 20 directory of the election is used.
+    """
+    # NumPy-backed modules are only needed when queueing, not to work or report
+    from booth_matrix import load_schema
+    from postal_reconcile import election_kind
+
+    kind = election_kind(state, year)
+    schema = load_schema()
+    state_name = schema.get('states', {}).get(state, {}).get('name', state)
+    return {
+        'state': state,
+        'year': year,
+        'kind': kind,
+        'form20_dir': form20.format(state=state, year=year) if form20 else str(form20_dir(state, year)),
+        'booths_dir': str(PATHS.booths / state),
+        'results_path': str(PATHS.elections / kind / state / f"{year}.json"),
+        'schema_path': str(PATHS.schema),
+        'pdf_pattern': PDF_PATTERN,
+        'source': f'{state_name} CEO - Form 20',
+    }
+
+
+def state_ac_numbers(schema: dict, state: str) -> list[int]:
+    return sorted(ac['acNo'] for ac in schema.get('assemblyConstituencies', {}).values()
+                  if ac.get('stateId') == state and ac.get('acNo'))
+
+
+def states_with_results(year: int) -> list[str]:
+    return sorted(p.parent.name for kind in ('ac', 'pc')
+                  for p in (PATHS.elections / kind).glob(f"*/{year}.json"))
+
+
+# ============================================================================
+# Enqueue
+# ============================================================================
+
+def enqueue(ledger: RunLedger, states: list[str], year: int, form20: str = None,
+            include_missing: bool = False) -> list[str]:
+    """Create one run per state-election; returns the run ids.
+
+    ACs are queued longest first (cost_model.py: earlier durations, else
+    page count and PDF type), so workers pick up the slow ACs before the
+    quick ones. The order holds within a run: workers drain the open runs
+    oldest first, so with several states queued a later state's slow ACs
+    wait for the earlier states' quick ones.
+    """
+    from booth_matrix import load_schema
+    from postal_reconcile import election_kind
+
+    schema = load_schema()
+    parser = load_parser()
+    history = ledger.durations(SCRIPT)
+    runs = []
+    for state in states:
+        if not election_kind(state, year):
+            print(f"  ⚠️  {state} {year}: no official results, skipped")
+            continue
+        election = election_config(state, year, form20)
+        ac_nums = state_ac_numbers(schema, state)
+        pdf_dir = Path(election['form20_dir'])
+        if not include_missing:
+            ac_nums = [n for n in ac_nums if (pdf_dir / PDF_PATTERN.format(num=n)).exists()]
+        if not ac_nums:
+            print(f"  ⚠️  {state} {year}: no Form 20 PDFs in {pdf_dir}")
+            continue
+        pdfs = {f"{state}-{n:03d}": pdf_dir / PDF_PATTERN.format(num=n) for n in ac_nums}
+        pages = {ac_id: parser.count_pages(pdf) for ac_id, pdf in pdfs.items()}
+        types = {ac_id: parser.detect_pdf_type(pdf) if pdf.exists() else 'text' for ac_id, pdf in pdfs.items()}
+        costs = lpt_order(estimate_costs(list(pdfs), types, pages, history))
+        run_id = f"{state}-{year}-{time.strftime('%Y%m%d-%H%M%S')}"
+        ledger.create_run(SCRIPT, [c.ac_id for c in costs],
+                          args=sys.argv[1:], run_id=run_id, election=election)
+        runs.append(run_id)
+        print(f"  ✅ {run_id}: {len(ac_nums)} ACs ({election['kind'].upper()} results)")
+    return runs
+
+
+# ============================================================================
+# Workers
+# ============================================================================
+
+class Heartbeat(threading.Thread):
+    """Renews a lease until stopped; flags a lost lease."""
+
+    def __init__(self, ledger_path: str, journal: str, task: dict, worker: str, lease: float):
+        super().__init__(daemon=True)
+        self.args = (ledger_path, journal, task, worker, lease)
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self):
+        ledger_path, journal, task, worker, lease = self.args
+        # SQLite connections are per thread
+        ledger = RunLedger(ledger_path, journal)
+        while not self.stopped.wait(lease / 3):
+            if not ledger.renew(task['run_id'], task['ac_id'], worker, lease):
+                self.lost = True
+                break
+        ledger.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def work_task(parser, task: dict, worker: str, ledger: RunLedger, lease: float,
+              journal: str, references: dict) -> dict:
+    config = dict(task['election'])
+    key = (config['state'], config['year'])
+    if key not in references:
+        election = parser.Election(
+            state=config['state'], year=config['year'],
+            form20_dir=Path(config['form20_dir']), booths_dir=Path(config['booths_dir']),
+            results_path=Path(config['results_path']), schema_path=Path(config['schema_path']),
+            pdf_pattern=config['pdf_pattern'], source=config['source'],
+            strategies=tuple(config.get('strategies', ())),
+            strategy_order=config.get('strategy_order', 'history'), merge=config.get('merge', 'best'))
+        references[key] = (election, *parser.load_reference_data(election))
+    election, results, schema = references[key]
+
+    ac_num = int(task['ac_id'].split('-')[1])
+    heartbeat = Heartbeat(str(ledger.path), journal, task, worker, lease)
+    heartbeat.start()
+    try:
+        result = parser.process_ac(ac_num, results, schema,
+                                   checkpoint=Checkpoint(str(ledger.path), task['run_id'], task['ac_id'], journal),
+                                   election=election)
+    except Exception as e:
+        result = {'status': 'error', 'ac_id': task['ac_id'], 'error': f"{type(e).__name__}: {e}"}
+    finally:
+        heartbeat.stop()
+
+    # Another worker may have taken over after our lease expired (also between
+    # the last heartbeat and now); its outcome counts
+    if heartbeat.lost or not ledger.finish_ac(task['run_id'], task['ac_id'], result, worker):
+        print(f"  ⚠️  {worker}: lease on {task['ac_id']} lost, result discarded")
+        return result
+    ledger.finish_if_done(task['run_id'])
+    return result
+
+
+def worker_loop(ledger_path: str, journal: str, worker: str, lease: float, max_attempts: int,
+                run_ids: list[str], form20: str, wait: bool, threads: int):
+    limit_threads(threads)
+    parser = load_parser()
+    ledger = RunLedger(ledger_path, journal)
+    references = {}
+    done = 0
+    while True:
+        task = ledger.claim(worker, lease, SCRIPT, run_ids, max_attempts)
+        if task is None:
+            if not wait:
+                break
+            time.sleep(IDLE_POLL)
+            continue
+        if form20:
+            task['election']['form20_dir'] = form20.format(state=task['election']['state'],
+                                                           year=task['election']['year'])
+        result = work_task(parser, task, worker, ledger, lease, journal, references)
+        done += 1
+        print(f"  [{worker}] {task['ac_id']} ({task['run_id']}): {result['status']}")
+    print(f"  [{worker}] queue empty after {done} ACs")
+
+
+def work(ledger_path: str, journal: str, workers: int, lease: float, max_attempts: int,
+         run_ids: list[str], form20: str, wait: bool):
+    from digit_recognizer import load_recognizer
+
+    host = socket.gethostname()
+    # Trained (first run) or loaded once, before the workers start, so they
+    # don't each train the digit recognizer and race to save it
+    load_recognizer()
+    # Workers x tesseract/OpenCV threads stay within the cores
+    _, threads = thread_budget(os.cpu_count() or 1, workers)
+    procs = []
+    for i in range(workers):
+        worker = f"{host}:{os.getpid()}:{i}"
+        p = Process(target=worker_loop,
+                    args=(ledger_path, journal, worker, lease, max_attempts, run_ids, form20, wait, threads))
+        p.start()
+        procs.append(p)
+    for p in procs:
+        p.join()
+
+
+# ============================================================================
+# Status
+# ============================================================================
+
+def status(ledger: RunLedger):
+    print("=" * 70)
+    print(f"EXTRACTION QUEUE: {ledger.path}")
+    print("=" * 70)
+    for run in ledger.runs(limit=100):
+        if run['script'] != SCRIPT:
+            continue
+        counts = ledger.counts(run['run_id'])
+        print(f"  {run['run_id']:28s} {run['status']:10s} "
+              + '  '.join(f"{k}: {v}" for k, v in sorted(counts.items())))
+
+    leases = ledger.leases()
+    if leases:
+        now = time.time()
+        print("\n  Active leases:")
+        for lease in leases:
+            state = '⚠️ expired' if lease['lease_until'] < now else ''
+            print(f"    {lease['ac_id']:8s} {lease['worker']:32s} attempt {lease['attempts']}  "
+                  f"running {now - (lease['started'] or now):6.0f}s  "
+                  f"heartbeat {now - lease['heartbeat']:4.0f}s ago {state}")
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def arg_value(args: list[str], name: str, default=None):
+    if name in args:
+        i = args.index(name)
+        if i + 1 < len(args):
+            return args[i + 1]
+    return default
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('enqueue', 'work', 'status'):
+        print(__doc__)
+        sys.exit(1)
+
+    ledger_path = arg_value(args, '--ledger', str(LEDGER_PATH))
+    journal = arg_value(args, '--journal', 'WAL')
+    ledger = RunLedger(ledger_path, journal)
+    if '--spans' in args:
+        print(f"Recording timing spans in {enable_spans(arg_value(args, '--spans'))}")
+
+    if args[0] == 'enqueue':
+        year = int(arg_value(args, '--year', 0))
+        if not year:
+            print("❌ --year is required")
+            sys.exit(1)
+        states = arg_value(args, '--states', 'all')
+        states = states_with_results(year) if states == 'all' else states.upper().split(',')
+        print(f"Queueing {len(states)} states for {year}")
+        enqueue(ledger, states, year, arg_value(args, '--form20'),
+                include_missing='--include-missing' in args)
+
+    elif args[0] == 'work':
+        runs = arg_value(args, '--runs')
+        # Workers open their own connections; don't carry one across fork
+        ledger.close()
+        work(ledger_path, journal,
+             workers=int(arg_value(args, '--workers', os.cpu_count() or 1)),
+             lease=float(arg_value(args, '--lease', DEFAULT_LEASE)),
+             max_attempts=int(arg_value(args, '--max-attempts', DEFAULT_MAX_ATTEMPTS)),
+             run_ids=runs.split(',') if runs else None,
+             form20=arg_value(args, '--form20'),
+             wait='--wait' in args)
+        status(RunLedger(ledger_path, journal))
+
+    else:
+        status(ledger)
+
+
+if __name__ == '__main__':
+    main()
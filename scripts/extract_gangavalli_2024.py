@@ -17,16 +17,17 @@ from unified_pdf_parser import (
     validate_extraction,
     save_extraction_result
 )
+from electionlens.config import PATHS
 
-FORM20_DIR = Path.home() / "Desktop"
-OUTPUT_BASE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-PC_DATA_PATH = Path("/Users/p0s097d/ElectionLens/public/data/elections/pc/TN/2024.json")
-SCHEMA_PATH = Path("/Users/p0s097d/ElectionLens/public/data/schema.json")
+FORM20_DIR = PATHS.downloads
+OUTPUT_BASE = PATHS.booths / "TN"
+PC_DATA_PATH = PATHS.elections / "pc/TN/2024.json"
+SCHEMA_PATH = PATHS.schema
 
 def main():
     ac_id = "TN-081"
     ac_num = 81
-    pdf_path = Path("/Users/p0s097d/Desktop/AC081.pdf")
+    pdf_path = PATHS.downloads / "AC081.pdf"
     
     print("=" * 70)
     print(f"Extracting Gangavalli (TN-081) 2024 Booth Data")
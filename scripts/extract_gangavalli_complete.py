@@ -5,9 +5,13 @@ import json
 import pdfplumber
 import re
 from pathlib import Path
+import sys
 
-PDF_PATH = Path("/Users/p0s097d/Desktop/AC081.pdf")
-OUTPUT_FILE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN/TN-081/2024.json")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+PDF_PATH = PATHS.downloads / "AC081.pdf"
+OUTPUT_FILE = PATHS.booths / "TN/TN-081/2024.json"
 
 # Column mapping: PDF Column -> Candidate Index
 # Based on official totals row: 72235 77483 403 11108 404 95 77 10612...
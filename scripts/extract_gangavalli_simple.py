@@ -10,10 +10,14 @@ try:
 except ImportError:
     print("❌ pdfplumber not installed. Install with: pip install pdfplumber")
     exit(1)
+import sys
 
-PDF_PATH = Path("/Users/p0s097d/Desktop/AC081.pdf")
-OUTPUT_FILE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN/TN-081/2024.json")
-PC_DATA_PATH = Path("/Users/p0s097d/ElectionLens/public/data/elections/pc/TN/2024.json")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+PDF_PATH = PATHS.downloads / "AC081.pdf"
+OUTPUT_FILE = PATHS.booths / "TN/TN-081/2024.json"
+PC_DATA_PATH = PATHS.elections / "pc/TN/2024.json"
 
 def extract_booth_data_from_pdf(pdf_path):
     """Extract booth data from PDF."""
@@ -10,9 +10,13 @@ try:
 except ImportError:
     print("❌ pdfplumber not installed. Install with: pip install pdfplumber")
     exit(1)
+import sys
 
-PDF_PATH = Path("/Users/p0s097d/Desktop/AC081.pdf")
-OUTPUT_FILE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN/TN-081/2024.json")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+PDF_PATH = PATHS.downloads / "AC081.pdf"
+OUTPUT_FILE = PATHS.booths / "TN/TN-081/2024.json"
 
 def reverse_text(text):
     """Reverse text (Tamil text in PDF is reversed)."""
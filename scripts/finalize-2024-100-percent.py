@@ -16,9 +16,12 @@ from pathlib import Path
 import subprocess
 import sys
 
-BOOTHS_DIR = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-PC_DATA = Path("/Users/p0s097d/ElectionLens/public/data/elections/pc/TN/2024.json")
-SCHEMA = Path("/Users/p0s097d/ElectionLens/public/data/schema.json")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+BOOTHS_DIR = PATHS.booths / "TN"
+PC_DATA = PATHS.elections / "pc/TN/2024.json"
+SCHEMA = PATHS.schema
 
 
 def load_json(path):
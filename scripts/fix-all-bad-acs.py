@@ -8,10 +8,14 @@ import re
 import subprocess
 from pathlib import Path
 from collections import defaultdict
+import sys
 
-FORM20_DIR = Path.home() / "Desktop/TNLA_2021_PDFs"
-ELECTION_DATA = Path("/Users/p0s097d/.cursor/worktrees/ElectionLens/dcy/public/data/elections/ac/TN/2021.json")
-OUTPUT_BASE = Path("/Users/p0s097d/.cursor/worktrees/ElectionLens/dcy/public/data/booths/TN")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS, form20_dir
+
+FORM20_DIR = form20_dir("TN", 2021)
+ELECTION_DATA = PATHS.elections / "ac/TN/2021.json"
+OUTPUT_BASE = PATHS.booths / "TN"
 
 
 def load_official_data():
@@ -15,6 +15,10 @@ except ImportError:
     print("Installing pdfplumber...")
     os.system("pip install pdfplumber")
     import pdfplumber
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import form20_dir
 
 # Problematic ACs to fix
 POOR_ACCURACY = [
@@ -126,7 +130,7 @@ def extract_booth_data(pdf_path, ac_id):
         return None, None
 
 def main():
-    pdf_dir = Path.home() / "Desktop" / "TNLA_2021_PDFs"
+    pdf_dir = form20_dir("TN", 2021)
     output_dir = Path("public/data/booths/TN")
     
     # Load existing election data for validation
@@ -18,10 +18,20 @@ import sys
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS, form20_dir
+from row_tokenizer import digit_runs
+
 # Configuration
-FORM20_DIR = Path(os.path.expanduser("~/Desktop/TNLA_2021_PDFs"))
-OUTPUT_BASE = Path("/Users/p0s097d/.cursor/worktrees/ElectionLens/hgh/public/data/booths/TN")
-ELECTION_DATA = Path("/Users/p0s097d/.cursor/worktrees/ElectionLens/hgh/public/data/elections/ac/TN/2021.json")
+FORM20_DIR = form20_dir("TN", 2021)
+OUTPUT_BASE = PATHS.booths / "TN"
+ELECTION_DATA = PATHS.elections / "ac/TN/2021.json"
+
+# Row start: SlNo BoothNo (e.g. 12, 12A, 12 A(W), 12M)
+ROW_START = re.compile(r'^\s*(\d{1,3})\s+(\d{1,3}[A-Za-z]*(?:\s*[A-Z]?\([AW]\))?(?:\s*[MW])?)\s+')
+SIMPLE_ROW = re.compile(ROW_START.pattern + r'(\d+)')
+DATA_LINE = re.compile(r'^\s*\d{1,3}\s+\d{1,3}')
+PINCODE = re.compile(r'\b6\d{5}\b')
 
 
 def load_official_data() -> dict:
@@ -49,9 +59,9 @@ def detect_format(text: str) -> str:
     data_lines = 0
     
     for line in lines:
-        if re.match(r'^\s*\d{1,3}\s+\d{1,3}', line):
+        if DATA_LINE.match(line):
             data_lines += 1
-            if re.search(r'\b6\d{5}\b', line):
+            if PINCODE.search(line):
                 pincode_lines += 1
     
     if data_lines == 0:
@@ -71,7 +81,7 @@ def parse_simple_format(text: str, ac_id: str) -> List[Dict]:
     
     for line in lines:
         # Match: SlNo BoothNo followed by numbers
-        match = re.match(r'^\s*(\d{1,3})\s+(\d{1,3}[A-Za-z]*(?:\s*[A-Z]?\([AW]\))?(?:\s*[MW])?)\s+(\d+)', line)
+        match = SIMPLE_ROW.match(line)
         if not match:
             continue
         
@@ -82,7 +92,7 @@ def parse_simple_format(text: str, ac_id: str) -> List[Dict]:
             continue
         
         # Extract all numbers after booth number
-        numbers = [int(n) for n in re.findall(r'\d+', line)[2:]]
+        numbers = digit_runs(line)[2:]
         
         if len(numbers) < 5:
             continue
@@ -102,7 +112,7 @@ def parse_address_format(text: str, ac_id: str) -> List[Dict]:
     
     for line in lines:
         # Match line starting with SlNo
-        match = re.match(r'^\s*(\d{1,3})\s+(\d{1,3}[A-Za-z]*(?:\s*[A-Z]?\([AW]\))?(?:\s*[MW])?)\s+', line)
+        match = ROW_START.match(line)
         if not match:
             continue
         
@@ -112,16 +122,9 @@ def parse_address_format(text: str, ac_id: str) -> List[Dict]:
         if sl_no > 500:
             continue
         
-        # Extract all numbers
-        all_numbers = re.findall(r'\d+', line)
-        
-        # Filter out pincodes (6-digit starting with 6)
-        numbers = []
-        for n in all_numbers[2:]:  # Skip SlNo and BoothNo
-            num = int(n)
-            if len(n) == 6 and 600000 <= num <= 699999:
-                continue
-            numbers.append(num)
+        # Extract all numbers, filtering out pincodes (6-digit starting with 6)
+        numbers = [n for n in digit_runs(line)[2:]  # Skip SlNo and BoothNo
+                   if not 600000 <= n <= 699999]
         
         if len(numbers) < 5:
             continue
@@ -13,8 +13,12 @@ import json
 import re
 from pathlib import Path
 from collections import Counter
+import sys
 
-BOOTHS_DIR = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+BOOTHS_DIR = PATHS.booths / "TN"
 
 
 def load_json(path):
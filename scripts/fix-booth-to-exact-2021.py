@@ -15,8 +15,12 @@ Solution:
 
 import json
 from pathlib import Path
+import sys
 
-BASE_DIR = Path("/Users/p0s097d/ElectionLens")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+BASE_DIR = PATHS.root
 BOOTHS_DIR = BASE_DIR / "public/data/booths/TN"
 ELECTION_DATA = BASE_DIR / "public/data/elections/ac/TN/2021.json"
 
@@ -6,8 +6,12 @@ Fix booth totals - ensure each booth's 'total' field equals sum of votes.
 import json
 import os
 from pathlib import Path
+import sys
 
-BOOTH_BASE = Path("/Users/p0s097d/.cursor/worktrees/ElectionLens/snj/public/data/booths/TN")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+BOOTH_BASE = PATHS.booths / "TN"
 
 
 def fix_all_booth_data():
@@ -11,9 +11,13 @@ mapped them using election data order (sorted by votes). This script:
 
 import json
 from pathlib import Path
+import sys
 
-OUTPUT_BASE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-ELECTION_DATA = Path("/Users/p0s097d/ElectionLens/public/data/elections/ac/TN/2021.json")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+OUTPUT_BASE = PATHS.booths / "TN"
+ELECTION_DATA = PATHS.elections / "ac/TN/2021.json"
 
 
 def fix_constituency(ac_id: str, election_data: dict):
@@ -8,9 +8,13 @@ import subprocess
 import re
 import json
 from pathlib import Path
+import sys
 
-FORM20_DIR = Path.home() / "Desktop/GELS_2024_Form20_PDFs"
-OUTPUT_BASE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS, form20_dir
+
+FORM20_DIR = form20_dir("TN", 2024)
+OUTPUT_BASE = PATHS.booths / "TN"
 
 # Known scanned ACs - can't determine count from PDF text
 SCANNED_ACS = set([1, 3, 4, 5, 6, 9, 28, 29, 30, 31, 38, 39, 40, 41, 42, 
@@ -11,6 +11,10 @@ import json
 import subprocess
 import re
 from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import form20_dir
 
 def extract_pdf_candidates(pdf_path):
     """Extract candidate names in PDF column order."""
@@ -43,7 +47,7 @@ def normalize_name(name):
     return name
 
 def main():
-    pdf_path = Path.home() / "Desktop" / "TNLA_2021_PDFs" / "AC094.pdf"
+    pdf_path = form20_dir("TN", 2021) / "AC094.pdf"
     json_path = Path("public/data/booths/TN/TN-094/2021.json")
     
     # Get PDF candidate order
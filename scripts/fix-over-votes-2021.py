@@ -5,9 +5,13 @@ Fix ACs with too many votes (>110%) by removing extra columns.
 
 import json
 from pathlib import Path
+import sys
 
-OUTPUT_BASE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-AC_DATA = Path("/Users/p0s097d/ElectionLens/public/data/elections/ac/TN/2021.json")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+OUTPUT_BASE = PATHS.booths / "TN"
+AC_DATA = PATHS.elections / "ac/TN/2021.json"
 
 
 def load_data():
@@ -6,8 +6,12 @@ import re
 import subprocess
 from pathlib import Path
 from collections import defaultdict
+import sys
 
-FORM20_DIR = Path.home() / "Desktop/TNLA_2021_PDFs"
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import form20_dir
+
+FORM20_DIR = form20_dir("TN", 2021)
 DATA_DIR = Path("public/data")
 
 def load_official(ac_id):
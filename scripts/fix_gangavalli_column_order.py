@@ -4,9 +4,13 @@
 import json
 import pdfplumber
 from pathlib import Path
+import sys
 
-PDF_PATH = Path("/Users/p0s097d/Desktop/AC081.pdf")
-DATA_FILE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN/TN-081/2024.json")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+PDF_PATH = PATHS.downloads / "AC081.pdf"
+DATA_FILE = PATHS.booths / "TN/TN-081/2024.json"
 
 def reverse_text(text):
     """Reverse text (Tamil text in PDF is reversed)."""
@@ -12,9 +12,13 @@ import json
 import os
 from pathlib import Path
 from copy import deepcopy
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
 
 # Paths
-BASE_DIR = Path("/Users/p0s097d/ElectionLens")
+BASE_DIR = PATHS.root
 BOOTHS_DIR = BASE_DIR / "public/data/booths/TN"
 ELECTION_DATA = BASE_DIR / "public/data/elections/ac/TN/2021.json"
 
@@ -5,8 +5,12 @@ import json
 import csv
 import io
 from pathlib import Path
+import sys
 
-OUTPUT_BASE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+OUTPUT_BASE = PATHS.booths / "TN"
 
 csv_data = """Station No,Station Name,Electors,C1: Kamalakannan,C2: Palaniyammal,C3: Balakrishnan,C4: Rajamanickam,C5: Malaiyarasan,C6: Venkatraman,C7: Subramanian,C8: Mayilamparai,C9: Kumaraguru (AIADMK),C10: Kumaraguru (PMK),C11: Iniyan,C12: Jagadesan,C13: Jeevanraj,C14: Devadass,C15: Jayabal,C16: Prabu,C17: Arul,C18: Ramasamy,C19: Mari,C20: R.K,C21: M,C22: C,C23: S,NOTA,Total Valid Votes,Tendered Votes
 1,Govt Higher Sec School Siruvachur Facing West North Wing,958,2,29,26,1,385,3,0,0,291,0,0,0,0,0,15,0,0,0,0,0,1,17,0,1,770,0
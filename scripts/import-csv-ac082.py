@@ -5,8 +5,12 @@ import json
 import csv
 import io
 from pathlib import Path
+import sys
 
-OUTPUT_BASE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+OUTPUT_BASE = PATHS.booths / "TN"
 
 csv_data = """Station No,Station Name,Electors,C1,C2,C3,C4,C5,C6,C7,C8,C9,C10,C11,C12,C13,C14,C15,C16,C17,C18,C19,C20,C21,C22,C23,NOTA,Total Valid,Tendered
 1,Govt Tribal Residence Middle School Thalvallam North Wing,880,2,29,26,682,12,2,1,2,5,2,0,3,2,2,6,4,251,692,329,0,1,10,1,48,682,0
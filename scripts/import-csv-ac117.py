@@ -6,11 +6,15 @@ import csv
 import io
 import re
 from pathlib import Path
+import sys
 
-OUTPUT_BASE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+OUTPUT_BASE = PATHS.booths / "TN"
 
 # Read CSV from stdin or file
-csv_file = Path("/Users/p0s097d/ElectionLens/scripts/ac117_data.csv")
+csv_file = PATHS.root / "scripts/ac117_data.csv"
 
 def main():
     ac_id = "TN-117"
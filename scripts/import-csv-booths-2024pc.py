@@ -15,17 +15,19 @@ Usage:
 The CSV file should be in ~/Desktop/TN_Booth_CSVs_2024/ folder.
 """
 
-import csv
 import json
 import os
-import re
 import sys
 from pathlib import Path
 
-OUTPUT_BASE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-PC_DATA = Path("/Users/p0s097d/ElectionLens/public/data/elections/pc/TN/2024.json")
-SCHEMA = Path("/Users/p0s097d/ElectionLens/public/data/schema.json")
-CSV_DIR = Path(os.path.expanduser("~/Desktop/TN_Booth_CSVs_2024"))
+sys.path.insert(0, str(Path(__file__).parent))
+from ingest import booth_results, iter_rows, positional_booth_layout, raw_booth_id, read_header
+from electionlens.config import PATHS
+
+OUTPUT_BASE = PATHS.booths / "TN"
+PC_DATA = PATHS.elections / "pc/TN/2024.json"
+SCHEMA = PATHS.schema
+CSV_DIR = PATHS.downloads / "TN_Booth_CSVs_2024"
 
 
 def load_pc_data():
@@ -71,46 +73,14 @@ def import_csv(csv_path: Path, ac_id: str, pc_data: dict, schema: dict):
     print(f"PC: {pc_id} ({pc_name})")
     print(f"Candidates: {num_candidates}")
     
-    results = {}
-    
-    with open(csv_path, 'r') as f:
-        reader = csv.reader(f)
-        header = next(reader, None)
-        
-        for row in reader:
-            if len(row) < num_candidates + 1:  # BoothNo + votes
-                continue
-            
-            booth_no = row[0].strip()
-            if not booth_no or not booth_no[0].isdigit():
-                continue
-            
-            # Clean booth number
-            booth_no = re.sub(r'\s+', '', booth_no)
-            
-            # Extract votes
-            try:
-                votes = []
-                for i in range(num_candidates):
-                    val = row[i+1].strip().replace(',', '')
-                    votes.append(int(val) if val else 0)
-            except (ValueError, IndexError) as e:
-                print(f"Warning: Skipping booth {booth_no}: {e}")
-                continue
-            
-            # Get totals if available
-            try:
-                total_idx = num_candidates + 1
-                total = int(row[total_idx].strip().replace(',', '')) if len(row) > total_idx else sum(votes)
-            except (ValueError, IndexError):
-                total = sum(votes)
-            
-            booth_id = f"{ac_id}-{booth_no}"
-            results[booth_id] = {
-                'votes': votes,
-                'total': total,
-                'rejected': 0
-            }
+    # Stream rows: BoothNo, one column per PC candidate, TotalValid, ...
+    rows = iter_rows(csv_path)
+    header = read_header(rows)
+    profile = positional_booth_layout(header, num_candidates)
+    skipped = []
+    results = booth_results(rows, profile, ac_id, booth_id=raw_booth_id, skipped=skipped)
+    for bid, cell in skipped:
+        print(f"Warning: Skipping booth {bid}: non-numeric vote {cell!r}")
     
     if not results:
         print(f"Error: No valid booth data found in {csv_path}")
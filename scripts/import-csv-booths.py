@@ -22,9 +22,12 @@ import re
 import sys
 from pathlib import Path
 
-OUTPUT_BASE = Path("/Users/p0s097d/.cursor/worktrees/ElectionLens/lsb/public/data/booths/TN")
-ELECTION_DATA = Path("/Users/p0s097d/.cursor/worktrees/ElectionLens/lsb/public/data/elections/ac/TN/2021.json")
-CSV_DIR = Path(os.path.expanduser("~/Desktop/TN_Booth_CSVs"))
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+OUTPUT_BASE = PATHS.booths / "TN"
+ELECTION_DATA = PATHS.elections / "ac/TN/2021.json"
+CSV_DIR = PATHS.downloads / "TN_Booth_CSVs"
 
 
 def load_official_data():
@@ -9,40 +9,20 @@ CSV format should have at minimum:
 - First column: Booth number (or "Station No", "Booth", etc.)
 - Last numeric columns: Vote totals
 
-The script will auto-detect column layouts.
+The script will auto-detect column layouts (cached per header, see ingest.py).
+Use `ingest.py booth <dir>` to import a whole directory of CSVs in parallel.
 """
 
-import json
 import csv
+import json
 import sys
-import re
 from pathlib import Path
 
-OUTPUT_BASE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-
-
-def parse_booth_no(val):
-    """Extract booth number from various formats."""
-    val = str(val).strip()
-    # Handle formats like "1", "001", "1A", etc.
-    match = re.match(r'^0*(\d+)', val)
-    if match:
-        return int(match.group(1))
-    return None
+sys.path.insert(0, str(Path(__file__).parent))
+from ingest import ProfileCache, booth_results, read_header
+from electionlens.config import PATHS
 
-
-def clean_numeric(val):
-    """Clean and convert a value to integer."""
-    val = str(val).strip()
-    # Remove citation markers like [cite: 57]
-    val = re.sub(r'\s*\[cite.*?\]', '', val)
-    # Remove commas
-    val = val.replace(',', '')
-    # Extract number
-    match = re.match(r'^(\d+)', val)
-    if match:
-        return int(match.group(1))
-    return 0
+OUTPUT_BASE = PATHS.booths / "TN"
 
 
 def import_csv(ac_code, csv_lines):
@@ -67,82 +47,14 @@ def import_csv(ac_code, csv_lines):
     
     existing_count = len(data.get('results', {}))
     
-    # Parse CSV
-    reader = csv.DictReader(csv_lines)
-    headers = reader.fieldnames
-    
-    # Find booth number column
-    booth_col = None
-    for h in headers:
-        h_lower = h.lower()
-        if 'station' in h_lower or 'booth' in h_lower or h_lower in ['no', 'sno', 's.no', '#']:
-            booth_col = h
-            break
-    
-    if not booth_col:
-        # Assume first column is booth number
-        booth_col = headers[0]
+    # Column layout is inferred once per header and cached (see ingest.py)
+    rows = csv.reader(csv_lines)
+    header = read_header(rows)
+    cache = ProfileCache()
+    profile = cache.resolve('booth', header, [])
+    cache.save()
     
-    # Find total column
-    total_col = None
-    for h in headers:
-        h_lower = h.lower()
-        if 'total valid' in h_lower or h_lower == 'total' or 'valid votes' in h_lower:
-            total_col = h
-            break
-    
-    # Find NOTA column
-    nota_col = None
-    for h in headers:
-        if 'nota' in h.lower():
-            nota_col = h
-            break
-    
-    # Find candidate vote columns (C1, C2, ... or columns between booth and total)
-    candidate_cols = []
-    for h in headers:
-        if re.match(r'^C\d+', h) or re.match(r'^Candidate', h, re.I):
-            candidate_cols.append(h)
-    
-    # If no explicit candidate columns, use columns between booth and total
-    if not candidate_cols:
-        start_idx = headers.index(booth_col) + 1
-        end_idx = headers.index(total_col) if total_col else len(headers)
-        # Skip name/electors columns
-        for h in headers[start_idx:end_idx]:
-            h_lower = h.lower()
-            if 'name' in h_lower or 'electors' in h_lower or 'address' in h_lower:
-                continue
-            candidate_cols.append(h)
-    
-    new_results = {}
-    for row in reader:
-        booth_no = parse_booth_no(row.get(booth_col, ''))
-        if not booth_no:
-            continue
-        
-        booth_id = f"{ac_id}-{booth_no:03d}"
-        
-        # Get candidate votes
-        votes = []
-        for col in candidate_cols:
-            votes.append(clean_numeric(row.get(col, 0)))
-        
-        # Add NOTA if available
-        if nota_col:
-            votes.append(clean_numeric(row.get(nota_col, 0)))
-        
-        # Get total
-        if total_col:
-            total = clean_numeric(row.get(total_col, 0))
-        else:
-            total = sum(votes)
-        
-        new_results[booth_id] = {
-            'votes': votes,
-            'total': total,
-            'rejected': 0
-        }
+    new_results = booth_results(rows, profile, ac_id)
     
     # Merge with existing
     added = 0
@@ -162,7 +74,7 @@ def import_csv(ac_code, csv_lines):
     
     new_count = len(data['results'])
     print(f"{ac_id}: {existing_count} -> {new_count} booths (+{added} new, {updated} updated)")
-    print(f"CSV had {len(new_results)} rows, {len(candidate_cols)} candidate columns detected")
+    print(f"CSV had {len(new_results)} rows, {len(profile.candidate_cols)} candidate columns detected")
 
 
 def main():
@@ -174,14 +86,12 @@ def main():
     ac_code = sys.argv[1]
     
     if len(sys.argv) > 2:
-        # Read from file
-        with open(sys.argv[2]) as f:
-            csv_lines = f.readlines()
+        # Stream from file
+        with open(sys.argv[2], newline='') as f:
+            import_csv(ac_code, f)
     else:
-        # Read from stdin
-        csv_lines = sys.stdin.readlines()
-    
-    import_csv(ac_code, csv_lines)
+        # Stream from stdin
+        import_csv(ac_code, sys.stdin)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,634 @@
+#!/usr/bin/env python3
+"""
+Election Data Ingestion Engine
+==============================
+Streaming, parallel import of XLSX/CSV election files into the standard
+JSON layout.
+
+Three parts:
+  1. Row streaming  - XLSX via openpyxl read-only iteration, CSV via
+                      csv.reader, consumed in fixed-size chunks. A file is
+                      never materialized as a DataFrame.
+  2. Layout profiles - the column mapping is inferred once per source family
+                      (same header -> same profile) and cached in
+                      .cache/ingest-profiles.json, instead of being re-sniffed
+                      for every file.
+  3. Directory mode - every file of a directory is converted in a process
+                      pool, one file per task; workers write their own
+                      output and return only a short summary.
+
+Kinds:
+    ac     - AC results, one row per candidate (convert-xlsx-elections.py)
+             -> public/data/elections/ac/{STATE}/{year}.json + index.json
+    booth  - booth results, one row per booth (import-csv.py)
+             -> public/data/booths/{STATE}/{AC_ID}/{year}.json (merged)
+
+Usage:
+    # AC results: one workbook, or a directory of "{State}_{year}.xlsx"
+    python scripts/ingest.py ac ~/Desktop/Rajasthan_2023.xlsx --state RJ --year 2023
+    python scripts/ingest.py ac ~/Desktop/state-xlsx/ --workers 8
+
+    # Booth CSVs: a directory of AC###.csv files
+    python scripts/ingest.py booth ~/Desktop/TN_Booth_CSVs_2024/ --state TN --year 2024
+
+    --refresh-profiles ignores the cached layout profiles.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from itertools import islice
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+from electionlens.lazy import available, lazy_import
+
+# openpyxl loads on first use: CSV-only runs never import it
+openpyxl = lazy_import('openpyxl')
+HAS_OPENPYXL = available('openpyxl')
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+BASE_DIR = PATHS.root
+ELECTIONS_AC_DIR = PATHS.elections / "ac"
+BOOTHS_DIR = PATHS.booths
+PROFILE_CACHE = PATHS.cache / "ingest-profiles.json"
+
+CHUNK_ROWS = 5000        # Rows handed to a builder at a time
+SAMPLE_ROWS = 50         # Rows used to infer numeric columns
+SOURCE_SUFFIXES = ('.xlsx', '.xlsm', '.csv')
+
+
+# ============================================================================
+# Row Streaming
+# ============================================================================
+
+def iter_xlsx_rows(path: Path, sheet: Optional[str] = None) -> Iterator[tuple]:
+    """Stream rows of a worksheet as value tuples (read-only, constant memory)."""
+    if not HAS_OPENPYXL:
+        raise RuntimeError("openpyxl is required for XLSX input (pip install openpyxl)")
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.active
+        yield from ws.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def iter_csv_rows(path) -> Iterator[list]:
+    """Stream rows of a CSV file ("-" reads stdin)."""
+    if str(path) == '-':
+        yield from csv.reader(sys.stdin)
+        return
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        yield from csv.reader(f)
+
+
+def iter_rows(path) -> Iterator:
+    """Stream rows from an XLSX or CSV source."""
+    if str(path).lower().endswith(('.xlsx', '.xlsm')):
+        return iter_xlsx_rows(Path(path))
+    return iter_csv_rows(path)
+
+
+def chunked(rows: Iterable, size: int = CHUNK_ROWS) -> Iterator[list]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_header(rows: Iterator) -> list[str]:
+    """Consume rows up to and including the first non-empty one (the header)."""
+    for row in rows:
+        if row and any(cell not in (None, '') for cell in row):
+            return [str(cell).strip() if cell is not None else '' for cell in row]
+    return []
+
+
+# ============================================================================
+# Value Cleaning
+# ============================================================================
+
+def cell_text(val) -> str:
+    return '' if val is None else str(val).strip()
+
+
+def clean_numeric(val) -> int:
+    """Integer from a cell: 1,234 / "1234 [cite: 57]" / 1234.0 -> 1234; else 0."""
+    if val is None:
+        return 0
+    if isinstance(val, (int, float)):
+        return int(val) if val == val else 0
+    val = re.sub(r'\s*\[cite.*?\]', '', str(val).strip()).replace(',', '')
+    match = re.match(r'^(\d+)', val)
+    return int(match.group(1)) if match else 0
+
+
+def vote_cell(val) -> Optional[int]:
+    """Vote count from a cell as clean_numeric reads it, but None for non-numbers like "12a"."""
+    if val is None or isinstance(val, (int, float)):
+        return clean_numeric(val)
+    val = re.sub(r'\s*\[cite.*?\]', '', str(val).strip()).replace(',', '')
+    if not val:
+        return 0
+    return int(val.split('.')[0]) if re.fullmatch(r'\d+(\.0+)?', val) else None
+
+
+def is_numeric(val) -> bool:
+    if isinstance(val, (int, float)):
+        return True
+    return bool(re.fullmatch(r'\d[\d,]*(\.\d+)?', cell_text(val)))
+
+
+def parse_booth_no(val) -> Optional[int]:
+    """Booth number from "1", "001", "1A" -> 1."""
+    match = re.match(r'^0*(\d+)', cell_text(val))
+    return int(match.group(1)) if match else None
+
+
+def padded_booth_id(ac_id: str, val) -> Optional[str]:
+    """"TN-028-007" style id; suffixes such as "7A" are dropped."""
+    booth_no = parse_booth_no(val)
+    return f"{ac_id}-{booth_no:03d}" if booth_no else None
+
+
+def raw_booth_id(ac_id: str, val) -> Optional[str]:
+    """"TN-003-3M" style id keeping the booth label as written."""
+    booth = re.sub(r'\s+', '', cell_text(val))
+    return f"{ac_id}-{booth}" if booth and booth[0].isdigit() else None
+
+
+# ============================================================================
+# Layout Profiles
+# ============================================================================
+
+@dataclass
+class LayoutProfile:
+    """Column mapping for one source family (files sharing a header)."""
+    kind: str                                   # 'ac' | 'booth'
+    signature: str
+    header: list[str]
+    columns: dict[str, int] = field(default_factory=dict)
+    candidate_cols: list[int] = field(default_factory=list)
+
+    def col(self, name: str) -> Optional[int]:
+        return self.columns.get(name)
+
+
+def header_signature(kind: str, header: list[str]) -> str:
+    norm = '|'.join(h.lower() for h in header)
+    return hashlib.sha1(f"{kind}:{norm}".encode()).hexdigest()[:16]
+
+
+def infer_ac_layout(header: list[str], sample: list) -> LayoutProfile:
+    """Map constituency/candidate/party/votes/electors/valid-votes columns."""
+    cols = {}
+    for i, col in enumerate(header):
+        col_lower = col.lower()
+        if 'constituency' in col_lower and 'name' in col_lower:
+            cols['constituency'] = i
+        elif 'ac' in col_lower and 'name' in col_lower:
+            cols['constituency'] = i
+        elif col_lower in ['constituency', 'ac name', 'ac_name']:
+            cols['constituency'] = i
+        elif 'candidate' in col_lower:
+            cols['candidate'] = i
+        elif 'party' in col_lower:
+            cols['party'] = i
+        elif 'votes' in col_lower and 'total' not in col_lower and 'valid' not in col_lower:
+            cols['votes'] = i
+        elif col_lower in ['votes', 'evm votes', 'total votes']:
+            cols['votes'] = i
+        elif 'electors' in col_lower:
+            cols['electors'] = i
+        elif 'valid' in col_lower and 'votes' in col_lower:
+            cols['valid_votes'] = i
+
+    if 'constituency' not in cols:
+        cols['constituency'] = 0
+    if 'candidate' not in cols:
+        for i, col in enumerate(header):
+            if 'name' in col.lower() and 'constituency' not in col.lower():
+                cols['candidate'] = i
+                break
+    if 'votes' not in cols:
+        # First column whose sampled values are all numeric
+        for i in range(len(header)):
+            values = [row[i] for row in sample if i < len(row) and row[i] not in (None, '')]
+            if values and all(is_numeric(v) for v in values):
+                cols['votes'] = i
+                break
+
+    return LayoutProfile('ac', header_signature('ac', header), header, cols)
+
+
+def infer_booth_layout(header: list[str]) -> LayoutProfile:
+    """Map booth number, candidate vote, NOTA and total columns."""
+    lower = [h.lower() for h in header]
+    cols = {}
+
+    cols['booth'] = next((i for i, h in enumerate(lower)
+                          if 'station' in h or 'booth' in h or h in ['no', 'sno', 's.no', '#']), 0)
+    total = next((i for i, h in enumerate(lower)
+                  if 'total valid' in h or h == 'total' or 'valid votes' in h), None)
+    if total is not None:
+        cols['total'] = total
+    nota = next((i for i, h in enumerate(lower) if 'nota' in h), None)
+    if nota is not None:
+        cols['nota'] = nota
+
+    candidate_cols = [i for i, h in enumerate(header)
+                      if re.match(r'^C\d+', h) or re.match(r'^Candidate', h, re.I)]
+    if not candidate_cols:
+        end = total if total is not None else len(header)
+        candidate_cols = [i for i in range(cols['booth'] + 1, end)
+                          if i != nota and not any(s in lower[i] for s in ('name', 'electors', 'address'))]
+
+    return LayoutProfile('booth', header_signature('booth', header), header, cols, candidate_cols)
+
+
+def positional_booth_layout(header: list[str], num_candidates: int) -> LayoutProfile:
+    """BoothNo, N candidate columns, TotalValid, ... (manually converted Form 20 CSVs)."""
+    return LayoutProfile('booth', header_signature('booth', header) + f"-{num_candidates}", header,
+                         {'booth': 0, 'total': num_candidates + 1},
+                         list(range(1, num_candidates + 1)))
+
+
+class ProfileCache:
+    """Layout profiles keyed by header signature, persisted as JSON."""
+
+    def __init__(self, path: Path = PROFILE_CACHE, refresh: bool = False):
+        self.path = path
+        self.profiles = {}
+        self.dirty = False
+        if path.exists() and not refresh:
+            with open(path) as f:
+                self.profiles = {k: LayoutProfile(**v) for k, v in json.load(f).items()}
+
+    def resolve(self, kind: str, header: list[str], sample: list) -> LayoutProfile:
+        signature = header_signature(kind, header)
+        profile = self.profiles.get(signature)
+        if profile is None:
+            profile = infer_ac_layout(header, sample) if kind == 'ac' else infer_booth_layout(header)
+            self.profiles[signature] = profile
+            self.dirty = True
+        return profile
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({k: asdict(v) for k, v in self.profiles.items()}, f, indent=2)
+        self.dirty = False
+
+
+def probe(path: Path, kind: str, cache: ProfileCache) -> LayoutProfile:
+    """Read only the header and a small sample of a file to resolve its profile."""
+    rows = iter_rows(path)
+    header = read_header(rows)
+    sample = list(islice(rows, SAMPLE_ROWS))
+    return cache.resolve(kind, header, sample)
+
+
+# ============================================================================
+# Builders
+# ============================================================================
+
+class AcResultsBuilder:
+    """Accumulates candidate rows into the elections/ac/{STATE}/{year}.json layout."""
+
+    def __init__(self, profile: LayoutProfile, year: int):
+        self.profile = profile
+        self.year = year
+        self.results = {}
+
+    def add_rows(self, rows: list):
+        p = self.profile
+        c_const, c_cand, c_party = p.col('constituency'), p.col('candidate'), p.col('party')
+        c_votes, c_electors = p.col('votes'), p.col('electors')
+
+        def get(row, i):
+            return row[i] if i is not None and i < len(row) else None
+
+        for row in rows:
+            const_name = cell_text(get(row, c_const))
+            if not const_name:
+                continue
+            const_key = const_name.upper()
+            entry = self.results.get(const_key)
+            if entry is None:
+                entry = self.results[const_key] = {
+                    'constituencyName': const_key,
+                    'constituencyNameOriginal': const_name,
+                    'year': self.year,
+                    'electors': clean_numeric(get(row, c_electors)),
+                    'validVotes': 0,
+                    'turnout': 0,
+                    'candidates': [],
+                }
+
+            candidate_name = cell_text(get(row, c_cand))
+            if not candidate_name:
+                continue
+            party = cell_text(get(row, c_party))
+            votes = clean_numeric(get(row, c_votes))
+            entry['candidates'].append({
+                'name': candidate_name,
+                'party': party or 'IND',
+                'votes': votes,
+                'voteShare': 0,
+                'position': 0,
+            })
+            entry['validVotes'] += votes
+
+    def finish(self) -> dict:
+        for const_data in self.results.values():
+            candidates = const_data['candidates']
+            candidates.sort(key=lambda x: x['votes'], reverse=True)
+
+            total_votes = const_data['validVotes']
+            for i, c in enumerate(candidates):
+                c['position'] = i + 1
+                c['voteShare'] = round((c['votes'] / total_votes * 100), 2) if total_votes > 0 else 0
+            if len(candidates) >= 2:
+                candidates[0]['margin'] = candidates[0]['votes'] - candidates[1]['votes']
+
+            const_data['totalCandidates'] = len(candidates)
+            if const_data['electors'] > 0:
+                const_data['turnout'] = round((total_votes / const_data['electors'] * 100), 2)
+        return self.results
+
+
+def booth_results(rows: Iterable, profile: LayoutProfile, ac_id: str,
+                  booth_id: Callable[[str, object], Optional[str]] = padded_booth_id,
+                  skipped: Optional[list] = None) -> dict:
+    """Stream booth rows (header already consumed) into {booth_id: result}.
+
+    Rows with a non-numeric vote cell are left out rather than read as 0
+    votes; (booth_id, cell) for each is appended to skipped when given.
+    """
+    c_booth, c_total, c_nota = profile.col('booth'), profile.col('total'), profile.col('nota')
+    cand_cols = profile.candidate_cols
+    min_width = max(cand_cols) + 1 if cand_cols else c_booth + 1
+
+    results = {}
+    for chunk in chunked(rows):
+        for row in chunk:
+            if len(row) < min_width:
+                continue
+            bid = booth_id(ac_id, row[c_booth])
+            if not bid:
+                continue
+            cells = [row[i] for i in cand_cols]
+            if c_nota is not None and c_nota < len(row):
+                cells.append(row[c_nota])
+            votes = [vote_cell(v) for v in cells]
+            if None in votes:
+                if skipped is not None:
+                    skipped.append((bid, cells[votes.index(None)]))
+                continue
+            total = vote_cell(row[c_total]) if c_total is not None and c_total < len(row) else None
+            if total is None:
+                total = sum(votes)
+            results[bid] = {'votes': votes, 'total': total, 'rejected': 0}
+    return results
+
+
+# ============================================================================
+# File Jobs
+# ============================================================================
+
+def write_json(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def update_ac_index(output_dir: Path):
+    """Refresh years/availableYears in elections/ac/{STATE}/index.json."""
+    index_path = output_dir / 'index.json'
+    index_data = {}
+    if index_path.exists():
+        with open(index_path) as f:
+            index_data = json.load(f)
+    years = sorted(int(p.stem) for p in output_dir.glob('*.json') if p.stem.isdigit())
+    index_data['years'] = years
+    index_data['availableYears'] = years
+    index_data['lastUpdated'] = date.today().isoformat()
+    write_json(index_path, index_data)
+
+
+def ingest_ac_file(path: Path, year: int, output_dir: Path, profile: LayoutProfile) -> dict:
+    """Convert one AC results workbook/CSV into {output_dir}/{year}.json."""
+    start = time.time()
+    rows = iter_rows(path)
+    read_header(rows)
+    builder = AcResultsBuilder(profile, year)
+    num_rows = 0
+    for chunk in chunked(rows):
+        builder.add_rows(chunk)
+        num_rows += len(chunk)
+    results = builder.finish()
+
+    output_path = output_dir / f"{year}.json"
+    write_json(output_path, results)
+    return {'source': str(path), 'output': str(output_path), 'rows': num_rows,
+            'units': len(results), 'seconds': round(time.time() - start, 2)}
+
+
+def ingest_booth_file(path: Path, ac_id: str, year: int, profile: LayoutProfile,
+                      output_base: Path = BOOTHS_DIR,
+                      booth_id: Callable[[str, object], Optional[str]] = padded_booth_id) -> dict:
+    """Merge one booth CSV into public/data/booths/{STATE}/{AC_ID}/{year}.json."""
+    start = time.time()
+    state = ac_id.split('-')[0]
+    results_file = output_base / state / ac_id / f"{year}.json"
+    if results_file.exists():
+        with open(results_file) as f:
+            data = json.load(f)
+    else:
+        data = {'results': {}, 'year': year}
+    data.setdefault('results', {})
+    existing = len(data['results'])
+
+    rows = iter_rows(path)
+    read_header(rows)
+    skipped = []
+    new_results = booth_results(rows, profile, ac_id, booth_id, skipped)
+
+    added = sum(1 for b in new_results if b not in data['results'])
+    data['results'].update(new_results)
+    data['totalBooths'] = len(data['results'])
+    write_json(results_file, data)
+
+    return {'source': str(path), 'output': str(results_file), 'rows': len(new_results),
+            'units': len(data['results']), 'existing': existing, 'added': added,
+            'updated': len(new_results) - added, 'skipped': len(skipped),
+            'candidates': len(profile.candidate_cols),
+            'seconds': round(time.time() - start, 2)}
+
+
+def _run_job(job: tuple) -> dict:
+    """Pool entry point: (kind, kwargs) -> summary, errors reported not raised."""
+    kind, kwargs = job
+    try:
+        if kind == 'ac':
+            return ingest_ac_file(**kwargs)
+        return ingest_booth_file(**kwargs)
+    except Exception as e:
+        return {'source': str(kwargs.get('path')), 'error': str(e)}
+
+
+# ============================================================================
+# Directory Mode
+# ============================================================================
+
+STATE_YEAR_RE = re.compile(r'^(?P<state>.+?)[_\s-]+(?P<year>(19|20)\d{2})$')
+AC_FILE_RE = re.compile(r'(?:^|AC|[A-Z]{2}-)0*(?P<num>\d{1,3})(?!\d)', re.I)
+
+
+def state_code(name: str) -> Optional[str]:
+    """State code from a name or code ("Rajasthan", "rajasthan", "RJ" -> "RJ")."""
+    if re.fullmatch(r'[A-Z]{2}', name):
+        return name
+    slug = re.sub(r'[\s_]+', '-', name.strip().lower())
+    for index in ELECTIONS_AC_DIR.glob('*/index.json'):
+        with open(index) as f:
+            info = json.load(f)
+        if slug in (info.get('stateSlug'), re.sub(r'\s+', '-', info.get('state', '').lower())):
+            return info.get('stateCode') or index.parent.name
+    return None
+
+
+def source_files(src: Path) -> list[Path]:
+    if src.is_file():
+        return [src]
+    return sorted(p for p in src.iterdir()
+                  if p.suffix.lower() in SOURCE_SUFFIXES and not p.name.startswith(('~', '.')))
+
+
+def plan_ac_jobs(files: list[Path], cache: ProfileCache, state: Optional[str],
+                 year: Optional[int]) -> tuple[list, list]:
+    jobs, skipped = [], []
+    for path in files:
+        match = STATE_YEAR_RE.match(path.stem)
+        file_state = state or (state_code(match.group('state')) if match else None)
+        file_year = year or (int(match.group('year')) if match else None)
+        if not file_state or not file_year:
+            skipped.append(f"{path.name}: cannot tell state/year (use --state/--year)")
+            continue
+        profile = probe(path, 'ac', cache)
+        jobs.append(('ac', {'path': path, 'year': file_year,
+                            'output_dir': ELECTIONS_AC_DIR / file_state, 'profile': profile}))
+    return jobs, skipped
+
+
+def plan_booth_jobs(files: list[Path], cache: ProfileCache, state: str,
+                    year: int) -> tuple[list, list]:
+    jobs, skipped = [], []
+    for path in files:
+        match = AC_FILE_RE.search(path.stem)
+        if not match:
+            skipped.append(f"{path.name}: no AC number in file name")
+            continue
+        ac_id = f"{state}-{int(match.group('num')):03d}"
+        profile = probe(path, 'booth', cache)
+        jobs.append(('booth', {'path': path, 'ac_id': ac_id, 'year': year, 'profile': profile}))
+    return jobs, skipped
+
+
+def run_jobs(jobs: list, workers: int) -> Iterator[dict]:
+    """Run file jobs in a process pool (inline for a single job/worker)."""
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield _run_job(job)
+        return
+    with Pool(min(workers, len(jobs))) as pool:
+        yield from pool.imap_unordered(_run_job, jobs)
+
+
+def arg_value(args: list[str], flag: str, default=None):
+    return args[args.index(flag) + 1] if flag in args and args.index(flag) + 1 < len(args) else default
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 2 or args[0] not in ('ac', 'booth'):
+        print(__doc__)
+        return
+
+    kind, src = args[0], Path(os.path.expanduser(args[1]))
+    state = arg_value(args, '--state')
+    year = arg_value(args, '--year')
+    year = int(year) if year else None
+    workers = int(arg_value(args, '--workers', cpu_count()))
+    cache = ProfileCache(refresh='--refresh-profiles' in args)
+
+    if not src.exists():
+        print(f"❌ Not found: {src}")
+        return
+    if kind == 'booth' and (not state or not year):
+        print("❌ booth ingestion needs --state and --year")
+        return
+
+    files = source_files(src)
+    start = time.time()
+    known = len(cache.profiles)
+    if kind == 'ac':
+        jobs, skipped = plan_ac_jobs(files, cache, state, year)
+    else:
+        jobs, skipped = plan_booth_jobs(files, cache, state, year)
+    cache.save()
+
+    print("=" * 70)
+    print(f"Ingesting {len(jobs)} {kind} file(s) with {min(workers, max(len(jobs), 1))} worker(s)")
+    print(f"Layout profiles: {len({j[1]['profile'].signature for j in jobs})} used, "
+          f"{len(cache.profiles) - known} newly inferred")
+    print("=" * 70)
+    for msg in skipped:
+        print(f"⚠️  {msg}")
+
+    touched_dirs = set()
+    failures = 0
+    total_rows = 0
+    for summary in run_jobs(jobs, workers):
+        if 'error' in summary:
+            failures += 1
+            print(f"❌ {Path(summary['source']).name}: {summary['error']}")
+            continue
+        total_rows += summary['rows']
+        touched_dirs.add(Path(summary['output']).parent)
+        print(f"✅ {Path(summary['source']).name}: {summary['rows']:,} rows -> "
+              f"{summary['units']} {'constituencies' if kind == 'ac' else 'booths'} "
+              f"({summary['seconds']}s)")
+        if summary.get('skipped'):
+            print(f"   ⚠️  {summary['skipped']} booth row(s) skipped: non-numeric vote cells")
+
+    if kind == 'ac':
+        for output_dir in sorted(touched_dirs):
+            update_ac_index(output_dir)
+
+    elapsed = time.time() - start
+    print(f"\n{len(jobs) - failures} file(s), {total_rows:,} rows in {elapsed:.1f}s"
+          + (f" ({total_rows / elapsed:,.0f} rows/s)" if elapsed > 0 else ""))
+    if failures:
+        print(f"❌ {failures} file(s) failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Memory Budget for Extraction Workers
+====================================
+Peak-memory accounting inside workers and a memory-aware admission
+scheduler for the pool.
+
+Worker side:
+  rss_bytes() / PeakTracker measure resident memory per pipeline stage.
+  spans.py uses them so that every span carries 'rss_mb' (RSS at the end
+  of the stage) and 'peak_mb' (peak RSS during the stage). On Linux the
+  kernel high-water mark is reset at every stage start
+  (/proc/self/clear_refs), elsewhere the process-lifetime maximum
+  (getrusage) is used, which is exact only for stages that set a new
+  maximum. With tracemalloc enabled, spans also carry 'alloc_mb' (peak
+  Python/NumPy allocations during the stage).
+
+Scheduler side:
+  MemoryBudget admits a task only when the sum of the projected peaks of
+  the running tasks plus the new one fits the budget, and lowers the
+  number of concurrent tasks when the measured RSS of the worker tree
+  (workers plus their tesseract/pdftoppm children) approaches it.
+  task_pool.ResilientPool admits and dispatches the parser's ACs with it.
+
+Projected peaks come from the history of earlier runs (the 'ac' spans of
+a span directory) and otherwise from a page-count model.
+
+Usage:
+    # Budget-limited run with memory-annotated spans
+    python scripts/unified-pdf-parser.py 1-234 --mem-budget 6G --spans /tmp/spans
+
+    # Use the recorded peaks of an earlier run for the projections
+    python scripts/unified-pdf-parser.py --all --mem-budget 6G --mem-history /tmp/spans
+
+    # Per-AC peak memory of a run
+    python scripts/memory_budget.py /tmp/spans
+"""
+
+import os
+import re
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+MB = 1024 * 1024
+
+# Share of the available memory used as budget when none is given
+MEMORY_BUDGET_SHARE = 0.75
+
+# Concurrency is lowered above HIGH_WATERMARK of the budget and raised
+# again below LOW_WATERMARK
+HIGH_WATERMARK = 0.90
+LOW_WATERMARK = 0.60
+
+# Page-count model for projected peaks (MB), used without history.
+# A rasterized 300 DPI A4 page is ~26 MB RGB; preprocessing holds a few
+# grayscale copies and tesseract its own buffers next to it.
+WORKER_BASE_MB = 250
+TEXT_PAGE_MB = 3
+SCANNED_PAGE_MB = 120
+HISTORY_MARGIN = 1.2
+
+ENV_TRACE_ALLOC = 'ELECTIONLENS_TRACE_ALLOC'
+
+
+# ============================================================================
+# Measurement
+# ============================================================================
+
+_PROC_STATUS = Path('/proc/self/status')
+_CLEAR_REFS = Path('/proc/self/clear_refs')
+
+
+def _status_kb(field_name: str, status: Path = _PROC_STATUS) -> int:
+    try:
+        with open(status) as f:
+            for line in f:
+                if line.startswith(field_name):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process."""
+    if HAS_PSUTIL:
+        return psutil.Process().memory_info().rss
+    return _status_kb('VmRSS:') * 1024
+
+
+def max_rss_bytes() -> int:
+    """Lifetime peak RSS of this process (getrusage)."""
+    if not HAS_RESOURCE:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _can_reset_hwm() -> bool:
+    if not _CLEAR_REFS.exists():
+        return False
+    try:
+        with open(_CLEAR_REFS, 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class PeakTracker:
+    """Peak RSS between start() and stop(), exact on Linux.
+
+    Trackers nest: a tracker started while another one is running folds the
+    peak seen so far into the outer one before resetting the kernel
+    high-water mark, and hands its own peak back when it stops.
+    """
+
+    _resettable = None
+    _stack: list = []
+
+    def __init__(self):
+        self.peak = 0
+        self.alloc_peak = 0
+        self.rss_end = 0
+        self._lifetime_start = 0
+
+    @classmethod
+    def resettable(cls) -> bool:
+        if cls._resettable is None:
+            cls._resettable = _can_reset_hwm()
+        return cls._resettable
+
+    @staticmethod
+    def _hwm() -> int:
+        return _status_kb('VmHWM:') * 1024
+
+    def start(self):
+        rss = rss_bytes()
+        if self._stack:
+            outer = self._stack[-1]
+            if self.resettable():
+                outer.peak = max(outer.peak, self._hwm())
+            outer._fold_alloc()
+        if self.resettable():
+            with open(_CLEAR_REFS, 'w') as f:
+                f.write('5')
+        self._lifetime_start = max_rss_bytes()
+        self.peak = rss
+        if tracing_alloc():
+            import tracemalloc
+            tracemalloc.reset_peak()
+        self._stack.append(self)
+        return self
+
+    def _fold_alloc(self):
+        if tracing_alloc():
+            import tracemalloc
+            self.alloc_peak = max(self.alloc_peak, tracemalloc.get_traced_memory()[1])
+
+    def stop(self):
+        if self._stack and self._stack[-1] is self:
+            self._stack.pop()
+        self.rss_end = rss_bytes()
+        if self.resettable():
+            self.peak = max(self.peak, self._hwm())
+        else:
+            lifetime = max_rss_bytes()
+            if lifetime > self._lifetime_start:
+                self.peak = max(self.peak, lifetime)
+        self.peak = max(self.peak, self.rss_end)
+        self._fold_alloc()
+        if self._stack:
+            outer = self._stack[-1]
+            outer.peak = max(outer.peak, self.peak)
+            outer.alloc_peak = max(outer.alloc_peak, self.alloc_peak)
+            if tracing_alloc():
+                import tracemalloc
+                tracemalloc.reset_peak()
+        return self
+
+
+def tracing_alloc() -> bool:
+    """Start tracemalloc on first use when allocation accounting is requested."""
+    if not os.environ.get(ENV_TRACE_ALLOC):
+        return False
+    import tracemalloc
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return True
+
+
+def tree_rss_bytes(pids: list[int]) -> int:
+    """RSS of the given processes and all their descendants."""
+    if HAS_PSUTIL:
+        total = 0
+        for pid in pids:
+            try:
+                proc = psutil.Process(pid)
+                procs = [proc] + proc.children(recursive=True)
+            except psutil.Error:
+                continue
+            for p in procs:
+                try:
+                    total += p.memory_info().rss
+                except psutil.Error:
+                    pass
+        return total
+
+    # /proc fallback: build the parent map once
+    proc_dir = Path('/proc')
+    if not proc_dir.exists():
+        return 0
+    children = defaultdict(list)
+    for entry in proc_dir.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / 'stat').read_text()
+        except OSError:
+            continue
+        # Field 4 (ppid) follows the parenthesized command name
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        children[ppid].append(int(entry.name))
+
+    total = 0
+    todo = list(pids)
+    while todo:
+        pid = todo.pop()
+        total += _status_kb('VmRSS:', proc_dir / str(pid) / 'status') * 1024
+        todo.extend(children.get(pid, []))
+    return total
+
+
+def available_bytes() -> int:
+    """Memory available for new allocations without swapping."""
+    if HAS_PSUTIL:
+        return psutil.virtual_memory().available
+    available = _status_kb('MemAvailable:', Path('/proc/meminfo')) * 1024
+    if available:
+        return available
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_AVPHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return 8 * 1024 * MB
+
+
+def parse_size(text: str) -> int:
+    """'6G', '512M', '2.5GB' or plain bytes -> bytes."""
+    match = re.fullmatch(r'\s*([\d.]+)\s*([KMGT]?)B?\s*', text.upper())
+    if not match:
+        raise ValueError(f"Invalid memory size: {text}")
+    scale = {'': 1, 'K': 1024, 'M': MB, 'G': 1024 * MB, 'T': 1024 * 1024 * MB}[match.group(2)]
+    return int(float(match.group(1)) * scale)
+
+
+# ============================================================================
+# Projection
+# ============================================================================
+
+def load_peak_history(span_dir) -> dict[str, int]:
+    """AC id -> largest recorded peak RSS (bytes) of its 'ac' spans."""
+    from spans import load_spans
+
+    history = {}
+    for s in load_spans(span_dir):
+        if s['stage'] == 'ac' and s.get('peak_mb') and s.get('ac'):
+            history[s['ac']] = max(history.get(s['ac'], 0), int(s['peak_mb'] * MB))
+    return history
+
+
+def project_peak(ac_id: str, pdf_type: str, pages: int, history: dict = None) -> int:
+    """Projected peak RSS (bytes) of a worker processing one AC."""
+    if history and ac_id in history:
+        return int(history[ac_id] * HISTORY_MARGIN)
+    per_page = SCANNED_PAGE_MB if pdf_type == 'scanned' else TEXT_PAGE_MB * max(pages, 1)
+    # Scanned pages are rasterized one at a time, so only one is resident
+    return (WORKER_BASE_MB + per_page) * MB
+
+
+# ============================================================================
+# Scheduling
+# ============================================================================
+
+@dataclass
+class MemoryBudget:
+    """Admission control: projected peaks of running tasks must fit the budget."""
+    budget: int
+    max_workers: int
+    limit: int = 0
+    reserved: dict = field(default_factory=dict)   # task key -> projected bytes
+    shrinks: int = 0
+
+    def __post_init__(self):
+        self.limit = self.limit or self.max_workers
+
+    @classmethod
+    def from_available(cls, max_workers: int, share: float = MEMORY_BUDGET_SHARE) -> 'MemoryBudget':
+        return cls(int(available_bytes() * share), max_workers)
+
+    def admits(self, projected: int) -> bool:
+        if not self.reserved:
+            # Always run at least one task, even one projected over budget
+            return True
+        return (len(self.reserved) < self.limit
+                and sum(self.reserved.values()) + projected <= self.budget)
+
+    def acquire(self, key, projected: int):
+        self.reserved[key] = projected
+
+    def release(self, key):
+        self.reserved.pop(key, None)
+
+    def observe(self, measured: int):
+        """Adapt concurrency to the measured RSS of the worker tree."""
+        if measured > self.budget * HIGH_WATERMARK and self.limit > 1:
+            self.limit = max(1, min(self.limit, len(self.reserved)) - 1)
+            self.shrinks += 1
+            print(f"  ⚠️  Workers at {measured / MB:,.0f} MB of {self.budget / MB:,.0f} MB budget: "
+                  f"concurrency lowered to {self.limit}")
+        elif measured < self.budget * LOW_WATERMARK and self.limit < self.max_workers:
+            self.limit += 1
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def main():
+    from spans import load_spans
+
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    spans = load_spans(sys.argv[1])
+    if not any('peak_mb' in s for s in spans):
+        print(f"❌ No memory data in {sys.argv[1]}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print(f"PEAK MEMORY: {sys.argv[1]}")
+    print("=" * 70)
+
+    by_stage = defaultdict(list)
+    for s in spans:
+        if 'peak_mb' in s:
+            by_stage[s['stage']].append(s)
+    print(f"\n  {'stage':20s} {'max peak MB':>12s} {'mean peak MB':>13s} {'max alloc MB':>13s}")
+    for stage, items in sorted(by_stage.items(), key=lambda kv: -max(s['peak_mb'] for s in kv[1])):
+        peaks = [s['peak_mb'] for s in items]
+        allocs = [s['alloc_mb'] for s in items if 'alloc_mb' in s]
+        alloc = f"{max(allocs):13.1f}" if allocs else f"{'-':>13s}"
+        print(f"  {stage:20s} {max(peaks):12.1f} {sum(peaks) / len(peaks):13.1f} {alloc}")
+
+    acs = sorted((s for s in spans if s['stage'] == 'ac' and 'peak_mb' in s),
+                 key=lambda s: -s['peak_mb'])
+    if acs:
+        print("\n  Largest ACs:")
+        for s in acs[:15]:
+            print(f"    {s.get('ac')}: {s['peak_mb']:,.0f} MB ({s.get('pdf_type') or '?'})")
+
+
+if __name__ == '__main__':
+    main()
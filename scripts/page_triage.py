@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Page Triage
+===========
+Cheap first pass over a scanned Form 20 before any full-resolution work:
+every page is rasterized as a 72 DPI thumbnail (1/17 of the pixels of a
+300 DPI render) and classified from its ink and ruling grid alone:
+
+    booth-data  a ruled table with booth rows (unruled: many text lines)
+    summary     a ruled table of vote columns with only a few rows
+                (EVM / postal / total votes)
+    header      text without a data table (cover page, candidate list)
+    blank       next to no ink
+
+The data table's bounding box comes with it. Only booth-data pages are
+rendered at full resolution and OCR'd, and only inside that box: margins,
+title block and signatures never reach the grid reader or tesseract.
+
+Usage:
+    from page_triage import crop_table, triage_pdf
+
+    for page in triage_pdf(pdf_path, pages):    # PageTriage per page
+        if page.kind == 'booth-data':
+            image = crop_table(full_resolution_image, page.box)
+
+    python scripts/page_triage.py ~/Form20/AC001.pdf      # kind and table box per page
+    python scripts/page_triage.py page1.png page2.png     # rasterized pages
+"""
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.lazy import lazy_import
+from table_grid import detect_grid, skew_angle, straighten
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+pdf2image = lazy_import('pdf2image')
+Image = lazy_import('PIL.Image')
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# Thumbnail resolution; ruling lines still survive the downsampling
+THUMB_DPI = 72
+# Thumbnails rasterized per pdf2image call
+THUMB_BATCH = 20
+# Pixels this much darker than the paper (the median) are ink; a page with
+# less ink than this share is blank. Thin rules are faint in a thumbnail,
+# so this is well below an Otsu threshold
+INK_CONTRAST = 60
+BLANK_INK = 0.001
+# A booth-data table has at least this many rows (its header row included)
+# and this many columns; a table of vote columns with fewer rows is a summary
+MIN_DATA_ROWS = 5
+MIN_DATA_COLUMNS = 5
+# Without rules: a page with this many text lines is an unruled data table
+MIN_TEXT_LINES = 10
+# Table box padding (share of the page) and the full-resolution crop is
+# widened to multiples of CROP_STEP pixels, so the boxes of a run of pages
+# usually crop identically and the grid found on one page is reused
+BOX_MARGIN = 0.02
+CROP_STEP = 64
+
+KINDS = ('booth-data', 'summary', 'header', 'blank')
+
+
+@dataclass
+class PageTriage:
+    page: int
+    kind: str                                   # one of KINDS
+    box: Optional[tuple[float, float, float, float]] = None   # x0, y0, x1, y1 (page fractions)
+    rows: int = 0                               # table rows / text lines seen
+    columns: int = 0
+
+    @property
+    def area(self) -> float:
+        """Share of the page inside the table box (1.0 without one)."""
+        if self.box is None:
+            return 1.0
+        x0, y0, x1, y1 = self.box
+        return (x1 - x0) * (y1 - y0)
+
+
+# ============================================================================
+# Classification
+# ============================================================================
+
+def padded_box(x0: float, y0: float, x1: float, y1: float,
+               shape: tuple[int, int]) -> tuple[float, float, float, float]:
+    """Pixel box as page fractions, padded by BOX_MARGIN and clipped to the page."""
+    h, w = shape
+    return (max(0.0, x0 / w - BOX_MARGIN), max(0.0, y0 / h - BOX_MARGIN),
+            min(1.0, x1 / w + BOX_MARGIN), min(1.0, y1 / h + BOX_MARGIN))
+
+
+def text_lines(ink: 'np.ndarray') -> list[tuple[int, int]]:
+    """(top, bottom) of the bands of pixel rows that hold ink."""
+    rows = ink.mean(axis=1) > 0.005
+    edges = np.flatnonzero(np.diff(rows.astype(np.int8))) + 1
+    bounds = np.concatenate([[0], edges, [len(rows)]])
+    return [(int(a), int(b)) for a, b in zip(bounds, bounds[1:]) if rows[a]]
+
+
+def classify_thumbnail(gray: 'np.ndarray', page: int = 0) -> PageTriage:
+    """Kind and table box of one page from its grayscale thumbnail."""
+    ink = gray < np.median(gray) - INK_CONTRAST
+    if ink.mean() < BLANK_INK:
+        return PageTriage(page, 'blank')
+
+    grid = detect_grid(gray)
+    if grid is not None:
+        rows, columns = len(grid.rows) - 1, grid.num_columns
+        if columns < MIN_DATA_COLUMNS:
+            return PageTriage(page, 'header', rows=rows, columns=columns)
+        kind = 'booth-data' if rows >= MIN_DATA_ROWS else 'summary'
+        # Table corners in the deskewed thumbnail, mapped back onto the page
+        h, w = gray.shape
+        unrotate = cv2.invertAffineTransform(cv2.getRotationMatrix2D((w / 2, h / 2), grid.angle, 1.0))
+        corners = np.array([[x, y, 1.0] for x in (grid.cols[0], grid.cols[-1])
+                            for y in (grid.rows[0], grid.rows[-1])])
+        xs, ys = (corners @ unrotate.T).T
+        return PageTriage(page, kind, padded_box(xs.min(), ys.min(), xs.max(), ys.max(), gray.shape),
+                          rows, columns)
+
+    # Unruled: count text lines on the deskewed ink (a slight lean over a
+    # landscape page runs neighbouring lines together); the box is the ink's
+    # extent, widened by the lean
+    binary = ink.astype(np.uint8) * 255
+    angle = skew_angle(binary)
+    lines = text_lines(straighten(binary, angle, fill=0) > 0)
+    if len(lines) < MIN_TEXT_LINES:
+        return PageTriage(page, 'header', rows=len(lines))
+    ys, xs = np.flatnonzero(ink.any(axis=1)), np.flatnonzero(ink.any(axis=0))
+    return PageTriage(page, 'booth-data', padded_box(xs[0], ys[0], xs[-1] + 1, ys[-1] + 1, gray.shape),
+                      len(lines))
+
+
+# ============================================================================
+# Documents
+# ============================================================================
+
+def page_thumbnails(pdf_path: Path, pages: list[int],
+                    dpi: int = THUMB_DPI) -> Iterator[tuple[int, 'np.ndarray']]:
+    """(page, grayscale thumbnail) for the given 0-based pages, THUMB_BATCH per poppler call."""
+    pages = sorted(pages)
+    while pages:
+        # A run of consecutive pages per call
+        run = pages[:1]
+        for page in pages[1:THUMB_BATCH]:
+            if page != run[-1] + 1:
+                break
+            run.append(page)
+        images = pdf2image.convert_from_path(str(pdf_path), dpi=dpi, grayscale=True,
+                                             first_page=run[0] + 1, last_page=run[-1] + 1)
+        for page, image in zip(run, images):
+            yield page, np.array(image.convert('L'))
+        pages = pages[len(run):]
+
+
+def triage_pdf(pdf_path: Path, pages: list[int]) -> list[PageTriage]:
+    """Kind and table box of each of the given pages."""
+    return [classify_thumbnail(gray, page) for page, gray in page_thumbnails(pdf_path, pages)]
+
+
+def crop_table(image: 'Image.Image', box: Optional[tuple[float, float, float, float]]) -> 'Image.Image':
+    """The table region of a full-resolution page, widened to CROP_STEP pixels."""
+    if box is None:
+        return image
+    w, h = image.size
+    x0, y0 = (int(box[0] * w) // CROP_STEP * CROP_STEP, int(box[1] * h) // CROP_STEP * CROP_STEP)
+    x1, y1 = (min(w, -(-int(box[2] * w) // CROP_STEP) * CROP_STEP),
+              min(h, -(-int(box[3] * h) // CROP_STEP) * CROP_STEP))
+    return image.crop((x0, y0, x1, y1))
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        return
+
+    if args[0].lower().endswith('.pdf'):
+        import pdfplumber
+        with pdfplumber.open(args[0]) as pdf:
+            count = len(pdf.pages)
+        pages = triage_pdf(Path(args[0]), list(range(count)))
+    else:
+        pages = []
+        for i, path in enumerate(args):
+            image = Image.open(path).convert('L')
+            scale = THUMB_DPI / image.info.get('dpi', (300, 300))[0]
+            thumb = image.resize((round(image.width * scale), round(image.height * scale)), Image.BOX)
+            pages.append(classify_thumbnail(np.array(thumb), i))
+
+    print("=" * 70)
+    print(f"PAGE TRIAGE: {args[0]}" + (f" (+{len(args) - 1} more)" if len(args) > 1 else ""))
+    print("=" * 70)
+    for page in pages:
+        box = ' '.join(f"{v:.2f}" for v in page.box) if page.box else '-'
+        icon = '✅' if page.kind == 'booth-data' else '  '
+        print(f"  {icon} page {page.page + 1:3d}  {page.kind:10s}  {page.rows:3d} rows  "
+              f"{page.columns:3d} cols  box {box}")
+    data = [p for p in pages if p.kind == 'booth-data']
+    area = sum(p.area for p in data) / len(data) if data else 0.0
+    print(f"\n  OCR: {len(data)} of {len(pages)} pages, table {area:.0%} of the page area")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,26 +4,18 @@
 import json
 import re
 from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+from row_tokenizer import cell_value
 
 MISSING_ACS = [27, 30, 31, 33, 34, 49, 147, 148]
-OCR_CACHE = Path("/Users/p0s097d/ElectionLens/scripts/ocr_cache")
-OUTPUT_DIR = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-ELECTIONS_FILE = Path("/Users/p0s097d/ElectionLens/public/data/elections/ac/TN/2021.json")
+OCR_CACHE = PATHS.root / "scripts/ocr_cache"
+OUTPUT_DIR = PATHS.booths / "TN"
+ELECTIONS_FILE = PATHS.elections / "ac/TN/2021.json"
 
-def clean_num(s):
-    """Clean OCR artifacts from numbers"""
-    # Common OCR errors
-    s = re.sub(r'[ie\(\)\{\}\[\]¢°~\-Oo]', '0', s)
-    s = re.sub(r'[lI|]', '1', s)
-    s = re.sub(r'[}h]', '', s)
-    s = re.sub(r'[=]', '', s)
-    s = s.strip()
-    if not s:
-        return 0
-    try:
-        return int(s)
-    except:
-        return None
+BOOTH_ID = re.compile(r'^\d+[A-Z]?$')
 
 def parse_booth_line(line, num_candidates):
     """Parse: row booth vote1 vote2 ... total total rejected"""
@@ -39,13 +31,13 @@ def parse_booth_line(line, num_candidates):
         
         # Second is booth ID
         booth = parts[1]
-        if not re.match(r'^\d+[A-Z]?$', booth):
+        if not BOOTH_ID.match(booth):
             return None
         
         # Parse all numeric values
         votes = []
         for i in range(2, len(parts)):
-            v = clean_num(parts[i])
+            v = cell_value(parts[i])
             if v is not None:
                 votes.append(v)
         
@@ -4,22 +4,18 @@
 import json
 import re
 from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+from row_tokenizer import cell_value
 
 MISSING_ACS = [27, 30, 31, 33, 34, 49, 108, 109, 147, 148]
-OCR_DIR = Path("/Users/p0s097d/ElectionLens/scripts/ocr_rotated")
-OUTPUT_DIR = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-ELECTIONS_FILE = Path("/Users/p0s097d/ElectionLens/public/data/elections/ac/TN/2021.json")
+OCR_DIR = PATHS.root / "scripts/ocr_rotated"
+OUTPUT_DIR = PATHS.booths / "TN"
+ELECTIONS_FILE = PATHS.elections / "ac/TN/2021.json"
 
-def clean_num(s):
-    s = re.sub(r'[ie\(\)\{\}\[\]¢°~\-O]', '0', s)
-    s = re.sub(r'[lI|]', '1', s)
-    s = s.strip()
-    if not s:
-        return 0
-    try:
-        return int(s)
-    except:
-        return None
+BOOTH_ID = re.compile(r'^\d+[A-Z]?(\([WM]\))?$')
 
 def parse_booth_line(line, num_candidates):
     """Parse a line with booth data"""
@@ -40,14 +36,14 @@ def parse_booth_line(line, num_candidates):
             booth = booth[1:]
         
         # Clean booth ID - should be number or numberA/W/M
-        if not re.match(r'^\d+[A-Z]?(\([WM]\))?$', booth):
+        if not BOOTH_ID.match(booth):
             return None
         
         # Parse vote columns
         votes = []
         for i in range(2, 2 + num_candidates):
             if i < len(parts):
-                v = clean_num(parts[i])
+                v = cell_value(parts[i])
                 if v is not None:
                     votes.append(v)
         
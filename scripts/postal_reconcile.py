@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Postal Ballot Reconciliation
+============================
+Derives the `postal` block of every booth results file from the official
+results in one pass, replacing the chain of add-*/fix-*postal* scripts.
+
+For each AC-year and candidate:
+    official = AC result (assembly years) or the AC segment's
+               `acWiseVotes` entry of the PC result (parliament years)
+    booth    = Σ booth votes in {year}.json
+    postal   = official - booth
+    total    = official
+
+so `booth + postal == total` holds exactly, in integers, for every
+candidate, and `booth` is always the AC's actual booth sum. Candidates
+without an official match keep postal = 0 and total = booth.
+
+An AC whose booth sums cannot be reconciled is held: its postal block is
+not written and it is reported instead. That is a candidate whose booth
+sum exceeds the official figure (over-count: a column swap, a booth number
+read as votes, duplicated booths; see booth_anomalies.py) or falls
+implausibly short of it (a misread column, e.g. 196 vs 75,514). Fixing the
+booth data releases the AC on the next run.
+
+Candidate matching is the only per-AC Python work; the arithmetic runs once
+over all ACs stacked into flat arrays. Files are rewritten only when their
+postal block actually changes.
+
+Usage:
+    python scripts/postal_reconcile.py                  # all years with booth data
+    python scripts/postal_reconcile.py --year 2024      # one year
+    python scripts/postal_reconcile.py TN-001 TN-030    # specific ACs
+    python scripts/postal_reconcile.py --dry-run        # report only
+"""
+
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from booth_matrix import (ELECTIONS_DIR, ac_to_pc_map, iter_ac_ids, load_json,
+                          load_schema, matrix_from_data, results_path)
+
+MIN_NAME_SIMILARITY = 0.5
+# A candidate whose booth sum falls this far short of the official figure has
+# a misread booth column (e.g. 196 vs 75,514), not 99% postal ballots. Its
+# AC is held and reported instead.
+MAX_POSTAL_SHARE = 0.25
+
+
+# ============================================================================
+# Official Targets
+# ============================================================================
+
+def normalize_name(name: str) -> str:
+    """Upper-case and drop punctuation/spacing ("Balaganapathy, V. Pon" -> "BALAGANAPATHYVPON")."""
+    return re.sub(r'[^A-Z0-9]', '', (name or '').upper())
+
+
+def election_kind(state: str, year: int) -> Optional[str]:
+    """'ac' for assembly years, 'pc' for parliament years, None if no official results."""
+    for kind in ('ac', 'pc'):
+        if (ELECTIONS_DIR / kind / state / f"{year}.json").exists():
+            return kind
+    return None
+
+
+def segment_votes(pc_result: dict, ac_name: str) -> list[dict]:
+    """
+    Official AC-segment votes of a PC result as [{name, party, votes}].
+
+    `acWiseVotes` sums to the PC total, i.e. the segment figure already
+    includes the postal ballots apportioned to that AC.
+    """
+    target = normalize_name(ac_name)
+    segment = []
+    for cand in pc_result.get('candidates', []):
+        entries = cand.get('acWiseVotes') or []
+        entry = next((e for e in entries if normalize_name(e.get('acName', '')) == target), None)
+        if entry is None:
+            entry = next((e for e in entries
+                          if target and (target in normalize_name(e.get('acName', ''))
+                                         or normalize_name(e.get('acName', '')) in target)), None)
+        if entry is not None:
+            segment.append({'name': cand.get('name', ''), 'party': cand.get('party', ''),
+                            'votes': entry.get('votes', 0) or 0})
+    return segment
+
+
+def official_candidates(state: str, year: int, kind: str, schema: dict) -> dict[str, list[dict]]:
+    """AC id -> official [{name, party, votes}] for a state-year."""
+    data = load_json(ELECTIONS_DIR / kind / state / f"{year}.json")
+    if kind == 'ac':
+        return {ac_id: ac.get('candidates', []) for ac_id, ac in data.items()
+                if ac_id.startswith(f"{state}-")}
+
+    schema_acs = schema.get('assemblyConstituencies', {})
+    targets = {}
+    for ac_id, pc_id in ac_to_pc_map(schema, state).items():
+        if pc_id in data:
+            ac_name = schema_acs.get(ac_id, {}).get('name', '')
+            targets[ac_id] = segment_votes(data[pc_id], ac_name)
+    return targets
+
+
+def match_candidates(booth_cands: list[dict], official: list[dict],
+                     booth_votes: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Official index for each booth-file candidate (-1 when unmatched).
+
+    Passes, each only over still-unmatched candidates: exact name + party,
+    party when it is unique on both sides, name similarity, same position.
+    Namesakes (two "Chandran", IND) are paired by closest vote count.
+    """
+    n, m = len(booth_cands), len(official)
+    match = np.full(n, -1, dtype=np.int64)
+    used = np.zeros(m, dtype=bool)
+    b_names = [normalize_name(c.get('name', '')) for c in booth_cands]
+    b_parties = [(c.get('party') or '').upper() for c in booth_cands]
+    o_names = [normalize_name(c.get('name', '')) for c in official]
+    o_parties = [(c.get('party') or '').upper() for c in official]
+
+    def assign(i: int, j: int):
+        match[i] = j
+        used[j] = True
+
+    o_votes = np.array([c.get('votes', 0) or 0 for c in official], dtype=np.int64)
+    by_key = {}
+    for j, key in enumerate(zip(o_names, o_parties)):
+        by_key.setdefault(key, []).append(j)
+    for i, key in enumerate(zip(b_names, b_parties)):
+        free = [j for j in by_key.get(key, []) if not used[j]]
+        if len(free) > 1 and booth_votes is not None:
+            free.sort(key=lambda j: abs(int(o_votes[j]) - int(booth_votes[i])))
+        if free:
+            assign(i, free[0])
+
+    for i in np.flatnonzero(match < 0):
+        party = b_parties[i]
+        if party in ('IND', ''):
+            continue
+        same = [j for j in range(m) if not used[j] and o_parties[j] == party]
+        if len(same) == 1 and sum(1 for k in np.flatnonzero(match < 0) if b_parties[k] == party) == 1:
+            assign(i, same[0])
+
+    for i in np.flatnonzero(match < 0):
+        best, best_j = MIN_NAME_SIMILARITY, -1
+        for j in np.flatnonzero(~used):
+            sim = SequenceMatcher(None, b_names[i], o_names[j]).ratio()
+            if sim > best:
+                best, best_j = sim, j
+        if best_j >= 0:
+            assign(i, best_j)
+
+    for i in np.flatnonzero(match < 0):
+        if i < m and not used[i]:
+            assign(i, i)
+
+    return match
+
+
+# ============================================================================
+# Reconciliation
+# ============================================================================
+
+@dataclass
+class PostalStack:
+    """Per-candidate booth sums and official targets of many ACs, flattened."""
+    state: str
+    year: int
+    ac_ids: list[str] = field(default_factory=list)
+    offsets: list[int] = field(default_factory=lambda: [0])
+    candidates: list[list[dict]] = field(default_factory=list)
+    rejected: list[int] = field(default_factory=list)
+    booth: list[np.ndarray] = field(default_factory=list)
+    official: list[np.ndarray] = field(default_factory=list)
+    matched: list[np.ndarray] = field(default_factory=list)
+
+    def add(self, ac_id: str, candidates: list[dict], booth: np.ndarray,
+            official: np.ndarray, matched: np.ndarray, rejected: int):
+        self.ac_ids.append(ac_id)
+        self.candidates.append(candidates)
+        self.booth.append(booth)
+        self.official.append(official)
+        self.matched.append(matched)
+        self.rejected.append(rejected)
+        self.offsets.append(self.offsets[-1] + len(candidates))
+
+
+def stack_state_year(state: str, year: int, ac_ids: Optional[list[str]] = None,
+                     schema: Optional[dict] = None,
+                     targets: Optional[dict[str, list[dict]]] = None) -> Optional[PostalStack]:
+    """Load booth sums and matched official votes for every AC of a state-year.
+
+    targets are official_candidates() of the state-year when the caller
+    already holds them; otherwise they are read from the results file.
+    """
+    kind = election_kind(state, year)
+    if kind is None:
+        return None
+    if targets is None:
+        schema = schema if schema is not None else load_schema()
+        targets = official_candidates(state, year, kind, schema)
+
+    stack = PostalStack(state, year)
+    for ac_id in ac_ids or iter_ac_ids(state):
+        path = results_path(state, ac_id, year)
+        official = targets.get(ac_id)
+        if not path.exists() or not official:
+            continue
+        data = load_json(path)
+        bm = matrix_from_data(data, state, ac_id, year, path)
+        if not bm.num_candidates:
+            continue
+
+        booth = bm.column_totals
+        match = match_candidates(bm.candidates, official, booth)
+        official_votes = np.array([c.get('votes', 0) or 0 for c in official], dtype=np.int64)
+        matched = match >= 0
+        targets_row = np.where(matched, official_votes[np.maximum(match, 0)], 0)
+        rejected = (data.get('postal') or {}).get('rejected', 0) or 0
+        stack.add(ac_id, bm.candidates, booth, targets_row, matched, rejected)
+    return stack
+
+
+def reconcile(stack: PostalStack) -> dict:
+    """
+    Vectorized postal derivation over all stacked candidates.
+
+    Returns flat `postal`, `booth`, `total` arrays (identity holds exactly,
+    booth untouched), the per-candidate over-count and misread flags, and
+    per AC the sums and whether it is held (see module docstring).
+    """
+    booth = np.concatenate(stack.booth) if stack.booth else np.zeros(0, dtype=np.int64)
+    official = np.concatenate(stack.official) if stack.official else np.zeros(0, dtype=np.int64)
+    matched = np.concatenate(stack.matched) if stack.matched else np.zeros(0, dtype=bool)
+
+    suspect = matched & (official - booth > official * MAX_POSTAL_SHARE)
+    over = matched & (booth > official)
+    excess = np.where(over, booth - official, 0)
+    total = np.where(matched & ~suspect & ~over, official, booth)
+    postal = total - booth
+
+    if (postal < 0).any() or (booth < 0).any():
+        raise ValueError(f"{stack.state} {stack.year}: negative postal or booth votes after reconciliation")
+    if (booth + postal != total).any():
+        raise ValueError(f"{stack.state} {stack.year}: booth + postal != total after reconciliation")
+
+    counts = np.diff(np.array(stack.offsets, dtype=np.int64))
+    ac_of = np.repeat(np.arange(len(stack.ac_ids)), counts)
+    n_acs = len(stack.ac_ids)
+    ac_suspect = np.bincount(ac_of, weights=suspect, minlength=n_acs).astype(np.int64)
+    ac_excess = np.bincount(ac_of, weights=excess, minlength=n_acs).astype(np.int64)
+    ac_over = np.bincount(ac_of, weights=over, minlength=n_acs).astype(np.int64)
+
+    return {
+        'postal': postal,
+        'booth': booth,
+        'total': total,
+        'matched': matched,
+        'suspect': suspect,
+        'over': over,
+        'excess': excess,
+        'ac_postal': np.bincount(ac_of, weights=postal, minlength=n_acs).astype(np.int64),
+        'ac_excess': ac_excess,
+        'ac_suspect': ac_suspect,
+        'ac_held': (ac_suspect > 0) | (ac_over > 0),
+    }
+
+
+def postal_block(candidates: list[dict], postal: np.ndarray, booth: np.ndarray,
+                 total: np.ndarray, rejected: int) -> dict:
+    """`postal` block in the booth results file format."""
+    cands = [{
+        'name': c.get('name', ''),
+        'party': c.get('party', ''),
+        'postal': int(p),
+        'booth': int(b),
+        'total': int(t),
+    } for c, p, b, t in zip(candidates, postal, booth, total)]
+    valid = int(postal.sum())
+    nota = next((c['postal'] for c in cands if c['party'] == 'NOTA' or c['name'] == 'NOTA'), 0)
+    return {
+        'candidates': cands,
+        'totalValid': valid,
+        'rejected': int(rejected),
+        'nota': nota,
+        'total': valid + int(rejected),
+    }
+
+
+def write_blocks(stack: PostalStack, result: dict, dry_run: bool = False) -> list[str]:
+    """Write postal blocks that differ from what is on disk; returns changed AC ids.
+
+    Held ACs (over-count or misread columns) are never written.
+    """
+    changed = []
+    for k, ac_id in enumerate(stack.ac_ids):
+        if result['ac_held'][k]:
+            continue
+        lo, hi = stack.offsets[k], stack.offsets[k + 1]
+        block = postal_block(stack.candidates[k], result['postal'][lo:hi],
+                             result['booth'][lo:hi], result['total'][lo:hi], stack.rejected[k])
+
+        path = results_path(stack.state, ac_id, stack.year)
+        text = path.read_text()
+        data = json.loads(text)
+        if data.get('postal') == block:
+            continue
+        changed.append(ac_id)
+        if dry_run:
+            continue
+        data['postal'] = block
+        out = json.dumps(data, indent=2, ensure_ascii=False)
+        path.write_text(out + '\n' if text.endswith('\n') else out)
+    return changed
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def years_with_booth_data(state: str) -> list[int]:
+    years = set()
+    for ac_id in iter_ac_ids(state):
+        for path in results_path(state, ac_id, 0).parent.glob('[0-9][0-9][0-9][0-9].json'):
+            years.add(int(path.stem))
+    return sorted(years)
+
+
+def main():
+    args = sys.argv[1:]
+    dry_run = '--dry-run' in args or '-n' in args
+    state = 'TN'
+    years = None
+    if '--state' in args:
+        state = args[args.index('--state') + 1]
+    if '--year' in args:
+        years = [int(args[args.index('--year') + 1])]
+    ac_ids = [a for a in args if re.match(r'^[A-Z]{2}-\d{3}$', a)] or None
+
+    print("=" * 70)
+    print(f"Postal Ballot Reconciliation ({state}){' - DRY RUN' if dry_run else ''}")
+    print("=" * 70)
+
+    schema = load_schema()
+    for year in years or years_with_booth_data(state):
+        start = time.time()
+        stack = stack_state_year(state, year, ac_ids, schema)
+        if stack is None:
+            print(f"\n{year}: no official results, skipped")
+            continue
+        result = reconcile(stack)
+        changed = write_blocks(stack, result, dry_run)
+
+        print(f"\n{year} ({election_kind(state, year).upper()} results):")
+        print(f"  ACs reconciled:       {len(stack.ac_ids)}")
+        print(f"  Candidates matched:   {int(result['matched'].sum())} / {len(result['matched'])}")
+        print(f"  Postal votes:         {int(result['postal'].sum()):,}")
+        print(f"  Misread columns:      {int(result['suspect'].sum())} candidates "
+              f"in {int((result['ac_suspect'] > 0).sum())} ACs")
+        print(f"  Booth over-count:     {int(result['excess'].sum()):,} votes over official "
+              f"in {int((result['ac_excess'] > 0).sum())} ACs")
+        print(f"  ACs held (not written): {int(result['ac_held'].sum())}")
+        print(f"  Files {'to update' if dry_run else 'updated'}:      {len(changed)}")
+        print(f"  Time:                 {time.time() - start:.2f}s")
+
+        held = np.flatnonzero(result['ac_held'])
+        for k in held[np.argsort(-result['ac_excess'][held], kind='stable')][:10]:
+            problems = []
+            if result['ac_excess'][k]:
+                problems.append(f"booth exceeds official by {int(result['ac_excess'][k]):,} votes")
+            if result['ac_suspect'][k]:
+                problems.append(f"{int(result['ac_suspect'][k])} misread column(s)")
+            print(f"    ⚠️  {stack.ac_ids[k]}: {'; '.join(problems)}")
+        if len(held) > 10:
+            print(f"    ... and {len(held) - 10} more held ACs (python scripts/booth_anomalies.py)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Typed Records
+=============
+Slotted record types for the data files, decoded by msgspec straight from
+JSON bytes into the records. Structure and types are checked during the
+parse itself: a malformed file fails on load with the exact path of the
+offending value instead of surfacing later as a KeyError or a silently
+defaulted `.get(..., 0)`.
+
+    booths/{STATE}/{AC}/{year}.json          BoothResults  (results, postal)
+    booths/{STATE}/{AC}/booths[-{year}].json BoothList
+    elections/{ac|pc}/{STATE}/{year}.json    dict[str, Contest]
+
+Fields are snake_case in Python and camelCase on disk ("acWiseVotes" ->
+ac_wise_votes). Keys the records do not name are skipped by the decoder.
+Postal and official vote counts must be non-negative. Booth votes are only
+required to be integers: some 2021 files carry -1..-3 in minor candidates'
+columns from earlier exact-match fixes, which the validators report. Records
+hold no references to one another, so they are created untracked by the
+garbage collector.
+
+Usage:
+    from records import RecordError, load_booth_list, load_election, load_results
+
+    results = load_results(path)             # BoothResults
+    results = load_results(path, check_postal=False)   # postal block as a plain dict
+    results.results['TN-001-001'].votes      # list[int]
+    contest = load_election(path)['TN-01']   # Contest
+    contest.candidates[0].ac_wise_votes[0].votes
+
+    python scripts/records.py                 # decode every data file, report errors
+    python scripts/records.py public/data/booths/TN/TN-001/2024.json
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Annotated, Optional
+
+import msgspec
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+Votes = Annotated[int, msgspec.Meta(ge=0)]
+
+
+class Record(msgspec.Struct, rename='camel', kw_only=True, gc=False):
+    """Base of the record types: camelCase keys on disk, untracked by gc."""
+
+
+# ============================================================================
+# Booth Files
+# ============================================================================
+
+class Booth(Record):
+    id: str
+    booth_no: str = ''
+    num: int = 0
+    type: str = 'regular'
+    name: str = ''
+    address: str = ''
+    area: str = ''
+
+
+class BoothList(Record):
+    """booths.json / booths-{year}.json: polling station metadata of an AC."""
+    ac_id: str = ''
+    ac_name: str = ''
+    state: str = ''
+    total_booths: int = 0
+    last_updated: str = ''
+    source: str = ''
+    booths: list[Booth] = []
+
+
+class Candidate(Record):
+    name: str = ''
+    party: str = ''
+    symbol: str = ''
+    sl_no: Optional[int] = None
+
+
+class BoothResult(Record):
+    votes: list[int] = []
+    total: int = 0
+    rejected: int = 0
+    booth_no: Optional[str] = None
+    name: str = ''
+    address: str = ''
+    area: str = ''
+
+
+class PostalCandidate(Record):
+    name: str = ''
+    party: str = ''
+    postal: Votes = 0
+    booth: Votes = 0
+    total: Votes = 0
+
+
+class Postal(Record):
+    candidates: list[PostalCandidate] = []
+    total_valid: Votes = 0
+    rejected: Votes = 0
+    nota: Votes = 0
+    total: Votes = 0
+
+
+class BoothResults(Record):
+    """{year}.json: booth-wise results of one AC-election."""
+    ac_id: str = ''
+    ac_name: str = ''
+    year: Optional[int] = None
+    election_type: str = ''
+    pc_name: str = ''
+    date: str = ''
+    total_booths: Optional[int] = None
+    source: str = ''
+    candidates: list[Candidate] = []
+    results: dict[str, BoothResult] = {}
+    postal: Optional[Postal] = None
+
+
+class UncheckedPostalResults(BoothResults):
+    """BoothResults with the postal block left as plain JSON, for validators that report it themselves."""
+    postal: Optional[dict] = None
+
+
+# ============================================================================
+# Election Files
+# ============================================================================
+
+class ACWiseVote(Record):
+    ac_name: str
+    votes: Votes
+    vote_share: Optional[float] = None
+
+
+class ContestCandidate(Record):
+    name: str
+    party: str = ''
+    votes: Votes = 0
+    vote_share: Optional[float] = None
+    position: Optional[int] = None
+    margin: Optional[int] = None
+    sex: str = ''
+    age: Optional[int] = None
+    deposit_lost: Optional[bool] = None
+    evm_votes: Optional[Votes] = None
+    postal_votes: Optional[Votes] = None
+    ac_wise_votes: list[ACWiseVote] = []       # parliament results only
+
+
+class Contest(Record):
+    """One AC or PC result of an election file."""
+    constituency_name: str
+    constituency_no: Optional[int] = None
+    constituency_type: str = ''
+    year: Optional[int] = None
+    schema_id: str = ''
+    name: str = ''
+    type: str = ''
+    district_name: str = ''
+    electors: Optional[int] = None
+    valid_votes: Optional[int] = None
+    turnout: Optional[float] = None
+    candidates: list[ContestCandidate] = []
+
+
+# ============================================================================
+# Decoding
+# ============================================================================
+
+class RecordError(ValueError):
+    """A data file that does not decode into its record type."""
+
+
+class RawResults(Record):
+    results: dict[str, msgspec.Raw] = {}
+
+
+DECODERS = {
+    BoothResults: msgspec.json.Decoder(BoothResults),
+    UncheckedPostalResults: msgspec.json.Decoder(UncheckedPostalResults),
+    BoothList: msgspec.json.Decoder(BoothList),
+    dict[str, Contest]: msgspec.json.Decoder(dict[str, Contest]),
+}
+
+
+def pinpoint(data: bytes, record_type, error: msgspec.ValidationError) -> str:
+    """
+    The error message with the dict key filled in.
+
+    msgspec reports a bad value under a dict as `$.results[...].votes[3]`;
+    the booth or contest is found by decoding the dict's values one by one
+    (only on the error path, so loading stays a single typed parse).
+    """
+    message = str(error)
+    if '[...]' not in message:
+        return message
+    if record_type in (BoothResults, UncheckedPostalResults):
+        container, value_type = msgspec.json.decode(data, type=RawResults).results, BoothResult
+    elif record_type == dict[str, Contest]:
+        container, value_type = msgspec.json.decode(data, type=dict[str, msgspec.Raw]), Contest
+    else:
+        return message
+    for key, raw in container.items():
+        try:
+            msgspec.json.decode(raw, type=value_type)
+        except msgspec.ValidationError:
+            return message.replace('[...]', f'["{key}"]', 1)
+    return message
+
+
+def decode(path: Path, record_type):
+    """Decode a file into record_type; RecordError names the file and the bad value's path."""
+    data = Path(path).read_bytes()
+    try:
+        return DECODERS[record_type].decode(data)
+    except msgspec.ValidationError as e:
+        raise RecordError(f"{path}: {pinpoint(data, record_type, e)}") from None
+    except msgspec.DecodeError as e:
+        raise RecordError(f"{path}: malformed JSON ({e})") from None
+
+
+def load_results(path: Path, check_postal: bool = True) -> BoothResults:
+    """Booth results; check_postal=False leaves the postal block unchecked, as a dict."""
+    return decode(path, BoothResults if check_postal else UncheckedPostalResults)
+
+
+def load_booth_list(path: Path) -> BoothList:
+    return decode(path, BoothList)
+
+
+def load_election(path: Path) -> dict[str, Contest]:
+    return decode(path, dict[str, Contest])
+
+
+def record_type(path: Path):
+    """Record type of a data file from its place in the tree (None: not a record file)."""
+    path = Path(path)
+    if path.stem.startswith('booths'):
+        return BoothList
+    if path.stem.isdigit() and path.parent.parent.parent.name == 'elections':
+        return dict[str, Contest]
+    if path.stem.isdigit():
+        return BoothResults
+    return None
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def data_files() -> list[Path]:
+    return sorted([*PATHS.booths.glob('*/*/*.json'), *PATHS.elections.glob('*/*/[0-9]*.json')])
+
+
+def main():
+    args = sys.argv[1:]
+    if '--help' in args or '-h' in args:
+        print(__doc__)
+        return
+    paths = [Path(a) for a in args] or data_files()
+
+    print("=" * 70)
+    print(f"Typed Record Check ({len(paths)} files)")
+    print("=" * 70)
+    start = time.time()
+    counts, errors = {}, []
+    for path in paths:
+        kind = record_type(path)
+        if kind is None:
+            continue
+        try:
+            decode(path, kind)
+        except RecordError as e:
+            errors.append(str(e))
+        name = 'Election' if kind == dict[str, Contest] else kind.__name__
+        counts[name] = counts.get(name, 0) + 1
+    elapsed = time.time() - start
+
+    for name, count in counts.items():
+        print(f"  {name:14s} {count:6d} files")
+    for error in errors[:20]:
+        print(f"  ❌ {error}")
+    if len(errors) > 20:
+        print(f"  ... and {len(errors) - 20} more")
+    print(f"\n{'✅' if not errors else '❌'} {sum(counts.values()) - len(errors)} of {sum(counts.values())} "
+          f"files decode cleanly in {elapsed:.2f}s")
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Row Checksum Solver
+===================
+Form 20 rows carry their own totals: after the candidate votes come total
+valid votes, rejected, NOTA, total and tendered. Two row sums hold on
+every clean row:
+
+    total valid = sum of the candidate votes
+    total       = total valid + rejected + NOTA
+
+An OCR'd row that breaks them usually has one or two digits misread as a
+look-alike (1/7, 0/8, 3/8, 5/6, ...). check_row() searches those digit
+substitutions over every cell of the row, votes and checksum columns alike,
+for the smallest set of edits that satisfies both sums, and applies it
+when it is the unique minimal one. With the digit recognizer's per-cell
+confidence (table_grid.read_cells) a tie between minimal edit sets goes to
+the one whose edited cells the recognizer was clearly least sure of. A
+row whose first vote is really the station number (a serial number was
+taken for the booth number) is recognized by the sums as well: the votes
+are realigned by an offset.
+
+Usage:
+    from row_checksum import CONFIDENCE_ADJUST, check_row
+
+    check = check_row(values, num_candidates)     # values after the booth number
+    check = check_row(values, num_candidates, confidence=scores)   # per-cell confidence breaks ties
+    check.votes, check.status, check.edits
+    confidence = 0.8 + check.confidence_adjust
+
+    python scripts/row_checksum.py 81 20 17 112 0 3 115 0     # check one row (3 candidates)
+    python scripts/row_checksum.py 7 81 20 11 112 0 3 115 --candidates 3
+    python scripts/row_checksum.py --simulate [--errors 1] [--rows 2000] [--scores]
+"""
+
+import random
+import sys
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Digits tesseract and the digit recognizer mistake for one another
+CONFUSION_PAIRS = ['17', '08', '38', '56', '68', '89', '35', '27', '49']
+CONFUSIONS: dict[str, str] = {}
+for _a, _b in CONFUSION_PAIRS:
+    CONFUSIONS[_a] = CONFUSIONS.get(_a, '') + _b
+    CONFUSIONS[_b] = CONFUSIONS.get(_b, '') + _a
+
+# Most digit edits one row may need. A unique one-edit fix was never wrong in
+# simulation (--simulate); of the two-edit fixes about one in six is (one in
+# twelve with cell confidences, which also fix far more rows). A row
+# read with two bad digits is wrong either way, so those fixes are still a
+# gain, but they rank below an unfixed reading (TWO_EDIT_ADJUST)
+MAX_EDITS = 2
+# A tie between minimal edit sets goes to the set whose edited cells have the
+# lowest confidence product, when that is at most this share of the runner-up's
+TIE_MARGIN = 0.8
+# Leading cells that may be a station/serial number read as the first vote
+MAX_OFFSET = 2
+
+# Confidence change of an OCR'd row by checksum status
+CONFIDENCE_ADJUST = {
+    'ok': 0.05,         # both sums hold as read
+    'fixed': 0.0,       # digit edits made the sums hold
+    'unchecked': 0.0,   # no checksum columns to check against
+    'ambiguous': -0.1,  # several equally small edit sets
+    'mismatch': -0.1,   # no edit set within MAX_EDITS
+}
+# Further change of a row fixed with two digit edits: below an ambiguous or
+# mismatched reading, which at least is what the page shows
+TWO_EDIT_ADJUST = -0.15
+
+
+@dataclass
+class RowCheck:
+    votes: list[int]
+    status: str                 # ok / fixed / ambiguous / mismatch / unchecked
+    offset: int = 0             # leading cells skipped before the votes
+    edits: list = field(default_factory=list)   # (column, read, corrected)
+
+    @property
+    def confidence_adjust(self) -> float:
+        """Confidence change of the row (CONFIDENCE_ADJUST, less for a two-digit fix)."""
+        digit_edits = sum(read is not None for _, read, _ in self.edits)
+        return CONFIDENCE_ADJUST[self.status] + (TWO_EDIT_ADJUST if digit_edits > 1 else 0.0)
+
+
+# ============================================================================
+# Digit confusions
+# ============================================================================
+
+def digit_confusions(value: int) -> list[int]:
+    """Values one look-alike digit away from value (no new leading zero)."""
+    text = str(value)
+    out = []
+    for i, ch in enumerate(text):
+        for alt in CONFUSIONS.get(ch, ''):
+            changed = text[:i] + alt + text[i + 1:]
+            if len(changed) > 1 and changed[0] == '0':
+                continue
+            out.append(int(changed))
+    return out
+
+
+def total_column(rest: list) -> Optional[int]:
+    """Index of the total among the checksum columns, None if there is none.
+
+    valid, rejected, NOTA, total[, tendered]; pages without a NOTA column
+    have valid, rejected, total.
+    """
+    if len(rest) >= 4:
+        return 3
+    if len(rest) == 3:
+        return 2
+    return None
+
+
+def residuals(values: list[Optional[int]], num_candidates: int) -> tuple[Optional[int], Optional[int]]:
+    """(valid - sum of votes, total - valid - rejected - NOTA); None where a cell is blank or missing."""
+    rest = values[num_candidates:]
+    first = second = None
+    if rest and None not in values[:num_candidates + 1]:
+        first = rest[0] - sum(values[:num_candidates])
+    t = total_column(rest)
+    if t is not None and None not in rest[:t + 1]:
+        second = rest[t] - sum(rest[:t])
+    return first, second
+
+
+def sums_hold(values: list[Optional[int]], num_candidates: int) -> bool:
+    """Valid votes add up (and the total too, where it can be checked)."""
+    first, second = residuals(values, num_candidates)
+    return first == 0 and second in (0, None)
+
+
+# ============================================================================
+# Solver
+# ============================================================================
+
+def cell_edits(values: list[Optional[int]], num_candidates: int, checked_total: bool) -> list[tuple]:
+    """Every single-digit substitution as (column, corrected, effect on the residuals)."""
+    t = total_column(values[num_candidates:]) if checked_total else None
+    edits = []
+    for col, value in enumerate(values):
+        k = col - num_candidates
+        if k < 0:
+            effect = (-1, 0)                # a vote
+        elif k == 0:
+            effect = (1, -1)                # total valid
+        elif t is not None and k < t:
+            effect = (0, -1)                # rejected, NOTA
+        elif t is not None and k == t:
+            effect = (0, 1)                 # total
+        else:
+            continue                        # tendered, or unchecked columns
+        if value is None:
+            continue
+        for corrected in digit_confusions(value):
+            d = corrected - value
+            edits.append((col, corrected, (effect[0] * d, effect[1] * d)))
+    return edits
+
+
+def break_tie(solutions: list[tuple], confidence: list[Optional[float]]) -> Optional[tuple]:
+    """The edit set whose edited cells are clearly least confident, None if no set stands out.
+
+    A cell without a confidence (blank, or no recognizer) counts as 1.0.
+    """
+    def score(solution):
+        product = 1.0
+        for col, _, _ in solution:
+            c = confidence[col] if col < len(confidence) else None
+            product *= 1.0 if c is None else c
+        return product
+
+    ranked = sorted(solutions, key=score)
+    if score(ranked[0]) <= TIE_MARGIN * score(ranked[1]):
+        return ranked[0]
+    return None
+
+
+def solve(values: list[Optional[int]], num_candidates: int, max_edits: int = MAX_EDITS,
+          confidence: Optional[list[Optional[float]]] = None) -> tuple[str, list[tuple[int, int, int]]]:
+    """Smallest digit-edit set making the row sums hold: (status, [(column, read, corrected)]).
+
+    confidence (per cell, like values) breaks ties between minimal edit sets.
+    """
+    first, second = residuals(values, num_candidates)
+    checked_total = second is not None
+    need = (-first, -(second or 0))     # first is checked by the caller
+    if need == (0, 0):
+        return 'ok', []
+
+    edits = cell_edits(values, num_candidates, checked_total)
+    solutions = [(e,) for e in edits if e[2] == need]
+    if not solutions and max_edits >= 2:
+        # Meet in the middle: second edits by their effect
+        by_effect: dict[tuple, list] = {}
+        for e in edits:
+            by_effect.setdefault(e[2], []).append(e)
+        for a in edits:
+            rest = (need[0] - a[2][0], need[1] - a[2][1])
+            solutions += [(a, b) for b in by_effect.get(rest, ()) if b[0] > a[0]]
+    if len(solutions) > 1 and confidence is not None:
+        chosen = break_tie(solutions, confidence)
+        solutions = [chosen] if chosen else solutions
+    if len(solutions) != 1:
+        return ('ambiguous' if solutions else 'mismatch'), []
+    return 'fixed', [(col, values[col], corrected) for col, corrected, _ in solutions[0]]
+
+
+def fill_blank(values: list[Optional[int]], num_candidates: int) -> list[Optional[int]]:
+    """A single blank vote cell filled from the total valid votes, when that fits."""
+    votes = values[:num_candidates]
+    if votes.count(None) != 1 or len(values) <= num_candidates or values[num_candidates] is None:
+        return values
+    fill = values[num_candidates] - sum(v for v in votes if v is not None)
+    if fill < 0:
+        return values
+    filled = list(values)
+    filled[votes.index(None)] = fill
+    return filled
+
+
+def check_row(values: list[Optional[int]], num_candidates: int, max_offset: int = MAX_OFFSET,
+              max_edits: int = MAX_EDITS, confidence: Optional[list[Optional[float]]] = None) -> RowCheck:
+    """Votes of a row checked (and corrected) against its checksum columns.
+
+    values are the row's numbers after the booth number, votes first;
+    None is a blank cell. Offsets up to max_offset are tried for a row
+    whose sums hold exactly once its leading cells are skipped; otherwise
+    the confusion solver runs on the row as read, confidence (the
+    recognizer's, per cell of values) breaking ties. Blank cells left
+    over read as 0.
+    """
+    n = num_candidates
+    if sums_hold(values, n):
+        return RowCheck(values[:n], 'ok')
+    for offset in range(1, max_offset + 1):
+        shifted = values[offset:]
+        if sums_hold(shifted, n) and any(shifted[:n]):
+            return RowCheck(shifted[:n], 'ok', offset)
+
+    filled = fill_blank(values, n)
+    blank = [(col, None, filled[col]) for col in range(n) if filled[col] != values[col]]
+    votes = [v or 0 for v in filled[:n]] + [0] * (n - len(filled))
+    if residuals(filled, n)[0] is None:
+        return RowCheck(votes, 'unchecked')
+    status, edits = solve(filled, n, max_edits, confidence)
+    for col, _, corrected in edits:
+        if col < n:
+            votes[col] = corrected
+    if blank and status == 'ok':
+        status = 'fixed'
+    return RowCheck(votes, status, 0, blank + edits)
+
+
+# ============================================================================
+# Simulation
+# ============================================================================
+
+def synthetic_row(rng: random.Random, num_candidates: int) -> list[int]:
+    """Votes, valid, rejected, NOTA, total, tendered of a plausible booth."""
+    weights = [rng.paretovariate(1.2) for _ in range(num_candidates)]
+    turnout = rng.randint(300, 1200)
+    votes = [int(turnout * w / sum(weights)) for w in weights]
+    valid = sum(votes)
+    rejected, nota = rng.choice([0, 0, 0, 1, 2]), rng.randint(0, 15)
+    return votes + [valid, rejected, nota, valid + rejected + nota, rng.choice([0, 0, 1])]
+
+
+def synthetic_scores(rng: random.Random, read: list[int], row: list[int]) -> list[float]:
+    """Per-cell recognizer confidence: high on cells read right, lower but overlapping on misreads."""
+    return [rng.uniform(0.9, 1.0) if r == v else rng.uniform(0.4, 1.0) for r, v in zip(read, row)]
+
+
+def simulate(errors: int, rows: int, seed: int = 1, scores: bool = False) -> dict[str, int]:
+    """Outcome counts of check_row on synthetic rows with `errors` look-alike digits each.
+
+    With scores, check_row gets synthetic per-cell confidences (synthetic_scores).
+    """
+    rng = random.Random(seed)
+    outcomes: dict[str, int] = {}
+    for _ in range(rows):
+        n = rng.randint(6, 24)
+        row = synthetic_row(rng, n)
+        read = list(row)
+        for _ in range(errors):
+            i = rng.randrange(len(read) - 1)      # not tendered: no sum checks it
+            alternatives = digit_confusions(read[i])
+            if alternatives:
+                read[i] = rng.choice(alternatives)
+        check = check_row(read, n, confidence=synthetic_scores(rng, read, row) if scores else None)
+        outcome = check.status
+        if check.status in ('ok', 'fixed'):
+            outcome += '' if check.votes == row[:n] else ' (wrong)'
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    return outcomes
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        return
+
+    if args[0] == '--simulate':
+        errors = int(args[args.index('--errors') + 1]) if '--errors' in args else 1
+        rows = int(args[args.index('--rows') + 1]) if '--rows' in args else 2000
+        scores = '--scores' in args
+        print("=" * 70)
+        print(f"ROW CHECKSUM SIMULATION: {rows} rows, {errors} look-alike digit(s) each"
+              + (", cell confidences" if scores else ""))
+        print("=" * 70)
+        for outcome, count in sorted(simulate(errors, rows, scores=scores).items(), key=lambda kv: -kv[1]):
+            print(f"  {outcome:18s} {count:6d} {count / rows:7.1%}")
+        return
+
+    num_candidates = None
+    if '--candidates' in args:
+        i = args.index('--candidates')
+        num_candidates = int(args[i + 1])
+        args = args[:i] + args[i + 2:]
+    values = [int(a) for a in args]
+    check = check_row(values, num_candidates or max(len(values) - 5, 1))
+    icon = {'ok': '✅', 'fixed': '✅'}.get(check.status, '⚠️')
+    print(f"  {icon} {check.status}: votes {check.votes}")
+    if check.offset:
+        print(f"     votes start after {check.offset} leading cell(s)")
+    for col, read, corrected in check.edits:
+        print(f"     column {col}: {read} -> {corrected}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Row Tokenizer
+=============
+Shared tokenizer for the line-oriented booth parsers: pdfplumber and
+pdftotext text, tesseract output and cached OCR pages.
+
+One pass per line instead of a chain of re.sub/re.findall calls:
+- OCR confusables (O/o for 0, l/I for 1, column rules and brackets) are
+  normalized with str.translate tables
+- header and footer lines are rejected by one precompiled keyword pattern
+  (the keywords' prefix trie compiled to a single regex)
+- numbers come out of a single regex scan; (position, value) tokens where
+  column positions matter
+- booth_row() splits a row's numbers into booth number and candidate votes
+
+Usage:
+    from row_tokenizer import OCR_HEADERS, booth_row, clean_ocr_line, numbers
+
+    if not OCR_HEADERS(raw):
+        line = clean_ocr_line(raw)
+        row = booth_row(numbers(line), max_booth=550, first=3, line=line, max_pos=200)
+
+    python scripts/bench_extraction.py --only tokenize      # lines/s
+"""
+
+import re
+from itertools import islice
+from typing import Callable, Optional
+
+# ============================================================================
+# Translation Tables
+# ============================================================================
+
+# OCR lines: table rules and brackets tesseract reads from the grid become
+# spaces, O/o become 0
+OCR_LINE = str.maketrans({**dict.fromkeys('|\\/[]{}()<>', ' '), 'o': '0', 'O': '0'})
+
+# Whole cells of cached OCR pages (split on whitespace): anything round is a
+# 0, anything upright a 1; stray h and = are dropped
+CELL_DIGITS = str.maketrans({**dict.fromkeys('ie(){}[]¢°~-Oo', '0'),
+                             **dict.fromkeys('lI|', '1'),
+                             'h': None, '=': None})
+
+
+# ============================================================================
+# Patterns
+# ============================================================================
+
+# A whole number (\b\d+\b)
+NUMBER = re.compile(r'(?<!\w)\d+(?!\w)')
+# Any run of digits, also inside booth ids like 12A
+DIGIT_RUN = re.compile(r'\d+')
+# l/I next to a digit is a 1 (a lone l/I is more likely a column rule)
+OCR_ONES = re.compile(r'[lI](?=\d)|(?<=\d)[lI]')
+
+
+def keyword_matcher(keywords: list[str]) -> Callable[[str], bool]:
+    """Case-insensitive test for any keyword in a line, one regex scan per line.
+
+    The keywords' prefix trie is compiled into a single pattern (shared
+    prefixes share one branch) and run over the upper-cased line, which is
+    several times faster than an IGNORECASE pattern or a scan per keyword.
+    A keyword containing a shorter one is redundant and dropped.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword.upper():
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def emit(node: dict) -> str:
+        if '' in node:
+            return ''
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items())]
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    search = re.compile(emit(trie)).search
+
+    def matches(line: str) -> bool:
+        return search(line.upper()) is not None
+    return matches
+
+
+# Header/footer lines of Form 20 pages
+TEXT_HEADERS = keyword_matcher(['FORM 20', 'ELECTION', 'CANDIDATE', 'PARTY', 'TOTAL'])
+OCR_HEADERS = keyword_matcher(['FORM', 'ELECTION', 'CANDIDATE', 'PARTY', 'TOTAL', 'NOTA'])
+TABLE_HEADERS = keyword_matcher(['SL', 'STATION', 'NO', 'SERIAL', 'BOOTH'])
+
+
+# ============================================================================
+# Tokenizing
+# ============================================================================
+
+def clean_ocr_line(line: str) -> str:
+    """OCR line normalized: grid rules and brackets to spaces, O/o to 0,
+    l/I next to a digit to 1, whitespace runs collapsed."""
+    line = ' '.join(line.translate(OCR_LINE).split())
+    if 'l' in line or 'I' in line:
+        line = OCR_ONES.sub('1', line)
+    return line
+
+
+def numbers(line: str) -> list[int]:
+    """Every whole number in a line, left to right (one scan)."""
+    return list(map(int, NUMBER.findall(line)))
+
+
+def number_tokens(line: str, limit: int = None) -> list[tuple[int, int]]:
+    """(position, value) of the whole numbers in a line, left to right (the first `limit`)."""
+    matches = NUMBER.finditer(line)
+    if limit is not None:
+        matches = islice(matches, limit)
+    return [(m.start(), int(m[0])) for m in matches]
+
+
+def digit_runs(line: str) -> list[int]:
+    """Every run of digits in a line, including those inside booth ids."""
+    return list(map(int, DIGIT_RUN.findall(line)))
+
+
+def cell_value(cell: str) -> Optional[int]:
+    """Number in one whitespace-separated OCR cell (0 if blank, None if not a number)."""
+    cell = cell.translate(CELL_DIGITS).strip()
+    if not cell:
+        return 0
+    try:
+        return int(cell)
+    except ValueError:
+        return None
+
+
+# ============================================================================
+# Rows
+# ============================================================================
+
+def booth_row(values: list[int], max_booth: int = 600, first: int = None, line: str = None,
+              max_pos: int = None, max_vote: int = 2000,
+              total_floor: int = 5000) -> Optional[tuple[int, list[int]]]:
+    """Booth number and votes from a row's numbers, or None.
+
+    The booth number is the first value in 1..max_booth among the first
+    `first` numbers; with max_pos it must also start left of max_pos in
+    line (positions are only scanned for lines longer than that). Votes
+    are the values after it up to max_vote; a value above total_floor is a
+    total column and ends them.
+    """
+    head = values if first is None else values[:first]
+    starts = None
+    if max_pos is not None and len(line) > max_pos:
+        starts = [pos for pos, _ in number_tokens(line, len(head))]
+    for i, value in enumerate(head):
+        if 1 <= value <= max_booth and (starts is None or starts[i] < max_pos):
+            booth_no = value
+            break
+    else:
+        return None
+
+    votes = []
+    for value in values[i + 1:]:
+        if value <= max_vote:
+            votes.append(value)
+        elif value > total_floor:
+            break
+    return booth_no, votes
+
+
+def fit_votes(votes: list[int], num_candidates: int) -> list[int]:
+    """Votes cut or zero-padded to the candidate count."""
+    return votes[:num_candidates] + [0] * (num_candidates - len(votes))
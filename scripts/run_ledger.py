@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Extraction Run Ledger
+=====================
+Persistent, checkpointed record of batch extraction runs (SQLite).
+
+A run is the list of ACs a batch was asked to process. As work completes,
+the ledger records per AC its status, attempts, timings and result summary,
+and per page of a scanned PDF the booths OCR'd from it. An interrupted run
+(crash, Ctrl-C, reboot) is resumed with --resume: finished ACs are skipped
+and a half-done AC continues after its last checkpointed page.
+
+Workers write their own checkpoints; SQLite runs in WAL mode so the pool
+and the scheduler can write concurrently.
+
+The ledger doubles as a work queue (extract_driver.py): workers claim an AC
+with a time-limited lease and renew it with heartbeats while they work. An
+AC whose lease runs out (worker or machine died) is claimed again by the
+next worker. Claims take an immediate write lock, so any number of worker
+processes and machines can share one ledger file. WAL needs shared memory
+between the processes, so machines sharing a ledger over a network
+filesystem should use --journal delete mode (see extract_driver.py).
+
+Tables:
+    runs     (run_id, script, args, election, started, finished, status)
+    ac_tasks (run_id, ac_id, position, status, attempts, started, finished,
+              result, error, worker, lease_until, heartbeat)
+                                            pending|running|done|failed
+    pages    (run_id, ac_id, page, data, finished)
+    quarantine (pdf, ac_id, size, mtime, failures, error, since, last_failed)
+    strategy_runs (election, layout, ac_id, strategy, booths, new_booths,
+                   gain, seconds, finished)     see strategies.py
+    ocr_dpi  (pdf, ac_id, dpi, pages, finished)  DPI rung a scanned PDF's
+                                                 pages read at (next run starts there)
+
+PDFs that still fail after all retries (timeouts, crashes, exceptions) are
+quarantined and skipped by later runs until the file changes on disk or is
+released.
+
+Usage:
+    python scripts/unified-pdf-parser.py --all --run tn-2024-full
+    python scripts/unified-pdf-parser.py --resume               # latest unfinished run
+    python scripts/unified-pdf-parser.py --resume tn-2024-full
+
+    python scripts/run_ledger.py list
+    python scripts/run_ledger.py show tn-2024-full [--status failed]
+    python scripts/run_ledger.py pages tn-2024-full TN-005
+    python scripts/run_ledger.py quarantine [--release PDF|all]
+    python scripts/run_ledger.py dpi
+
+    --ledger PATH uses another ledger file (default <cache>/extraction-runs.sqlite,
+    see `electionlens paths`)
+"""
+
+import json
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+LEDGER_PATH = PATHS.cache / 'extraction-runs.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id   TEXT PRIMARY KEY,
+    script   TEXT NOT NULL,
+    args     TEXT,
+    election TEXT,
+    started  REAL NOT NULL,
+    finished REAL,
+    status   TEXT NOT NULL DEFAULT 'running'
+);
+CREATE TABLE IF NOT EXISTS ac_tasks (
+    run_id   TEXT NOT NULL,
+    ac_id    TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    status   TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    started  REAL,
+    finished REAL,
+    result   TEXT,
+    error    TEXT,
+    worker      TEXT,
+    lease_until REAL,
+    heartbeat   REAL,
+    PRIMARY KEY (run_id, ac_id)
+);
+CREATE TABLE IF NOT EXISTS pages (
+    run_id   TEXT NOT NULL,
+    ac_id    TEXT NOT NULL,
+    page     INTEGER NOT NULL,
+    data     TEXT NOT NULL,
+    finished REAL NOT NULL,
+    PRIMARY KEY (run_id, ac_id, page)
+);
+CREATE TABLE IF NOT EXISTS quarantine (
+    pdf         TEXT PRIMARY KEY,
+    ac_id       TEXT,
+    size        INTEGER,
+    mtime       REAL,
+    failures    INTEGER NOT NULL DEFAULT 0,
+    error       TEXT,
+    since       REAL NOT NULL,
+    last_failed REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS strategy_runs (
+    election   TEXT NOT NULL,
+    layout     TEXT NOT NULL,
+    ac_id      TEXT NOT NULL,
+    strategy   TEXT NOT NULL,
+    booths     INTEGER NOT NULL,
+    new_booths INTEGER NOT NULL,
+    gain       REAL NOT NULL,
+    seconds    REAL NOT NULL,
+    finished   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS strategy_runs_layout ON strategy_runs (layout, strategy);
+CREATE TABLE IF NOT EXISTS ocr_dpi (
+    pdf      TEXT PRIMARY KEY,
+    ac_id    TEXT,
+    dpi      INTEGER NOT NULL,
+    pages    TEXT,
+    finished REAL NOT NULL
+);
+"""
+
+# Columns added after the first ledger version, migrated on open
+ADDED_COLUMNS = {
+    'runs': [('election', 'TEXT')],
+    'ac_tasks': [('worker', 'TEXT'), ('lease_until', 'REAL'), ('heartbeat', 'REAL')],
+}
+
+
+# ============================================================================
+# Ledger
+# ============================================================================
+
+class RunLedger:
+    """SQLite-backed record of runs, their ACs and checkpointed pages."""
+
+    def __init__(self, path=LEDGER_PATH, journal_mode: str = 'WAL'):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(f'PRAGMA journal_mode={journal_mode}')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {r['name'] for r in self.db.execute(f'PRAGMA table_info({table})')}
+            for name, sql_type in columns:
+                if name not in existing:
+                    self.db.execute(f'ALTER TABLE {table} ADD COLUMN {name} {sql_type}')
+
+    def close(self):
+        self.db.close()
+
+    # Runs ---------------------------------------------------------------
+
+    def create_run(self, script: str, ac_ids: list[str], args: list[str] = None,
+                   run_id: str = None, election: dict = None) -> str:
+        run_id = run_id or datetime.now().strftime('%Y%m%d-%H%M%S')
+        if self.db.execute('SELECT 1 FROM runs WHERE run_id = ?', (run_id,)).fetchone():
+            raise ValueError(f"Run {run_id} already exists (use --resume {run_id})")
+        with self.db:
+            self.db.execute('BEGIN')
+            self.db.execute('INSERT INTO runs (run_id, script, args, election, started) VALUES (?, ?, ?, ?, ?)',
+                            (run_id, script, json.dumps(args or []),
+                             json.dumps(election) if election else None, time.time()))
+            self.db.executemany('INSERT INTO ac_tasks (run_id, ac_id, position) VALUES (?, ?, ?)',
+                                [(run_id, ac_id, i) for i, ac_id in enumerate(ac_ids)])
+        return run_id
+
+    def latest_unfinished(self, script: str) -> Optional[str]:
+        row = self.db.execute(
+            "SELECT run_id FROM runs WHERE script = ? AND status != 'finished' "
+            "ORDER BY started DESC LIMIT 1", (script,)).fetchone()
+        return row['run_id'] if row else None
+
+    def run(self, run_id: str) -> Optional[dict]:
+        row = self.db.execute('SELECT * FROM runs WHERE run_id = ?', (run_id,)).fetchone()
+        return dict(row) if row else None
+
+    def reopen_run(self, run_id: str):
+        self.db.execute("UPDATE runs SET status = 'running', finished = NULL WHERE run_id = ?", (run_id,))
+
+    def finish_run(self, run_id: str, status: str = 'finished'):
+        self.db.execute('UPDATE runs SET finished = ?, status = ? WHERE run_id = ?',
+                        (time.time(), status, run_id))
+
+    def runs(self, limit: int = 20) -> list[dict]:
+        rows = self.db.execute("""
+            SELECT r.*, COUNT(t.ac_id) AS acs,
+                   SUM(t.status = 'done') AS done,
+                   SUM(t.status = 'failed') AS failed
+            FROM runs r LEFT JOIN ac_tasks t USING (run_id)
+            GROUP BY r.run_id ORDER BY r.started DESC LIMIT ?""", (limit,))
+        return [dict(r) for r in rows]
+
+    # ACs ----------------------------------------------------------------
+
+    def tasks(self, run_id: str, status: str = None) -> list[dict]:
+        sql = 'SELECT * FROM ac_tasks WHERE run_id = ?'
+        params = [run_id]
+        if status:
+            sql += ' AND status = ?'
+            params.append(status)
+        rows = self.db.execute(sql + ' ORDER BY position', params)
+        return [dict(r) for r in rows]
+
+    def pending(self, run_id: str) -> list[str]:
+        """ACs still to do, in run order: never finished, or interrupted while running."""
+        rows = self.db.execute(
+            "SELECT ac_id FROM ac_tasks WHERE run_id = ? AND status IN ('pending', 'running') "
+            "ORDER BY position", (run_id,))
+        return [r['ac_id'] for r in rows]
+
+    def start_ac(self, run_id: str, ac_id: str):
+        self.db.execute(
+            "UPDATE ac_tasks SET status = 'running', attempts = attempts + 1, started = ?, "
+            "error = NULL WHERE run_id = ? AND ac_id = ?", (time.time(), run_id, ac_id))
+
+    def finish_ac(self, run_id: str, ac_id: str, result: dict, worker: str = None) -> bool:
+        """Record an AC outcome; 'success'/'complete' results count as done.
+
+        With a worker, only while that worker still holds the AC's lease:
+        False if another worker has re-claimed it (its outcome counts).
+        """
+        status = 'done' if result.get('status') in ('success', 'complete') else 'failed'
+        error = result.get('error') or '; '.join(result.get('errors', [])) or None
+        lease_filter, params = '', []
+        if worker is not None:
+            lease_filter, params = " AND worker = ? AND status = 'running'", [worker]
+        cur = self.db.execute(
+            'UPDATE ac_tasks SET status = ?, finished = ?, result = ?, error = ?, lease_until = NULL '
+            f'WHERE run_id = ? AND ac_id = ?{lease_filter}',
+            [status, time.time(), json.dumps(result), error, run_id, ac_id] + params)
+        return cur.rowcount == 1
+
+    # Leases -------------------------------------------------------------
+
+    def claim(self, worker: str, lease: float, script: str, run_ids: list[str] = None,
+              max_attempts: int = 3) -> Optional[dict]:
+        """Lease the next AC of the open runs: pending, or running with an expired lease.
+
+        ACs whose lease expired max_attempts times are marked failed instead.
+        Returns the task row (with the run's election) or None when the
+        queue is empty.
+        """
+        now = time.time()
+        run_filter, params = '', [script]
+        if run_ids:
+            run_filter = f" AND r.run_id IN ({','.join('?' * len(run_ids))})"
+            params += list(run_ids)
+
+        with self.db:
+            self.db.execute('BEGIN IMMEDIATE')
+            self.db.execute(
+                "UPDATE ac_tasks SET status = 'failed', error = ?, finished = ?, lease_until = NULL "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (f'Lease expired after {max_attempts} attempts', now, now, max_attempts))
+            row = self.db.execute(f"""
+                SELECT t.run_id, t.ac_id, t.attempts, r.election
+                FROM ac_tasks t JOIN runs r USING (run_id)
+                WHERE r.status = 'running' AND r.script = ?{run_filter}
+                  AND (t.status = 'pending' OR (t.status = 'running' AND t.lease_until < ?))
+                ORDER BY r.started, t.position LIMIT 1""", params + [now]).fetchone()
+            if not row:
+                return None
+            self.db.execute(
+                "UPDATE ac_tasks SET status = 'running', worker = ?, lease_until = ?, heartbeat = ? "
+                "WHERE run_id = ? AND ac_id = ?",
+                (worker, now + lease, now, row['run_id'], row['ac_id']))
+        task = dict(row)
+        task['election'] = json.loads(task['election']) if task['election'] else None
+        return task
+
+    def renew(self, run_id: str, ac_id: str, worker: str, lease: float) -> bool:
+        """Heartbeat: extend the lease; False if the worker no longer holds it."""
+        now = time.time()
+        cur = self.db.execute(
+            "UPDATE ac_tasks SET lease_until = ?, heartbeat = ? "
+            "WHERE run_id = ? AND ac_id = ? AND worker = ? AND status = 'running'",
+            (now + lease, now, run_id, ac_id, worker))
+        return cur.rowcount == 1
+
+    def leases(self) -> list[dict]:
+        rows = self.db.execute(
+            "SELECT run_id, ac_id, worker, attempts, started, heartbeat, lease_until FROM ac_tasks "
+            "WHERE status = 'running' AND lease_until IS NOT NULL ORDER BY heartbeat")
+        return [dict(r) for r in rows]
+
+    def finish_if_done(self, run_id: str) -> bool:
+        """Close the run once none of its ACs is pending or running."""
+        if self.pending(run_id):
+            return False
+        self.db.execute("UPDATE runs SET finished = ?, status = 'finished' "
+                        "WHERE run_id = ? AND status = 'running'", (time.time(), run_id))
+        return True
+
+    def counts(self, run_id: str) -> dict[str, int]:
+        rows = self.db.execute(
+            'SELECT status, COUNT(*) AS n FROM ac_tasks WHERE run_id = ? GROUP BY status', (run_id,))
+        return {r['status']: r['n'] for r in rows}
+
+    def outcomes(self, run_id: str) -> dict[str, int]:
+        """Result statuses (success/complete/validation_failed/...) of finished ACs."""
+        outcomes = {}
+        for t in self.tasks(run_id):
+            if t['result']:
+                status = json.loads(t['result']).get('status', 'unknown')
+                outcomes[status] = outcomes.get(status, 0) + 1
+        return outcomes
+
+    def durations(self, script: str) -> dict[str, float]:
+        """AC id -> duration (seconds) of its latest successful run of a script."""
+        rows = self.db.execute(
+            "SELECT t.ac_id, t.finished - t.started AS seconds, t.result FROM ac_tasks t JOIN runs r USING (run_id) "
+            "WHERE r.script = ? AND t.status = 'done' AND t.started IS NOT NULL AND t.finished IS NOT NULL "
+            "ORDER BY t.finished", (script,))
+        # ACs that had nothing to extract ('complete') say nothing about cost
+        return {r['ac_id']: r['seconds'] for r in rows
+                if json.loads(r['result'] or '{}').get('status') != 'complete'}
+
+    # Quarantine ---------------------------------------------------------
+
+    def quarantine(self, pdf, ac_id: str, error: str):
+        """Quarantine a PDF that failed all its attempts (counts repeat offences)."""
+        pdf = Path(pdf)
+        stat = pdf.stat() if pdf.exists() else None
+        now = time.time()
+        self.db.execute(
+            'INSERT INTO quarantine (pdf, ac_id, size, mtime, failures, error, since, last_failed) '
+            'VALUES (?, ?, ?, ?, 1, ?, ?, ?) '
+            'ON CONFLICT (pdf) DO UPDATE SET failures = failures + 1, error = excluded.error, '
+            'size = excluded.size, mtime = excluded.mtime, last_failed = excluded.last_failed',
+            (str(pdf), ac_id, stat.st_size if stat else None, stat.st_mtime if stat else None,
+             error, now, now))
+
+    def quarantined(self, pdfs: list = None) -> dict[str, dict]:
+        """PDF path -> quarantine entry; a PDF replaced on disk is no longer quarantined."""
+        entries = {}
+        for row in self.db.execute('SELECT * FROM quarantine ORDER BY last_failed DESC'):
+            pdf = Path(row['pdf'])
+            if pdfs is not None and row['pdf'] not in {str(p) for p in pdfs}:
+                continue
+            if pdf.exists() and row['size'] is not None:
+                stat = pdf.stat()
+                if (stat.st_size, stat.st_mtime) != (row['size'], row['mtime']):
+                    continue
+            entries[row['pdf']] = dict(row)
+        return entries
+
+    def release(self, pdf: str = None) -> int:
+        """Take one PDF (or all) out of quarantine; returns the number released."""
+        if pdf is None:
+            return self.db.execute('DELETE FROM quarantine').rowcount
+        return self.db.execute('DELETE FROM quarantine WHERE pdf = ?', (str(pdf),)).rowcount
+
+    # Strategies ---------------------------------------------------------
+
+    def record_strategy_runs(self, election: str, layout: str, ac_id: str, runs: list[dict]):
+        """Record what each extraction strategy added for an AC (see strategies.py)."""
+        now = time.time()
+        self.db.executemany(
+            'INSERT INTO strategy_runs (election, layout, ac_id, strategy, booths, new_booths, gain, seconds, finished) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(election, layout, ac_id, r['strategy'], r['booths'], r['new_booths'], r['gain'], r['seconds'], now)
+             for r in runs])
+
+    def strategy_stats(self, layout: str) -> dict[str, dict]:
+        """Strategy -> runs, wins (runs adding booths), summed gain and seconds on a layout family."""
+        rows = self.db.execute(
+            'SELECT strategy, COUNT(*) AS runs, SUM(new_booths > 0) AS wins, SUM(gain) AS gain, '
+            'SUM(seconds) AS seconds FROM strategy_runs WHERE layout = ? GROUP BY strategy', (layout,))
+        return {r['strategy']: dict(r) for r in rows}
+
+    def strategy_layouts(self) -> list[str]:
+        return [r['layout'] for r in self.db.execute('SELECT DISTINCT layout FROM strategy_runs ORDER BY layout')]
+
+    # OCR resolution -----------------------------------------------------
+
+    def record_dpi(self, pdf, ac_id: str, dpi: int, pages: dict[int, int]):
+        """Rung a PDF's OCR should start at next time, and pages read per DPI this time."""
+        self.db.execute(
+            'INSERT OR REPLACE INTO ocr_dpi (pdf, ac_id, dpi, pages, finished) VALUES (?, ?, ?, ?, ?)',
+            (str(pdf), ac_id, dpi, json.dumps(pages), time.time()))
+
+    def start_dpi(self, pdf) -> Optional[int]:
+        row = self.db.execute('SELECT dpi FROM ocr_dpi WHERE pdf = ?', (str(pdf),)).fetchone()
+        return row['dpi'] if row else None
+
+    def dpi_records(self) -> list[dict]:
+        return [dict(r) for r in self.db.execute('SELECT * FROM ocr_dpi ORDER BY ac_id')]
+
+    # Pages --------------------------------------------------------------
+
+    def save_page(self, run_id: str, ac_id: str, page: int, data):
+        self.db.execute(
+            'INSERT OR REPLACE INTO pages (run_id, ac_id, page, data, finished) VALUES (?, ?, ?, ?, ?)',
+            (run_id, ac_id, page, json.dumps(data), time.time()))
+
+    def load_pages(self, run_id: str, ac_id: str) -> dict:
+        rows = self.db.execute('SELECT page, data FROM pages WHERE run_id = ? AND ac_id = ?',
+                               (run_id, ac_id))
+        return {r['page']: json.loads(r['data']) for r in rows}
+
+
+@dataclass
+class Checkpoint:
+    """Per-AC handle passed to workers: opens the ledger lazily in the worker."""
+    ledger_path: str
+    run_id: str
+    ac_id: str
+    journal_mode: str = 'WAL'       # the opening process's (extract_driver --journal)
+
+    def __getstate__(self):
+        # Connections don't cross process boundaries
+        return {k: v for k, v in self.__dict__.items() if k != '_ledger'}
+
+    @property
+    def ledger(self) -> RunLedger:
+        if getattr(self, '_ledger', None) is None:
+            self._ledger = RunLedger(self.ledger_path, self.journal_mode)
+        return self._ledger
+
+    def start(self):
+        self.ledger.start_ac(self.run_id, self.ac_id)
+
+    def pages(self) -> dict:
+        return self.ledger.load_pages(self.run_id, self.ac_id)
+
+    def save_page(self, page: int, data):
+        self.ledger.save_page(self.run_id, self.ac_id, page, data)
+
+
+def open_run(ledger: RunLedger, script: str, ac_ids: list[str], args: list[str],
+             run_name: str = None, resume=False) -> tuple[str, list[str]]:
+    """Create a run, or resume one; returns (run_id, ACs still to process).
+
+    resume may be True (latest unfinished run of the script) or a run id.
+    """
+    if resume:
+        run_id = ledger.latest_unfinished(script) if resume is True else resume
+        if not run_id or not ledger.run(run_id):
+            raise ValueError(f"No run to resume{f' named {resume}' if resume is not True else ''}")
+        ledger.reopen_run(run_id)
+        pending = ledger.pending(run_id)
+        total = len(ledger.tasks(run_id))
+        print(f"Resuming run {run_id}: {total - len(pending)} of {total} ACs already finished")
+        return run_id, pending
+
+    run_id = ledger.create_run(script, ac_ids, args, run_name)
+    print(f"Run {run_id} ({len(ac_ids)} ACs) recorded in {ledger.path}")
+    return run_id, list(ac_ids)
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def format_time(ts) -> str:
+    return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M') if ts else '-'
+
+
+def main():
+    args = sys.argv[1:]
+    ledger_path = LEDGER_PATH
+    if '--ledger' in args:
+        i = args.index('--ledger')
+        ledger_path = args[i + 1]
+        del args[i:i + 2]
+
+    if not args or args[0] not in ('list', 'show', 'pages', 'quarantine', 'dpi'):
+        print(__doc__)
+        sys.exit(1)
+
+    ledger = RunLedger(ledger_path)
+
+    if args[0] == 'quarantine':
+        if '--release' in args:
+            pdf = args[args.index('--release') + 1]
+            print(f"Released {ledger.release(None if pdf == 'all' else pdf)} PDFs from quarantine")
+            return
+        entries = ledger.quarantined()
+        print(f"{len(entries)} quarantined PDFs")
+        for pdf, q in entries.items():
+            print(f"  ⛔ {q['ac_id'] or '-':10s} x{q['failures']} since {format_time(q['since'])}  {pdf}")
+            print(f"       {(q['error'] or '')[:100]}")
+        return
+
+    if args[0] == 'dpi':
+        records = ledger.dpi_records()
+        print(f"{len(records)} scanned PDFs with a recorded OCR resolution")
+        for r in records:
+            pages = ', '.join(f"{n} at {dpi}" for dpi, n in sorted(json.loads(r['pages'] or '{}').items()))
+            print(f"  {r['ac_id'] or '-':10s} start {r['dpi']:3d} DPI  (pages {pages})  {r['pdf']}")
+        return
+
+    if args[0] == 'list':
+        print(f"{'run':24s} {'script':28s} {'started':17s} {'status':10s} {'done':>11s} {'failed':>7s}")
+        for r in ledger.runs():
+            print(f"{r['run_id']:24s} {r['script']:28s} {format_time(r['started']):17s} "
+                  f"{r['status']:10s} {r['done'] or 0:5d}/{r['acs']:<5d} {r['failed'] or 0:7d}")
+        return
+
+    if len(args) < 2 or not ledger.run(args[1]):
+        print(f"❌ Unknown run: {args[1] if len(args) > 1 else ''}")
+        sys.exit(1)
+    run_id = args[1]
+
+    if args[0] == 'pages':
+        if len(args) < 3:
+            print("Usage: run_ledger.py pages RUN AC_ID")
+            sys.exit(1)
+        for page, data in sorted(ledger.load_pages(run_id, args[2]).items()):
+            print(f"  page {page:3d}: {len(data)} booths")
+        return
+
+    status = args[args.index('--status') + 1] if '--status' in args else None
+    run = ledger.run(run_id)
+    print("=" * 70)
+    print(f"RUN {run_id} ({run['script']} {' '.join(json.loads(run['args'] or '[]'))})")
+    print("=" * 70)
+    print(f"  Started: {format_time(run['started'])}  Finished: {format_time(run['finished'])}  "
+          f"Status: {run['status']}")
+    print(f"  Tasks: {ledger.counts(run_id)}")
+    print(f"  Outcomes: {ledger.outcomes(run_id)}")
+    print()
+    for t in ledger.tasks(run_id, status):
+        dur = f"{t['finished'] - t['started']:7.1f}s" if t['finished'] and t['started'] else f"{'-':>8s}"
+        icon = {'done': '✅', 'failed': '❌', 'running': '⏳'}.get(t['status'], '  ')
+        error = f"  {t['error'][:80]}" if t['error'] else ''
+        print(f"  {icon} {t['ac_id']:10s} {t['status']:8s} x{t['attempts']} {dur}{error}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Pipeline Timing Spans
+=====================
+Lightweight per-stage timing for the extraction pipeline.
+
+Every stage (catalog lookup, rasterize, preprocess, OCR call, parse, column
+correction, validation, write) is wrapped in a span. Spans nest: a span
+inherits the tags of its enclosing span (AC, page, ...) and records its
+parent, so the per-AC tree can be rebuilt afterwards.
+
+Recording is off unless a span directory is configured, either with
+enable(dir) or through the ELECTIONLENS_SPANS environment variable (which
+pool workers inherit). Each process appends to its own
+spans-<pid>.jsonl file, one JSON object per finished span:
+
+    {"id": "4711-12", "parent": "4711-3", "stage": "ocr", "ts": 1718000000.1,
+     "dur": 1.734, "pid": 4711, "rss_mb": 412.3, "peak_mb": 498.0,
+     "ac": "TN-001", "page": 3, "method": "standard", "psm": 6}
+
+rss_mb/peak_mb are the worker's RSS at the end of and peak RSS during the
+stage (see memory_budget.py); with ELECTIONLENS_TRACE_ALLOC set, alloc_mb
+is the peak of traced Python/NumPy allocations.
+
+The summary merges all files of a directory and shows the hottest stages,
+OCR calls per booth recovered and the critical path of every AC.
+
+Usage:
+    python scripts/unified-pdf-parser.py 1-10 --spans /tmp/spans
+    python scripts/spans.py summary /tmp/spans
+    python scripts/spans.py summary /tmp/spans --top 20 --acs 5
+"""
+
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from memory_budget import MB, PeakTracker, tracing_alloc
+
+ENV_VAR = 'ELECTIONLENS_SPANS'
+
+# Stages whose spans are OCR engine calls
+OCR_STAGES = ('ocr', 'ocr_surya')
+
+
+# ============================================================================
+# Recording
+# ============================================================================
+
+_local = threading.local()
+_counter = itertools.count(1)
+_sink = {'pid': None, 'file': None}
+
+
+def enable(directory) -> Path:
+    """Record spans of this process (and pool workers started later) into directory."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    os.environ[ENV_VAR] = str(directory)
+    return directory
+
+
+def enabled() -> bool:
+    return bool(os.environ.get(ENV_VAR))
+
+
+def _stack() -> list:
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def _write(record: dict):
+    pid = os.getpid()
+    if _sink['pid'] != pid:
+        # First span in this process (or a forked worker that inherited the
+        # parent's handle): open our own file.
+        directory = Path(os.environ[ENV_VAR])
+        directory.mkdir(parents=True, exist_ok=True)
+        _sink['file'] = open(directory / f"spans-{pid}.jsonl", 'a', buffering=1)
+        _sink['pid'] = pid
+    _sink['file'].write(json.dumps(record) + '\n')
+
+
+@contextmanager
+def span(stage: str, **tags):
+    """Time a pipeline stage.
+
+    Yields a dict of tags; values added to it inside the block (e.g. the
+    number of booths parsed) are recorded with the span. Nested spans
+    inherit these tags.
+    """
+    if not enabled():
+        yield {}
+        return
+
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    record_tags = dict(parent['tags']) if parent else {}
+    record_tags.update(tags)
+    current = {'id': f"{os.getpid()}-{next(_counter)}", 'tags': record_tags}
+    stack.append(current)
+
+    memory = PeakTracker().start()
+    ts = time.time()
+    start = time.perf_counter()
+    error = None
+    try:
+        yield record_tags
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        dur = time.perf_counter() - start
+        memory.stop()
+        stack.pop()
+        record = {'id': current['id'], 'parent': parent['id'] if parent else None,
+                  'stage': stage, 'ts': round(ts, 6), 'dur': round(dur, 6),
+                  'pid': os.getpid(), 'rss_mb': round(memory.rss_end / MB, 1),
+                  'peak_mb': round(memory.peak / MB, 1)}
+        if tracing_alloc():
+            record['alloc_mb'] = round(memory.alloc_peak / MB, 1)
+        record.update(record_tags)
+        if error:
+            record['error'] = error
+        _write(record)
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+
+def load_spans(directory) -> list[dict]:
+    """Merge the span files of all processes of a run."""
+    spans = []
+    for path in sorted(Path(directory).glob('spans-*.jsonl')):
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    spans.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Truncated last line of a killed worker
+                    continue
+    return spans
+
+
+# ============================================================================
+# Summary
+# ============================================================================
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def self_times(spans: list[dict]) -> dict:
+    """Span id -> duration minus the time spent in its direct children."""
+    child_time = defaultdict(float)
+    for s in spans:
+        if s.get('parent'):
+            child_time[s['parent']] += s['dur']
+    return {s['id']: max(0.0, s['dur'] - child_time[s['id']]) for s in spans}
+
+
+def stage_table(spans: list[dict]) -> list[dict]:
+    """Per-stage call count, total/self time and latency percentiles, hottest first."""
+    own = self_times(spans)
+    by_stage = defaultdict(list)
+    for s in spans:
+        by_stage[s['stage']].append(s)
+
+    rows = []
+    for stage, items in by_stage.items():
+        durs = [s['dur'] for s in items]
+        rows.append({
+            'stage': stage,
+            'calls': len(items),
+            'total': sum(durs),
+            'self': sum(own[s['id']] for s in items),
+            'mean': sum(durs) / len(durs),
+            'p95': percentile(durs, 0.95),
+            'errors': sum(1 for s in items if 'error' in s),
+            'peak_mb': max((s.get('peak_mb', 0) for s in items), default=0),
+        })
+    return sorted(rows, key=lambda r: -r['self'])
+
+
+def ocr_yield(spans: list[dict]) -> list[dict]:
+    """OCR calls per booth recovered, per AC.
+
+    Booths recovered come from the 'booths' tag of the AC root span
+    (set by process_ac after extraction).
+    """
+    calls = defaultdict(int)
+    ocr_time = defaultdict(float)
+    booths = {}
+    for s in spans:
+        ac = s.get('ac')
+        if not ac:
+            continue
+        if s['stage'] in OCR_STAGES:
+            calls[ac] += 1
+            ocr_time[ac] += s['dur']
+        if s['stage'] == 'ac' and 'booths' in s:
+            booths[ac] = s['booths']
+
+    rows = []
+    for ac in sorted(calls):
+        recovered = booths.get(ac, 0)
+        rows.append({
+            'ac': ac,
+            'ocr_calls': calls[ac],
+            'ocr_time': ocr_time[ac],
+            'booths': recovered,
+            'calls_per_booth': calls[ac] / recovered if recovered else None,
+        })
+    return rows
+
+
+def critical_paths(spans: list[dict]) -> list[dict]:
+    """For each AC root span, the chain of longest children down the tree.
+
+    Stages inside an AC run sequentially, so the root's wall time is the sum
+    of its children plus self time; following the longest child at every
+    level shows where that AC's time actually went.
+    """
+    children = defaultdict(list)
+    for s in spans:
+        if s.get('parent'):
+            children[s['parent']].append(s)
+
+    paths = []
+    for root in spans:
+        if root['stage'] != 'ac':
+            continue
+        path = []
+        node = root
+        while children.get(node['id']):
+            kids = children[node['id']]
+            # Aggregate repeated stages (e.g. one 'page' span per page) so a
+            # long tail of short calls is not hidden behind the single longest one
+            by_stage = defaultdict(list)
+            for k in kids:
+                by_stage[k['stage']].append(k)
+            stage, group = max(by_stage.items(), key=lambda kv: sum(k['dur'] for k in kv[1]))
+            path.append({'stage': stage, 'calls': len(group),
+                         'dur': sum(k['dur'] for k in group),
+                         'share': sum(k['dur'] for k in group) / node['dur'] if node['dur'] else 0.0})
+            node = max(group, key=lambda k: k['dur'])
+        paths.append({'ac': root.get('ac'), 'dur': root['dur'],
+                      'pdf_type': root.get('pdf_type'), 'status': root.get('status'),
+                      'path': path})
+    return sorted(paths, key=lambda p: -p['dur'])
+
+
+def summarize(directory, top: int = 15, num_acs: int = 10) -> dict:
+    spans = load_spans(directory)
+    stages = stage_table(spans)
+    yields = ocr_yield(spans)
+    paths = critical_paths(spans)
+
+    wall = 0.0
+    if spans:
+        wall = max(s['ts'] + s['dur'] for s in spans) - min(s['ts'] for s in spans)
+
+    print("=" * 70)
+    print(f"SPAN SUMMARY: {directory}")
+    print("=" * 70)
+    print(f"  Spans: {len(spans):,}  Processes: {len({s['pid'] for s in spans})}  "
+          f"Wall: {wall:.1f}s")
+
+    print("\n  Hottest stages (by self time):")
+    print(f"    {'stage':20s} {'calls':>7s} {'self s':>9s} {'total s':>9s} "
+          f"{'mean ms':>9s} {'p95 ms':>9s} {'peak MB':>8s}")
+    for r in stages[:top]:
+        err = f"  ⚠️ {r['errors']} errors" if r['errors'] else ''
+        print(f"    {r['stage']:20s} {r['calls']:7d} {r['self']:9.2f} {r['total']:9.2f} "
+              f"{r['mean'] * 1000:9.1f} {r['p95'] * 1000:9.1f} {r['peak_mb']:8.0f}{err}")
+
+    if yields:
+        total_calls = sum(r['ocr_calls'] for r in yields)
+        total_booths = sum(r['booths'] for r in yields)
+        overall = f"{total_calls / total_booths:.2f}" if total_booths else 'n/a'
+        print(f"\n  OCR calls per booth recovered: {overall} "
+              f"({total_calls:,} calls, {total_booths:,} booths)")
+        worst = sorted(yields, key=lambda r: -(r['calls_per_booth'] or float('inf')))
+        for r in worst[:num_acs]:
+            ratio = f"{r['calls_per_booth']:.2f}" if r['calls_per_booth'] is not None else '∞'
+            print(f"    {r['ac']:8s} {r['ocr_calls']:5d} calls  {r['booths']:4d} booths  "
+                  f"{ratio:>6s}/booth  {r['ocr_time']:7.1f}s OCR")
+
+    if paths:
+        print("\n  Critical paths (slowest ACs):")
+        for p in paths[:num_acs]:
+            chain = ' → '.join(f"{step['stage']}×{step['calls']} {step['dur']:.1f}s ({step['share']:.0%})"
+                               if step['calls'] > 1 else
+                               f"{step['stage']} {step['dur']:.1f}s ({step['share']:.0%})"
+                               for step in p['path'])
+            print(f"    {p['ac']} [{p.get('pdf_type') or '?'}, {p.get('status') or '?'}] "
+                  f"{p['dur']:.1f}s: {chain}")
+
+    return {'stages': stages, 'ocr_yield': yields, 'critical_paths': paths}
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def arg_value(args: list[str], name: str, default=None):
+    if name in args:
+        i = args.index(name)
+        if i + 1 < len(args):
+            return args[i + 1]
+    return default
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 2 or args[0] != 'summary':
+        print(__doc__)
+        sys.exit(1)
+
+    directory = Path(args[1])
+    if not directory.is_dir():
+        print(f"❌ No span directory: {directory}")
+        sys.exit(1)
+
+    report = summarize(directory,
+                       top=int(arg_value(args, '--top', 15)),
+                       num_acs=int(arg_value(args, '--acs', 10)))
+
+    out = arg_value(args, '--json')
+    if out:
+        with open(out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n  Written {out}")
+
+
+if __name__ == '__main__':
+    main()
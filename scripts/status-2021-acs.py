@@ -8,10 +8,14 @@ import json
 import re
 from pathlib import Path
 from collections import defaultdict
+import sys
 
-OUTPUT_BASE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-AC_DATA = Path("/Users/p0s097d/ElectionLens/public/data/elections/ac/TN/2021.json")
-SCHEMA = Path("/Users/p0s097d/ElectionLens/public/data/schema.json")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+OUTPUT_BASE = PATHS.booths / "TN"
+AC_DATA = PATHS.elections / "ac/TN/2021.json"
+SCHEMA = PATHS.schema
 
 
 def load_data():
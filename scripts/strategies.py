@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Extraction Strategy Registry
+============================
+One extraction engine for every election: strategies (pdfplumber tables,
+text lines, pdftotext, tesseract, Surya, ...) register themselves here and
+the engine decides per AC which to run and in which order.
+
+Every strategy run is recorded in the run ledger (strategy_runs table) with
+the booths it added and its cost, per AC and per layout family (PDF type,
+page orientation, candidate-column count). Strategies are then run in
+expected-value order for the AC's layout family: expected share of the
+AC's booths gained per second, with the registered priors standing in
+until there is history. A strategy that never added a booth in
+MIN_TRIALS runs on a layout is skipped for it (every EXPLORE_EVERY-th AC
+still tries it, so a layout change is noticed).
+
+The engine stops once every expected booth is found; fallback strategies
+only run while coverage is below their run_below threshold. Strategies
+return every reading they made as a BoothTable (booth_table.py); the
+readings of all strategies are kept side by side and merged per booth,
+by highest confidence or by consensus (Election.merge).
+
+Per-election config (Election.strategies / strategy_order in
+unified-pdf-parser.py, or the election JSON of extract_driver.py runs)
+restricts the strategies and can pin their order.
+
+Usage:
+    from strategies import register, run_strategies
+
+    @register('tables', 'text', prior_gain=0.9, seconds_per_page=0.3)
+    def tables(ctx):                # -> BoothTable of its readings
+        ...
+
+    python scripts/strategies.py            # stats per layout family and strategy
+    python scripts/strategies.py --layout scanned-landscape-9-15
+"""
+
+import sys
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from booth_table import BoothTable
+from electionlens.lazy import lazy_import
+from spans import span
+
+np = lazy_import('numpy')
+
+# Runs of a strategy on a layout before history overrides its priors fully;
+# the priors count as this many runs
+PRIOR_RUNS = 2
+# A strategy that added nothing in this many runs on a layout is skipped...
+MIN_TRIALS = 5
+# ...except on every EXPLORE_EVERY-th AC (by AC id hash)
+EXPLORE_EVERY = 20
+# Without an expected booth list, fallbacks run below this many booths
+MIN_BOOTHS_UNKNOWN = 50
+
+
+@dataclass
+class Strategy:
+    name: str
+    pdf_type: str                   # 'text' or 'scanned'
+    run: Callable                   # (ExtractionContext) -> BoothTable
+    prior_gain: float = 0.5         # expected share of an AC's booths it finds
+    seconds_per_page: float = 1.0   # expected cost
+    run_below: float = float('inf') # only run while coverage is below this
+
+
+@dataclass
+class ExtractionContext:
+    pdf_path: Path
+    num_candidates: int
+    ac_id: str
+    pdf_type: str
+    pages: int = 0
+    layout: str = ''
+    expected: set = field(default_factory=set)   # booth numbers to find
+    checkpoint: object = None
+    merge: str = 'best'                          # booth_table.MERGES
+    readings: Optional[BoothTable] = None        # every row read so far, all strategies
+    found: Optional[BoothTable] = None           # readings merged: one row per booth
+    errors: list = field(default_factory=list)
+    warnings: list = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.readings is None:
+            self.readings = BoothTable.empty(self.num_candidates)
+        if self.found is None:
+            self.found = self.readings.merge(self.merge)
+
+    @property
+    def max_booth(self) -> int:
+        return max(self.expected) if self.expected else 500
+
+    def coverage(self) -> float:
+        if self.expected:
+            return int(np.isin(self.found.booth_nos, list(self.expected)).sum()) / len(self.expected)
+        # Unknown booth list: fallbacks stop at MIN_BOOTHS_UNKNOWN booths
+        return min(1.0, len(self.found) / MIN_BOOTHS_UNKNOWN)
+
+
+REGISTRY: dict[str, Strategy] = {}
+
+
+def register(name: str, pdf_type: str, prior_gain: float = 0.5, seconds_per_page: float = 1.0,
+             run_below: float = float('inf')):
+    """Decorator: register an extraction strategy under a name."""
+    def decorator(func):
+        REGISTRY[name] = Strategy(name, pdf_type, func, prior_gain, seconds_per_page, run_below)
+        return func
+    return decorator
+
+
+# ============================================================================
+# Layout families and ordering
+# ============================================================================
+
+def candidate_bucket(num_candidates: int) -> str:
+    if num_candidates <= 8:
+        return '1-8'
+    if num_candidates <= 15:
+        return '9-15'
+    return '16+'
+
+
+def layout_family(pdf_type: str, landscape: bool, num_candidates: int) -> str:
+    """e.g. 'scanned-landscape-9-15': PDF type, orientation, candidate columns."""
+    return f"{pdf_type}-{'landscape' if landscape else 'portrait'}-{candidate_bucket(num_candidates)}"
+
+
+def expected_value(strategy: Strategy, stats: Optional[dict], pages: int) -> float:
+    """Expected share of the AC's booths gained per second, priors blended with history."""
+    runs = stats['runs'] if stats else 0
+    gain = ((stats['gain'] if stats else 0.0) + strategy.prior_gain * PRIOR_RUNS) / (runs + PRIOR_RUNS)
+    prior_seconds = strategy.seconds_per_page * max(pages, 1)
+    seconds = ((stats['seconds'] if stats else 0.0) + prior_seconds * PRIOR_RUNS) / (runs + PRIOR_RUNS)
+    return gain / max(seconds, 1e-3)
+
+
+def plan(ctx: ExtractionContext, history: dict[str, dict], allowed: tuple = (),
+         order: str = 'history') -> tuple[list[Strategy], list[str]]:
+    """Strategies to try for an AC, best expected value first; also the skipped names.
+
+    allowed restricts the strategies (per-election config); with
+    order='fixed' they run in the given order and none is skipped.
+    """
+    candidates = [s for s in REGISTRY.values() if s.pdf_type == ctx.pdf_type]
+    if allowed:
+        candidates = [REGISTRY[name] for name in allowed
+                      if name in REGISTRY and REGISTRY[name].pdf_type == ctx.pdf_type]
+    if order == 'fixed':
+        return candidates, []
+
+    ranked, skipped = [], []
+    for strategy in candidates:
+        stats = history.get(strategy.name)
+        explore = zlib.crc32(f"{ctx.ac_id}:{strategy.name}".encode()) % EXPLORE_EVERY == 0
+        if stats and stats['runs'] >= MIN_TRIALS and stats['wins'] == 0 and not explore:
+            skipped.append(strategy.name)
+            continue
+        ranked.append(strategy)
+    ranked.sort(key=lambda s: -expected_value(s, history.get(s.name), ctx.pages))
+    return ranked, skipped
+
+
+# ============================================================================
+# Engine
+# ============================================================================
+
+def run_strategies(ctx: ExtractionContext, strategies: list[Strategy]) -> list[dict]:
+    """Run strategies in order, merging their readings; returns one record per run.
+
+    With ctx.merge 'best' a booth found by several strategies keeps the
+    highest-confidence reading (the earlier strategy on ties); with
+    'consensus' the reading most of the confidence agrees on. Stops once
+    every expected booth is found; without a booth list every planned
+    strategy runs.
+    """
+    runs = []
+    for strategy in strategies:
+        if ctx.expected and ctx.coverage() >= 1.0:
+            break
+        if ctx.coverage() >= strategy.run_below:
+            continue
+        before, covered = len(ctx.found), ctx.coverage()
+        start = time.time()
+        with span('strategy', strategy=strategy.name) as tags:
+            try:
+                readings = strategy.run(ctx)
+            except Exception as e:
+                # A failed fallback only costs coverage
+                issues = ctx.errors if strategy.run_below == float('inf') else ctx.warnings
+                issues.append(f"{strategy.name} extraction error: {e}")
+                readings = None
+            booths = readings.num_booths if readings is not None else 0
+            tags['booths'] = booths
+        if readings is not None and len(readings):
+            ctx.readings = BoothTable.concat([ctx.readings, readings])
+            ctx.found = ctx.readings.merge(ctx.merge)
+        # Merging never drops a booth number: the growth is the new booths
+        new = len(ctx.found) - before
+        # Gain: share of the AC's booths this run added
+        gain = ctx.coverage() - covered if ctx.expected else new / max(len(ctx.found), 1)
+        runs.append({'strategy': strategy.name, 'booths': booths, 'new_booths': new,
+                     'gain': gain, 'seconds': time.time() - start})
+    return runs
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    from run_ledger import LEDGER_PATH, RunLedger
+
+    args = sys.argv[1:]
+    ledger = RunLedger(args[args.index('--ledger') + 1] if '--ledger' in args else LEDGER_PATH)
+    layout = args[args.index('--layout') + 1] if '--layout' in args else None
+
+    print("=" * 70)
+    print("EXTRACTION STRATEGIES BY LAYOUT FAMILY")
+    print("=" * 70)
+    layouts = ledger.strategy_layouts() if layout is None else [layout]
+    if not layouts:
+        print("  No strategy runs recorded yet")
+    for family in layouts:
+        stats = ledger.strategy_stats(family)
+        print(f"\n  {family}")
+        print(f"    {'strategy':14s} {'runs':>5s} {'wins':>6s} {'gain':>6s} {'sec/run':>8s} {'EV':>8s}")
+        rows = []
+        for name, s in stats.items():
+            strategy = REGISTRY.get(name) or Strategy(name, '', None, prior_gain=0.0)
+            rows.append((expected_value(strategy, s, 0), name, s))
+        for ev, name, s in sorted(rows, reverse=True):
+            never = '  ⚠️ never wins' if s['runs'] >= MIN_TRIALS and s['wins'] == 0 else ''
+            print(f"    {name:14s} {s['runs']:5d} {s['wins'] / s['runs']:6.0%} {s['gain'] / s['runs']:6.1%} "
+                  f"{s['seconds'] / s['runs']:8.1f} {ev:8.4f}{never}")
+
+
+if __name__ == '__main__':
+    main()
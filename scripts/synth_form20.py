@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Synthetic Form 20 Generator
+===========================
+Generates Form 20-style result PDFs from ground-truth vote matrices, so the
+extraction pipeline can be load- and accuracy-tested offline on any number
+of ACs.
+
+Each AC produces:
+    {out}/{AC_ID}.pdf          - text PDF (real text objects + ruled table)
+                                 or a rasterized scan (image-only PDF)
+    {out}/{AC_ID}.truth.json   - candidates, booth votes, layout parameters
+and the run writes {out}/manifest.json listing every AC.
+
+Scans can be degraded with Gaussian noise, speckle, skew, 90° page rotation
+and the transposed layout (candidates as rows, booths as columns) seen in
+some districts' Form 20s. Everything is seeded: the same arguments always
+produce the same files.
+
+Usage:
+    # 100 text PDFs, 150-400 booths, 6-30 candidates
+    python scripts/synth_form20.py --out /tmp/form20 --acs 100
+
+    # 1000 noisy scans at 200 DPI, 20% transposed, on all cores
+    python scripts/synth_form20.py --out /tmp/form20-scans --acs 1000 --kind scan \\
+        --noise 0.08 --skew 1.5 --rotate 0.05 --transpose 0.2
+
+    # Re-render real booth results as Form 20 (truth = public/data)
+    python scripts/synth_form20.py --out /tmp/form20-real --from-data TN 2024 --acs 20
+
+Options:
+    --kind text|scan|mixed   --booths MIN-MAX   --candidates MIN-MAX
+    --dpi N (scans, default 200)   --seed N   --workers N
+"""
+
+import io
+import json
+import sys
+import time
+import zlib
+from dataclasses import asdict, dataclass, field
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+sys.path.insert(0, str(Path(__file__).parent))
+from booth_matrix import iter_ac_ids, load_booth_matrix
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+PAGE_W, PAGE_H = 842, 595          # A4 landscape, points
+MARGIN = 28
+HEADER_LINES = 3
+BOOTHS_PER_TRANSPOSED_PAGE = 16
+JPEG_QUALITY = 75
+SUMMARY_COLUMNS = ['Total Valid', 'Rejected', 'NOTA', 'Total', 'Tendered']
+
+PARTIES = ['DMK', 'ADMK', 'BJP', 'INC', 'PMK', 'NTK', 'DMDK', 'VCK', 'CPI', 'CPI(M)',
+           'MDMK', 'AMMK', 'BSP', 'MNM', 'IUML', 'SDPI']
+FIRST_NAMES = ['Murugan', 'Lakshmi', 'Senthil', 'Kavitha', 'Ramesh', 'Saravanan', 'Priya',
+               'Karthik', 'Selvi', 'Arun', 'Meena', 'Vijay', 'Anbu', 'Devi', 'Ganesh', 'Rani']
+INITIALS = 'ABCDEGKMNPRSTV'
+
+
+# ============================================================================
+# Ground Truth
+# ============================================================================
+
+@dataclass
+class SynthAC:
+    """Ground truth and layout parameters for one synthetic AC."""
+    ac_id: str
+    ac_name: str
+    candidates: list[dict]             # last entry is NOTA (repo convention)
+    booth_labels: list[str]            # "1", "2", "2A", "3W", ...
+    votes: list[list[int]]             # booths x candidates (NOTA last)
+    rejected: list[int]
+    tendered: list[int]
+    kind: str = 'text'                 # 'text' | 'scan'
+    transposed: bool = False
+    rotated: bool = False
+    skew: float = 0.0
+    noise: float = 0.0
+    dpi: int = 200
+    seed: int = 0
+    source: str = 'synthetic'
+    pages: int = 0
+
+    def truth(self) -> dict:
+        data = asdict(self)
+        data['booths'] = {label: {'votes': votes, 'rejected': rej, 'total': sum(votes) + rej}
+                          for label, votes, rej in zip(self.booth_labels, self.votes, self.rejected)}
+        for key in ('booth_labels', 'votes', 'rejected', 'tendered'):
+            data.pop(key)
+        return data
+
+
+def synth_candidates(rng: np.random.Generator, n: int) -> list[dict]:
+    parties = list(rng.permutation(PARTIES))[:max(n - 1, 0)]
+    parties += ['IND'] * (n - 1 - len(parties))
+    cands = []
+    for party in parties:
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(list(INITIALS))}."
+        cands.append({'name': name, 'party': party})
+    cands.append({'name': 'NOTA', 'party': 'NOTA'})
+    return cands
+
+
+def synth_votes(rng: np.random.Generator, num_booths: int, num_candidates: int) -> np.ndarray:
+    """Booths x candidates matrix: a few strong parties, a long tail, local swing."""
+    concentration = np.full(num_candidates, 0.3)
+    concentration[:min(3, num_candidates)] = 6.0
+    strength = rng.dirichlet(concentration)
+    strength = np.r_[strength[:-1], 0.01]   # NOTA ~1%
+    strength = strength / strength.sum()
+    voters = np.clip(rng.normal(650, 220, num_booths), 40, 1450).astype(np.int64)
+    local = rng.dirichlet(strength * 60 + 0.05, size=num_booths)
+    votes = np.zeros((num_booths, num_candidates), dtype=np.int64)
+    for b in range(num_booths):
+        votes[b] = rng.multinomial(voters[b], local[b])
+    return votes
+
+
+def booth_labels(rng: np.random.Generator, num_booths: int) -> list[str]:
+    """Station numbers with occasional auxiliary ("12A") and women ("12W") booths."""
+    labels, n = [], 0
+    while len(labels) < num_booths:
+        n += 1
+        labels.append(str(n))
+        r = rng.random()
+        if r < 0.04 and len(labels) < num_booths:
+            labels.append(f"{n}A")
+        elif r < 0.06 and len(labels) < num_booths:
+            labels.append(f"{n}W")
+    return labels
+
+
+def make_ac(index: int, opts: dict) -> SynthAC:
+    seed = opts['seed'] * 100_003 + index
+    rng = np.random.default_rng(seed)
+    num_booths = int(rng.integers(opts['booths'][0], opts['booths'][1] + 1))
+    num_cands = int(rng.integers(opts['candidates'][0], opts['candidates'][1] + 1))
+    votes = synth_votes(rng, num_booths, num_cands)
+
+    kind = opts['kind']
+    if kind == 'mixed':
+        kind = 'scan' if rng.random() < 0.5 else 'text'
+    scan = kind == 'scan'
+    return SynthAC(
+        ac_id=f"SY-{index + 1:03d}" if index < 999 else f"SY-{index + 1}",
+        ac_name=f"SYNTH {index + 1}",
+        candidates=synth_candidates(rng, num_cands),
+        booth_labels=booth_labels(rng, num_booths),
+        votes=votes.tolist(),
+        rejected=rng.poisson(0.6, num_booths).tolist(),
+        tendered=(rng.random(num_booths) < 0.02).astype(int).tolist(),
+        kind=kind,
+        transposed=bool(rng.random() < opts['transpose']),
+        rotated=bool(scan and rng.random() < opts['rotate']),
+        skew=float(rng.uniform(-opts['skew'], opts['skew'])) if scan else 0.0,
+        noise=opts['noise'] if scan else 0.0,
+        dpi=opts['dpi'],
+        seed=seed,
+    )
+
+
+def ac_from_data(state: str, year: int, ac_id: str, index: int, opts: dict) -> Optional[SynthAC]:
+    """SynthAC whose truth is a real booth results file."""
+    bm = load_booth_matrix(state, ac_id, year)
+    if bm is None or not bm.num_booths:
+        return None
+    ac = make_ac(index, {**opts, 'booths': (1, 1), 'candidates': (3, 3)})
+    keep = bm.has_votes
+    labels = [bid.split('-', 2)[-1].lstrip('0') or '0' for bid, k in zip(bm.booth_ids, keep) if k]
+    ac.ac_id, ac.ac_name, ac.source = ac_id, bm.ac_name, f"{state}/{ac_id}/{year}.json"
+    ac.candidates = [{'name': c.get('name', ''), 'party': c.get('party', '')} for c in bm.candidates]
+    ac.booth_labels = labels
+    ac.votes = bm.votes[keep].tolist()
+    ac.rejected = bm.rejected[keep].tolist()
+    ac.tendered = [0] * len(labels)
+    return ac
+
+
+# ============================================================================
+# Page Layout
+# ============================================================================
+
+@dataclass
+class Page:
+    """Text items and ruling lines of one page, in points (origin top-left)."""
+    texts: list[tuple[float, float, float, str]] = field(default_factory=list)   # x, y, size, text
+    lines: list[tuple[float, float, float, float]] = field(default_factory=list)  # x0, y0, x1, y1
+
+
+def table_page(header: list[str], rows: list[list[str]], title: list[str], first_col_w: float = 0) -> Page:
+    """Ruled grid with a title block; column width shrinks to fit the page."""
+    page = Page()
+    for i, line in enumerate(title):
+        page.texts.append((MARGIN, MARGIN + 12 + i * 13, 10 if i == 0 else 8, line))
+
+    top = MARGIN + HEADER_LINES * 13 + 10
+    ncols = len(header)
+    first_w = first_col_w or 0
+    col_w = (PAGE_W - 2 * MARGIN - first_w) / (ncols - (1 if first_w else 0))
+    widths = ([first_w] if first_w else []) + [col_w] * (ncols - (1 if first_w else 0))
+    font = max(4.0, min(8.0, col_w / 3.2))
+    head_h, row_h = font * 3.2, font * 1.9
+
+    xs = [MARGIN]
+    for w in widths:
+        xs.append(xs[-1] + w)
+    y = top
+    for i, text in enumerate(header):
+        page.texts.append((xs[i] + 1.5, y + font * 1.3, font * 0.85, text[:int(widths[i] / (font * 0.45))]))
+    y += head_h
+    for row in rows:
+        for i, text in enumerate(row):
+            page.texts.append((xs[i] + 1.5, y + font * 1.35, font, text))
+        y += row_h
+
+    for x in xs:
+        page.lines.append((x, top, x, y))
+    page.lines.append((xs[0], top, xs[-1], top))
+    page.lines.append((xs[0], top + head_h, xs[-1], top + head_h))
+    for k in range(len(rows) + 1):
+        yy = top + head_h + k * row_h
+        page.lines.append((xs[0], yy, xs[-1], yy))
+    return page
+
+
+def rows_per_page(ncols: int) -> int:
+    col_w = (PAGE_W - 2 * MARGIN) / ncols
+    font = max(4.0, min(8.0, col_w / 3.2))
+    usable = PAGE_H - 2 * MARGIN - HEADER_LINES * 13 - 10 - font * 3.2
+    return max(1, int(usable // (font * 1.9)))
+
+
+def booth_row(ac: SynthAC, b: int, serial: int) -> list[str]:
+    votes = ac.votes[b]
+    valid = sum(votes[:-1])
+    nota = votes[-1]
+    return ([str(serial), ac.booth_labels[b]] + [str(v) for v in votes[:-1]]
+            + [str(valid), str(ac.rejected[b]), str(nota),
+               str(valid + ac.rejected[b] + nota), str(ac.tendered[b])])
+
+
+def layout_pages(ac: SynthAC) -> list[Page]:
+    title = ["FORM 20", "FINAL RESULT SHEET",
+             f"Assembly Constituency: {ac.ac_name} ({ac.ac_id})"]
+    names = [f"{c['name']} ({c['party']})" for c in ac.candidates[:-1]]
+    num_booths = len(ac.booth_labels)
+
+    if not ac.transposed:
+        header = ['Sl.No', 'Station'] + names + SUMMARY_COLUMNS
+        per_page = rows_per_page(len(header))
+        return [table_page(header, [booth_row(ac, b, b + 1) for b in range(s, min(s + per_page, num_booths))], title)
+                for s in range(0, num_booths, per_page)]
+
+    # Transposed: one row per candidate / summary line, one column per booth
+    pages = []
+    for s in range(0, num_booths, BOOTHS_PER_TRANSPOSED_PAGE):
+        idx = list(range(s, min(s + BOOTHS_PER_TRANSPOSED_PAGE, num_booths)))
+        rows = [booth_row(ac, b, b + 1) for b in idx]
+        labels = ['Sl.No', 'Station'] + names + SUMMARY_COLUMNS
+        body = [[labels[r]] + [row[r] for row in rows] for r in range(1, len(labels))]
+        pages.append(table_page([labels[0]] + [row[0] for row in rows], body, title, first_col_w=150))
+    return pages
+
+
+# ============================================================================
+# Text PDF Writer
+# ============================================================================
+
+def pdf_escape(text: str) -> str:
+    text = text.encode('latin-1', 'replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def page_stream(page: Page) -> bytes:
+    ops = ['0.4 w']
+    for x0, y0, x1, y1 in page.lines:
+        ops.append(f"{x0:.2f} {PAGE_H - y0:.2f} m {x1:.2f} {PAGE_H - y1:.2f} l S")
+    for x, y, size, text in page.texts:
+        ops.append(f"BT /F1 {size:.2f} Tf {x:.2f} {PAGE_H - y:.2f} Td ({pdf_escape(text)}) Tj ET")
+    return '\n'.join(ops).encode('latin-1')
+
+
+def write_pdf(path: Path, objects_for_pages: list[tuple[bytes, bytes]]):
+    """
+    Minimal PDF writer: one (page dict tail, content stream) per page.
+
+    Object 1 is the catalog, 2 the page tree, 3 the Helvetica font; each
+    page adds a page object and a compressed content/image stream.
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    kids = []
+    for resources, stream in objects_for_pages:
+        page_num = len(objects) + 1
+        kids.append(f"{page_num} 0 R")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_W} {PAGE_H}] "
+                       f"/Resources {resources.decode()} /Contents {page_num + 1} 0 R >>".encode())
+        data = zlib.compress(stream)
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+    write_objects(path, objects)
+
+
+def write_objects(path: Path, objects: list[bytes]):
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(bytes(out))
+
+
+def write_text_pdf(path: Path, pages: list[Page]):
+    write_pdf(path, [(b"<< /Font << /F1 3 0 R >> >>", page_stream(p)) for p in pages])
+
+
+# ============================================================================
+# Scanned PDF Rendering
+# ============================================================================
+
+def load_font(size: int):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def render_page(page: Page, dpi: int) -> Image.Image:
+    scale = dpi / 72
+    image = Image.new('L', (int(PAGE_W * scale), int(PAGE_H * scale)), 255)
+    draw = ImageDraw.Draw(image)
+    width = max(1, int(0.5 * scale))
+    for x0, y0, x1, y1 in page.lines:
+        draw.line((x0 * scale, y0 * scale, x1 * scale, y1 * scale), fill=0, width=width)
+    fonts = {}
+    for x, y, size, text in page.texts:
+        px = max(6, int(size * scale))
+        font = fonts.get(px)
+        if font is None:
+            font = fonts[px] = load_font(px)
+        draw.text((x * scale, y * scale - px), text, fill=0, font=font)
+    return image
+
+
+def degrade(image: Image.Image, ac: SynthAC, rng: np.random.Generator) -> Image.Image:
+    """Scanner damage: skew, speckle, Gaussian noise, optional 90° rotation."""
+    if ac.skew:
+        image = image.rotate(ac.skew + rng.normal(0, 0.1), resample=Image.BILINEAR,
+                             expand=False, fillcolor=255)
+    if ac.noise:
+        arr = np.asarray(image, dtype=np.float32)
+        arr += rng.standard_normal(arr.shape, dtype=np.float32) * (ac.noise * 255)
+        speckle = rng.random(arr.shape) < ac.noise * 0.02
+        arr[speckle] = 0
+        image = Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
+    if ac.rotated:
+        image = image.rotate(90, expand=True)
+    return image
+
+
+def write_scan_pdf(path: Path, pages: list[Page], ac: SynthAC):
+    """Image-only PDF: one grayscale JPEG per page (as scanners emit), no text layer."""
+    rng = np.random.default_rng(ac.seed)
+    page_objects = []
+    for page in pages:
+        image = degrade(render_page(page, ac.dpi), ac, rng)
+        w, h = image.size
+        pw, ph = (PAGE_H, PAGE_W) if ac.rotated else (PAGE_W, PAGE_H)
+        stream = f"q {pw} 0 0 {ph} 0 0 cm /Im0 Do Q".encode()
+        buf = io.BytesIO()
+        image.save(buf, 'JPEG', quality=JPEG_QUALITY)
+        page_objects.append((w, h, buf.getvalue(), stream, pw, ph))
+
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< >>"]
+    kids = []
+    for w, h, jpeg, stream, pw, ph in page_objects:
+        page_num = len(objects) + 1
+        kids.append(f"{page_num} 0 R")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {pw} {ph}] "
+                       f"/Resources << /XObject << /Im0 {page_num + 2} 0 R >> >> "
+                       f"/Contents {page_num + 1} 0 R >>".encode())
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(f"<< /Type /XObject /Subtype /Image /Width {w} /Height {h} "
+                       f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /DCTDecode "
+                       f"/Length {len(jpeg)} >>\nstream\n".encode() + jpeg + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+    write_objects(path, objects)
+
+
+# ============================================================================
+# Generation
+# ============================================================================
+
+def generate(job: tuple) -> dict:
+    """Pool entry point: render one AC and its truth file."""
+    ac, out_dir = job
+    pages = layout_pages(ac)
+    ac.pages = len(pages)
+    pdf_path = out_dir / f"{ac.ac_id}.pdf"
+    if ac.kind == 'scan':
+        write_scan_pdf(pdf_path, pages, ac)
+    else:
+        write_text_pdf(pdf_path, pages)
+    with open(out_dir / f"{ac.ac_id}.truth.json", 'w') as f:
+        json.dump(ac.truth(), f, indent=2)
+    return {'ac_id': ac.ac_id, 'pdf': pdf_path.name, 'kind': ac.kind, 'pages': ac.pages,
+            'booths': len(ac.booth_labels), 'candidates': len(ac.candidates),
+            'transposed': ac.transposed, 'rotated': ac.rotated,
+            'bytes': pdf_path.stat().st_size}
+
+
+def parse_range(text: str) -> tuple[int, int]:
+    lo, _, hi = text.partition('-')
+    return int(lo), int(hi or lo)
+
+
+def arg_value(args: list[str], flag: str, default=None):
+    return args[args.index(flag) + 1] if flag in args and args.index(flag) + 1 < len(args) else default
+
+
+def main():
+    args = sys.argv[1:]
+    out = arg_value(args, '--out')
+    if not out:
+        print(__doc__)
+        return
+    opts = {
+        'kind': arg_value(args, '--kind', 'text'),
+        'booths': parse_range(arg_value(args, '--booths', '150-400')),
+        'candidates': parse_range(arg_value(args, '--candidates', '6-30')),
+        'noise': float(arg_value(args, '--noise', 0.05)),
+        'skew': float(arg_value(args, '--skew', 1.0)),
+        'rotate': float(arg_value(args, '--rotate', 0.0)),
+        'transpose': float(arg_value(args, '--transpose', 0.0)),
+        'dpi': int(arg_value(args, '--dpi', 200)),
+        'seed': int(arg_value(args, '--seed', 1)),
+    }
+    num_acs = int(arg_value(args, '--acs', 10))
+    workers = int(arg_value(args, '--workers', cpu_count()))
+    if opts['kind'] != 'text' and not HAS_PIL:
+        print("❌ Pillow is required for scanned output (pip install pillow)")
+        return
+
+    out_dir = Path(out).expanduser()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    if '--from-data' in args:
+        i = args.index('--from-data')
+        state, year = args[i + 1], int(args[i + 2])
+        acs = []
+        for n, ac_id in enumerate(iter_ac_ids(state)):
+            if len(acs) >= num_acs:
+                break
+            ac = ac_from_data(state, year, ac_id, n, opts)
+            if ac:
+                acs.append(ac)
+    else:
+        acs = [make_ac(i, opts) for i in range(num_acs)]
+
+    print("=" * 70)
+    print(f"Generating {len(acs)} synthetic Form 20 PDFs ({opts['kind']}) -> {out_dir}")
+    print("=" * 70)
+
+    start = time.time()
+    jobs = [(ac, out_dir) for ac in acs]
+    if workers > 1 and len(jobs) > 1:
+        with Pool(min(workers, len(jobs))) as pool:
+            entries = list(pool.imap_unordered(generate, jobs, chunksize=4))
+    else:
+        entries = [generate(job) for job in jobs]
+    entries.sort(key=lambda e: e['ac_id'])
+
+    with open(out_dir / 'manifest.json', 'w') as f:
+        json.dump({'options': {**opts, 'acs': num_acs}, 'acs': entries}, f, indent=2)
+
+    elapsed = time.time() - start
+    pages = sum(e['pages'] for e in entries)
+    booths = sum(e['booths'] for e in entries)
+    size = sum(e['bytes'] for e in entries)
+    print(f"✅ {len(entries)} ACs, {pages:,} pages, {booths:,} booths, {size / 1e6:.1f} MB "
+          f"in {elapsed:.1f}s ({pages / max(elapsed, 1e-9):.1f} pages/s)")
+    print(f"   Manifest: {out_dir / 'manifest.json'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Table Grid Segmentation
+=======================
+Cell-level reading of scanned Form 20 tables. The table's ruling lines are
+found with OpenCV morphology (long thin opening kernels keep only
+horizontal / vertical rules, not text) after the page is deskewed by
+projection profile, and every column strip between two vertical rules is OCR'd on its
+own with a digits-only whitelist and the single-column page segmentation
+mode. Values therefore come back already assigned to their column: no
+rebuilding columns from whitespace in a full-page OCR line, which is where
+merged, dropped and shifted columns (and the column-order corrections
+they need) come from.
+
+With a digit recognizer (digit_recognizer.py) the cells are read by a
+NumPy classifier in one batch per page instead, and tesseract only sees
+the cells it is unsure of.
+
+Rules are found once per page layout: GridCache checks a cached grid
+against the next page with a cheap pixel test and only runs the
+morphology again when the rules moved (e.g. the short last page).
+
+Usage:
+    from table_grid import GridCache, grid_rows, read_cells
+
+    grids = GridCache()
+    grid = grids.grid_for(gray)                 # None: no ruled table found
+    cells = read_cells(gray, grid)              # rows x columns, int or None
+    cells = read_cells(gray, grid, load_recognizer())   # NumPy digits, tesseract if unsure
+    cells, scores = read_cells(gray, grid, load_recognizer(), with_confidence=True)
+    for booth_no, votes, rest, missing, conf in grid_rows(cells, num_candidates, max_booth, scores):
+        ...
+
+    python scripts/table_grid.py page.png              # grid found, columns
+    python scripts/table_grid.py page.png --ocr        # also the cell values
+    python scripts/table_grid.py page.png --digits     # cell values, digit recognizer
+    python scripts/table_grid.py page.png --draw out.png
+"""
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.lazy import lazy_import
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+pytesseract = lazy_import('pytesseract')
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# Opening kernels are 1/RULE_KERNEL of the page: longer than any glyph
+# stroke, shorter than a skewed rule's straight runs
+RULE_KERNEL = 50
+# A horizontal rule spans at least this share of the page width, a vertical
+# one this share of the table's height (first to last horizontal rule)
+MIN_RULE_SHARE = 0.3
+MIN_COLUMN_SHARE = 0.5
+# Rules are thickened to this many pixels before projecting
+RULE_SPREAD = 5
+# Deskew when the page leans more than this (degrees); the search tries
+# (step, +/- range) rounds around the best angle so far
+MIN_SKEW = 0.1
+SKEW_SEARCH = [(0.5, 3.0), (0.1, 0.4), (0.02, 0.08)]
+# A cached grid is reused when every one of its rules is inked along this
+# share of its length (a short last page misses its lower rules)
+RULE_INK = 0.7
+# Pixels trimmed inside each cell so the rules are not OCR'd
+CELL_PAD = 3
+# Blank margin around each cell when unsure cells are stacked for one OCR call
+CELL_GAP = 12
+# Recognizer readings below this confidence are checked by tesseract
+MIN_CELL_CONFIDENCE = 0.9
+
+# Digits only, one column of text per strip
+COLUMN_CONFIG = '--psm 4 --oem 3 -c tessedit_char_whitelist=0123456789'
+
+
+@dataclass
+class Grid:
+    """Rule positions of a page's table, in pixels of the deskewed page."""
+    rows: list[int]             # y of the horizontal rules, top to bottom
+    cols: list[int]             # x of the vertical rules, left to right
+    shape: tuple[int, int]      # (height, width) of the page image
+    angle: float = 0.0          # degrees the page was rotated to straighten it
+
+    @property
+    def num_columns(self) -> int:
+        return len(self.cols) - 1
+
+    def fits(self, binary: 'np.ndarray') -> bool:
+        """Whether another page (straightened, binarized) has its rules in the same places."""
+        if binary.shape != self.shape:
+            return False
+        x0, x1, y0, y1 = self.cols[0], self.cols[-1], self.rows[0], self.rows[-1]
+        return (all(binary[max(y - 2, 0):y + 3, x0:x1].max(axis=0).mean() >= RULE_INK * 255
+                    for y in self.rows) and
+                all(binary[y0:y1, max(x - 2, 0):x + 3].max(axis=1).mean() >= RULE_INK * 255
+                    for x in self.cols))
+
+
+# ============================================================================
+# Rule Detection
+# ============================================================================
+
+def binarize(gray: 'np.ndarray') -> 'np.ndarray':
+    """Ink mask (ink 255, paper 0), Otsu threshold."""
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    return binary
+
+
+def rule_masks(binary: 'np.ndarray') -> tuple['np.ndarray', 'np.ndarray']:
+    """Horizontal and vertical rules: the ink that survives a long thin opening."""
+    h, w = binary.shape
+    across = cv2.getStructuringElement(cv2.MORPH_RECT, (max(w // RULE_KERNEL, 20), 1))
+    down = cv2.getStructuringElement(cv2.MORPH_RECT, (1, max(h // RULE_KERNEL, 20)))
+    return cv2.morphologyEx(binary, cv2.MORPH_OPEN, across), cv2.morphologyEx(binary, cv2.MORPH_OPEN, down)
+
+
+def skew_angle(binary: 'np.ndarray') -> float:
+    """Angle (degrees) that straightens the page: the rotation whose row
+    profile is sharpest (rules and text lines each fall in as few rows as
+    possible), searched coarse to fine on a quarter-size copy."""
+    small = cv2.resize(binary, None, fx=0.25, fy=0.25, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    def sharpness(angle: float) -> float:
+        profile = straighten(small, angle, fill=0, min_angle=0).sum(axis=1)
+        return float(np.square(profile).sum())
+
+    best = 0.0
+    for step, span in SKEW_SEARCH:
+        angles = best + np.arange(-span, span + step / 2, step)
+        best = float(max(angles, key=sharpness))
+    return best
+
+
+def straighten(image: 'np.ndarray', angle: float, fill: int = 255,
+               min_angle: float = MIN_SKEW) -> 'np.ndarray':
+    """Image rotated by angle degrees about its centre, same size."""
+    if abs(angle) < min_angle or angle == 0:
+        return image
+    h, w = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    return cv2.warpAffine(image, matrix, (w, h), flags=cv2.INTER_LINEAR,
+                          borderMode=cv2.BORDER_CONSTANT, borderValue=fill)
+
+
+def rule_positions(mask: 'np.ndarray', axis: int, min_length: float) -> list[int]:
+    """Centres of the rules at least min_length long in a rule mask
+    (axis 1: horizontal rules, 0: vertical).
+
+    The mask is thickened across the rules first, so a thin rule left a
+    little off straight still projects as one line.
+    """
+    thicken = (1, RULE_SPREAD) if axis == 1 else (RULE_SPREAD, 1)
+    mask = cv2.dilate(mask, cv2.getStructuringElement(cv2.MORPH_RECT, thicken))
+    ink = mask.sum(axis=axis) / 255
+    hits = np.flatnonzero(ink >= min_length)
+    if not len(hits):
+        return []
+    # Adjacent pixel rows/columns are one (thick) rule
+    breaks = np.flatnonzero(np.diff(hits) > 1) + 1
+    return [int(run.mean()) for run in np.split(hits, breaks)]
+
+
+def detect_grid(gray: 'np.ndarray') -> Optional[Grid]:
+    """The page's ruled table, or None if it has fewer than 3 rules either way."""
+    binary = binarize(gray)
+    angle = skew_angle(binary)
+    binary = straighten(binary, angle, fill=0)
+    horizontal, vertical = rule_masks(binary)
+    rows = rule_positions(horizontal, 1, MIN_RULE_SHARE * binary.shape[1])
+    if len(rows) < 3:
+        return None
+    cols = rule_positions(vertical[rows[0]:rows[-1] + 1], 0, MIN_COLUMN_SHARE * (rows[-1] - rows[0]))
+    if len(cols) < 3:
+        return None
+    return Grid(rows, cols, binary.shape, angle)
+
+
+class GridCache:
+    """Grid of the previous page, reused while the next page's rules line up with it."""
+
+    def __init__(self):
+        self.grid: Optional[Grid] = None
+        self.detected = 0
+        self.reused = 0
+
+    def grid_for(self, gray: 'np.ndarray') -> Optional[Grid]:
+        if self.grid is not None:
+            binary = straighten(binarize(gray), self.grid.angle, fill=0)
+            if self.grid.fits(binary):
+                self.reused += 1
+                return self.grid
+        self.grid = detect_grid(gray)
+        self.detected += 1
+        return self.grid
+
+
+# ============================================================================
+# Cell Reading
+# ============================================================================
+
+def column_words(strip: 'np.ndarray') -> list[tuple[float, str]]:
+    """(y centre, digits) of every word tesseract reads in one column strip."""
+    data = pytesseract.image_to_data(strip, config=COLUMN_CONFIG, output_type=pytesseract.Output.DICT)
+    return [(top + height / 2, text.strip())
+            for top, height, text in zip(data['top'], data['height'], data['text'])
+            if text.strip().isdigit()]
+
+
+def read_cells(gray: 'np.ndarray', grid: Grid, recognizer=None,
+               min_confidence: float = MIN_CELL_CONFIDENCE, with_confidence: bool = False):
+    """Value of every cell, row by row (None: blank or unreadable).
+
+    With a recognizer (digit_recognizer.DigitRecognizer) the whole page is
+    read in one batch and only cells below min_confidence go to tesseract,
+    all of them in one call. Without one, one OCR call per column strip;
+    each word is assigned to the row band its centre falls in, several
+    words in one cell are one number split by noise.
+
+    with_confidence also returns the recognizer's confidence of every cell
+    (cells tesseract re-read keep their low score; all None without a
+    recognizer), for row_checksum.check_row to break ties with.
+    """
+    gray = straighten(gray, grid.angle)
+    shape = (len(grid.rows) - 1, grid.num_columns)
+    if recognizer is not None:
+        values, confidence = recognizer.read_page(binarize(gray), grid)
+        unsure = np.flatnonzero(confidence < min_confidence)
+        if len(unsure):
+            for index, value in zip(unsure, ocr_cells(gray, grid, unsure)):
+                values[index] = -1 if value is None else value
+        cells = [[None if v < 0 else int(v) for v in row] for row in values.reshape(shape)]
+        return (cells, confidence.reshape(shape).tolist()) if with_confidence else cells
+
+    top, bottom = grid.rows[0], grid.rows[-1]
+    cells = [[None] * grid.num_columns for _ in range(len(grid.rows) - 1)]
+    for col, (x0, x1) in enumerate(zip(grid.cols, grid.cols[1:])):
+        if x1 - x0 <= 2 * CELL_PAD:
+            continue
+        strip = gray[top:bottom, x0 + CELL_PAD:x1 - CELL_PAD]
+        words = {}
+        for y, text in column_words(strip):
+            row = int(np.searchsorted(grid.rows, top + y)) - 1
+            if 0 <= row < len(cells):
+                words[row] = words.get(row, '') + text
+        for row, text in words.items():
+            cells[row][col] = int(text)
+    if with_confidence:
+        return cells, [[None] * grid.num_columns for _ in cells]
+    return cells
+
+
+def ocr_cells(gray: 'np.ndarray', grid: Grid, indices: 'np.ndarray') -> list[Optional[int]]:
+    """Tesseract reading of some cells (row-major indices), one OCR call for all.
+
+    The cells are stacked into one column, each in its own band with a
+    blank gap, and words are mapped back to cells by band.
+    """
+    crops = []
+    for index in indices:
+        row, col = divmod(int(index), grid.num_columns)
+        crops.append(gray[grid.rows[row] + CELL_PAD:grid.rows[row + 1] - CELL_PAD + 1,
+                          grid.cols[col] + CELL_PAD:grid.cols[col + 1] - CELL_PAD + 1])
+    band = max(c.shape[0] for c in crops) + 2 * CELL_GAP
+    canvas = np.full((band * len(crops), max(c.shape[1] for c in crops) + 2 * CELL_GAP), 255, np.uint8)
+    for i, crop in enumerate(crops):
+        canvas[i * band + CELL_GAP:i * band + CELL_GAP + crop.shape[0],
+               CELL_GAP:CELL_GAP + crop.shape[1]] = crop
+    words = {}
+    for y, text in column_words(canvas):
+        words[int(y // band)] = words.get(int(y // band), '') + text
+    return [int(words[i]) if i in words else None for i in range(len(crops))]
+
+
+# ============================================================================
+# Rows
+# ============================================================================
+
+def booth_column(cells: list[list[Optional[int]]], max_booth: int) -> Optional[int]:
+    """Column of the booth (polling station) numbers among the first three.
+
+    Sl.No and station number both run upwards within 1..max_booth; the
+    station number is the later of the two. A vote column does not climb
+    down a whole page.
+    """
+    best = None
+    for col in range(min(3, len(cells[0]) if cells else 0)):
+        values = [row[col] for row in cells if row[col] is not None]
+        in_range = [v for v in values if 1 <= v <= max_booth]
+        if len(values) < 3 or len(in_range) < 0.8 * len(values):
+            continue
+        rising = sum(b >= a for a, b in zip(in_range, in_range[1:]))
+        if rising >= 0.8 * (len(in_range) - 1):
+            best = col
+    return best
+
+
+def grid_rows(cells: list[list[Optional[int]]], num_candidates: int, max_booth: int,
+              confidence: Optional[list[list[Optional[float]]]] = None) -> list[tuple]:
+    """(booth_no, votes, remaining columns, missing vote cells, cell confidence) per booth row.
+
+    Candidate votes are the num_candidates columns right of the booth
+    column, by position; blank vote cells stay None and are counted in
+    missing. The remaining columns (total valid, rejected, NOTA, total,
+    tendered) are kept for the checksums (row_checksum.py). Header rows (no
+    booth number) and rows with more than one missing vote cell are dropped.
+    Cell confidence (read_cells) is that of the votes and remaining columns,
+    aligned with votes + remaining; None without confidences.
+    """
+    col = booth_column(cells, max_booth)
+    if col is None:
+        return []
+    rows = []
+    for i, row in enumerate(cells):
+        booth_no = row[col]
+        if booth_no is None or not 1 <= booth_no <= max_booth:
+            continue
+        votes = row[col + 1:col + 1 + num_candidates]
+        missing = votes.count(None) + num_candidates - len(votes)
+        if missing > 1:
+            continue
+        scores = None
+        if confidence is not None:
+            scores = confidence[i][col + 1:col + 1 + num_candidates]
+            scores = scores + [None] * (num_candidates - len(scores)) + confidence[i][col + 1 + num_candidates:]
+        votes = votes + [None] * (num_candidates - len(votes))
+        rows.append((booth_no, votes, row[col + 1 + num_candidates:], missing, scores))
+    return rows
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    from PIL import Image
+
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        return
+    gray = np.array(Image.open(args[0]).convert('L'))
+
+    print("=" * 70)
+    print(f"TABLE GRID: {args[0]} ({gray.shape[1]}x{gray.shape[0]})")
+    print("=" * 70)
+    grid = detect_grid(gray)
+    if grid is None:
+        print("  ❌ No ruled table found")
+        return
+    widths = [b - a for a, b in zip(grid.cols, grid.cols[1:])]
+    print(f"  Skew:    {grid.angle:+.2f}°")
+    print(f"  Rows:    {len(grid.rows) - 1} (rules at y={grid.rows[0]}..{grid.rows[-1]})")
+    print(f"  Columns: {grid.num_columns} (widths {min(widths)}-{max(widths)} px)")
+
+    if '--draw' in args:
+        out = cv2.cvtColor(straighten(gray, grid.angle), cv2.COLOR_GRAY2BGR)
+        for y in grid.rows:
+            cv2.line(out, (grid.cols[0], y), (grid.cols[-1], y), (0, 0, 255), 2)
+        for x in grid.cols:
+            cv2.line(out, (x, grid.rows[0]), (x, grid.rows[-1]), (255, 0, 0), 2)
+        path = args[args.index('--draw') + 1]
+        cv2.imwrite(path, out)
+        print(f"  Drawn:   {path}")
+
+    if '--ocr' in args or '--digits' in args:
+        recognizer = None
+        if '--digits' in args:
+            from digit_recognizer import load_recognizer
+            recognizer = load_recognizer()
+        print()
+        for row in read_cells(gray, grid, recognizer):
+            print('  ' + ' '.join('.' if v is None else str(v) for v in row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Fault-Tolerant Worker Pool
+==========================
+Process pool for long extraction batches where a single task may hang,
+crash its worker or fail transiently.
+
+  - Results stream back as tasks complete (imap_unordered-style); one
+    failing task never discards the results of the others.
+  - Every task has a deadline. A worker that runs past it is killed
+    together with its children (pdftoppm, tesseract) and replaced.
+  - Workers are recycled after max_tasks_per_child tasks, which bounds
+    memory growth from leaky native libraries.
+  - Exceptions, timeouts and worker deaths are retried with exponential
+    backoff; a task that still fails after all attempts is reported as
+    failed (callers quarantine its input, see run_ledger.py).
+  - Optional memory budget admission (memory_budget.MemoryBudget).
+  - A progress line (done/failed/retrying, throughput, ETA) after every
+    completed task.
+
+Workers are plain processes with one pipe each, so the pool can tell
+exactly which task a dead or hung worker was running.
+
+Usage (from code):
+    pool = ResilientPool(workers=4, timeout=600, retries=2)
+    for outcome in pool.run(func, tasks, keys=ac_ids):
+        if outcome.ok:
+            ...outcome.result...
+        else:
+            ...outcome.error...
+
+    python scripts/task_pool.py                  # self-test: short tasks, recycling every 1 and 20
+    python scripts/task_pool.py --workers 8 --tasks 2000 --max-tasks-per-child 1
+"""
+
+import sys
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from memory_budget import HAS_PSUTIL, MemoryBudget, tree_rss_bytes
+
+if HAS_PSUTIL:
+    import psutil
+
+DEFAULT_TIMEOUT = 1800
+# Per-task deadline from an estimated duration: generous, never below the floor
+TIMEOUT_FACTOR = 4.0
+TIMEOUT_FLOOR = 300
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 5.0
+MAX_BACKOFF = 300.0
+DEFAULT_MAX_TASKS_PER_CHILD = 20
+POLL_SECONDS = 0.5
+
+
+@dataclass
+class TaskOutcome:
+    key: Any
+    result: Any = None
+    error: Optional[str] = None
+    attempts: int = 1
+    seconds: float = 0.0
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _Task:
+    key: Any
+    args: Any
+    index: int
+    attempts: int = 0
+    not_before: float = 0.0
+    timeout: Optional[float] = None
+    errors: list = field(default_factory=list)
+
+
+def task_timeout(estimated_seconds: float, factor: float = TIMEOUT_FACTOR, floor: float = TIMEOUT_FLOOR) -> float:
+    return max(floor, factor * estimated_seconds)
+
+
+class _Worker:
+    def __init__(self, initializer, initargs, max_tasks):
+        self.conn, child_conn = Pipe()
+        self.process = Process(target=_worker_main, args=(child_conn, initializer, initargs, max_tasks),
+                               daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task: Optional[_Task] = None
+        self.started = 0.0
+        self.deadline = float('inf')
+        self.done = 0
+        self.max_tasks = max_tasks
+
+    @property
+    def retiring(self) -> bool:
+        return bool(self.max_tasks) and self.done >= self.max_tasks
+
+    def assign(self, func, task: _Task, default_timeout: float):
+        self.task = task
+        self.started = time.time()
+        self.deadline = self.started + (task.timeout or default_timeout)
+        self.conn.send((task.key, func, task.args))
+
+    def kill(self):
+        """Kill the worker and everything it started."""
+        if HAS_PSUTIL:
+            try:
+                for child in psutil.Process(self.process.pid).children(recursive=True):
+                    child.kill()
+            except psutil.Error:
+                pass
+        self.process.kill()
+        self.process.join(5)
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(5)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+def _worker_main(conn, initializer, initargs, max_tasks):
+    if initializer:
+        initializer(*initargs)
+    done = 0
+    while not max_tasks or done < max_tasks:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        key, func, args = message
+        try:
+            reply = (key, True, func(args))
+        except BaseException as e:
+            reply = (key, False, ''.join(traceback.format_exception_only(type(e), e)).strip())
+        conn.send(reply)
+        done += 1
+    conn.close()
+
+
+class ResilientPool:
+    """Process pool with per-task deadlines, worker recycling and retries."""
+
+    def __init__(self, workers: int, initializer: Callable = None, initargs: tuple = (),
+                 timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, max_tasks_per_child: int = DEFAULT_MAX_TASKS_PER_CHILD,
+                 progress: bool = True):
+        self.num_workers = max(1, workers)
+        self.initializer = initializer
+        self.initargs = initargs
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_tasks_per_child = max_tasks_per_child
+        self.progress = progress
+        self.stats = {'done': 0, 'failed': 0, 'retries': 0, 'timeouts': 0, 'deaths': 0, 'recycled': 0}
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self.initializer, self.initargs, self.max_tasks_per_child)
+
+    def _backoff(self, attempts: int) -> float:
+        return min(MAX_BACKOFF, self.backoff * 2 ** (attempts - 1))
+
+    def run(self, func: Callable, tasks: list, keys: list = None, timeouts: list = None,
+            budget: MemoryBudget = None, projections: list[int] = None,
+            costs: list[float] = None) -> Iterator[TaskOutcome]:
+        """Run func(task) for every task; yield outcomes as they complete.
+
+        Tasks are dispatched in list order. timeouts/projections/costs are
+        optional per-task deadlines, projected peak memory (with budget)
+        and estimated seconds (for the ETA).
+        """
+        keys = keys if keys is not None else list(range(len(tasks)))
+        pending = deque(_Task(key, args, i, timeout=timeouts[i] if timeouts else None)
+                        for i, (key, args) in enumerate(zip(keys, tasks)))
+        total = len(pending)
+        remaining_cost = sum(costs) if costs else None
+        start = time.time()
+        workers = [self._spawn() for _ in range(min(self.num_workers, total))]
+        finished = 0
+
+        def settle(worker: _Worker, error: Optional[str] = None, result=None, timed_out: bool = False):
+            """Task of worker ended; returns its final outcome or None if it was requeued."""
+            nonlocal finished, remaining_cost
+            task = worker.task
+            worker.task = None
+            if budget:
+                budget.release(task.key)
+            seconds = time.time() - worker.started
+            task.attempts += 1
+            if error is not None:
+                task.errors.append(error)
+                if task.attempts <= self.retries:
+                    delay = self._backoff(task.attempts)
+                    task.not_before = time.time() + delay
+                    # Retries go to the front: they were next in line already
+                    pending.appendleft(task)
+                    self.stats['retries'] += 1
+                    print(f"  ↻ {task.key}: {error.splitlines()[-1][:100]} "
+                          f"(attempt {task.attempts}/{self.retries + 1}, retry in {delay:.0f}s)", flush=True)
+                    return None
+                self.stats['failed'] += 1
+            else:
+                self.stats['done'] += 1
+            finished += 1
+            if costs:
+                remaining_cost -= costs[task.index]
+            outcome = TaskOutcome(task.key, result, error if error is None else ' | '.join(task.errors),
+                                  task.attempts, seconds, timed_out)
+            if self.progress:
+                self._print_progress(finished, total, start, costs, remaining_cost, workers, pending)
+            return outcome
+
+        def receive(worker: _Worker) -> Optional[TaskOutcome]:
+            """Settle worker's task from its reply; the task stays set if the pipe has none."""
+            try:
+                key, ok, payload = worker.conn.recv()
+            except (EOFError, OSError):
+                return None
+            worker.done += 1
+            return settle(worker, None if ok else payload, payload if ok else None)
+
+        try:
+            while pending or any(w.task for w in workers):
+                now = time.time()
+
+                # Dispatch: the first ready task, if the budget admits it
+                for worker in workers:
+                    if worker.task or worker.retiring or not pending:
+                        continue
+                    ready = next((t for t in pending if t.not_before <= now), None)
+                    if ready is None:
+                        break
+                    if budget and not budget.admits(projections[ready.index]):
+                        break
+                    pending.remove(ready)
+                    if budget:
+                        budget.acquire(ready.key, projections[ready.index])
+                    worker.assign(func, ready, self.timeout)
+
+                busy = [w for w in workers if w.task]
+                next_event = min([w.deadline for w in busy] + [t.not_before for t in pending if t.not_before > now]
+                                 + [now + POLL_SECONDS])
+                ready_objects = wait([w.conn for w in busy] + [w.process.sentinel for w in workers],
+                                     timeout=max(0.0, min(POLL_SECONDS, next_event - now)))
+
+                for worker in list(workers):
+                    outcome = None
+                    if worker.task and worker.conn in ready_objects:
+                        outcome = receive(worker)
+                    if worker.task and time.time() > worker.deadline:
+                        worker.kill()
+                        self.stats['timeouts'] += 1
+                        outcome = settle(worker, f"Timed out after {time.time() - worker.started:.0f}s",
+                                         timed_out=True)
+                        workers[workers.index(worker)] = self._spawn()
+                    elif not worker.process.is_alive():
+                        # A recycled worker sends its last reply and exits: the
+                        # reply may arrive after wait() returned, so drain the
+                        # pipe before calling it a death
+                        if worker.task and worker.conn.poll():
+                            outcome = receive(worker)
+                        if worker.task:
+                            self.stats['deaths'] += 1
+                            outcome = settle(worker, f"Worker died (exit code {worker.process.exitcode})")
+                        else:
+                            self.stats['recycled'] += 1
+                        worker.conn.close()
+                        worker.process.join()
+                        if pending or any(w.task for w in workers):
+                            workers[workers.index(worker)] = self._spawn()
+                        else:
+                            workers.remove(worker)
+                    if outcome is not None:
+                        yield outcome
+
+                if budget and busy:
+                    budget.observe(tree_rss_bytes([w.process.pid for w in workers if w.process.is_alive()]))
+        finally:
+            for worker in workers:
+                if worker.task:
+                    worker.kill()
+                elif worker.process.is_alive():
+                    worker.stop()
+
+    def _print_progress(self, finished: int, total: int, start: float, costs, remaining_cost,
+                        workers: list, pending: deque):
+        elapsed = time.time() - start
+        rate = finished / elapsed * 60 if elapsed > 0 else 0.0
+        if costs and remaining_cost is not None:
+            done_cost = sum(costs) - remaining_cost
+            eta = remaining_cost * elapsed / done_cost if done_cost > 0 else 0.0
+        else:
+            eta = (total - finished) * elapsed / finished if finished else 0.0
+        running = sum(1 for w in workers if w.task)
+        waiting = sum(1 for t in pending if t.attempts)
+        print(f"  ⏱  {finished}/{total} finished ({self.stats['failed']} failed) · {running} running"
+              f"{f' · {waiting} retrying' if waiting else ''} · {rate:.1f}/min · "
+              f"elapsed {elapsed / 60:.1f} min · ETA {eta / 60:.1f} min", flush=True)
+
+
+# ============================================================================
+# Self-test
+# ============================================================================
+
+def _double(x: int) -> int:
+    time.sleep(0.001)
+    return 2 * x
+
+
+def main():
+    """Stress the pool with short tasks; every task must come back with its result."""
+    args = sys.argv[1:]
+    if '--help' in args or '-h' in args:
+        print(__doc__)
+        return
+    workers = int(args[args.index('--workers') + 1]) if '--workers' in args else 8
+    num_tasks = int(args[args.index('--tasks') + 1]) if '--tasks' in args else 2000
+    per_child = [int(args[args.index('--max-tasks-per-child') + 1])] if '--max-tasks-per-child' in args \
+        else [1, DEFAULT_MAX_TASKS_PER_CHILD]
+
+    print("=" * 70)
+    print(f"TASK POOL SELF-TEST ({workers} workers, {num_tasks} tasks of ~1 ms)")
+    print("=" * 70)
+    failed = False
+    for max_tasks in per_child:
+        pool = ResilientPool(workers, retries=0, max_tasks_per_child=max_tasks, progress=False)
+        start = time.time()
+        wrong = [o.key for o in pool.run(_double, list(range(num_tasks))) if not o.ok or o.result != 2 * o.key]
+        ok = not wrong and pool.stats['done'] == num_tasks and not pool.stats['deaths']
+        failed |= not ok
+        print(f"  {'✅' if ok else '❌'} max_tasks_per_child={max_tasks:<3d} {pool.stats['done']} done, "
+              f"{pool.stats['deaths']} deaths, {pool.stats['recycled']} recycled, {len(wrong)} lost "
+              f"({time.time() - start:.1f}s)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -22,40 +22,29 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
-try:
-    import cv2
-    import numpy as np
-    HAS_CV2 = True
-except ImportError:
-    HAS_CV2 = False
-
-import pdfplumber
-try:
-    import pytesseract
-    HAS_TESSERACT = True
-except ImportError:
-    HAS_TESSERACT = False
-
-try:
-    from pdf2image import convert_from_path
-    HAS_PDF2IMAGE = True
-except ImportError:
-    HAS_PDF2IMAGE = False
-
-try:
-    from PIL import Image
-    HAS_PIL = True
-except ImportError:
-    HAS_PIL = False
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS, form20_dir
+from electionlens.lazy import available, lazy_import
+
+# PDF/OCR backends load on first use; the flags only check availability
+pdfplumber = lazy_import('pdfplumber')
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+HAS_CV2 = available('cv2') and available('numpy')
+pytesseract = lazy_import('pytesseract')
+HAS_TESSERACT = available('pytesseract')
+pdf2image = lazy_import('pdf2image')
+HAS_PDF2IMAGE = available('pdf2image')
+Image = lazy_import('PIL.Image')
+HAS_PIL = available('PIL')
 
 # Configuration for 2021 data
-FORM20_DIR = Path.home() / "Desktop/TNLA_2021_PDFs"
-OUTPUT_BASE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-AC_DATA_PATH = Path("/Users/p0s097d/ElectionLens/public/data/elections/ac/TN/2021.json")
-SCHEMA_PATH = Path("/Users/p0s097d/ElectionLens/public/data/schema.json")
+FORM20_DIR = form20_dir("TN", 2021)
+OUTPUT_BASE = PATHS.booths / "TN"
+AC_DATA_PATH = PATHS.elections / "ac/TN/2021.json"
+SCHEMA_PATH = PATHS.schema
 
 # Import common utilities from original parser
-sys.path.insert(0, str(Path(__file__).parent))
 try:
     from unified_pdf_parser import (
         MIN_VOTES_PER_BOOTH, MAX_VOTES_PER_BOOTH,
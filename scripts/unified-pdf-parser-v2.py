@@ -16,6 +16,7 @@ Usage:
     python scripts/unified-pdf-parser-v2.py --all     # Process all needing extraction
 """
 
+import importlib.util
 import json
 import re
 import subprocess
@@ -25,15 +26,25 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
-import cv2
-import numpy as np
-import pdfplumber
-import pytesseract
-from pdf2image import convert_from_path
-from PIL import Image
-
-# Import from original parser
 sys.path.insert(0, str(Path(__file__).parent))
+from booth_table import BoothTable
+from electionlens.lazy import lazy_import
+from row_checksum import check_row
+from row_tokenizer import OCR_HEADERS, booth_row, clean_ocr_line, fit_votes, numbers
+
+# PDF/OCR backends load on first use
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+pdfplumber = lazy_import('pdfplumber')
+pytesseract = lazy_import('pytesseract')
+pdf2image = lazy_import('pdf2image')
+Image = lazy_import('PIL.Image')
+
+# Import from original parser (hyphenated file name, so load it by path)
+_spec = importlib.util.spec_from_file_location('unified_pdf_parser',
+                                               Path(__file__).parent / 'unified-pdf-parser.py')
+sys.modules['unified_pdf_parser'] = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sys.modules['unified_pdf_parser'])
 from unified_pdf_parser import (
     FORM20_DIR, OUTPUT_BASE, PC_DATA_PATH, SCHEMA_PATH,
     MIN_VOTES_PER_BOOTH, MAX_VOTES_PER_BOOTH,
@@ -50,9 +61,10 @@ MAX_VOTE_DEVIATION = 0.10     # Stricter: 10% deviation allowed
 # Multi-Strategy Text Extraction
 # ============================================================================
 
-def extract_text_pdf_multi_strategy(pdf_path: Path, num_candidates: int, ac_id: str) -> ExtractionResult:
-    """Extract from text PDF using multiple strategies and merge best results."""
-    all_booths = {}  # booth_id -> (BoothResult, confidence)
+def extract_text_pdf_multi_strategy(pdf_path: Path, num_candidates: int, ac_id: str,
+                                    merge: str = 'best') -> ExtractionResult:
+    """Extract from text PDF using multiple strategies and merge their readings (booth_table.py)."""
+    readings = [BoothTable.empty(num_candidates)]
     
     # Strategy 1: pdfplumber tables (highest confidence)
     try:
@@ -62,10 +74,7 @@ def extract_text_pdf_multi_strategy(pdf_path: Path, num_candidates: int, ac_id:
                 if tables:
                     for table in tables:
                         booths = parse_table_enhanced(table, num_candidates, page_num)
-                        for booth in booths:
-                            key = f"{booth.booth_no:03d}"
-                            if key not in all_booths or all_booths[key][1] < 0.95:
-                                all_booths[key] = (booth, 0.95)
+                        readings.append(BoothTable.from_booths(booths, num_candidates, 'tables', 0.95))
     except Exception as e:
         pass
     
@@ -75,10 +84,7 @@ def extract_text_pdf_multi_strategy(pdf_path: Path, num_candidates: int, ac_id:
             for page_num, page in enumerate(pdf.pages):
                 text = page.extract_text() or ""
                 booths = parse_text_enhanced(text, num_candidates, page_num)
-                for booth in booths:
-                    key = f"{booth.booth_no:03d}"
-                    if key not in all_booths or all_booths[key][1] < 0.85:
-                        all_booths[key] = (booth, 0.85)
+                readings.append(BoothTable.from_booths(booths, num_candidates, 'text', 0.85))
     except Exception as e:
         pass
     
@@ -90,16 +96,12 @@ def extract_text_pdf_multi_strategy(pdf_path: Path, num_candidates: int, ac_id:
         )
         if result.returncode == 0:
             booths = parse_text_enhanced(result.stdout, num_candidates, 0)
-            for booth in booths:
-                key = f"{booth.booth_no:03d}"
-                if key not in all_booths or all_booths[key][1] < 0.75:
-                    all_booths[key] = (booth, 0.75)
+            readings.append(BoothTable.from_booths(booths, num_candidates, 'pdftotext', 0.75))
     except Exception as e:
         pass
     
-    # Merge results (keep highest confidence)
-    result = ExtractionResult(ac_id=ac_id, pdf_type="text")
-    result.booths = {k: v[0] for k, v in all_booths.items()}
+    # Merge results (highest confidence or consensus)
+    result = ExtractionResult(ac_id=ac_id, pdf_type="text", table=BoothTable.concat(readings).merge(merge))
     result.pages_processed = len(list(pdfplumber.open(pdf_path).pages)) if pdfplumber.open(pdf_path) else 0
     
     return result
@@ -247,49 +249,44 @@ def parse_text_enhanced(text: str, num_candidates: int, page_num: int) -> list[B
 # Multi-Strategy OCR Extraction
 # ============================================================================
 
-def extract_scanned_pdf_multi_strategy(pdf_path: Path, num_candidates: int, ac_id: str, expected_booths: set) -> ExtractionResult:
-    """Extract from scanned PDF using multiple OCR strategies."""
-    all_booths = {}  # booth_id -> (BoothResult, confidence, method)
+def extract_scanned_pdf_multi_strategy(pdf_path: Path, num_candidates: int, ac_id: str, expected_booths: set,
+                                       merge: str = 'best') -> ExtractionResult:
+    """Extract from scanned PDF using multiple OCR strategies (page x preprocessing x PSM readings)."""
+    readings = [BoothTable.empty(num_candidates)]
     max_booth = max(expected_booths) if expected_booths else 500
     
     # Strategy 1: pytesseract with multiple preprocessing
     try:
-        images = convert_from_path(str(pdf_path), dpi=300)
+        images = pdf2image.convert_from_path(str(pdf_path), dpi=300)
         for page_num, image in enumerate(images):
             for preprocess in ['standard', 'high_contrast', 'adaptive', 'denoise', 'sharpen']:
                 processed = preprocess_image_enhanced(image, preprocess)
                 for psm in [6, 4, 3]:
                     config = f'--psm {psm} --oem 3'
                     text = pytesseract.image_to_string(processed, config=config)
-                    booths = parse_ocr_text_enhanced(text, num_candidates, page_num, max_booth)
-                    
-                    for booth in booths:
-                        key = f"{booth.booth_no:03d}"
-                        confidence = 0.8 if preprocess == 'standard' else 0.75
-                        if key not in all_booths or all_booths[key][1] < confidence:
-                            all_booths[key] = (booth, confidence, 'pytesseract')
+                    booths = BoothTable.from_booths(parse_ocr_text_enhanced(text, num_candidates, page_num, max_booth),
+                                                    num_candidates, method=f"{preprocess}/{psm}")
+                    if preprocess != 'standard':
+                        booths.rows['confidence'] -= 0.05
+                    readings.append(booths)
     except Exception as e:
         pass
     
     # Strategy 2: Surya OCR (if available, higher confidence)
     try:
         surya_booths = extract_with_surya(pdf_path, num_candidates, ac_id, expected_booths)
-        for booth in surya_booths:
-            key = f"{booth.booth_no:03d}"
-            if key not in all_booths or all_booths[key][1] < 0.9:
-                all_booths[key] = (booth, 0.9, 'surya')
+        readings.append(BoothTable.from_booths(surya_booths, num_candidates, 'surya', 0.9))
     except Exception as e:
         pass
     
     # Merge results
-    result = ExtractionResult(ac_id=ac_id, pdf_type="scanned")
-    result.booths = {k: v[0] for k, v in all_booths.items()}
+    result = ExtractionResult(ac_id=ac_id, pdf_type="scanned", table=BoothTable.concat(readings).merge(merge))
     result.pages_processed = len(images) if 'images' in locals() else 0
     
     return result
 
 
-def preprocess_image_enhanced(image: Image.Image, method: str = 'standard') -> Image.Image:
+def preprocess_image_enhanced(image: 'Image.Image', method: str = 'standard') -> 'Image.Image':
     """Enhanced image preprocessing with more methods."""
     img_array = np.array(image)
     
@@ -330,69 +327,47 @@ def parse_ocr_text_enhanced(text: str, num_candidates: int, page_num: int, max_b
     """Enhanced OCR text parsing with better error correction."""
     booths = []
     seen_booths = set()
-    lines = text.split('\n')
     
-    for line in lines:
-        # Aggressive cleaning
-        line = re.sub(r'[|\\\/\[\]{}()<>]', ' ', line)
-        line = re.sub(r'[oO](?=\d)', '0', line)  # o before digit -> 0
-        line = re.sub(r'[lI](?=\d)', '1', line)  # l/I before digit -> 1
-        line = re.sub(r'(?<=\d)[oO]', '0', line)  # o after digit -> 0
-        line = re.sub(r'\s+', ' ', line).strip()
-        
-        if len(line) < 10:
+    for line in text.split('\n'):
+        # Aggressive cleaning: grid rules, O/o for 0, l/I for 1
+        if OCR_HEADERS(line):
             continue
-        if any(kw in line.upper() for kw in ['FORM', 'ELECTION', 'CANDIDATE', 'PARTY', 'TOTAL', 'NOTA']):
+        line = clean_ocr_line(line)
+        if len(line) < 10:
             continue
         
-        # Extract numbers with positions
-        numbers = []
-        for match in re.finditer(r'\b(\d+)\b', line):
-            num = int(match.group(1))
-            pos = match.start()
-            numbers.append((pos, num))
-        
-        if len(numbers) < 4:
+        values = numbers(line)
+        if len(values) < 4:
             continue
         
-        numbers.sort(key=lambda x: x[0])
-        
-        # Find booth number
-        booth_no = None
-        vote_start_idx = 0
-        
-        for i, (pos, num) in enumerate(numbers[:3]):
-            if 1 <= num <= max_booth + 50 and pos < 200:
-                booth_no = num
-                vote_start_idx = i + 1
-                break
-        
-        if not booth_no or booth_no in seen_booths:
+        # Find booth number and votes
+        row = booth_row(values, max_booth + 50, first=3, line=line, max_pos=200)
+        if row is None or len(row[1]) < 3:
             continue
         
-        # Get votes
-        vote_nums = []
-        for pos, num in numbers[vote_start_idx:]:
-            if num <= 2000:
-                vote_nums.append(num)
-            elif num > 5000:
-                break
+        # Votes checked (and corrected) against the row's total columns;
+        # a row that does not check keeps the plain reading
+        start = values.index(row[0]) + 1
+        check = check_row(values[start:], num_candidates)
+        if check.status in ('ok', 'fixed'):
+            booth_no = values[start + check.offset - 1] if check.offset else row[0]
+            votes = check.votes
+        else:
+            booth_no, votes = row[0], fit_votes(row[1], num_candidates)
+        if booth_no in seen_booths or not 1 <= booth_no <= max_booth + 50:
+            continue
         
-        if len(vote_nums) >= 3:
-            votes = vote_nums[:num_candidates]
-            while len(votes) < num_candidates:
-                votes.append(0)
-            
-            total = sum(votes)
-            if MIN_VOTES_PER_BOOTH <= total <= MAX_VOTES_PER_BOOTH:
-                seen_booths.add(booth_no)
-                booths.append(BoothResult(
-                    booth_no=booth_no,
-                    votes=votes,
-                    total=total,
-                    source_page=page_num,
-                    confidence=0.8
-                ))
+        total = sum(votes)
+        if MIN_VOTES_PER_BOOTH <= total <= MAX_VOTES_PER_BOOTH:
+            seen_booths.add(booth_no)
+            booths.append(BoothResult(
+                booth_no=booth_no,
+                votes=votes,
+                total=total,
+                source_page=page_num,
+                confidence=0.8 + check.confidence_adjust,
+                checksum=check.status
+            ))
     
     return booths
 
@@ -561,7 +536,7 @@ def process_ac_enhanced(ac_num: int, pc_data: dict, schema: dict, force: bool =
     if not pc_id:
         return {'status': 'error', 'error': 'No PC found'}
     
-    candidates = pc_data.get(pc_id, {}).get('candidates', [])
+    candidates = pc_data[pc_id].candidates if pc_id in pc_data else []
     num_candidates = len(candidates)
     print(f"  PC: {pc_id}, Candidates: {num_candidates}")
     
@@ -8,6 +8,8 @@ Features:
 - Auto-detects PDF type (text vs scanned)
 - Uses pdfplumber for text-based PDFs
 - Uses pytesseract for scanned PDFs with preprocessing
+- Extraction strategies run in order of their record on similar PDFs
+  (see strategies.py); one engine for the 2021 and 2024 elections
 - 100% validation before saving any data
 - Guard rails against corrupt/misaligned columns
 
@@ -15,6 +17,25 @@ Usage:
     python scripts/unified-pdf-parser.py 21        # Process single AC
     python scripts/unified-pdf-parser.py 1-50     # Process range
     python scripts/unified-pdf-parser.py --all    # Process all ACs needing extraction
+
+    --spans DIR records per-stage timing and memory spans (see spans.py)
+    --mem-budget 6G caps the projected peak memory of concurrent workers
+    --mem-history DIR projects peaks from the spans of an earlier run
+    --run NAME names the run in the run ledger (see run_ledger.py)
+    --resume [NAME] resumes the latest (or named) interrupted run
+    --ledger PATH uses another run ledger file
+    --threads-per-worker N gives each worker N tesseract/OpenCV threads
+      (workers = cores / N; ACs run longest first, see cost_model.py)
+    --timeout SECONDS kills and retries an AC running longer (default: from
+      its estimated duration, see task_pool.py)
+    --retries N retries a failed, hung or crashed AC N times (default 2);
+      PDFs failing every attempt are quarantined
+    --retry-quarantined also runs quarantined PDFs
+    --election TN-2021 extracts another election (default TN-2024)
+    --strategies tables,text limits the extraction strategies
+    --fixed-order runs strategies in registration order, skipping none
+    --merge consensus keeps the reading most strategies agree on per booth
+      (default best: the highest-confidence reading; see booth_table.py)
 """
 
 import json
@@ -22,26 +43,49 @@ import re
 import subprocess
 import sys
 from collections import defaultdict
-from dataclasses import dataclass, field
-from multiprocessing import Pool, cpu_count
+from dataclasses import asdict, dataclass, field, replace
+from multiprocessing import cpu_count
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS, form20_dir
+from electionlens.lazy import lazy_import
+from booth_table import MERGES, BoothResult, BoothTable, booth_key
+from cost_model import estimate_costs, limit_threads, lpt_order, print_plan, thread_budget
+from digit_recognizer import load_recognizer
+from memory_budget import MemoryBudget, load_peak_history, parse_size, project_peak
+from page_triage import crop_table, triage_pdf
+from row_checksum import check_row
+from row_tokenizer import (OCR_HEADERS, TABLE_HEADERS, TEXT_HEADERS, booth_row, clean_ocr_line,
+                           fit_votes, numbers)
+from run_ledger import LEDGER_PATH, Checkpoint, RunLedger, open_run
+from spans import enable as enable_spans
+from spans import span
+from strategies import ExtractionContext, layout_family, plan, register, run_strategies
+from table_grid import GridCache, grid_rows, read_cells
+from task_pool import DEFAULT_RETRIES, ResilientPool, task_timeout
+
+if TYPE_CHECKING:
+    from records import Contest   # msgspec is imported by load_reference_data
 
-import cv2
-import numpy as np
-import pdfplumber
-import pytesseract
-from pdf2image import convert_from_path
-from PIL import Image
+# PDF/OCR backends load on first use: --help, resumes of finished runs and
+# text-only workers never import OpenCV, tesseract or pdf2image
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+pdfplumber = lazy_import('pdfplumber')
+pytesseract = lazy_import('pytesseract')
+pdf2image = lazy_import('pdf2image')
+Image = lazy_import('PIL.Image')
 
 # ============================================================================
 # Configuration
 # ============================================================================
 
-FORM20_DIR = Path.home() / "Desktop" / "GELS_2024_Form20_PDFs"
-OUTPUT_BASE = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-PC_DATA_PATH = Path("/Users/p0s097d/ElectionLens/public/data/elections/pc/TN/2024.json")
-SCHEMA_PATH = Path("/Users/p0s097d/ElectionLens/public/data/schema.json")
+FORM20_DIR = form20_dir("TN", 2024)
+OUTPUT_BASE = PATHS.booths / "TN"
+PC_DATA_PATH = PATHS.elections / "pc/TN/2024.json"
+SCHEMA_PATH = PATHS.schema
 
 # Validation thresholds
 MIN_VOTES_PER_BOOTH = 20
@@ -51,34 +95,84 @@ MIN_EXTRACTION_RATIO_SCANNED = 0.70  # Lower threshold for scanned PDFs (OCR is
 MAX_VOTE_DEVIATION = 0.10    # Allow 10% deviation from official totals (stricter for accuracy)
 MAX_VOTE_DEVIATION_SCANNED = 0.25    # More lenient for scanned PDFs
 
+# ACs whose TN 2024 Form 20 PDFs are scans
+SCANNED_ACS = [1, 3, 4, 5, 6, 7, 28, 29, 30, 31, 38, 39, 40, 41, 42, 151, 152, 153, 154, 155, 156,
+               188, 189, 191, 192, 193, 194, 213, 214]
+
+# OCR resolution ladder: scanned pages are read at the AC's starting rung
+# (the lowest without history; with a run ledger, the rung most of its pages
+# needed last time) and re-rendered one rung up while they fail validation
+DPI_LADDER = (200, 300, 400)
+# A page passes when every booth read is at least this confident (its row
+# checksums hold, or it has none) and at most ROW_SLACK rows of its ruled
+# table gave no booth
+PASS_CONFIDENCE = 0.8
+ROW_SLACK = 2
+
 
 # ============================================================================
 # Data Classes
 # ============================================================================
 
 @dataclass
-class BoothResult:
-    """Single booth extraction result."""
-    booth_no: int
-    votes: list[int]
-    total: int
-    source_page: int = 0
-    confidence: float = 1.0
+class Election:
+    """The election a run extracts and where its files live."""
+    state: str = 'TN'
+    year: int = 2024
+    form20_dir: Path = FORM20_DIR
+    booths_dir: Path = OUTPUT_BASE
+    results_path: Path = PC_DATA_PATH
+    schema_path: Path = SCHEMA_PATH
+    pdf_pattern: str = 'AC{num:03d}.pdf'
+    source: str = 'Tamil Nadu CEO - Form 20'
+    # Extraction strategies to use (default: all registered) and their
+    # order: 'history' (expected value on the layout family) or 'fixed'
+    strategies: tuple = ()
+    strategy_order: str = 'history'
+    # How readings of the same booth are merged: 'best' (highest confidence)
+    # or 'consensus' (the reading most confidence agrees on; booth_table.py)
+    merge: str = 'best'
+    scanned_acs: tuple = ()
+    
+    def ac_id(self, ac_num: int) -> str:
+        return f"{self.state}-{ac_num:03d}"
+    
+    def pdf_path(self, ac_num: int) -> Path:
+        return Path(self.form20_dir) / self.pdf_pattern.format(num=ac_num, state=self.state, year=self.year)
+    
+    def results_file(self, ac_id: str) -> Path:
+        return Path(self.booths_dir) / ac_id / f"{self.year}.json"
+
+
+TN_2024 = Election(scanned_acs=tuple(SCANNED_ACS))
+TN_2021 = Election(year=2021, form20_dir=form20_dir("TN", 2021),
+                   results_path=PATHS.elections / "ac/TN/2021.json")
+ELECTIONS = {'TN-2024': TN_2024, 'TN-2021': TN_2021}
 
 
 @dataclass
 class ExtractionResult:
-    """Complete extraction result for an AC."""
+    """Complete extraction result for an AC: one merged row per booth (booth_table.py)."""
     ac_id: str
-    booths: dict[str, BoothResult] = field(default_factory=dict)
+    table: BoothTable = field(default_factory=lambda: BoothTable.empty(0))
     errors: list[str] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
     pdf_type: str = "unknown"
     pages_processed: int = 0
     
+    @property
+    def booths(self) -> dict[str, BoothResult]:
+        """Booth key -> BoothResult, built from the table on each access."""
+        return self.table.booths()
+    
+    @booths.setter
+    def booths(self, booths: dict[str, BoothResult]):
+        num_candidates = max((len(b.votes) for b in booths.values()), default=0)
+        self.table = BoothTable.from_booths(booths.values(), num_candidates)
+    
     @property
     def is_valid(self) -> bool:
-        return len(self.errors) == 0 and len(self.booths) > 0
+        return len(self.errors) == 0 and len(self.table) > 0
 
 
 @dataclass 
@@ -94,11 +188,11 @@ class ValidationResult:
 # Data Loading
 # ============================================================================
 
-def load_reference_data():
-    """Load PC data and schema for validation."""
-    with open(PC_DATA_PATH) as f:
-        pc_data = json.load(f)
-    with open(SCHEMA_PATH) as f:
+def load_reference_data(election: Election = TN_2024):
+    """Load official results (PC or AC, typed Contest records) and schema for validation."""
+    from records import load_election   # msgspec only where reference data is read
+    pc_data = load_election(election.results_path)
+    with open(election.schema_path) as f:
         schema = json.load(f)
     return pc_data, schema
 
@@ -111,7 +205,21 @@ def get_pc_for_ac(ac_id: str, schema: dict) -> tuple[str, dict]:
     return None, {}
 
 
-def get_ac_official_data(ac_id: str, pc_data: dict, schema: dict) -> dict:
+def get_contest(ac_id: str, pc_data: dict[str, 'Contest'], schema: dict) -> tuple[str, list]:
+    """The contest an AC's booths vote in and its candidates.
+
+    Assembly results are keyed by AC id; parliament results by PC id, so
+    the AC's PC is looked up in the schema.
+    """
+    if ac_id in pc_data:
+        return ac_id, pc_data[ac_id].candidates
+    pc_id, _ = get_pc_for_ac(ac_id, schema)
+    if not pc_id or pc_id not in pc_data:
+        return pc_id, []
+    return pc_id, pc_data[pc_id].candidates
+
+
+def get_ac_official_data(ac_id: str, pc_data: dict[str, 'Contest'], schema: dict) -> dict:
     """
     Get official vote data for an AC including booth totals and postal votes.
     Returns: {
@@ -120,49 +228,47 @@ def get_ac_official_data(ac_id: str, pc_data: dict, schema: dict) -> dict:
         'total_votes': {candidate_index: votes},  # Set in stone, never modify
         'candidates': [list of candidate info]
     }
+    
+    Assembly results carry no per-candidate postal split, so for assembly
+    elections the booth totals are the candidate totals. Parliament booth
+    totals are the AC's entry of each candidate's acWiseVotes.
     """
-    pc_id, pc_info_schema = get_pc_for_ac(ac_id, schema)
-    if not pc_id:
-        return {}
+    if ac_id in pc_data:
+        candidates = pc_data[ac_id].candidates
+        total_votes = {i: c.votes for i, c in enumerate(candidates)}
+        return {
+            'booth_totals': dict(total_votes),
+            'postal_votes': {i: 0 for i in total_votes},
+            'total_votes': total_votes,
+            'candidates': [{'index': i, 'name': c.name, 'party': c.party,
+                            'total_votes': total_votes[i], 'booth_votes': total_votes[i],
+                            'postal_votes': 0} for i, c in enumerate(candidates)]
+        }
     
-    pc_info = pc_data.get(pc_id, {})
-    candidates = pc_info.get('candidates', [])
-    ac_num = int(ac_id.split('-')[1])
+    pc_id, _ = get_pc_for_ac(ac_id, schema)
+    if not pc_id or pc_id not in pc_data:
+        return {}
     
     # Get AC name from schema
-    ac_name = schema.get('assemblyConstituencies', {}).get(ac_id, {}).get('name', '')
+    ac_name = schema.get('assemblyConstituencies', {}).get(ac_id, {}).get('name', '').lower()
     
     booth_totals = {}
     total_votes = {}
     candidate_info = []
     
-    for i, cand in enumerate(candidates):
+    for i, cand in enumerate(pc_data[pc_id].candidates):
         # Total votes (set in stone - includes booth + postal)
-        total = cand.get('votes', 0)
-        total_votes[i] = total
-        
+        total_votes[i] = cand.votes
         # AC-wise votes (booth votes only)
-        ac_votes_list = cand.get('acWiseVotes', [])
-        booth_votes = 0
-        
-        if isinstance(ac_votes_list, list):
-            for ac_entry in ac_votes_list:
-                if isinstance(ac_entry, dict):
-                    entry_name = ac_entry.get('acName', '')
-                    if entry_name.lower() == ac_name.lower():
-                        booth_votes = ac_entry.get('votes', 0)
-                        break
-        elif isinstance(ac_votes_list, dict):
-            booth_votes = ac_votes_list.get(str(ac_num), ac_votes_list.get(ac_id, 0))
-        
-        booth_totals[i] = booth_votes
+        booth_totals[i] = next((entry.votes for entry in cand.ac_wise_votes
+                                if entry.ac_name.lower() == ac_name), 0)
         candidate_info.append({
             'index': i,
-            'name': cand.get('name', ''),
-            'party': cand.get('party', ''),
-            'total_votes': total,
-            'booth_votes': booth_votes,
-            'postal_votes': total - booth_votes
+            'name': cand.name,
+            'party': cand.party,
+            'total_votes': cand.votes,
+            'booth_votes': booth_totals[i],
+            'postal_votes': cand.votes - booth_totals[i]
         })
     
     return {
@@ -173,9 +279,9 @@ def get_ac_official_data(ac_id: str, pc_data: dict, schema: dict) -> dict:
     }
 
 
-def load_existing_data(ac_id: str) -> dict:
-    """Load existing 2024.json data for an AC."""
-    results_file = OUTPUT_BASE / ac_id / "2024.json"
+def load_existing_data(ac_id: str, election: Election = TN_2024) -> dict:
+    """Load existing booth results ({year}.json) for an AC."""
+    results_file = election.results_file(ac_id)
     if results_file.exists():
         with open(results_file) as f:
             return json.load(f)
@@ -210,60 +316,113 @@ def detect_pdf_type(pdf_path: Path) -> str:
         return f"error: {e}"
 
 
+def count_pages(pdf_path: Path) -> int:
+    """Page count without rendering anything (0 if the PDF can't be read)."""
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            return len(pdf.pages)
+    except Exception:
+        return 0
+
+
+# ============================================================================
+# Extraction Engine
+# ============================================================================
+
+def pdf_layout(pdf_path: Path) -> tuple[int, bool]:
+    """Page count and whether the first page is landscape, without rendering."""
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            if not pdf.pages:
+                return 0, False
+            return len(pdf.pages), pdf.pages[0].width > pdf.pages[0].height
+    except Exception:
+        return 0, False
+
+
+def extract_pdf(pdf_path: Path, num_candidates: int, ac_id: str, pdf_type: str, expected_booths: set = None,
+                checkpoint: Checkpoint = None, election: Election = TN_2024) -> ExtractionResult:
+    """Run the election's extraction strategies for a PDF type (see strategies.py).
+
+    With a run ledger checkpoint, strategies are ordered by their record on
+    the PDF's layout family, ones that never added booths there are
+    skipped, and what each strategy added is recorded for later runs.
+    """
+    pages, landscape = pdf_layout(pdf_path)
+    ctx = ExtractionContext(pdf_path, num_candidates, ac_id, pdf_type, pages=pages,
+                            layout=layout_family(pdf_type, landscape, num_candidates),
+                            expected=set(expected_booths or ()), checkpoint=checkpoint,
+                            merge=election.merge)
+    ledger = checkpoint.ledger if checkpoint else None
+    history = ledger.strategy_stats(ctx.layout) if ledger else {}
+    strategies, skipped = plan(ctx, history, election.strategies, election.strategy_order)
+    if skipped:
+        print(f"    Skipping {', '.join(skipped)} (never added booths on {ctx.layout} PDFs)")
+    
+    runs = run_strategies(ctx, strategies)
+    for r in runs:
+        print(f"    {r['strategy']}: {r['booths']} booths, {r['new_booths']} new ({r['seconds']:.1f}s)")
+    if ledger and runs:
+        ledger.record_strategy_runs(f"{election.state}-{election.year}", ctx.layout, ac_id, runs)
+    
+    return ExtractionResult(ac_id=ac_id, table=ctx.found, errors=ctx.errors, warnings=ctx.warnings,
+                            pdf_type=pdf_type, pages_processed=pages)
+
+
 # ============================================================================
 # Text-based PDF Extraction (pdfplumber)
 # ============================================================================
 
 def extract_text_pdf(pdf_path: Path, num_candidates: int, ac_id: str) -> ExtractionResult:
     """Extract booth data from text-based PDF using multiple strategies."""
-    result = ExtractionResult(ac_id=ac_id, pdf_type="text")
-    all_booths = {}  # booth_id -> BoothResult (keep best)
-    
-    try:
-        # Strategy 1: pdfplumber tables (highest quality)
-        with pdfplumber.open(pdf_path) as pdf:
-            result.pages_processed = len(pdf.pages)
-            
-            for page_num, page in enumerate(pdf.pages):
-                tables = page.extract_tables()
-                
-                if tables:
-                    for table in tables:
-                        booths = parse_table_data(table, num_candidates, page_num)
-                        for booth in booths:
-                            key = f"{booth.booth_no:03d}"
-                            if key not in all_booths:
-                                all_booths[key] = booth
-                
-                # Strategy 2: pdfplumber text extraction
-                text = page.extract_text() or ""
-                booths = parse_text_data(text, num_candidates, page_num)
-                for booth in booths:
-                    key = f"{booth.booth_no:03d}"
-                    if key not in all_booths:
-                        all_booths[key] = booth
-        
-        # Strategy 3: pdftotext fallback (if we're missing booths)
-        if len(all_booths) < 50:  # Likely incomplete
-            try:
-                pdftotext_result = subprocess.run(
-                    ['pdftotext', '-layout', str(pdf_path), '-'],
-                    capture_output=True, text=True, timeout=30
-                )
-                if pdftotext_result.returncode == 0:
-                    booths = parse_text_data(pdftotext_result.stdout, num_candidates, 0)
-                    for booth in booths:
-                        key = f"{booth.booth_no:03d}"
-                        if key not in all_booths:
-                            all_booths[key] = booth
-            except Exception:
-                pass
-                            
-    except Exception as e:
-        result.errors.append(f"PDF extraction error: {e}")
-    
-    result.booths = all_booths
-    return result
+    return extract_pdf(pdf_path, num_candidates, ac_id, 'text')
+
+
+@register('tables', 'text', prior_gain=0.9, seconds_per_page=0.3)
+def extract_tables(ctx: ExtractionContext) -> BoothTable:
+    """pdfplumber tables (highest quality)."""
+    booths = []
+    with pdfplumber.open(ctx.pdf_path) as pdf:
+        for page_num, page in enumerate(pdf.pages):
+            with span('page', page=page_num):
+                with span('pdf_text', method='table'):
+                    tables = page.extract_tables()
+                with span('parse', method='table') as tags:
+                    found = [b for table in tables
+                             for b in parse_table_data(table, ctx.num_candidates, page_num)]
+                    tags['booths'] = len(found)
+            booths += found
+    return BoothTable.from_booths(booths, ctx.num_candidates, method='tables', confidence=1.0)
+
+
+@register('text', 'text', prior_gain=0.5, seconds_per_page=0.2)
+def extract_text_lines(ctx: ExtractionContext) -> BoothTable:
+    """pdfplumber text lines."""
+    booths = []
+    with pdfplumber.open(ctx.pdf_path) as pdf:
+        for page_num, page in enumerate(pdf.pages):
+            with span('page', page=page_num):
+                with span('pdf_text', method='text'):
+                    text = page.extract_text() or ""
+                with span('parse', method='text') as tags:
+                    found = parse_text_data(text, ctx.num_candidates, page_num)
+                    tags['booths'] = len(found)
+            booths += found
+    return BoothTable.from_booths(booths, ctx.num_candidates, method='text', confidence=0.95)
+
+
+@register('pdftotext', 'text', prior_gain=0.2, seconds_per_page=0.1, run_below=1.0)
+def extract_pdftotext(ctx: ExtractionContext) -> BoothTable:
+    """poppler pdftotext -layout, while booths are missing."""
+    found = []
+    with span('pdf_text', method='pdftotext'):
+        result = subprocess.run(['pdftotext', '-layout', str(ctx.pdf_path), '-'],
+                                capture_output=True, text=True, timeout=30)
+    if result.returncode == 0:
+        with span('parse', method='pdftotext') as tags:
+            found = parse_text_data(result.stdout, ctx.num_candidates, 0)
+            tags['booths'] = len(found)
+    return BoothTable.from_booths(found, ctx.num_candidates, method='pdftotext', confidence=0.9)
 
 
 def parse_table_data(table: list, num_candidates: int, page_num: int) -> list[BoothResult]:
@@ -276,74 +435,35 @@ def parse_table_data(table: list, num_candidates: int, page_num: int) -> list[Bo
     # Find header row (contains "Sl", "Station", "No", or similar)
     header_row = 0
     for i, row in enumerate(table[:5]):
-        if row and any(cell and isinstance(cell, str) and 
-                      any(kw in str(cell).upper() for kw in ['SL', 'STATION', 'NO', 'SERIAL', 'BOOTH'])
-                      for cell in row[:3]):
+        if row and any(isinstance(cell, str) and TABLE_HEADERS(cell) for cell in row[:3]):
             header_row = i
             break
     
     # Process data rows
-    for row_idx, row in enumerate(table[header_row + 1:], start=header_row + 1):
+    for row in table[header_row + 1:]:
         if not row or len(row) < 3:
             continue
         
-        # Clean row data - handle None and extract numbers
-        clean_row = []
-        for cell in row:
-            if cell is None:
-                clean_row.append("")
-            else:
-                # Remove non-numeric characters but keep spaces
-                cell_str = str(cell).strip()
-                # Extract numbers from cell (may contain text)
-                clean_row.append(cell_str)
-        
-        # Extract all numbers from the row
-        all_numbers = []
-        for cell in clean_row:
-            # Extract all numbers from cell
-            nums = re.findall(r'\b(\d+)\b', cell)
-            all_numbers.extend([int(n) for n in nums])
-        
-        if len(all_numbers) < 4:
+        # Numbers of all cells (cells may contain text) in one scan
+        values = numbers(' '.join(str(cell) for cell in row if cell is not None))
+        if len(values) < 4:
             continue
         
-        # Find booth number (first number 1-600 in first few positions)
-        booth_no = None
-        vote_start = 0
-        
-        for i, num in enumerate(all_numbers[:5]):
-            if 1 <= num <= 600:
-                booth_no = num
-                vote_start = i + 1
-                break
-        
-        if not booth_no:
+        # Booth number: first number 1-600 in the first few positions
+        booth = booth_row(values, max_booth=600, first=5)
+        if booth is None or len(booth[1]) < 3:
             continue
         
-        # Extract votes (numbers after booth number)
-        votes = []
-        for num in all_numbers[vote_start:]:
-            if num <= 2000:  # Reasonable vote count
-                votes.append(num)
-            elif num > 5000:  # Likely a total column
-                break
-        
-        if len(votes) >= 3:
-            # Trim to candidate count
-            votes = votes[:num_candidates]
-            while len(votes) < num_candidates:
-                votes.append(0)
-            
-            total = sum(votes)
-            if MIN_VOTES_PER_BOOTH <= total <= MAX_VOTES_PER_BOOTH:
-                booths.append(BoothResult(
-                    booth_no=booth_no,
-                    votes=votes,
-                    total=total,
-                    source_page=page_num,
-                    confidence=0.95
-                ))
+        votes = fit_votes(booth[1], num_candidates)
+        total = sum(votes)
+        if MIN_VOTES_PER_BOOTH <= total <= MAX_VOTES_PER_BOOTH:
+            booths.append(BoothResult(
+                booth_no=booth[0],
+                votes=votes,
+                total=total,
+                source_page=page_num,
+                confidence=0.95
+            ))
     
     return booths
 
@@ -351,53 +471,31 @@ def parse_table_data(table: list, num_candidates: int, page_num: int) -> list[Bo
 def parse_text_data(text: str, num_candidates: int, page_num: int) -> list[BoothResult]:
     """Parse booth data from raw text."""
     booths = []
-    lines = text.split('\n')
     
-    for line in lines:
+    for line in text.split('\n'):
         # Skip header lines
-        if any(kw in line.upper() for kw in ['FORM 20', 'ELECTION', 'CANDIDATE', 'PARTY', 'TOTAL']):
+        if TEXT_HEADERS(line):
             continue
         
-        # Extract all numbers from line
-        numbers = [int(n) for n in re.findall(r'\b(\d+)\b', line)]
-        
-        if len(numbers) < 4:
+        values = numbers(line)
+        if len(values) < 4:
             continue
         
-        # Find booth number (first number in range 1-600)
-        booth_no = None
-        vote_start = 0
-        
-        for i, num in enumerate(numbers):
-            if 1 <= num <= 600:
-                booth_no = num
-                vote_start = i + 1
-                break
-        
-        if booth_no is None:
+        # Booth number: first number in range 1-600; votes after it
+        # (totals, usually > 2000, are filtered out)
+        row = booth_row(values, max_booth=600)
+        if row is None or len(row[1]) < 3:
             continue
         
-        # Get votes (filter out totals which are usually > 2000)
-        votes = []
-        for num in numbers[vote_start:]:
-            if num <= 2000:
-                votes.append(num)
-            elif num > 5000:  # Likely a total, stop
-                break
-        
-        if len(votes) >= 3:
-            votes = votes[:num_candidates]
-            while len(votes) < num_candidates:
-                votes.append(0)
-            
-            total = sum(votes)
-            if MIN_VOTES_PER_BOOTH <= total <= MAX_VOTES_PER_BOOTH:
-                booths.append(BoothResult(
-                    booth_no=booth_no,
-                    votes=votes,
-                    total=total,
-                    source_page=page_num
-                ))
+        votes = fit_votes(row[1], num_candidates)
+        total = sum(votes)
+        if MIN_VOTES_PER_BOOTH <= total <= MAX_VOTES_PER_BOOTH:
+            booths.append(BoothResult(
+                booth_no=row[0],
+                votes=votes,
+                total=total,
+                source_page=page_num
+            ))
     
     return booths
 
@@ -406,75 +504,198 @@ def parse_text_data(text: str, num_candidates: int, page_num: int) -> list[Booth
 # Scanned PDF Extraction (OCR)
 # ============================================================================
 
-def extract_scanned_pdf(pdf_path: Path, num_candidates: int, ac_id: str, expected_booths: set = None) -> ExtractionResult:
+def extract_scanned_pdf(pdf_path: Path, num_candidates: int, ac_id: str, expected_booths: set = None,
+                        checkpoint: Checkpoint = None) -> ExtractionResult:
     """Extract booth data from scanned PDF using multiple OCR strategies."""
-    result = ExtractionResult(ac_id=ac_id, pdf_type="scanned")
-    
-    # Determine max booth number from expected set
-    max_booth = max(expected_booths) if expected_booths else 500
-    all_booths = {}  # booth_id -> (BoothResult, confidence)
-    
-    try:
-        # Strategy 1: pytesseract - FAST MODE (single best method)
-        # Use single best DPI (300) and best preprocessing method only
-        images = convert_from_path(str(pdf_path), dpi=300)
-        result.pages_processed = len(images)
-        
-        for page_num, image in enumerate(images):
-            page_booths = {}
-            
-            # Try only the best preprocessing method first (standard)
-            processed = preprocess_image(image, 'standard')
-            
-            # Try only best PSM mode (6)
-            config = '--psm 6 --oem 3'
-            text = pytesseract.image_to_string(processed, config=config)
-            booths = parse_ocr_text(text, num_candidates, page_num, max_booth)
-            
-            for booth in booths:
-                key = f"{booth.booth_no:03d}"
-                if booth.booth_no <= max_booth + 50:
-                    page_booths[key] = (booth, 0.8)
-            
-            # Only try other methods if we got very few booths
-            if len(page_booths) < 5:
-                # Try high_contrast as fallback
-                processed = preprocess_image(image, 'high_contrast')
-                text = pytesseract.image_to_string(processed, config=config)
-                booths = parse_ocr_text(text, num_candidates, page_num, max_booth)
-                
-                for booth in booths:
-                    key = f"{booth.booth_no:03d}"
-                    if booth.booth_no <= max_booth + 50:
-                        if key not in page_booths:
-                            page_booths[key] = (booth, 0.75)
-            
-            # Merge page results
-            for key, (booth, conf) in page_booths.items():
-                if key not in all_booths or all_booths[key][1] < conf:
-                    all_booths[key] = (booth, conf)
-        
-        # Strategy 2: Surya OCR fallback (enabled for difficult cases)
-        # Use Surya if we got less than 80% of expected booths
-        extraction_ratio = len(all_booths) / len(expected_booths) if expected_booths and len(expected_booths) > 0 else 1.0
-        if extraction_ratio < 0.8:  # Use Surya if we got less than 80%
-            try:
-                print(f"    Using Surya OCR fallback (extraction ratio: {extraction_ratio:.1%})")
-                surya_booths = extract_with_surya_fallback(pdf_path, num_candidates, ac_id, expected_booths)
-                for booth in surya_booths:
-                    key = f"{booth.booth_no:03d}"
-                    if key not in all_booths or all_booths[key][1] < 0.9:
-                        all_booths[key] = (booth, 0.9)
-                print(f"    Surya extracted {len(surya_booths)} additional booths")
-            except Exception as e:
-                result.warnings.append(f"Surya OCR fallback failed: {e}")
-                    
-    except Exception as e:
-        result.errors.append(f"OCR extraction error: {e}")
-    
-    # Keep highest confidence results
-    result.booths = {k: v[0] for k, v in all_booths.items()}
-    return result
+    return extract_pdf(pdf_path, num_candidates, ac_id, 'scanned', expected_booths, checkpoint)
+
+
+@register('tesseract', 'scanned', prior_gain=0.8, seconds_per_page=12.0)
+def extract_tesseract(ctx: ExtractionContext) -> dict:
+    """pytesseract, one page at a time, climbing the DPI ladder per page.
+
+    A thumbnail pass first (page_triage.py) sorts out cover, summary and
+    blank pages and boxes the data table, so only booth-data pages are
+    rendered for OCR and only their table is read; the other non-blank
+    pages are OCR'd after all when the data pages leave expected booths
+    missing. Each data page is read at the AC's starting DPI and read
+    again one DPI_LADDER rung up while it fails validation (low-confidence
+    rows, i.e. broken checksums, or table rows without a booth); every
+    booth keeps its best reading across rungs. Pages are rasterized one at
+    a time since a whole document at 300 DPI holds ~26 MB per page. Ruled
+    tables are read cell by cell (the grid found on one page is reused on
+    the next while its rules line up). With a run ledger checkpoint every
+    OCR'd page is saved as it completes, pages saved by an interrupted
+    earlier attempt are not OCR'd again, and the rung most pages needed is
+    recorded as the PDF's starting rung for the next run. Every reading
+    of every rung is returned; a page's rungs are merged (ctx.merge) only
+    to judge whether it passes.
+    """
+    readings = [BoothTable.empty(ctx.num_candidates)]
+    grids = defaultdict(GridCache)      # per DPI: a grid only fits pages of its size
+    ledger = ctx.checkpoint.ledger if ctx.checkpoint else None
+    done_pages = ctx.checkpoint.pages() if ctx.checkpoint else {}
+    if done_pages:
+        print(f"    Resuming after {len(done_pages)} checkpointed pages")
+    todo = [page_num for page_num in range(ctx.pages) if page_num not in done_pages]
+    with span('triage', pages=len(todo)) as tags:
+        triage = {page.page: page for page in triage_pdf(ctx.pdf_path, todo)}
+        kinds = defaultdict(int)
+        for page in triage.values():
+            kinds[page.kind] += 1
+        tags['data_pages'] = kinds['booth-data']
+    if len(triage) > kinds['booth-data']:
+        print(f"    Triage: {kinds['booth-data']}/{len(triage)} booth-data pages "
+              f"({', '.join(f'{n} {kind}' for kind, n in kinds.items() if kind != 'booth-data')})")
+    start_dpi = (ledger.start_dpi(ctx.pdf_path) if ledger else None) or DPI_LADDER[0]
+    rungs = [dpi for dpi in DPI_LADDER if dpi >= start_dpi] or [DPI_LADDER[-1]]
+    page_dpi = {}
+    
+    def passes(page: BoothTable, triaged) -> bool:
+        if not len(page) or page.confidence.min() < PASS_CONFIDENCE:
+            return False
+        # Ruled table: its rows (less the header row) are booths
+        return not triaged.columns or len(page) >= triaged.rows - 1 - ROW_SLACK
+    
+    def ocr(page_num: int, triaged=None):
+        page_readings = []
+        for dpi in rungs:
+            page_readings.append(ocr_scanned_page(ctx.pdf_path, page_num, ctx.num_candidates, ctx.max_booth,
+                                                  grids[dpi], triaged.box if triaged else None, dpi))
+            page = BoothTable.concat(page_readings).merge(ctx.merge)
+            page_dpi[page_num] = dpi
+            if triaged is None or passes(page, triaged):
+                break
+        if ctx.checkpoint:
+            ctx.checkpoint.save_page(page_num, [[booth_key(booth.booth_no), asdict(booth), booth.confidence]
+                                                for booth in page.booth_results()])
+        readings.extend(page_readings)
+    
+    skipped = []
+    for page_num in range(ctx.pages):
+        if page_num in done_pages:
+            readings.append(BoothTable.from_booths([BoothResult(**{**booth, 'confidence': conf})
+                                                    for _, booth, conf in done_pages[page_num]],
+                                                   ctx.num_candidates))
+        elif triage[page_num].kind == 'booth-data':
+            ocr(page_num, triage[page_num])
+        elif triage[page_num].kind != 'blank':
+            skipped.append(page_num)
+    
+    # Misclassified data pages (e.g. a short last page): read the skipped
+    # pages whole while booths are missing
+    found = set(BoothTable.concat(readings).booth_nos.tolist())
+    if skipped and (not ctx.expected or not ctx.expected <= found):
+        for page_num in skipped:
+            ocr(page_num)
+    
+    if page_dpi:
+        counts = defaultdict(int)
+        for dpi in page_dpi.values():
+            counts[dpi] += 1
+        climbed = sum(n for dpi, n in counts.items() if dpi > rungs[0])
+        if climbed:
+            print(f"    DPI ladder: {climbed}/{len(page_dpi)} pages re-read above {rungs[0]} DPI")
+        if ledger:
+            # Next run starts at the rung most pages needed
+            ledger.record_dpi(ctx.pdf_path, ctx.ac_id, max(counts, key=lambda dpi: (counts[dpi], -dpi)),
+                              dict(counts))
+    return BoothTable.concat(readings)
+
+
+@register('surya', 'scanned', prior_gain=0.3, seconds_per_page=40.0, run_below=0.8)
+def extract_surya(ctx: ExtractionContext) -> BoothTable:
+    """Surya OCR for difficult scans, while under 80% of booths are found."""
+    print(f"    Using Surya OCR fallback (extraction ratio: {ctx.coverage():.1%})")
+    with span('ocr_surya', method='surya') as tags:
+        found = extract_with_surya_fallback(ctx.pdf_path, ctx.num_candidates, ctx.ac_id, ctx.expected)
+        tags['booths'] = len(found)
+    return BoothTable.from_booths(found, ctx.num_candidates, method='surya', confidence=0.9)
+
+
+def ocr_scanned_page(pdf_path: Path, page_num: int, num_candidates: int, max_booth: int,
+                     grids: GridCache = None, box: tuple = None, dpi: int = 300) -> BoothTable:
+    """Rasterize and OCR one page; returns the readings of every method run on it.
+
+    With a table box (page_triage.py) only that region is read. A ruled
+    table is read column by column (values land in their columns);
+    full-page OCR only runs when that finds fewer than 5 booths.
+    """
+    with span('page', page=page_num, dpi=dpi):
+        with span('rasterize', dpi=dpi):
+            image = pdf2image.convert_from_path(str(pdf_path), dpi=dpi,
+                                      first_page=page_num + 1, last_page=page_num + 1)[0]
+            image = crop_table(image, box)
+        page = ocr_grid_page(image, num_candidates, page_num, max_booth, grids)
+        config = '--psm 6 --oem 3'
+        
+        if page.num_booths < 5:
+            # No usable grid: full-page OCR with the best preprocessing
+            # method first (standard) and only the best PSM mode (6)
+            booths = ocr_page(image, 'standard', 6, config, num_candidates, page_num, max_booth)
+            standard = BoothTable.from_booths(booths, num_candidates, method='standard')
+            page = BoothTable.concat([page, standard.select(standard.booth_nos <= max_booth + 50)])
+        
+        # Only try other methods if we got very few booths
+        if page.num_booths < 5:
+            # Try high_contrast as fallback, for booths not read yet
+            booths = ocr_page(image, 'high_contrast', 6, config, num_candidates, page_num, max_booth)
+            fallback = BoothTable.from_booths(booths, num_candidates, method='high_contrast')
+            fallback = fallback.select(fallback.booth_nos <= max_booth + 50).missing_from(page)
+            fallback.rows['confidence'] -= 0.05
+            page = BoothTable.concat([page, fallback])
+    
+    return page
+
+
+def ocr_grid_page(image: 'Image.Image', num_candidates: int, page_num: int, max_booth: int,
+                  grids: GridCache = None) -> BoothTable:
+    """Booths of a ruled table read cell by cell (none if no grid is found).
+
+    Cells are read by the NumPy digit recognizer in one batch; tesseract
+    only reads the cells it is unsure of. A complete row is 0.85 (its columns come from the rules, not from
+    spacing); a row with one blank vote cell is 0.7, so a full-page OCR
+    reading of it wins. Both move with the row's checksum columns
+    (row_checksum.py), which also correct look-alike digits (ties going to
+    the cells the recognizer was least sure of) and fill a blank vote cell
+    from the total valid votes.
+    """
+    gray = np.array(image.convert('L'))
+    with span('grid') as tags:
+        grid = (grids or GridCache()).grid_for(gray)
+        tags['columns'] = grid.num_columns if grid else 0
+    if grid is None:
+        return BoothTable.empty(num_candidates)
+    with span('ocr', method='digits'):
+        cells, scores = read_cells(gray, grid, load_recognizer(), with_confidence=True)
+    with span('parse', method='grid') as tags:
+        booths, fixed = [], 0
+        for booth_no, votes, rest, missing, conf in grid_rows(cells, num_candidates, max_booth + 50, scores):
+            # Columns come from the rules: no offset to search; the
+            # recognizer's cell confidences break ties between fixes
+            check = check_row(votes + rest, num_candidates, max_offset=0, confidence=conf)
+            fixed += check.status == 'fixed'
+            total = sum(check.votes)
+            if MIN_VOTES_PER_BOOTH <= total <= MAX_VOTES_PER_BOOTH:
+                confidence = (0.7 if missing and check.status != 'fixed' else 0.85) + check.confidence_adjust
+                booths.append(BoothResult(booth_no, check.votes, total, page_num, confidence,
+                                          checksum=check.status))
+        tags['booths'] = len(booths)
+        tags['fixed'] = fixed
+    return BoothTable.from_booths(booths, num_candidates, method='grid')
+
+
+def ocr_page(image: 'Image.Image', method: str, psm: int, config: str,
+             num_candidates: int, page_num: int, max_booth: int) -> list[BoothResult]:
+    """Preprocess, OCR and parse one page image, one span per stage."""
+    with span('preprocess', method=method):
+        processed = preprocess_image(image, method)
+    with span('ocr', method=method, psm=psm):
+        text = pytesseract.image_to_string(processed, config=config)
+    with span('parse', method=method, psm=psm) as tags:
+        booths = parse_ocr_text(text, num_candidates, page_num, max_booth)
+        tags['booths'] = len(booths)
+    return booths
 
 
 def extract_with_surya_fallback(pdf_path: Path, num_candidates: int, ac_id: str, expected_booths: set) -> list[BoothResult]:
@@ -609,7 +830,7 @@ def parse_surya_json(surya_data: dict, num_candidates: int, max_booth: int) -> l
     return booths
 
 
-def preprocess_image(image: Image.Image, method: str = 'standard') -> Image.Image:
+def preprocess_image(image: 'Image.Image', method: str = 'standard') -> 'Image.Image':
     """Preprocess image for better OCR results."""
     # Convert PIL to OpenCV
     img_array = np.array(image)
@@ -657,79 +878,50 @@ def parse_ocr_text(text: str, num_candidates: int, page_num: int, max_booth: int
     """Parse booth data from OCR text with aggressive number extraction."""
     booths = []
     seen_booths = set()
-    lines = text.split('\n')
-    
-    for line in lines:
-        # Clean OCR artifacts - be aggressive
-        line = re.sub(r'[|\\\/\[\]{}()<>]', ' ', line)
-        line = re.sub(r'[oO]', '0', line)  # Common OCR error
-        line = re.sub(r'[lI](?=\d)', '1', line)  # l or I before digit -> 1
-        line = re.sub(r'\s+', ' ', line).strip()
-        
-        # Skip short lines and headers
-        if len(line) < 10:
+    
+    for line in text.split('\n'):
+        # Skip headers; clean OCR artifacts (grid rules, O/o for 0, l/I for 1)
+        if OCR_HEADERS(line):
             continue
-        if any(kw in line.upper() for kw in ['FORM', 'ELECTION', 'CANDIDATE', 'PARTY', 'TOTAL', 'NOTA']):
+        line = clean_ocr_line(line)
+        if len(line) < 10:
             continue
         
-        # Extract all numbers with their positions
-        numbers = []
-        for match in re.finditer(r'\b(\d+)\b', line):
-            num = int(match.group(1))
-            pos = match.start()
-            numbers.append((pos, num))
-        
-        if len(numbers) < 4:
+        values = numbers(line)
+        if len(values) < 4:
             continue
         
-        # Sort by position
-        numbers.sort(key=lambda x: x[0])
-        
-        # Find booth number - should be in first 2-3 columns
-        booth_no = None
-        vote_start_idx = 0
-        
-        for i, (pos, num) in enumerate(numbers[:3]):
-            # Booth numbers are 1-max_booth, typically in leftmost columns
-            if 1 <= num <= max_booth + 50 and pos < 200:
-                # Check if this looks like a serial/station number
-                # (not a vote count which would be larger or have specific patterns)
-                booth_no = num
-                vote_start_idx = i + 1
-                break
-        
-        if booth_no is None:
+        # Booth numbers are 1-max_booth, in the first 2-3 (leftmost) columns
+        row = booth_row(values, max_booth + 50, first=3, line=line, max_pos=200)
+        if row is None or len(row[1]) < 3:
             continue
         
-        # Skip if we've seen this booth
-        if booth_no in seen_booths:
+        # Votes checked against the row's own total columns (every value
+        # after the booth number), look-alike digits corrected; a serial
+        # number taken for the booth number shows up as an offset, the
+        # station number being the cell before the votes. A row that does
+        # not check keeps the plain reading.
+        start = values.index(row[0]) + 1
+        check = check_row(values[start:], num_candidates)
+        if check.status in ('ok', 'fixed'):
+            booth_no = values[start + check.offset - 1] if check.offset else row[0]
+            votes = check.votes
+        else:
+            booth_no, votes = row[0], fit_votes(row[1], num_candidates)
+        if booth_no in seen_booths or not 1 <= booth_no <= max_booth + 50:
             continue
         
-        # Get votes - numbers after booth, filter reasonable values
-        vote_nums = []
-        for pos, num in numbers[vote_start_idx:]:
-            # Vote counts are typically 0-2000
-            if num <= 2000:
-                vote_nums.append(num)
-            elif num > 5000:
-                # Likely a total column, stop here
-                break
-        
-        if len(vote_nums) >= 3:
-            votes = vote_nums[:num_candidates]
-            while len(votes) < num_candidates:
-                votes.append(0)
-            
-            total = sum(votes)
-            if MIN_VOTES_PER_BOOTH <= total <= MAX_VOTES_PER_BOOTH:
-                seen_booths.add(booth_no)
-                booths.append(BoothResult(
-                    booth_no=booth_no,
-                    votes=votes,
-                    total=total,
-                    source_page=page_num,
-                    confidence=0.8
-                ))
+        total = sum(votes)
+        if MIN_VOTES_PER_BOOTH <= total <= MAX_VOTES_PER_BOOTH:
+            seen_booths.add(booth_no)
+            booths.append(BoothResult(
+                booth_no=booth_no,
+                votes=votes,
+                total=total,
+                source_page=page_num,
+                confidence=0.8 + check.confidence_adjust,
+                checksum=check.status
+            ))
     
     return booths
 
@@ -743,23 +935,20 @@ def correct_column_order(extraction: ExtractionResult, official_data: dict, num_
     Detect and correct column order by matching extracted totals to official totals.
     Returns corrected extraction with columns reordered.
     """
-    if not official_data or not extraction.booths:
+    if not official_data or not len(extraction.table):
         return extraction
     
     official_booth_totals = official_data.get('booth_totals', {})
     if not official_booth_totals:
         return extraction
     
-    # Calculate extracted totals per column
-    extracted_totals = defaultdict(int)
-    for booth in extraction.booths.values():
-        for i, votes in enumerate(booth.votes):
-            extracted_totals[i] += votes
+    # Extracted totals per column
+    column_totals = extraction.table.votes.sum(axis=0).tolist()
     
     # Find best column mapping using Hungarian algorithm (simplified)
     # Try to match extracted columns to official candidates
     official_list = [official_booth_totals.get(i, 0) for i in range(num_candidates)]
-    extracted_list = [extracted_totals.get(i, 0) for i in range(num_candidates)]
+    extracted_list = [column_totals[i] if i < len(column_totals) else 0 for i in range(num_candidates)]
     
     # Calculate correlation for each possible mapping
     best_mapping = None
@@ -828,19 +1017,7 @@ def correct_column_order(extraction: ExtractionResult, official_data: dict, num_
         # Only apply mapping if it reduces error by at least 30%
         if original_error > 0 and mapped_error < original_error * 0.7:
             # Reorder columns in all booths
-            corrected_booths = {}
-            for booth_id, booth in extraction.booths.items():
-                reordered_votes = [booth.votes[best_mapping[i]] if best_mapping[i] < len(booth.votes) else 0 
-                                  for i in range(num_candidates)]
-                corrected_booths[booth_id] = BoothResult(
-                    booth_no=booth.booth_no,
-                    votes=reordered_votes,
-                    total=sum(reordered_votes),
-                    source_page=booth.source_page,
-                    confidence=booth.confidence
-                )
-            
-            extraction.booths = corrected_booths
+            extraction.table = extraction.table.with_columns(list(best_mapping))
             extraction.warnings.append(f"Column order corrected (mapping: {best_mapping[:5]}...)")
     
     return extraction
@@ -862,11 +1039,12 @@ def validate_extraction(
     Returns ValidationResult with is_valid=True only if all critical checks pass.
     """
     result = ValidationResult(is_valid=True)
+    table = extraction.table
     
     # -------------------------------------------------------------------------
     # Check 1: Minimum extraction count
     # -------------------------------------------------------------------------
-    if len(extraction.booths) == 0:
+    if len(table) == 0:
         result.errors.append("No booths extracted")
         result.is_valid = False
         return result
@@ -875,7 +1053,7 @@ def validate_extraction(
     # Check 2: Extraction ratio (different thresholds for scanned PDFs)
     # -------------------------------------------------------------------------
     if expected_booths:
-        extraction_ratio = len(extraction.booths) / len(expected_booths)
+        extraction_ratio = len(table) / len(expected_booths)
         result.stats['extraction_ratio'] = extraction_ratio
         
         # Use different threshold for scanned PDFs
@@ -884,7 +1062,7 @@ def validate_extraction(
         if extraction_ratio < min_ratio:
             result.warnings.append(
                 f"Low extraction ratio: {extraction_ratio:.1%} "
-                f"({len(extraction.booths)}/{len(expected_booths)} booths)"
+                f"({len(table)}/{len(expected_booths)} booths)"
             )
             # Only fail validation if way below threshold
             if extraction_ratio < min_ratio * 0.5:  # Less than half of required
@@ -895,35 +1073,27 @@ def validate_extraction(
                 result.is_valid = False
     
     # -------------------------------------------------------------------------
-    # Check 3: Column count consistency
+    # Check 3: Column count (the table has one width for every booth)
     # -------------------------------------------------------------------------
-    vote_lengths = [len(b.votes) for b in extraction.booths.values()]
-    if len(set(vote_lengths)) > 1:
+    if table.num_candidates != num_candidates:
         result.errors.append(
-            f"Inconsistent vote column counts: {set(vote_lengths)}"
-        )
-        result.is_valid = False
-    
-    # Check against expected candidate count
-    if vote_lengths and vote_lengths[0] != num_candidates:
-        result.errors.append(
-            f"Column count mismatch: got {vote_lengths[0]}, expected {num_candidates}"
+            f"Column count mismatch: got {table.num_candidates}, expected {num_candidates}"
         )
         result.is_valid = False
     
     # -------------------------------------------------------------------------
     # Check 4: Booth number validity
     # -------------------------------------------------------------------------
-    booth_numbers = [b.booth_no for b in extraction.booths.values()]
+    booth_numbers = table.booth_nos
     
     # Check for duplicates
-    if len(booth_numbers) != len(set(booth_numbers)):
-        dups = [n for n in booth_numbers if booth_numbers.count(n) > 1]
-        result.errors.append(f"Duplicate booth numbers: {set(dups)}")
+    numbers, counts = np.unique(booth_numbers, return_counts=True)
+    if (counts > 1).any():
+        result.errors.append(f"Duplicate booth numbers: {set(numbers[counts > 1].tolist())}")
         result.is_valid = False
     
     # Check range
-    invalid_booths = [n for n in booth_numbers if n < 1 or n > 600]
+    invalid_booths = booth_numbers[(booth_numbers < 1) | (booth_numbers > 600)].tolist()
     if invalid_booths:
         result.errors.append(f"Invalid booth numbers: {invalid_booths}")
         result.is_valid = False
@@ -931,17 +1101,15 @@ def validate_extraction(
     # -------------------------------------------------------------------------
     # Check 5: Vote totals per booth
     # -------------------------------------------------------------------------
-    suspicious_booths = []
-    for booth_id, booth in extraction.booths.items():
-        if booth.total < MIN_VOTES_PER_BOOTH:
-            suspicious_booths.append((booth_id, booth.total, "too low"))
-        elif booth.total > MAX_VOTES_PER_BOOTH:
-            suspicious_booths.append((booth_id, booth.total, "too high"))
-        
-        # Check for negative votes
-        if any(v < 0 for v in booth.votes):
-            result.errors.append(f"Booth {booth_id} has negative votes")
-            result.is_valid = False
+    totals = table.totals
+    suspicious_booths = [(booth_key(no), total, "too low" if total < MIN_VOTES_PER_BOOTH else "too high")
+                         for no, total in zip(booth_numbers.tolist(), totals.tolist())
+                         if not MIN_VOTES_PER_BOOTH <= total <= MAX_VOTES_PER_BOOTH]
+    
+    # Check for negative votes
+    for no in booth_numbers[(table.votes < 0).any(axis=1)].tolist():
+        result.errors.append(f"Booth {booth_key(no)} has negative votes")
+        result.is_valid = False
     
     if suspicious_booths:
         result.warnings.append(f"Suspicious booth totals: {suspicious_booths[:5]}")
@@ -956,10 +1124,7 @@ def validate_extraction(
         candidates = official_data.get('candidates', [])
         
         # Calculate extracted booth totals
-        extracted_booth_totals = defaultdict(int)
-        for booth in extraction.booths.values():
-            for i, votes in enumerate(booth.votes):
-                extracted_booth_totals[i] += votes
+        extracted_booth_totals = dict(enumerate(table.votes.sum(axis=0).tolist()))
         
         # Calculate accuracy metrics for each candidate
         accuracy_details = []
@@ -1054,23 +1219,14 @@ def validate_extraction(
     # -------------------------------------------------------------------------
     # Check 7: Detect low-voting candidates getting unusually high booth wins
     # -------------------------------------------------------------------------
-    if official_data and len(extraction.booths) > 10:
+    if official_data and len(table) > 10 and table.num_candidates:
         candidates = official_data.get('candidates', [])
-        extracted_booth_totals = defaultdict(int)
-        booth_wins = defaultdict(int)  # Count of booths where candidate got most votes
-        
-        for booth in extraction.booths.values():
-            if not booth.votes:
-                continue
-            
-            # Find winner (candidate with most votes in this booth)
-            max_votes = max(booth.votes)
-            winner_indices = [i for i, v in enumerate(booth.votes) if v == max_votes]
-            
-            for i, votes in enumerate(booth.votes):
-                extracted_booth_totals[i] += votes
-                if i in winner_indices and len(winner_indices) == 1:  # Single winner
-                    booth_wins[i] += 1
+        votes = table.votes
+        extracted_booth_totals = dict(enumerate(votes.sum(axis=0).tolist()))
+        # Count of booths where candidate got most votes (single winner only)
+        single = (votes == votes.max(axis=1, keepdims=True)).sum(axis=1) == 1
+        booth_wins = dict(enumerate(np.bincount(votes.argmax(axis=1)[single],
+                                                minlength=table.num_candidates).tolist()))
         
         # Check for anomalies: low-voting candidates winning many booths
         anomalies = []
@@ -1081,7 +1237,7 @@ def validate_extraction(
             
             if total_votes > 0 and booth_wins_count > 0:
                 # Calculate expected win rate based on vote share
-                total_booths = len(extraction.booths)
+                total_booths = len(table)
                 vote_share = total_votes / sum(c['total_votes'] for c in candidates if c.get('total_votes', 0) > 0)
                 expected_wins = total_booths * vote_share
                 
@@ -1117,10 +1273,7 @@ def validate_extraction(
         sorted_official = sorted(official_booth_totals.items(), key=lambda x: -x[1])[:2]
         
         # Get top 2 by extracted votes
-        extracted_booth_totals = defaultdict(int)
-        for booth in extraction.booths.values():
-            for i, votes in enumerate(booth.votes):
-                extracted_booth_totals[i] += votes
+        extracted_booth_totals = dict(enumerate(table.votes.sum(axis=0).tolist()))
         sorted_extracted = sorted(extracted_booth_totals.items(), key=lambda x: -x[1])[:2]
         
         # Check if order matches (at least for top candidates)
@@ -1141,37 +1294,51 @@ def validate_extraction(
 
 def process_ac_wrapper(args):
     """Wrapper for parallel processing."""
-    ac_num, pc_data, schema = args
-    return process_ac(ac_num, pc_data, schema)
+    ac_num, pc_data, schema, checkpoint, election = args
+    return process_ac(ac_num, pc_data, schema, checkpoint=checkpoint, election=election)
 
 
 # ============================================================================
 # Main Processing
 # ============================================================================
 
-def process_ac(ac_num: int, pc_data: dict, schema: dict, force: bool = False) -> dict:
+def process_ac(ac_num: int, pc_data: dict, schema: dict, force: bool = False,
+               checkpoint: Checkpoint = None, election: Election = TN_2024) -> dict:
     """Process a single AC with full validation."""
-    ac_id = f"TN-{ac_num:03d}"
-    
+    ac_id = election.ac_id(ac_num)
+    if checkpoint:
+        checkpoint.start()
+    with span('ac', ac=ac_id, year=election.year) as tags:
+        result = _process_ac(ac_id, ac_num, pc_data, schema, force, checkpoint, election)
+        result.setdefault('ac_id', ac_id)
+        tags['status'] = result['status']
+        tags['pdf_type'] = result.get('pdf_type')
+        tags['booths'] = result.get('extracted', 0)
+    return result
+
+
+def _process_ac(ac_id: str, ac_num: int, pc_data: dict, schema: dict, force: bool,
+                checkpoint: Checkpoint = None, election: Election = TN_2024) -> dict:
     print(f"\n{'='*70}")
     print(f"Processing {ac_id}")
     print(f"{'='*70}")
     
     # Load existing data
-    existing = load_existing_data(ac_id)
+    with span('catalog', lookup='existing'):
+        existing = load_existing_data(ac_id, election)
     
     # Find booths needing extraction (empty votes)
     needs_extraction = set()
     for k, v in existing.get('results', {}).items():
         if not v.get('votes') or len(v.get('votes', [])) == 0:
-            match = re.match(r'^TN-\d{3}-0*(\d+)', k)
+            match = re.match(rf'^{re.escape(ac_id)}-0*(\d+)', k)
             if match:
                 needs_extraction.add(int(match.group(1)))
     
-    # Also check booths.json for booths missing from 2024.json entirely
-    booths_file = OUTPUT_BASE / ac_id / "booths.json"
+    # Also check booths.json for booths missing from the results entirely
+    booths_file = Path(election.booths_dir) / ac_id / "booths.json"
     if booths_file.exists():
-        with open(booths_file) as f:
+        with span('catalog', lookup='booths'), open(booths_file) as f:
             booths_data = json.load(f)
         booth_list = booths_data.get('booths', [])
         for booth in booth_list:
@@ -1184,77 +1351,80 @@ def process_ac(ac_num: int, pc_data: dict, schema: dict, force: bool = False) ->
                     if padded_id not in existing.get('results', {}):
                         needs_extraction.add(booth_num)
     
-    if not needs_extraction and not force:
+    # Without any results or booth list yet, the whole AC is extracted
+    if not needs_extraction and not force and (existing.get('results') or booths_file.exists()):
         print(f"  ✓ All booths already have vote data")
         return {'status': 'complete', 'ac_id': ac_id}
     
     print(f"  Booths needing extraction: {len(needs_extraction)}")
     
-    # Get PC info
-    pc_id, pc_info = get_pc_for_ac(ac_id, schema)
+    # Get PC (or, for assembly elections, AC) info
+    with span('catalog', lookup='pc'):
+        pc_id, candidates = get_contest(ac_id, pc_data, schema)
     if not pc_id:
         print(f"  ✗ Could not find PC for {ac_id}")
         return {'status': 'error', 'error': 'No PC found'}
     
-    candidates = pc_data.get(pc_id, {}).get('candidates', [])
     num_candidates = len(candidates)
     print(f"  PC: {pc_id}, Candidates: {num_candidates}")
     
     # Get official data for validation (booth totals, postal votes, total votes)
-    official_data = get_ac_official_data(ac_id, pc_data, schema)
+    with span('catalog', lookup='official'):
+        official_data = get_ac_official_data(ac_id, pc_data, schema)
     
     # Check PDF
-    pdf_path = FORM20_DIR / f"AC{ac_num:03d}.pdf"
+    pdf_path = election.pdf_path(ac_num)
     if not pdf_path.exists():
         print(f"  ✗ PDF not found: {pdf_path}")
         return {'status': 'error', 'error': 'PDF not found'}
     
     # Detect PDF type
-    pdf_type = detect_pdf_type(pdf_path)
+    with span('detect') as tags:
+        pdf_type = detect_pdf_type(pdf_path)
+        tags['pdf_type'] = pdf_type
     print(f"  PDF type: {pdf_type}")
     
     # Extract data
-    if pdf_type == "text":
-        extraction = extract_text_pdf(pdf_path, num_candidates, ac_id)
-    elif pdf_type == "scanned":
-        extraction = extract_scanned_pdf(pdf_path, num_candidates, ac_id, needs_extraction)
+    if pdf_type in ("text", "scanned"):
+        with span('extract', method='text' if pdf_type == 'text' else 'ocr'):
+            extraction = extract_pdf(pdf_path, num_candidates, ac_id, pdf_type, needs_extraction,
+                                     checkpoint, election)
     else:
         print(f"  ✗ Unknown PDF type: {pdf_type}")
         return {'status': 'error', 'error': f'Unknown PDF type: {pdf_type}'}
     
     # Filter to expected booths if we have too many
-    original_count = len(extraction.booths)
-    if needs_extraction and len(extraction.booths) > len(needs_extraction) * 1.5:
+    original_count = len(extraction.table)
+    if needs_extraction and original_count > len(needs_extraction) * 1.5:
         max_booth = max(needs_extraction) if needs_extraction else 600
-        filtered_booths = {}
-        for booth_id, booth in extraction.booths.items():
-            if booth.booth_no <= max_booth + 50:  # Allow some margin
-                filtered_booths[booth_id] = booth
-        extraction.booths = filtered_booths
-        if len(filtered_booths) < original_count:
-            extraction.warnings.append(f"Filtered from {original_count} to {len(filtered_booths)} booths")
+        # Allow some margin
+        extraction.table = extraction.table.select(extraction.table.booth_nos <= max_booth + 50)
+        if len(extraction.table) < original_count:
+            extraction.warnings.append(f"Filtered from {original_count} to {len(extraction.table)} booths")
     
-    print(f"  Extracted {len(extraction.booths)} booths from {extraction.pages_processed} pages")
+    print(f"  Extracted {len(extraction.table)} booths from {extraction.pages_processed} pages")
     
     if extraction.errors:
         for err in extraction.errors:
             print(f"  ✗ {err}")
     
     # Correct column order if needed
-    if len(extraction.booths) > 10:
-        extraction = correct_column_order(extraction, official_data, num_candidates)
+    if len(extraction.table) > 10:
+        with span('column_correction'):
+            extraction = correct_column_order(extraction, official_data, num_candidates)
         if extraction.warnings and "Column order corrected" in str(extraction.warnings):
             print(f"  ✓ Column order corrected")
     
     # Validate extraction
     print(f"\n  Validating...")
-    validation = validate_extraction(
-        extraction, 
-        official_data, 
-        num_candidates,
-        needs_extraction,
-        pdf_type
-    )
+    with span('validate'):
+        validation = validate_extraction(
+            extraction, 
+            official_data, 
+            num_candidates,
+            needs_extraction,
+            pdf_type
+        )
     
     # Print validation results
     if validation.errors:
@@ -1310,7 +1480,8 @@ def process_ac(ac_num: int, pc_data: dict, schema: dict, force: bool = False) ->
         return {
             'status': 'validation_failed',
             'ac_id': ac_id,
-            'extracted': len(extraction.booths),
+            'pdf_type': pdf_type,
+            'extracted': len(extraction.table),
             'errors': validation.errors
         }
     
@@ -1334,12 +1505,19 @@ def process_ac(ac_num: int, pc_data: dict, schema: dict, force: bool = False) ->
             }
             new += 1
     
+    if 'acId' not in existing:
+        # First results for this AC
+        existing = {'acId': ac_id, 'year': election.year,
+                    'candidates': [{'slNo': i + 1, 'name': c.name, 'party': c.party,
+                                    'symbol': ''} for i, c in enumerate(candidates)],
+                    **existing}
     existing['totalBooths'] = len(existing['results'])
-    existing['source'] = f'Tamil Nadu CEO - Form 20 (unified-parser, {pdf_type})'
+    existing['source'] = f'{election.source} (unified-parser, {pdf_type})'
     
     # Save
-    results_file = OUTPUT_BASE / ac_id / "2024.json"
-    with open(results_file, 'w') as f:
+    results_file = election.results_file(ac_id)
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    with span('write'), open(results_file, 'w') as f:
         json.dump(existing, f, indent=2)
     
     print(f"\n  ✓ SAVED: {new} new, {updated} updated")
@@ -1349,84 +1527,172 @@ def process_ac(ac_num: int, pc_data: dict, schema: dict, force: bool = False) ->
         'ac_id': ac_id,
         'new': new,
         'updated': updated,
+        'extracted': len(extraction.table),
         'pdf_type': pdf_type
     }
 
 
 def main():
     """Main entry point."""
-    pc_data, schema = load_reference_data()
-    
-    if len(sys.argv) < 2:
+    if '--help' in sys.argv or '-h' in sys.argv:
+        print(__doc__)
+        return
+
+    if '--spans' in sys.argv:
+        i = sys.argv.index('--spans')
+        print(f"Recording timing spans in {enable_spans(sys.argv[i + 1])}")
+        del sys.argv[i:i + 2]
+
+    mem_budget = None
+    if '--mem-budget' in sys.argv:
+        i = sys.argv.index('--mem-budget')
+        mem_budget = parse_size(sys.argv[i + 1])
+        del sys.argv[i:i + 2]
+
+    peak_history = {}
+    if '--mem-history' in sys.argv:
+        i = sys.argv.index('--mem-history')
+        peak_history = load_peak_history(sys.argv[i + 1])
+        print(f"Loaded peak memory history for {len(peak_history)} ACs")
+        del sys.argv[i:i + 2]
+
+    threads_per_worker = 1
+    if '--threads-per-worker' in sys.argv:
+        i = sys.argv.index('--threads-per-worker')
+        threads_per_worker = int(sys.argv[i + 1])
+        del sys.argv[i:i + 2]
+
+    ledger_path = LEDGER_PATH
+    if '--ledger' in sys.argv:
+        i = sys.argv.index('--ledger')
+        ledger_path = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+
+    run_name = None
+    if '--run' in sys.argv:
+        i = sys.argv.index('--run')
+        run_name = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+
+    timeout = None
+    if '--timeout' in sys.argv:
+        i = sys.argv.index('--timeout')
+        timeout = float(sys.argv[i + 1])
+        del sys.argv[i:i + 2]
+
+    retries = DEFAULT_RETRIES
+    if '--retries' in sys.argv:
+        i = sys.argv.index('--retries')
+        retries = int(sys.argv[i + 1])
+        del sys.argv[i:i + 2]
+
+    retry_quarantined = '--retry-quarantined' in sys.argv
+    if retry_quarantined:
+        sys.argv.remove('--retry-quarantined')
+
+    election = TN_2024
+    if '--election' in sys.argv:
+        i = sys.argv.index('--election')
+        if sys.argv[i + 1] not in ELECTIONS:
+            print(f"✗ Unknown election {sys.argv[i + 1]} (known: {', '.join(ELECTIONS)})")
+            return
+        election = ELECTIONS[sys.argv[i + 1]]
+        del sys.argv[i:i + 2]
+
+    if '--strategies' in sys.argv:
+        i = sys.argv.index('--strategies')
+        election = replace(election, strategies=tuple(sys.argv[i + 1].split(',')))
+        del sys.argv[i:i + 2]
+
+    if '--fixed-order' in sys.argv:
+        election = replace(election, strategy_order='fixed')
+        sys.argv.remove('--fixed-order')
+
+    if '--merge' in sys.argv:
+        i = sys.argv.index('--merge')
+        if sys.argv[i + 1] not in MERGES:
+            print(f"✗ Unknown merge {sys.argv[i + 1]} (one of {', '.join(MERGES)})")
+            return
+        election = replace(election, merge=sys.argv[i + 1])
+        del sys.argv[i:i + 2]
+
+    resume = False
+    if '--resume' in sys.argv:
+        i = sys.argv.index('--resume')
+        resume = True
+        if i + 1 < len(sys.argv) and not sys.argv[i + 1].startswith('--') and not sys.argv[i + 1][0].isdigit():
+            resume = sys.argv[i + 1]
+            del sys.argv[i + 1]
+        del sys.argv[i]
+
+    if len(sys.argv) < 2 and not resume:
         print("Usage:")
         print("  python unified-pdf-parser.py 21        # Single AC")
         print("  python unified-pdf-parser.py 1-50     # Range")
         print("  python unified-pdf-parser.py --all    # All needing extraction")
+        print("  python unified-pdf-parser.py --resume # Continue an interrupted run")
         return
     
-    arg = sys.argv[1]
+    arg = sys.argv[1] if len(sys.argv) > 1 else ''
     
-    if arg == '--all':
+    if resume:
+        # The resumed run's own AC list is used
+        ac_nums = []
+        
+    elif arg == '--all':
         # Find all ACs needing extraction
         ac_nums = []
         for ac_num in range(1, 235):
-            ac_id = f"TN-{ac_num:03d}"
-            existing = load_existing_data(ac_id)
+            ac_id = election.ac_id(ac_num)
+            existing = load_existing_data(ac_id, election)
             empty = sum(1 for r in existing.get('results', {}).values() 
                        if not r.get('votes') or len(r.get('votes', [])) == 0)
             if empty > 0:
                 ac_nums.append(ac_num)
         print(f"Found {len(ac_nums)} ACs needing extraction")
         
-    elif '-' in arg:
+    elif '-' in arg and not arg.startswith('-'):
         # Range
-        start, end = map(int, arg.split('-'))
+        try:
+            start, end = map(int, arg.split('-'))
+        except ValueError:
+            print(f"✗ Invalid AC range {arg!r} (expected e.g. 1-50)")
+            return
         ac_nums = list(range(start, end + 1))
         
     else:
         # Single or multiple ACs
         ac_nums = [int(a) for a in sys.argv[1:] if a.isdigit()]
+
+    if not ac_nums and not resume:
+        print(f"✗ No AC numbers in {' '.join(sys.argv[1:])!r} (see --help)")
+        return
+
+    with span('catalog', lookup='reference'):
+        pc_data, schema = load_reference_data(election)
     
-    # Process in parallel for speed
-    results = {'success': 0, 'failed': 0, 'skipped': 0}
-    
-    # Separate text and scanned PDFs for optimal parallelization
-    text_acs = []
-    scanned_acs = []
-    scanned_list = [1,3,4,5,6,7,28,29,30,31,38,39,40,41,42,151,152,153,154,155,156,188,189,191,192,193,194,213,214]
+    # Record the run; a resumed run continues with its unfinished ACs
+    ledger = RunLedger(ledger_path)
+    try:
+        run_id, pending = open_run(ledger, 'unified-pdf-parser.py', [election.ac_id(ac) for ac in ac_nums],
+                                   sys.argv[1:], run_name, resume)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return
+    ac_nums = [int(ac_id.split('-')[1]) for ac_id in pending]
     
-    for ac_num in ac_nums:
-        if ac_num in scanned_list:
-            scanned_acs.append(ac_num)
-        else:
-            text_acs.append(ac_num)
-    
-    # Process text PDFs in parallel (fast, can do many at once)
-    if text_acs:
-        print(f"\nProcessing {len(text_acs)} text PDFs in parallel...")
-        num_workers = min(len(text_acs), cpu_count() * 2, 8)  # Limit to 8 workers
-        with Pool(num_workers) as pool:
-            text_results = pool.map(process_ac_wrapper, [(ac, pc_data, schema) for ac in text_acs])
-            for result in text_results:
-                if result['status'] == 'success':
-                    results['success'] += 1
-                elif result['status'] == 'complete':
-                    results['skipped'] += 1
-                else:
-                    results['failed'] += 1
-    
-    # Process scanned PDFs sequentially (OCR is CPU-intensive, parallel doesn't help much)
-    if scanned_acs:
-        print(f"\nProcessing {len(scanned_acs)} scanned PDFs sequentially...")
-        for ac_num in scanned_acs:
-            result = process_ac(ac_num, pc_data, schema)
-            
-            if result['status'] == 'success':
-                results['success'] += 1
-            elif result['status'] == 'complete':
-                results['skipped'] += 1
-            else:
-                results['failed'] += 1
+    try:
+        results = run_batch(ac_nums, pc_data, schema, ledger, run_id, mem_budget, peak_history,
+                            threads_per_worker, timeout, retries, retry_quarantined, election)
+    except KeyboardInterrupt:
+        ledger.finish_run(run_id, 'interrupted')
+        print(f"\n✗ Interrupted - resume with: --resume {run_id}")
+        raise
+    except BaseException:
+        ledger.finish_run(run_id, 'crashed')
+        print(f"\n✗ Crashed - resume with: --resume {run_id}")
+        raise
+    ledger.finish_run(run_id)
     
     # Summary
     print(f"\n{'='*70}")
@@ -1435,7 +1701,90 @@ def main():
     print(f"  Success: {results['success']}")
     print(f"  Failed:  {results['failed']}")
     print(f"  Skipped: {results['skipped']}")
+    if results['quarantined']:
+        print(f"  Quarantined: {results['quarantined']} (see: run_ledger.py quarantine)")
+    print(f"  Run {run_id}: {ledger.outcomes(run_id)}")
 
 
+def run_batch(ac_nums: list[int], pc_data: dict, schema: dict, ledger: RunLedger, run_id: str,
+              mem_budget: Optional[int], peak_history: dict, threads_per_worker: int = 1,
+              timeout: Optional[float] = None, retries: int = DEFAULT_RETRIES,
+              retry_quarantined: bool = False, election: Election = TN_2024) -> dict:
+    """Process ACs in one pool, longest first, checkpointing every outcome in the run ledger.
+    
+    A hung or crashing AC is killed at its deadline and retried; one that
+    fails every attempt is quarantined and skipped by later runs.
+    """
+    results = {'success': 0, 'failed': 0, 'skipped': 0, 'quarantined': 0}
+    if not ac_nums:
+        return results
+    
+    def record(result):
+        ledger.finish_ac(run_id, result['ac_id'], result)
+        if result['status'] == 'success':
+            results['success'] += 1
+        elif result['status'] == 'complete':
+            results['skipped'] += 1
+        else:
+            results['failed'] += 1
+    
+    # Skip PDFs that failed every attempt in earlier runs (unless replaced on disk)
+    if not retry_quarantined:
+        quarantined = ledger.quarantined([election.pdf_path(n) for n in ac_nums])
+        for n in list(ac_nums):
+            entry = quarantined.get(str(election.pdf_path(n)))
+            if entry:
+                print(f"  ⛔ {election.ac_id(n)}: quarantined after {entry['failures']} failed runs, skipped")
+                record({'status': 'quarantined', 'ac_id': election.ac_id(n), 'error': entry['error']})
+                ac_nums.remove(n)
+    if not ac_nums:
+        return results
+    
+    # Estimate every AC's cost (history, else pages x rate for its type) and
+    # run text and scanned ACs together, longest first, so the OCR-heavy
+    # ACs don't form a serial tail after the text ones
+    ac_of = {election.ac_id(n): n for n in ac_nums}
+    types = {ac_id: 'scanned' if n in election.scanned_acs else 'text' for ac_id, n in ac_of.items()}
+    pages = {ac_id: count_pages(election.pdf_path(n)) for ac_id, n in ac_of.items()}
+    costs = lpt_order(estimate_costs(list(ac_of), types, pages, ledger.durations('unified-pdf-parser.py')))
+    
+    # Workers x tesseract/OpenCV threads never exceed the cores
+    num_workers, threads = thread_budget(cpu_count(), len(costs), threads_per_worker)
+    print()
+    print_plan(costs, num_workers, threads)
+    
+    if mem_budget:
+        budget = MemoryBudget(mem_budget, num_workers)
+    else:
+        budget = MemoryBudget.from_available(num_workers)
+    print(f"Memory budget: {budget.budget / 2**20:,.0f} MB for up to {num_workers} workers")
+    
+    # Admit ACs only while their projected peaks fit the budget; each AC
+    # gets a deadline from its estimated duration unless --timeout is given
+    projections = [project_peak(c.ac_id, c.pdf_type, c.pages, peak_history) for c in costs]
+    timeouts = [timeout or task_timeout(c.seconds) for c in costs]
+    tasks = [(ac_of[c.ac_id], pc_data, schema, Checkpoint(str(ledger.path), run_id, c.ac_id), election)
+             for c in costs]
+    # The digit recognizer is trained (first run) or loaded here, once, so
+    # scanned-AC workers don't each train one and race to save it
+    if any(c.pdf_type == 'scanned' for c in costs):
+        load_recognizer()
+    pool = ResilientPool(num_workers, initializer=limit_threads, initargs=(threads,), retries=retries)
+    print(f"Deadlines: {min(timeouts):.0f}-{max(timeouts):.0f}s per AC, {retries} retries")
+    for outcome in pool.run(process_ac_wrapper, tasks, keys=[c.ac_id for c in costs], timeouts=timeouts,
+                            budget=budget, projections=projections, costs=[c.seconds for c in costs]):
+        if outcome.ok:
+            record(outcome.result)
+            continue
+        # Every attempt failed: keep the error and quarantine the PDF
+        pdf = election.pdf_path(ac_of[outcome.key])
+        ledger.quarantine(pdf, outcome.key, outcome.error)
+        record({'status': 'error', 'ac_id': outcome.key, 'attempts': outcome.attempts,
+                'timed_out': outcome.timed_out, 'error': outcome.error})
+        results['quarantined'] += 1
+        print(f"  ⛔ {outcome.key}: failed {outcome.attempts} attempts, quarantined {pdf.name}")
+    
+    return results
+
 if __name__ == "__main__":
     main()
@@ -7,8 +7,12 @@ Checks that booth + postal = total for all candidates and fixes any mismatches.
 import json
 from pathlib import Path
 from collections import defaultdict
+import sys
 
-BASE_DIR = Path("/Users/p0s097d/ElectionLens")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+
+BASE_DIR = PATHS.root
 BOOTHS_DIR = BASE_DIR / "public/data/booths/TN"
 
 def load_json(path):
@@ -13,10 +13,15 @@ Validates all rules from booth-data-parsing.mdc:
 import json
 from pathlib import Path
 from collections import Counter, defaultdict
+import sys
 
-BOOTHS_DIR = Path("/Users/p0s097d/ElectionLens/public/data/booths/TN")
-PC_DATA = Path("/Users/p0s097d/ElectionLens/public/data/elections/pc/TN/2024.json")
-SCHEMA = Path("/Users/p0s097d/ElectionLens/public/data/schema.json")
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS
+from records import RecordError, load_booth_list, load_election, load_results
+
+BOOTHS_DIR = PATHS.booths / "TN"
+PC_DATA = PATHS.elections / "pc/TN/2024.json"
+SCHEMA = PATHS.schema
 
 
 def load_json(path):
@@ -66,19 +71,21 @@ def validate_ac(ac_id, pc_data, schema):
     if not results_file.exists():
         return {'status': 'missing', 'issues': ['No 2024.json']}
     
-    with open(results_file) as f:
-        results_data = json.load(f)
+    # The postal block is decoded unchecked: Validation 5 reports it per candidate
+    try:
+        results_data = load_results(results_file, check_postal=False)
+    except RecordError as e:
+        return {'status': 'error', 'issues': [f"HARD RULE VIOLATION: {e}"]}
     
-    results = results_data.get('results', {})
-    candidates = results_data.get('candidates', [])
+    results = results_data.results
+    candidates = results_data.candidates
     
     if not results or not candidates:
         return {'status': 'error', 'issues': ['Missing results or candidates']}
     
     # Get PC data for validation
     pc_id, pc_name = get_pc_for_ac(ac_id, schema)
-    pc_result = pc_data.get(pc_id, {}) if pc_id else {}
-    official_candidates = pc_result.get('candidates', [])
+    official_candidates = pc_data[pc_id].candidates if pc_id in pc_data else []
     
     issues = []
     warnings = []
@@ -92,8 +99,7 @@ def validate_ac(ac_id, pc_data, schema):
     vote_value_errors = []
     
     for booth_id, booth_result in results.items():
-        votes = booth_result.get('votes', [])
-        total = booth_result.get('total', 0)
+        votes = booth_result.votes
         
         # Extract booth number from booth_id (e.g., "TN-001-45" -> "45")
         booth_no = booth_id.split('-')[-1]
@@ -127,14 +133,14 @@ def validate_ac(ac_id, pc_data, schema):
     if official_candidates:
         vote_errors = []
         for i in range(min(3, len(official_candidates), len(booth_totals))):
-            official = official_candidates[i].get('votes', 0)
+            official = official_candidates[i].votes
             extracted = booth_totals[i]
             if official > 0:
                 ratio = extracted / official
                 if not (0.80 <= ratio <= 1.20):  # Within 20% tolerance
                     error_pct = abs(extracted - official) / official * 100
                     vote_errors.append(
-                        f"Candidate {i+1} ({official_candidates[i].get('party', 'Unknown')}): "
+                        f"Candidate {i+1} ({official_candidates[i].party or 'Unknown'}): "
                         f"extracted {extracted:,} vs official {official:,} ({error_pct:.1f}% error, ratio {ratio:.2f})"
                     )
                     if error_pct > 5:
@@ -146,10 +152,10 @@ def validate_ac(ac_id, pc_data, schema):
     if candidates and len(results) > 0:
         booth_wins = Counter()
         for booth_id, booth_result in results.items():
-            votes = booth_result.get('votes', [])
+            votes = booth_result.votes
             if votes:
                 # Exclude NOTA from winner calculation
-                votes_excluding_nota = votes[:-1] if len(votes) == len(candidates) and candidates[-1].get('party') == 'NOTA' else votes
+                votes_excluding_nota = votes[:-1] if len(votes) == len(candidates) and candidates[-1].party == 'NOTA' else votes
                 if votes_excluding_nota:
                     winner_idx = max(range(len(votes_excluding_nota)), key=lambda i: votes_excluding_nota[i])
                     booth_wins[winner_idx] += 1
@@ -158,9 +164,9 @@ def validate_ac(ac_id, pc_data, schema):
             top_2_by_wins = set()
             for i, _ in booth_wins.most_common(2):
                 if i < len(candidates):
-                    top_2_by_wins.add(candidates[i]['party'])
+                    top_2_by_wins.add(candidates[i].party)
             if official_candidates and top_2_by_wins:
-                top_2_official = {c['party'] for c in official_candidates[:2]}
+                top_2_official = {c.party for c in official_candidates[:2]}
                 if top_2_by_wins != top_2_official:
                     warnings.append(
                         f"Winner distribution mismatch: extracted top 2 by booth wins {top_2_by_wins} "
@@ -168,7 +174,7 @@ def validate_ac(ac_id, pc_data, schema):
                     )
     
     # Validation 5: Check postal votes (if present)
-    postal = results_data.get('postal', {})
+    postal = results_data.postal or {}
     if postal and 'candidates' in postal:
         postal_errors = []
         for cand in postal['candidates']:
@@ -187,12 +193,16 @@ def validate_ac(ac_id, pc_data, schema):
     booths_json = BOOTHS_DIR / ac_id / "booths.json"
     expected_booths = None
     if booths_json.exists():
-        with open(booths_json) as f:
-            booths_meta = json.load(f)
-        expected_booths = booths_meta.get('totalBooths', len(booths_meta.get('booths', [])))
-        coverage_pct = (len(results) / expected_booths * 100) if expected_booths > 0 else 0
-        if coverage_pct < 80:
-            warnings.append(f"Low booth coverage: {len(results)}/{expected_booths} ({coverage_pct:.1f}%)")
+        try:
+            booths_meta = load_booth_list(booths_json)
+        except RecordError as e:
+            booths_meta = None
+            warnings.append(f"Unreadable booth list: {e}")
+        if booths_meta is not None:
+            expected_booths = booths_meta.total_booths or len(booths_meta.booths)
+            coverage_pct = (len(results) / expected_booths * 100) if expected_booths > 0 else 0
+            if coverage_pct < 80:
+                warnings.append(f"Low booth coverage: {len(results)}/{expected_booths} ({coverage_pct:.1f}%)")
     
     # Determine status
     if len(issues) == 0 and len(warnings) == 0:
@@ -219,7 +229,7 @@ def validate_ac(ac_id, pc_data, schema):
 
 
 def main():
-    pc_data = load_json(PC_DATA)
+    pc_data = load_election(PC_DATA)
     schema = load_json(SCHEMA)
     
     print("=" * 80)
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Pipeline Watch Mode
+===================
+Long-running loop for working on problem ACs: edit a booth file, drop in a
+new Form 20 PDF or correct an official result, and only the affected ACs
+go through the pipeline again:
+
+    Form 20 PDF  {form20}/AC{num:03d}.pdf      -> extract, then as below
+    booth data   booths/{STATE}/{AC}/{year}.json,
+                 booths.json, booths-{year}.json -> reconcile, validate, export
+    official     elections/{ac|pc}/{STATE}/{year}.json
+                                               -> reload, every AC of the year
+    schema       schema.json                   -> reload, every AC
+
+    extract      unified-pdf-parser.py process_ac (the election's parser config)
+    reconcile    postal_reconcile.py, postal blocks of the affected ACs
+    validate     booth_anomalies.py signatures, misread columns, booth over-count
+    export       booth_summaries.py AC summaries and the PC/state rollups
+
+The schema, the official results (matched per AC) and the parser with its
+reference data are loaded once and held between runs; they are reloaded
+only when their own file changes. Files are polled by size and mtime (no
+watcher dependency); a change is acted on once it has held still for one
+poll, so a PDF still being copied is not read half-written. The pipeline's
+own writes are absorbed into the baseline and do not trigger another run.
+
+Usage:
+    python scripts/watch.py                       # TN, all years with booth data
+    python scripts/watch.py --year 2024 --interval 1
+    python scripts/watch.py --no-extract          # booth/official edits only
+"""
+
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from electionlens.config import PATHS, form20_dir
+
+POLL_INTERVAL = 2.0
+PDF_GLOB = 'AC[0-9][0-9][0-9].pdf'
+
+Stat = tuple[int, int]                  # size, mtime (ns)
+
+
+@dataclass
+class References:
+    """Reference data of one election, kept warm between runs."""
+    year: int
+    kind: str
+    official: dict[str, list[dict]]     # AC id -> official candidates
+    election: object = None             # parser Election, on the first extraction
+    results: Optional[dict] = None      # official results file as the parser reads it
+
+
+@dataclass
+class Batch:
+    """What one round of changes asks for."""
+    extract: dict[int, set[str]] = field(default_factory=dict)     # year -> AC ids
+    refresh: dict[int, set[str]] = field(default_factory=dict)     # year -> AC ids
+    reload: set[int] = field(default_factory=set)                  # years
+    schema: bool = False
+
+    def __bool__(self):
+        return bool(self.extract or self.refresh or self.reload or self.schema)
+
+
+# ============================================================================
+# Watched Files
+# ============================================================================
+
+def file_stat(path: Path) -> Optional[Stat]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def watched_files(state: str, years: list[int]) -> dict[Path, Stat]:
+    """Stat of every file the pipeline depends on."""
+    from postal_reconcile import election_kind
+
+    paths = [PATHS.schema]
+    booths = PATHS.booths / state
+    ac_dirs = sorted(d for d in booths.iterdir() if d.is_dir() and d.name.startswith(f"{state}-")) \
+        if booths.exists() else []
+    for ac_dir in ac_dirs:
+        paths.append(ac_dir / "booths.json")
+    for year in years:
+        kind = election_kind(state, year)
+        if kind:
+            paths.append(PATHS.elections / kind / state / f"{year}.json")
+        pdf_dir = form20_dir(state, year)
+        if pdf_dir.exists():
+            paths += sorted(pdf_dir.glob(PDF_GLOB))
+        for ac_dir in ac_dirs:
+            paths += [ac_dir / f"{year}.json", ac_dir / f"booths-{year}.json"]
+
+    stats = {}
+    for path in paths:
+        stat = file_stat(path)
+        if stat is not None:
+            stats[path] = stat
+    return stats
+
+
+def classify(path: Path, state: str, years: list[int], batch: Batch):
+    """Add the pipeline work a changed file asks for to batch."""
+    if path == PATHS.schema:
+        batch.schema = True
+        return
+    for year in years:
+        if path.name == f"{year}.json" and path.is_relative_to(PATHS.elections):
+            batch.reload.add(year)
+            return
+        if path.suffix.lower() == '.pdf' and path.parent == form20_dir(state, year):
+            ac_id = f"{state}-{int(path.stem[2:]):03d}"
+            batch.extract.setdefault(year, set()).add(ac_id)
+            return
+    ac_id = path.parent.name
+    if path.name == "booths.json":
+        for year in years:
+            batch.refresh.setdefault(year, set()).add(ac_id)
+        return
+    for year in years:
+        if path.name in (f"{year}.json", f"booths-{year}.json"):
+            batch.refresh.setdefault(year, set()).add(ac_id)
+
+
+# ============================================================================
+# Watcher
+# ============================================================================
+
+class Watcher:
+    def __init__(self, state: str, years: list[int], extract: bool = True,
+                 interval: float = POLL_INTERVAL):
+        from booth_matrix import load_schema
+
+        self.state = state
+        self.years = years
+        self.extract = extract
+        self.interval = interval
+        self.schema = load_schema()
+        self.references: dict[int, References] = {}
+        self.parser = None
+        self.seen = watched_files(state, years)
+        self.pending: dict[Path, Optional[Stat]] = {}
+
+    # -- reference data ------------------------------------------------------
+
+    def refs(self, year: int) -> Optional[References]:
+        """Warm reference data of a year (loaded on first use)."""
+        from postal_reconcile import election_kind, official_candidates
+
+        if year not in self.references:
+            kind = election_kind(self.state, year)
+            if kind is None:
+                return None
+            self.references[year] = References(year, kind,
+                                               official_candidates(self.state, year, kind, self.schema))
+        return self.references[year]
+
+    def parser_refs(self, year: int) -> References:
+        """refs() plus the parser's Election and results, for extraction."""
+        from extract_driver import election_config, load_parser
+
+        refs = self.refs(year)
+        if self.parser is None:
+            self.parser = load_parser()
+        if refs.election is None:
+            config = election_config(self.state, year)
+            refs.election = self.parser.Election(
+                state=self.state, year=year, form20_dir=Path(config['form20_dir']),
+                booths_dir=Path(config['booths_dir']), results_path=Path(config['results_path']),
+                schema_path=Path(config['schema_path']), pdf_pattern=config['pdf_pattern'],
+                source=config['source'])
+            refs.results, _ = self.parser.load_reference_data(refs.election)
+        return refs
+
+    # -- polling -------------------------------------------------------------
+
+    def poll(self) -> Batch:
+        """Changes that have held still since the last poll."""
+        now = watched_files(self.state, self.years)
+        settled = Batch()
+        for path in set(now) | set(self.seen) | set(self.pending):
+            stat = now.get(path)
+            if path in self.pending:
+                if self.pending[path] == stat:
+                    del self.pending[path]
+                    self.seen[path] = stat
+                    if stat is None:
+                        del self.seen[path]
+                    classify(path, self.state, self.years, settled)
+                else:
+                    self.pending[path] = stat
+            elif self.seen.get(path) != stat:
+                self.pending[path] = stat
+        return settled
+
+    def absorb(self, paths: list[Path]):
+        """Take the pipeline's own writes into the baseline."""
+        for path in paths:
+            stat = file_stat(path)
+            if stat is None:
+                self.seen.pop(path, None)
+            else:
+                self.seen[path] = stat
+            self.pending.pop(path, None)
+
+    # -- pipeline ------------------------------------------------------------
+
+    def run(self, batch: Batch):
+        from booth_matrix import iter_ac_ids, load_schema, results_path
+
+        start = time.time()
+        if batch.schema:
+            print("  ↻ schema.json changed: reference data reloaded")
+            self.schema = load_schema()
+            self.references.clear()
+            for year in self.years:
+                batch.refresh[year] = set(iter_ac_ids(self.state))
+        for year in batch.reload:
+            print(f"  ↻ {year} official results changed: reloaded")
+            self.references.pop(year, None)
+            batch.refresh[year] = set(iter_ac_ids(self.state))
+
+        for year, ac_ids in sorted(batch.extract.items()):
+            if not self.extract:
+                print(f"  · {year}: {len(ac_ids)} PDF(s) changed, extraction off")
+                continue
+            for ac_id in sorted(ac_ids):
+                batch.refresh.setdefault(year, set()).add(ac_id)
+                self.extract_ac(year, ac_id)
+
+        written = []
+        for year, ac_ids in sorted(batch.refresh.items()):
+            ac_ids = sorted(a for a in ac_ids if results_path(self.state, a, year).exists())
+            if ac_ids:
+                written += self.refresh(year, ac_ids)
+        self.absorb(written)
+        print(f"  ⏱  {time.time() - start:.2f}s")
+
+    def extract_ac(self, year: int, ac_id: str):
+        refs = self.parser_refs(year)
+        try:
+            result = self.parser.process_ac(int(ac_id.split('-')[1]), refs.results, self.schema,
+                                            force=True, election=refs.election)
+        except Exception as e:
+            result = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+        icon = '✅' if result['status'] in ('success', 'complete') else '❌'
+        print(f"  {icon} extract {ac_id} {year}: {result['status']}"
+              + (f" ({result['error']})" if result.get('error') else ''))
+
+    def refresh(self, year: int, ac_ids: list[str]) -> list[Path]:
+        """Reconcile, validate and export some ACs of a year; returns the files it may have written."""
+        from booth_anomalies import scan_matrix
+        from booth_matrix import load_booth_matrix, results_path
+        from booth_summaries import refresh_summaries
+        from postal_reconcile import reconcile, stack_state_year, write_blocks
+
+        refs = self.refs(year)
+        suspect = excess = {}
+        if refs is not None:
+            stack = stack_state_year(self.state, year, ac_ids, self.schema, refs.official)
+            result = reconcile(stack)
+            changed = write_blocks(stack, result)
+            suspect = dict(zip(stack.ac_ids, result['ac_suspect']))
+            excess = dict(zip(stack.ac_ids, result['ac_excess']))
+            print(f"  ✓ reconcile {year}: {len(stack.ac_ids)} ACs, {len(changed)} postal blocks rewritten, "
+                  f"{int(result['ac_held'].sum())} held")
+
+        official = refs.official if refs is not None else {}
+        clean = []
+        for ac_id in ac_ids:
+            bm = load_booth_matrix(self.state, ac_id, year)
+            problems = [f"{a.kind} {a.score:.1%} → {a.fixer}" for a in scan_matrix(bm, official.get(ac_id))]
+            if suspect.get(ac_id):
+                problems.append(f"{int(suspect[ac_id])} misread column(s)")
+            if excess.get(ac_id):
+                problems.append(f"booth over official by {int(excess[ac_id]):,}")
+            if problems:
+                print(f"  ⚠️  validate {ac_id} {year}: {'; '.join(problems)}")
+            else:
+                clean.append(ac_id)
+        if clean:
+            print(f"  ✅ validate {year}: {', '.join(clean) if len(clean) <= 5 else f'{len(clean)} ACs'} clean")
+
+        # Summaries go stale by their input files' content, so only ACs whose
+        # results actually changed are recomputed
+        changed = refresh_summaries(self.state, [year], schema=self.schema)
+        print(f"  ✓ export {year}: {len(changed.get(year, []))} AC summaries, rollups updated")
+        # Extraction and reconciliation rewrite the results files
+        return [results_path(self.state, a, year) for a in ac_ids]
+
+    def watch(self):
+        print(f"  Watching {len(self.seen)} files every {self.interval:g}s (Ctrl-C to stop)")
+        while True:
+            time.sleep(self.interval)
+            batch = self.poll()
+            if batch:
+                print(f"\n[{time.strftime('%H:%M:%S')}] changes:")
+                self.run(batch)
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    from postal_reconcile import years_with_booth_data
+
+    args = sys.argv[1:]
+    if '--help' in args or '-h' in args:
+        print(__doc__)
+        return
+    state = args[args.index('--state') + 1] if '--state' in args else 'TN'
+    years = [int(y) for y in args[args.index('--year') + 1].split(',')] if '--year' in args \
+        else years_with_booth_data(state)
+    interval = float(args[args.index('--interval') + 1]) if '--interval' in args else POLL_INTERVAL
+
+    print("=" * 70)
+    print(f"Pipeline Watch ({state} {', '.join(map(str, years))})")
+    print("=" * 70)
+    for year in years:
+        print(f"  {year}: Form 20 PDFs in {form20_dir(state, year)}")
+    watcher = Watcher(state, years, extract='--no-extract' not in args, interval=interval)
+    try:
+        watcher.watch()
+    except KeyboardInterrupt:
+        print("\n✅ Stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -22,7 +22,12 @@ import { useState, useCallback, memo, useMemo, useEffect } from 'react';
 import type { ACElectionResult, ElectionCandidate } from '../types';
 import { getPartyColor, getPartyFullName } from '../utils/partyData';
 import { trackShare } from '../utils/firebase';
-import type { BoothResults, BoothWithResult, PostalData } from '../hooks/useBoothData';
+import type {
+  BoothResults,
+  BoothSummary,
+  BoothWithResult,
+  PostalData,
+} from '../hooks/useBoothData';
 
 function formatNumber(num: number | undefined | null): string {
   if (num === undefined || num === null) return '—';
@@ -58,6 +63,9 @@ interface ElectionResultPanelProps {
   /** Booth data for booth-wise view */
   boothResults?: BoothResults | null | undefined;
   boothsWithResults?: BoothWithResult[] | undefined;
+  /** Precomputed booth analytics, loaded instead of the full results until a booth tab needs them */
+  boothSummary?: BoothSummary | null | undefined;
+  onRequestBoothResults?: (() => void) | undefined;
 }
 
 /** Remove diacritics from text (e.g., Tamil Nādu → Tamil Nadu) */
@@ -115,6 +123,8 @@ export function ElectionResultPanel({
   pcContributionShareUrl,
   boothResults,
   boothsWithResults = [],
+  boothSummary,
+  onRequestBoothResults,
 }: ElectionResultPanelProps): JSX.Element {
   // Read tab from URL on mount
   const getTabFromUrl = useCallback((): TabType => {
@@ -132,16 +142,26 @@ export function ElectionResultPanel({
   const [selectedBoothId, setSelectedBoothId] = useState<string | null>(null);
 
   // Check if booth data is available
-  // For booth data to be available, we need:
-  // 1. boothResults must be loaded (not null/undefined)
-  // 2. boothResults must have results (at least one booth with results)
+  // For booth data to be available, we need either:
+  // 1. boothResults loaded with results (at least one booth with results), or
+  // 2. a booth summary, in which case boothResults is fetched when a booth tab is opened
   // Note: boothsWithResults can be empty if boothList is missing but boothResults exists
-  const hasBoothData = Boolean(
+  const hasFullResults = Boolean(
     boothResults &&
     boothResults.results &&
     typeof boothResults.results === 'object' &&
     Object.keys(boothResults.results).length > 0
   );
+  const hasBoothData = hasFullResults || Boolean(boothSummary && boothSummary.totalBooths > 0);
+  const isBoothTab = activeTab === 'booths' || activeTab === 'postal' || activeTab === 'analysis';
+  const boothResultsPending = hasBoothData && !hasFullResults && isBoothTab;
+
+  // Booth-level tabs need the full results file; only the summary is loaded up front
+  useEffect(() => {
+    if (boothResultsPending) {
+      onRequestBoothResults?.();
+    }
+  }, [boothResultsPending, onRequestBoothResults]);
 
   // Update URL when tab changes
   useEffect(() => {
@@ -428,7 +448,12 @@ export function ElectionResultPanel({
 
       {/* Tab content */}
       <div className="panel-tab-content">
-        {selectedPCYear && currentPCContribution ? (
+        {boothResultsPending ? (
+          <div className="analysis-empty">
+            <MapPin size={32} />
+            <p>Loading booth results…</p>
+          </div>
+        ) : selectedPCYear && currentPCContribution ? (
           /* Parliament view */
           activeTab === 'overview' ? (
             <div className="overview-view">
@@ -487,6 +512,7 @@ export function ElectionResultPanel({
                   </button>
                 )}
               </div>
+              {boothSummary && <BoothSummaryStrip summary={boothSummary} />}
 
               {/* Parliament candidates preview */}
               <div className="candidates-preview">
@@ -662,6 +688,7 @@ export function ElectionResultPanel({
                 ) : null;
               })()}
             </div>
+            {boothSummary && <BoothSummaryStrip summary={boothSummary} />}
 
             {/* Top 3 candidates preview */}
             <div className="candidates-preview">
@@ -1089,6 +1116,37 @@ function BoothWiseView({
   );
 }
 
+// Booth summary strip - booths won by the leading parties, from summary-{year}.json
+function BoothSummaryStrip({ summary }: { summary: BoothSummary }): JSX.Element {
+  const leaders = summary.parties.filter((p) => p.boothsWon > 0).slice(0, 2);
+
+  return (
+    <div className="stats-inline">
+      <div className="stat-inline">
+        <MapPin size={12} />
+        <span className="label">Booths</span>
+        <span className="value">{formatNumber(summary.totalBooths)}</span>
+      </div>
+      {leaders.map((p) => (
+        <div
+          key={p.party}
+          className="stat-inline"
+          title={`${p.party} won ${p.boothsWon} booths (${p.strikeRate}% strike rate)`}
+        >
+          <span className="label" style={{ color: getPartyColor(p.party) }}>
+            {p.party}
+          </span>
+          <span className="value">{formatNumber(p.boothsWon)}</span>
+        </div>
+      ))}
+      <div className="stat-inline" title="Booths decided by fewer than 50 votes">
+        <span className="label">Close</span>
+        <span className="value">{formatNumber(summary.battlegrounds.count)}</span>
+      </div>
+    </div>
+  );
+}
+
 // Boothwise Analysis component - provides detailed insights on election results
 interface BoothwiseAnalysisProps {
   boothResults: BoothResults | null | undefined;
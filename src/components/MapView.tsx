@@ -554,7 +554,14 @@ export function MapView({
   // Base layer state - 'Vector' uses VectorTileLayer, others use TileLayer
   const [baseLayer, setBaseLayer] = useState<LayerName>('Streets');
   // Booth data hook - loads booth data for selected assembly
-  const { boothResults, boothsWithResults, loadBoothData, loadBoothResults } = useBoothData();
+  const {
+    boothResults,
+    boothSummary,
+    boothsWithResults,
+    loadBoothData,
+    loadBoothResults,
+    loadBoothSummary,
+  } = useBoothData();
   // Schema hook - used to get pcId for booth data availability check
   const { getAC } = useSchema();
 
@@ -590,15 +597,21 @@ export function MapView({
     boothDataEnabled,
   ]);
 
-  // Load booth results when year changes
+  // Load the booth analytics summary when year changes; the full results file is only
+  // fetched up front when there is no summary, otherwise when a booth-level tab asks for it
   // Try to load even if boothDataEnabled is false - let the availability check happen in ElectionResultPanel
   useEffect(() => {
     if (electionResult?.schemaId?.startsWith('TN-')) {
       // When viewing PC contribution (selectedACPCYear), use that year for booth data
       // Otherwise use selectedYear or election result's year
+      const schemaId = electionResult.schemaId;
       const yearToLoad = selectedACPCYear ?? selectedYear ?? electionResult?.year;
       if (yearToLoad) {
-        void loadBoothResults('TN', electionResult.schemaId, yearToLoad);
+        void loadBoothSummary('TN', schemaId, yearToLoad).then((found) => {
+          if (!found) {
+            void loadBoothResults('TN', schemaId, yearToLoad);
+          }
+        });
       }
     }
   }, [
@@ -606,10 +619,25 @@ export function MapView({
     electionResult?.year,
     selectedYear,
     loadBoothResults,
+    loadBoothSummary,
     selectedACPCYear,
     boothDataEnabled,
   ]);
 
+  // Full booth results for the Booths/Postal/Analysis tabs
+  const handleRequestBoothResults = useCallback(() => {
+    const yearToLoad = selectedACPCYear ?? selectedYear ?? electionResult?.year;
+    if (electionResult?.schemaId?.startsWith('TN-') && yearToLoad) {
+      void loadBoothResults('TN', electionResult.schemaId, yearToLoad);
+    }
+  }, [
+    electionResult?.schemaId,
+    electionResult?.year,
+    selectedYear,
+    selectedACPCYear,
+    loadBoothResults,
+  ]);
+
   // Listen for layer change events from toolbar
   useEffect(() => {
     const handleLayerChange = (e: Event): void => {
@@ -1234,7 +1262,9 @@ export function MapView({
             onPCYearChange={onACPCYearChange}
             pcContributionShareUrl={pcContributionShareUrl}
             boothResults={boothResults}
+            boothSummary={boothSummary}
             boothsWithResults={boothsWithResults}
+            onRequestBoothResults={handleRequestBoothResults}
           />
         </Suspense>
       )}
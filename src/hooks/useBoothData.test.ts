@@ -1,7 +1,7 @@
 import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest';
 import { renderHook, act, waitFor } from '@testing-library/react';
 import { useBoothData } from './useBoothData';
-import type { BoothList, BoothResults } from './useBoothData';
+import type { BoothList, BoothResults, BoothSummary } from './useBoothData';
 
 // Mock fetch
 const mockFetch = vi.fn();
@@ -65,6 +65,32 @@ const mockBoothResults: BoothResults = {
   },
 };
 
+const mockBoothSummary: BoothSummary = {
+  version: 1,
+  acId: 'TN-001',
+  acName: 'GUMMIDIPUNDI',
+  pcId: 'TN-01',
+  year: 2021,
+  totalBooths: 2,
+  totalVotes: 1575,
+  parties: [
+    {
+      party: 'DMK',
+      votes: 900,
+      voteShare: 57.14,
+      boothsWon: 2,
+      strikeRate: 100,
+      marginTotal: 250,
+      avgMargin: 125,
+    },
+  ],
+  landslides: { count: 0, booths: [] },
+  oneSided: { count: 0, booths: [] },
+  battlegrounds: { count: 1, booths: [{ id: 'TN-001-2', party: 'DMK', margin: 50 }] },
+  highNota: { count: 0, booths: [] },
+  womenBooths: { count: 1, boothsWon: { DMK: 1 } },
+};
+
 describe('useBoothData', () => {
   beforeEach(() => {
     vi.clearAllMocks();
@@ -79,6 +105,7 @@ describe('useBoothData', () => {
       const { result } = renderHook(() => useBoothData());
       expect(result.current.boothList).toBeNull();
       expect(result.current.boothResults).toBeNull();
+      expect(result.current.boothSummary).toBeNull();
       expect(result.current.boothsWithResults).toEqual([]);
       expect(result.current.availableYears).toEqual([]);
       expect(result.current.loading).toBe(false);
@@ -153,6 +180,51 @@ describe('useBoothData', () => {
     });
   });
 
+  describe('loadBoothSummary', () => {
+    it('loads the summary and drops full results', async () => {
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        json: () => Promise.resolve(mockBoothResults),
+      });
+
+      const { result } = renderHook(() => useBoothData());
+
+      await act(async () => {
+        await result.current.loadBoothResults('TN', 'TN-001', 2021);
+      });
+
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        json: () => Promise.resolve(mockBoothSummary),
+      });
+
+      let found = false;
+      await act(async () => {
+        found = await result.current.loadBoothSummary('TN', 'TN-001', 2021);
+      });
+
+      expect(found).toBe(true);
+      expect(mockFetch).toHaveBeenLastCalledWith('/data/booths/TN/TN-001/summary-2021.json');
+      expect(result.current.boothSummary).toEqual(mockBoothSummary);
+      expect(result.current.boothResults).toBeNull();
+    });
+
+    it('reports a missing summary without an error', async () => {
+      mockFetch.mockResolvedValueOnce({ ok: false, status: 404 });
+
+      const { result } = renderHook(() => useBoothData());
+
+      let found = true;
+      await act(async () => {
+        found = await result.current.loadBoothSummary('TN', 'TN-001', 2019);
+      });
+
+      expect(found).toBe(false);
+      expect(result.current.boothSummary).toBeNull();
+      expect(result.current.error).toBeNull();
+    });
+  });
+
   describe('boothsWithResults', () => {
     it('merges booth list with results', async () => {
       mockFetch
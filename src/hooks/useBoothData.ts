@@ -77,6 +77,45 @@ export interface BoothResults {
   postal?: PostalData;
 }
 
+// Precomputed booth analytics (scripts/booth_summaries.py -> summary-{year}.json)
+export interface SummaryBooth {
+  id: string;
+  party: string;
+  percent?: number;
+  margin?: number;
+  notaVotes?: number;
+  notaPercent?: number;
+}
+
+export interface SummaryBoothList {
+  count: number;
+  booths: SummaryBooth[]; // capped; count is always exact
+}
+
+export interface BoothSummary {
+  version: number;
+  acId: string;
+  acName: string;
+  pcId: string | null;
+  year: number;
+  totalBooths: number;
+  totalVotes: number;
+  parties: Array<{
+    party: string;
+    votes: number;
+    voteShare: number;
+    boothsWon: number;
+    strikeRate: number;
+    marginTotal: number;
+    avgMargin: number;
+  }>;
+  landslides: SummaryBoothList;
+  oneSided: SummaryBoothList;
+  battlegrounds: SummaryBoothList;
+  highNota: SummaryBoothList;
+  womenBooths: { count: number; boothsWon: Record<string, number> };
+}
+
 // Merged booth data for display
 export interface BoothWithResult extends Booth {
   result?: BoothResult;
@@ -86,12 +125,14 @@ export interface BoothWithResult extends Booth {
 interface UseBoothDataReturn {
   boothList: BoothList | null;
   boothResults: BoothResults | null;
+  boothSummary: BoothSummary | null;
   boothsWithResults: BoothWithResult[];
   availableYears: number[];
   loading: boolean;
   error: string | null;
   loadBoothData: (stateId: string, acId: string, year?: number) => Promise<void>;
   loadBoothResults: (stateId: string, acId: string, year: number) => Promise<void>;
+  loadBoothSummary: (stateId: string, acId: string, year: number) => Promise<boolean>;
 }
 
 /**
@@ -100,6 +141,7 @@ interface UseBoothDataReturn {
 export function useBoothData(): UseBoothDataReturn {
   const [boothList, setBoothList] = useState<BoothList | null>(null);
   const [boothResults, setBoothResults] = useState<BoothResults | null>(null);
+  const [boothSummary, setBoothSummary] = useState<BoothSummary | null>(null);
   const [availableYears, setAvailableYears] = useState<number[]>([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
@@ -119,6 +161,7 @@ export function useBoothData(): UseBoothDataReturn {
         });
         setBoothList(null);
         setBoothResults(null);
+        setBoothSummary(null);
         setAvailableYears([]);
       }
       setCurrentAcId(acId);
@@ -193,6 +236,32 @@ export function useBoothData(): UseBoothDataReturn {
     }
   }, []);
 
+  /**
+   * Load the precomputed analytics summary for a year (a few KB instead of the
+   * full results file). Full results are dropped and must be loaded on demand
+   * with loadBoothResults. Returns false when no summary exists, so the caller
+   * can fall back to the full results.
+   */
+  const loadBoothSummary = useCallback(
+    async (stateId: string, acId: string, year: number): Promise<boolean> => {
+      setBoothResults(null);
+      try {
+        const response = await fetch(`/data/booths/${stateId}/${acId}/summary-${year}.json`);
+        if (!response.ok) {
+          setBoothSummary(null);
+          return false;
+        }
+        const data: BoothSummary = await response.json();
+        setBoothSummary(data);
+        return true;
+      } catch {
+        setBoothSummary(null);
+        return false;
+      }
+    },
+    []
+  );
+
   /**
    * Merge booth list with results for display
    * Includes booths from results that may not be in booth list
@@ -370,11 +439,13 @@ export function useBoothData(): UseBoothDataReturn {
   return {
     boothList,
     boothResults,
+    boothSummary,
     boothsWithResults,
     availableYears,
     loading,
     error,
     loadBoothData,
     loadBoothResults,
+    loadBoothSummary,
   };
 }